@@ -0,0 +1,48 @@
+"""add_notification_counters
+
+Unread notification counters per visibility bucket (recipient user or
+broadcast, school or global), backfilled from notifications.
+
+Revision ID: a9b0c1d2e3f4
+Revises: f8a9b0c1d2e3
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9b0c1d2e3f4'
+down_revision = 'f8a9b0c1d2e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_counters',
+        sa.Column('scope_key', sa.String(80), primary_key=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=True),
+        sa.Column('school_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('schools.id', ondelete='CASCADE'), nullable=True),
+        sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_notification_at', sa.DateTime(), nullable=True),
+    )
+
+    op.execute("""
+        INSERT INTO notification_counters
+            (scope_key, user_id, school_id, unread_count, last_notification_at)
+        SELECT
+            COALESCE(user_id::text, '*') || ':' || COALESCE(school_id::text, '*'),
+            user_id,
+            school_id,
+            COUNT(*) FILTER (WHERE NOT is_read),
+            MAX(created_at)
+        FROM notifications
+        GROUP BY user_id, school_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('notification_counters')
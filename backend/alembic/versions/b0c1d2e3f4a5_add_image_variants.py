@@ -0,0 +1,30 @@
+"""add_image_variants
+
+Resized WebP/JPEG variants of garment type images. Existing images are
+filled by scripts/backfill_image_variants.py.
+
+Revision ID: b0c1d2e3f4a5
+Revises: a9b0c1d2e3f4
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b0c1d2e3f4a5'
+down_revision = 'a9b0c1d2e3f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('garment_type_images', sa.Column('variants', postgresql.JSONB(), nullable=True))
+    op.add_column('global_garment_type_images', sa.Column('variants', postgresql.JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('global_garment_type_images', 'variants')
+    op.drop_column('garment_type_images', 'variants')
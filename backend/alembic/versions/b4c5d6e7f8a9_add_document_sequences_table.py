@@ -0,0 +1,35 @@
+"""add_document_sequences_table
+
+Counter table for document codes (VNT, ENC, ARR, CLI, PRD, GLB).
+Counters are created lazily on first use and seeded from the highest
+existing code, so no data backfill is needed here.
+
+Revision ID: b4c5d6e7f8a9
+Revises: ec3e44bb9fc9
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4c5d6e7f8a9'
+down_revision = 'ec3e44bb9fc9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'document_sequences',
+        sa.Column('scope', sa.String(36), nullable=False),
+        sa.Column('prefix', sa.String(50), nullable=False),
+        sa.Column('last_value', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('scope', 'prefix'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('document_sequences')
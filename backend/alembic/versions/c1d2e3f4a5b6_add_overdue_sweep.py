@@ -0,0 +1,44 @@
+"""add_overdue_sweep
+
+Notification types for receivables/payables that become overdue, and
+partial indexes for the background overdue sweep (unpaid rows not yet
+flagged, by due date).
+
+Revision ID: c1d2e3f4a5b6
+Revises: b0c1d2e3f4a5
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c1d2e3f4a5b6'
+down_revision = 'b0c1d2e3f4a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TYPE notification_type_enum ADD VALUE IF NOT EXISTS 'receivables_overdue'")
+    op.execute("ALTER TYPE notification_type_enum ADD VALUE IF NOT EXISTS 'payables_overdue'")
+
+    op.create_index(
+        'ix_accounts_receivable_overdue_sweep',
+        'accounts_receivable',
+        ['due_date'],
+        postgresql_where=sa.text('is_paid = false AND is_overdue = false')
+    )
+    op.create_index(
+        'ix_accounts_payable_overdue_sweep',
+        'accounts_payable',
+        ['due_date'],
+        postgresql_where=sa.text('is_paid = false AND is_overdue = false')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_accounts_payable_overdue_sweep', table_name='accounts_payable')
+    op.drop_index('ix_accounts_receivable_overdue_sweep', table_name='accounts_receivable')
+    # PostgreSQL doesn't support removing enum values; they remain unused
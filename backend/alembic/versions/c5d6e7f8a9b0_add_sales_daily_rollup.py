@@ -0,0 +1,138 @@
+"""add_sales_daily_rollup
+
+Daily sales totals per school / payment method / status, maintained by
+SalesRollupService. Backfills from existing sales and sale change
+transactions, and rebuilds v_sales_daily_summary on top of the rollup.
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d6e7f8a9b0'
+down_revision = 'b4c5d6e7f8a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sales_daily_rollup',
+        sa.Column('school_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('sale_date', sa.Date(), nullable=False),
+        sa.Column('payment_method', sa.String(20), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('is_historical', sa.Boolean(), nullable=False),
+        sa.Column('sales_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_amount', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('paid_amount', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('adjustments_amount', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['school_id'], ['schools.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('school_id', 'sale_date', 'payment_method', 'status', 'is_historical'),
+    )
+
+    # Backfill from sales (enums are stored by name, rollup keys use lowercase values)
+    op.execute("""
+    INSERT INTO sales_daily_rollup (
+        school_id, sale_date, payment_method, status, is_historical,
+        sales_count, total_amount, paid_amount
+    )
+    SELECT
+        s.school_id,
+        DATE(s.sale_date),
+        COALESCE(LOWER(s.payment_method::TEXT), 'other'),
+        LOWER(s.status::TEXT),
+        COALESCE(s.is_historical, false),
+        COUNT(*),
+        COALESCE(SUM(s.total), 0),
+        COALESCE(SUM(s.paid_amount), 0)
+    FROM sales s
+    GROUP BY 1, 2, 3, 4, 5;
+    """)
+
+    # Backfill net adjustments from approved sale changes
+    op.execute("""
+    INSERT INTO sales_daily_rollup (
+        school_id, sale_date, payment_method, status, is_historical, adjustments_amount
+    )
+    SELECT
+        t.school_id,
+        t.transaction_date,
+        LOWER(t.payment_method::TEXT),
+        'completed',
+        false,
+        SUM(CASE WHEN LOWER(t.type::TEXT) = 'expense' THEN -t.amount ELSE t.amount END)
+    FROM transactions t
+    WHERE t.category = 'sale_changes' AND t.school_id IS NOT NULL
+    GROUP BY 1, 2, 3
+    ON CONFLICT (school_id, sale_date, payment_method, status, is_historical)
+    DO UPDATE SET adjustments_amount = EXCLUDED.adjustments_amount;
+    """)
+
+    op.execute("DROP VIEW IF EXISTS v_sales_daily_summary;")
+    op.execute("""
+    CREATE VIEW v_sales_daily_summary AS
+    SELECT
+        r.sale_date,
+        r.school_id,
+        sch.name as school_name,
+        SUM(r.sales_count) as total_sales,
+        SUM(r.total_amount) as total_revenue,
+        SUM(r.paid_amount) as total_collected,
+        SUM(r.total_amount - r.paid_amount) as total_pending,
+        SUM(CASE WHEN r.payment_method = 'cash' THEN r.sales_count ELSE 0 END) as cash_count,
+        SUM(CASE WHEN r.payment_method = 'cash' THEN r.paid_amount ELSE 0 END) as cash_amount,
+        SUM(CASE WHEN r.payment_method = 'nequi' THEN r.sales_count ELSE 0 END) as nequi_count,
+        SUM(CASE WHEN r.payment_method = 'nequi' THEN r.paid_amount ELSE 0 END) as nequi_amount,
+        SUM(CASE WHEN r.payment_method = 'transfer' THEN r.sales_count ELSE 0 END) as transfer_count,
+        SUM(CASE WHEN r.payment_method = 'transfer' THEN r.paid_amount ELSE 0 END) as transfer_amount,
+        SUM(CASE WHEN r.payment_method = 'card' THEN r.sales_count ELSE 0 END) as card_count,
+        SUM(CASE WHEN r.payment_method = 'card' THEN r.paid_amount ELSE 0 END) as card_amount,
+        SUM(CASE WHEN r.payment_method = 'credit' THEN r.sales_count ELSE 0 END) as credit_count,
+        SUM(CASE WHEN r.payment_method = 'credit' THEN r.total_amount ELSE 0 END) as credit_amount,
+        SUM(r.adjustments_amount) as total_adjustments
+    FROM sales_daily_rollup r
+    LEFT JOIN schools sch ON r.school_id = sch.id
+    WHERE r.status = 'completed' AND r.is_historical = false
+    GROUP BY r.sale_date, r.school_id, sch.name
+    HAVING SUM(r.sales_count) > 0
+    ORDER BY r.sale_date DESC, school_name;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS v_sales_daily_summary;")
+    op.execute("""
+    CREATE OR REPLACE VIEW v_sales_daily_summary AS
+    SELECT
+        DATE(s.sale_date) as sale_date,
+        s.school_id,
+        sch.name as school_name,
+        COUNT(s.id) as total_sales,
+        COALESCE(SUM(s.total), 0) as total_revenue,
+        COALESCE(SUM(s.paid_amount), 0) as total_collected,
+        COALESCE(SUM(s.total - s.paid_amount), 0) as total_pending,
+        COUNT(CASE WHEN s.payment_method::TEXT = 'cash' THEN 1 END) as cash_count,
+        COALESCE(SUM(CASE WHEN s.payment_method::TEXT = 'cash' THEN s.paid_amount ELSE 0 END), 0) as cash_amount,
+        COUNT(CASE WHEN s.payment_method::TEXT = 'nequi' THEN 1 END) as nequi_count,
+        COALESCE(SUM(CASE WHEN s.payment_method::TEXT = 'nequi' THEN s.paid_amount ELSE 0 END), 0) as nequi_amount,
+        COUNT(CASE WHEN s.payment_method::TEXT = 'transfer' THEN 1 END) as transfer_count,
+        COALESCE(SUM(CASE WHEN s.payment_method::TEXT = 'transfer' THEN s.paid_amount ELSE 0 END), 0) as transfer_amount,
+        COUNT(CASE WHEN s.payment_method::TEXT = 'card' THEN 1 END) as card_count,
+        COALESCE(SUM(CASE WHEN s.payment_method::TEXT = 'card' THEN s.paid_amount ELSE 0 END), 0) as card_amount,
+        COUNT(CASE WHEN s.payment_method::TEXT = 'credit' THEN 1 END) as credit_count,
+        COALESCE(SUM(CASE WHEN s.payment_method::TEXT = 'credit' THEN s.total ELSE 0 END), 0) as credit_amount
+    FROM sales s
+    LEFT JOIN schools sch ON s.school_id = sch.id
+    WHERE s.status::TEXT = 'completed' AND (s.is_historical = false OR s.is_historical IS NULL)
+    GROUP BY DATE(s.sale_date), s.school_id, sch.name
+    ORDER BY sale_date DESC, school_name;
+    """)
+    op.drop_table('sales_daily_rollup')
@@ -0,0 +1,33 @@
+"""add_keyset_pagination_indexes
+
+Composite indexes matching the keyset (cursor) pagination sort keys of
+the sales, orders, clients and global balance entry lists, so each page
+is an index range scan instead of an OFFSET skip.
+
+Revision ID: d2e3f4a5b6c7
+Revises: c1d2e3f4a5b6
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2e3f4a5b6c7'
+down_revision = 'c1d2e3f4a5b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_sales_created_at_id', 'sales', ['created_at', 'id'])
+    op.create_index('ix_orders_created_at_id', 'orders', ['created_at', 'id'])
+    op.create_index('ix_clients_name_id', 'clients', ['name', 'id'])
+    op.create_index('ix_balance_entries_created_at_id', 'balance_entries', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_balance_entries_created_at_id', table_name='balance_entries')
+    op.drop_index('ix_clients_name_id', table_name='clients')
+    op.drop_index('ix_orders_created_at_id', table_name='orders')
+    op.drop_index('ix_sales_created_at_id', table_name='sales')
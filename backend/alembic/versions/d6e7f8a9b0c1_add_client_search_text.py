@@ -0,0 +1,83 @@
+"""add_client_search_text
+
+Accent-insensitive client search: search_normalize() function, generated
+clients.search_text column with a pg_trgm GIN index, and text_pattern_ops
+indexes for code/phone prefix lookups.
+
+The trigram index is skipped (with a warning) when the pg_trgm extension
+is not available on the server; search still works, without the index.
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6e7f8a9b0c1'
+down_revision = 'c5d6e7f8a9b0'
+branch_labels = None
+depends_on = None
+
+
+# Same definition as app.utils.text_search.SEARCH_NORMALIZE_FUNCTION
+SEARCH_NORMALIZE_FUNCTION = """
+CREATE OR REPLACE FUNCTION search_normalize(value TEXT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+PARALLEL SAFE
+AS $$
+    SELECT lower(translate(value, 'áéíóúüñàèìòùâêîôûäëïöçÁÉÍÓÚÜÑÀÈÌÒÙÂÊÎÔÛÄËÏÖÇ', 'aeiouunaeiouaeiouaeiocAEIOUUNAEIOUAEIOUAEIOC'))
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.execute(SEARCH_NORMALIZE_FUNCTION)
+
+    op.add_column(
+        'clients',
+        sa.Column(
+            'search_text',
+            sa.Text(),
+            sa.Computed(
+                "search_normalize("
+                "coalesce(code, '') || ' ' || coalesce(name, '') || ' ' || "
+                "coalesce(email, '') || ' ' || coalesce(phone, '') || ' ' || "
+                "coalesce(student_name, ''))",
+                persisted=True
+            )
+        )
+    )
+
+    op.create_index(
+        'ix_clients_code_prefix', 'clients', ['code'],
+        postgresql_ops={'code': 'text_pattern_ops'}
+    )
+    op.create_index(
+        'ix_clients_phone_prefix', 'clients', ['phone'],
+        postgresql_ops={'phone': 'text_pattern_ops'}
+    )
+
+    bind = op.get_bind()
+    has_trgm = bind.execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).scalar()
+    if has_trgm:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        op.execute(
+            "CREATE INDEX ix_clients_search_text_trgm "
+            "ON clients USING gin (search_text gin_trgm_ops);"
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_clients_search_text_trgm;")
+    op.drop_index('ix_clients_phone_prefix', table_name='clients')
+    op.drop_index('ix_clients_code_prefix', table_name='clients')
+    op.drop_column('clients', 'search_text')
+    op.execute("DROP FUNCTION IF EXISTS search_normalize(TEXT);")
@@ -0,0 +1,74 @@
+"""add_balance_ledger
+
+Append-only ledger mode for balance accounts: balance_entries.balance_after
+becomes nullable (NULL = pending compaction), a partial index finds pending
+entries per account, and balance_accounts.ledger_compacted_at records the
+last compaction.
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7f8a9b0c1d2'
+down_revision = 'd6e7f8a9b0c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'balance_accounts',
+        sa.Column('ledger_compacted_at', sa.DateTime(), nullable=True)
+    )
+    op.alter_column(
+        'balance_entries', 'balance_after',
+        existing_type=sa.Numeric(14, 2),
+        nullable=True
+    )
+    op.create_index(
+        'ix_balance_entries_pending', 'balance_entries', ['account_id'],
+        postgresql_where=sa.text('balance_after IS NULL')
+    )
+
+
+def downgrade() -> None:
+    # Fold pending entries first so balance_after can be NOT NULL again
+    op.execute("""
+        WITH running AS (
+            SELECT e.id,
+                   a.balance + sum(e.amount) OVER (
+                       PARTITION BY e.account_id ORDER BY e.created_at, e.id
+                   ) AS balance_after
+            FROM balance_entries e
+            JOIN balance_accounts a ON a.id = e.account_id
+            WHERE e.balance_after IS NULL
+        ),
+        folded AS (
+            UPDATE balance_entries e
+            SET balance_after = r.balance_after
+            FROM running r
+            WHERE e.id = r.id
+            RETURNING e.account_id, e.amount
+        )
+        UPDATE balance_accounts a
+        SET balance = a.balance + t.total
+        FROM (
+            SELECT account_id, sum(amount) AS total
+            FROM folded
+            GROUP BY account_id
+        ) t
+        WHERE a.id = t.account_id
+    """)
+    op.drop_index('ix_balance_entries_pending', table_name='balance_entries')
+    op.alter_column(
+        'balance_entries', 'balance_after',
+        existing_type=sa.Numeric(14, 2),
+        nullable=False
+    )
+    op.drop_column('balance_accounts', 'ledger_compacted_at')
@@ -0,0 +1,61 @@
+"""add_email_outbox
+
+Durable queue of rendered transactional emails, delivered by the
+EmailOutboxWorker in batches with retries and rate limiting.
+
+Revision ID: f8a9b0c1d2e3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8a9b0c1d2e3'
+down_revision = 'e7f8a9b0c1d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    email_status_enum = postgresql.ENUM(
+        'pending',
+        'sent',
+        'failed',
+        name='email_status_enum',
+        create_type=False
+    )
+    email_status_enum.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('kind', sa.String(50), nullable=False),
+        sa.Column('from_email', sa.String(255), nullable=False),
+        sa.Column('to_email', sa.String(255), nullable=False),
+        sa.Column('subject', sa.String(500), nullable=False),
+        sa.Column('html', sa.Text(), nullable=False),
+        sa.Column('status', email_status_enum, nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('provider_id', sa.String(100), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+    )
+
+    op.create_index('ix_email_outbox_to_email', 'email_outbox', ['to_email'])
+    op.create_index(
+        'ix_email_outbox_due', 'email_outbox', ['next_attempt_at'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_outbox_due', table_name='email_outbox')
+    op.drop_index('ix_email_outbox_to_email', table_name='email_outbox')
+    op.drop_table('email_outbox')
+    op.execute("DROP TYPE IF EXISTS email_status_enum")
@@ -18,6 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
 from app.models.user import User, UserRole
 from app.schemas.user import TokenData
+from app.services.auth_cache import AuthSnapshot, load_auth_snapshot
 from app.services.user import UserService
 
 
@@ -33,22 +34,25 @@ ROLE_HIERARCHY = {
 security = HTTPBearer()
 
 
-async def get_current_user(
+async def get_auth_snapshot(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     db: Annotated[AsyncSession, Depends(get_db)]
-) -> User:
+) -> AuthSnapshot:
     """
-    Dependency to get current authenticated user from JWT token
+    Dependency to get the authenticated user's snapshot from JWT token
+
+    The snapshot (user flags and school roles) is cached for
+    AUTH_CACHE_TTL_SECONDS, so most requests authorize without queries.
 
     Args:
         credentials: Bearer token from Authorization header
         db: Database session
 
     Returns:
-        Current authenticated user
+        Snapshot of the authenticated user and its school roles
 
     Raises:
-        HTTPException: 401 if token invalid or user not found
+        HTTPException: 401 if token invalid or user not found, 403 if inactive
     """
     # Extract token
     token = credentials.credentials
@@ -64,23 +68,41 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Get user from database
-    user = await user_service.get(token_data.user_id)
+    # Get user snapshot (cache, then database)
+    snapshot = await load_auth_snapshot(db, token_data.user_id)
 
-    if not user:
+    if not snapshot:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not user.is_active:
+    if not snapshot.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user"
         )
 
-    return user
+    return snapshot
+
+
+async def get_current_user(
+    snapshot: Annotated[AuthSnapshot, Depends(get_auth_snapshot)]
+) -> User:
+    """
+    Dependency to get current authenticated user from JWT token
+
+    Args:
+        snapshot: Authenticated user's snapshot
+
+    Returns:
+        Current authenticated user (detached; only columns are loaded)
+
+    Raises:
+        HTTPException: 401 if token invalid or user not found
+    """
+    return snapshot.to_user()
 
 
 async def get_current_active_user(
@@ -158,23 +180,15 @@ def require_school_access(required_role: UserRole | None = None):
     """
     async def verify_school_access(
         school_id: UUID,
-        current_user: Annotated[User, Depends(get_current_user)],
-        db: Annotated[AsyncSession, Depends(get_db)]
+        snapshot: Annotated[AuthSnapshot, Depends(get_auth_snapshot)]
     ) -> None:
         """Verify user has access to school with required role"""
         # Superusers bypass ALL role checks
-        if current_user.is_superuser:
+        if snapshot.is_superuser:
             return
 
         # Check user has role in this school
-        from app.services.user import UserService
-        user_service = UserService(db)
-
-        user_roles = await user_service.get_user_schools(current_user.id)
-        school_role = next(
-            (r for r in user_roles if r.school_id == school_id),
-            None
-        )
+        school_role = snapshot.role_for(school_id)
 
         if not school_role:
             raise HTTPException(
@@ -184,7 +198,7 @@ def require_school_access(required_role: UserRole | None = None):
 
         # Check role level if required
         if required_role:
-            user_level = ROLE_HIERARCHY.get(school_role.role, 0)
+            user_level = ROLE_HIERARCHY.get(school_role, 0)
             required_level = ROLE_HIERARCHY.get(required_role, 0)
 
             if user_level < required_level:
@@ -215,22 +229,14 @@ def require_any_role(*roles: UserRole):
     """
     async def verify_role(
         school_id: UUID,
-        current_user: Annotated[User, Depends(get_current_user)],
-        db: Annotated[AsyncSession, Depends(get_db)]
+        snapshot: Annotated[AuthSnapshot, Depends(get_auth_snapshot)]
     ) -> None:
         """Verify user has one of the specified roles"""
         # Superusers bypass ALL role checks
-        if current_user.is_superuser:
+        if snapshot.is_superuser:
             return
 
-        from app.services.user import UserService
-        user_service = UserService(db)
-
-        user_roles = await user_service.get_user_schools(current_user.id)
-        school_role = next(
-            (r for r in user_roles if r.school_id == school_id),
-            None
-        )
+        school_role = snapshot.role_for(school_id)
 
         if not school_role:
             raise HTTPException(
@@ -238,7 +244,7 @@ def require_any_role(*roles: UserRole):
                 detail="No access to this school"
             )
 
-        if school_role.role not in roles:
+        if school_role not in roles:
             role_names = ", ".join(r.value for r in roles)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -250,8 +256,7 @@ def require_any_role(*roles: UserRole):
 
 async def get_user_school_role(
     school_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)]
+    snapshot: Annotated[AuthSnapshot, Depends(get_auth_snapshot)]
 ) -> UserRole | None:
     """
     Get the user's role for a specific school.
@@ -260,19 +265,10 @@ async def get_user_school_role(
         UserRole if user has access, None otherwise.
         For superusers, returns OWNER (highest level).
     """
-    if current_user.is_superuser:
+    if snapshot.is_superuser:
         return UserRole.OWNER
 
-    from app.services.user import UserService
-    user_service = UserService(db)
-
-    user_roles = await user_service.get_user_schools(current_user.id)
-    school_role = next(
-        (r for r in user_roles if r.school_id == school_id),
-        None
-    )
-
-    return school_role.role if school_role else None
+    return snapshot.role_for(school_id)
 
 
 # Type aliases for common dependencies
@@ -283,7 +279,7 @@ DatabaseSession = Annotated[AsyncSession, Depends(get_db)]
 
 
 async def get_user_school_ids(
-    current_user: Annotated[User, Depends(get_current_user)],
+    snapshot: Annotated[AuthSnapshot, Depends(get_auth_snapshot)],
     db: Annotated[AsyncSession, Depends(get_db)]
 ) -> list[UUID]:
     """
@@ -295,18 +291,15 @@ async def get_user_school_ids(
     Returns:
         List of school UUIDs the user can access
     """
-    from app.services.user import UserService
     from app.models.school import School
     from sqlalchemy import select
 
-    if current_user.is_superuser:
+    if snapshot.is_superuser:
         # Superusers can access all schools
         result = await db.execute(select(School.id))
         return list(result.scalars().all())
 
-    user_service = UserService(db)
-    user_roles = await user_service.get_user_schools(current_user.id)
-    return [r.school_id for r in user_roles]
+    return list(snapshot.roles)
 
 
 # Type alias for user's school IDs
@@ -364,7 +357,7 @@ def can_delete_records(role: UserRole | None) -> bool:
 
 async def require_any_school_admin(
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)]
+    snapshot: Annotated[AuthSnapshot, Depends(get_auth_snapshot)]
 ) -> User:
     """
     Dependency to verify user is ADMIN in at least one school.
@@ -382,15 +375,10 @@ async def require_any_school_admin(
     if current_user.is_superuser:
         return current_user
 
-    from app.services.user import UserService
-    user_service = UserService(db)
-
-    user_roles = await user_service.get_user_schools(current_user.id)
-
     # Check if user has ADMIN or higher in any school
     has_admin = any(
-        ROLE_HIERARCHY.get(r.role, 0) >= ROLE_HIERARCHY[UserRole.ADMIN]
-        for r in user_roles
+        ROLE_HIERARCHY.get(role, 0) >= ROLE_HIERARCHY[UserRole.ADMIN]
+        for role in snapshot.roles.values()
     )
 
     if not has_admin:
@@ -24,6 +24,7 @@ from app.api.dependencies import (
     CurrentUser,
     require_any_school_admin
 )
+from app.core.cache import cache
 from app.models.alteration import AlterationType, AlterationStatus
 from app.schemas.alteration import (
     AlterationCreate,
@@ -38,6 +39,8 @@ from app.schemas.alteration import (
 )
 from app.services.alteration import AlterationService
 
+# Dashboard summary cache TTL (seconds); writes invalidate explicitly
+ALTERATIONS_SUMMARY_CACHE_TTL = 60
 
 router = APIRouter(
     prefix="/global/alterations",
@@ -111,9 +114,11 @@ async def get_summary(
     db: DatabaseSession,
     current_user: CurrentUser
 ):
-    """Get summary statistics for alterations."""
+    """Get summary statistics for alterations (cached; writes invalidate it)."""
     service = AlterationService(db)
-    return await service.get_summary()
+    # Today's counts are part of the summary, so the key changes daily
+    cache_key = cache.key("alterations_summary", None, date.today())
+    return await cache.get_or_set(cache_key, ALTERATIONS_SUMMARY_CACHE_TTL, service.get_summary)
 
 
 # ============================================
@@ -8,10 +8,11 @@ This module provides endpoints for:
 - Client student management
 """
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, status, Query, Depends
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Response
 from sqlalchemy import select
 
 from app.api.dependencies import DatabaseSession, CurrentUser, get_current_user
+from app.db.pagination import CountMode, InvalidCursorError, set_page_headers
 from app.models.user import UserRole, User
 from app.models.client import ClientType, Client
 from app.schemas.client import (
@@ -37,27 +38,15 @@ from app.schemas.client import (
 from app.services.client import ClientService
 from app.services.email import send_verification_email, send_welcome_email
 
-# In-memory store for verification codes (in production, use Redis)
+# Verification codes live in the shared ephemeral store (expire by TTL)
 import random
-from datetime import datetime, timedelta
-phone_verification_codes: dict[str, tuple[str, datetime]] = {}
-email_verification_codes: dict[str, tuple[str, datetime]] = {}
-verified_emails: dict[str, datetime] = {}  # email -> expiry_time
+from datetime import datetime
+from app.core.ephemeral import ephemeral_store
 
-
-def cleanup_expired_data():
-    """Remove expired verification codes and verified emails"""
-    now = datetime.utcnow()  # Use utcnow() to match existing code
-
-    # Clean expired verification codes
-    expired_codes = [email for email, (_, expiry) in email_verification_codes.items() if expiry < now]
-    for email in expired_codes:
-        del email_verification_codes[email]
-
-    # Clean expired verified emails
-    expired_verified = [email for email, expiry in verified_emails.items() if expiry < now]
-    for email in expired_verified:
-        del verified_emails[email]
+PHONE_CODE_TTL_SECONDS = 5 * 60
+EMAIL_CODE_TTL_SECONDS = 10 * 60
+# Time to complete registration after confirming the email
+VERIFIED_EMAIL_TTL_SECONDS = 30 * 60
 
 
 # =============================================================================
@@ -105,8 +94,11 @@ async def create_client(
 async def list_clients(
     db: DatabaseSession,
     current_user: CurrentUser,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page (replaces skip)"),
+    count: CountMode = Query(CountMode.NONE, description="Total in X-Total-Count: none, exact or approximate"),
     search: str | None = Query(None, min_length=1),
     client_type: ClientType | None = None,
     is_active: bool = True
@@ -115,15 +107,26 @@ async def list_clients(
     List all clients (global).
 
     Supports filtering by search term, client type, and active status.
+    Ordered by name; pass the X-Next-Cursor response header as `cursor`
+    to get the next page.
     """
     client_service = ClientService(db)
-    clients = await client_service.get_all_clients(
-        skip=skip,
-        limit=limit,
-        search=search,
-        client_type=client_type,
-        is_active=is_active
-    )
+    try:
+        clients, next_cursor, total = await client_service.get_all_clients(
+            skip=skip,
+            limit=limit,
+            search=search,
+            client_type=client_type,
+            is_active=is_active,
+            cursor=cursor,
+            count=count
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    set_page_headers(response, next_cursor, total)
 
     return [
         ClientListResponse(
@@ -547,25 +550,27 @@ async def register_web_client(
     If email already exists, returns the existing client.
     This allows repeat customers to place orders without issues.
     """
-    # Clean expired data
-    cleanup_expired_data()
-
     client_service = ClientService(db)
 
-    # Check if email was verified via OTP
     email = registration_data.email.lower().strip()
-    email_verified = email in verified_emails and verified_emails[email] > datetime.utcnow()
+    verified_key = ephemeral_store.key("verified_email", email)
 
     try:
         client = await client_service.register_web_client(registration_data)
 
-        # Update is_verified if email was confirmed via OTP
-        if email_verified:
+        # Update is_verified if email was confirmed via OTP; the mark is
+        # single use, so pop it (a concurrent registration won't see it)
+        verified = await ephemeral_store.pop(verified_key) is not None
+        if verified:
             client.is_verified = True
-            # Remove from verified emails list
-            del verified_emails[email]
 
-        await db.commit()
+        try:
+            await db.commit()
+        except Exception:
+            # Nothing was registered: give the verification back for a retry
+            if verified:
+                await ephemeral_store.set(verified_key, True, VERIFIED_EMAIL_TTL_SECONDS)
+            raise
 
         # TODO: Send welcome email
 
@@ -793,15 +798,16 @@ async def send_phone_verification(
     code = "".join([str(random.randint(0, 9)) for _ in range(6)])
 
     # Store with 5-minute expiry
-    expiry = datetime.utcnow() + timedelta(minutes=5)
-    phone_verification_codes[phone] = (code, expiry)
+    await ephemeral_store.set(
+        ephemeral_store.key("phone_code", phone), code, PHONE_CODE_TTL_SECONDS
+    )
 
     # In production: Send SMS here via Twilio/AWS SNS
     # For now, we'll include the code in response for testing (REMOVE IN PRODUCTION)
 
     return {
         "message": "Código de verificación enviado",
-        "expires_in": 300,  # 5 minutes
+        "expires_in": PHONE_CODE_TTL_SECONDS,
         # DEV ONLY - Remove this in production
         "dev_code": code
     }
@@ -818,21 +824,13 @@ async def confirm_phone_verification(
     phone = data.phone.replace(" ", "").replace("-", "")
     code = data.code
 
-    # Check if code exists
-    if phone not in phone_verification_codes:
+    # Check if code exists (expired codes are gone)
+    code_key = ephemeral_store.key("phone_code", phone)
+    stored_code = await ephemeral_store.get(code_key)
+    if stored_code is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No se encontró código de verificación. Solicita uno nuevo."
-        )
-
-    stored_code, expiry = phone_verification_codes[phone]
-
-    # Check if expired
-    if datetime.utcnow() > expiry:
-        del phone_verification_codes[phone]
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="El código ha expirado. Solicita uno nuevo."
+            detail="No se encontró código de verificación o expiró. Solicita uno nuevo."
         )
 
     # Verify code
@@ -842,8 +840,12 @@ async def confirm_phone_verification(
             detail="Código incorrecto"
         )
 
-    # Code is valid - remove from store
-    del phone_verification_codes[phone]
+    # Code is valid - consume it; only one concurrent request gets it
+    if await ephemeral_store.pop(code_key) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No se encontró código de verificación o expiró. Solicita uno nuevo."
+        )
 
     return {
         "message": "Teléfono verificado exitosamente",
@@ -867,9 +869,6 @@ async def send_email_verification(
     Uses Resend to send emails (3,000/month free).
     In dev mode without API key, code is logged to console.
     """
-    # Clean expired data
-    cleanup_expired_data()
-
     email = data.email.lower().strip()
     name = data.name or "Usuario"
 
@@ -886,8 +885,9 @@ async def send_email_verification(
     code = "".join([str(random.randint(0, 9)) for _ in range(6)])
 
     # Store with 10-minute expiry
-    expiry = datetime.utcnow() + timedelta(minutes=10)
-    email_verification_codes[email] = (code, expiry)
+    await ephemeral_store.set(
+        ephemeral_store.key("email_code", email), code, EMAIL_CODE_TTL_SECONDS
+    )
 
     # Send email
     sent = send_verification_email(email, code, name)
@@ -900,7 +900,7 @@ async def send_email_verification(
 
     return {
         "message": "Código de verificación enviado a tu correo",
-        "expires_in": 600,  # 10 minutes
+        "expires_in": EMAIL_CODE_TTL_SECONDS,
     }
 
 
@@ -912,27 +912,16 @@ async def confirm_email_verification(
     """
     Verify the email with the code sent.
     """
-    # Clean expired data
-    cleanup_expired_data()
-
     email = data.email.lower().strip()
     code = data.code
 
-    # Check if code exists
-    if email not in email_verification_codes:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No se encontró código de verificación. Solicita uno nuevo."
-        )
-
-    stored_code, expiry = email_verification_codes[email]
-
-    # Check if expired
-    if datetime.utcnow() > expiry:
-        del email_verification_codes[email]
+    # Check if code exists (expired codes are gone)
+    code_key = ephemeral_store.key("email_code", email)
+    stored_code = await ephemeral_store.get(code_key)
+    if stored_code is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="El código ha expirado. Solicita uno nuevo."
+            detail="No se encontró código de verificación o expiró. Solicita uno nuevo."
         )
 
     # Verify code
@@ -942,11 +931,17 @@ async def confirm_email_verification(
             detail="Código incorrecto"
         )
 
-    # Code is valid - remove from store
-    del email_verification_codes[email]
+    # Code is valid - consume it; only one concurrent request gets it
+    if await ephemeral_store.pop(code_key) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No se encontró código de verificación o expiró. Solicita uno nuevo."
+        )
 
     # Mark email as verified for 30 minutes (time to complete registration)
-    verified_emails[email] = datetime.utcnow() + timedelta(minutes=30)
+    await ephemeral_store.set(
+        ephemeral_store.key("verified_email", email), True, VERIFIED_EMAIL_TTL_SECONDS
+    )
 
     return {
         "message": "Email verificado exitosamente",
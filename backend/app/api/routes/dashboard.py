@@ -4,6 +4,7 @@ Global Dashboard Endpoints
 Provides aggregated statistics across all schools the user has access to.
 Does NOT depend on school_id - aggregates everything globally.
 """
+import hashlib
 from datetime import datetime
 from uuid import UUID
 from fastapi import APIRouter
@@ -11,6 +12,8 @@ from sqlalchemy import select, func
 from pydantic import BaseModel
 
 from app.api.dependencies import DatabaseSession, CurrentUser, UserSchoolIds
+from app.core.cache import cache
+from app.db.fanout import fan_out
 from app.models.school import School
 from app.models.product import Product
 from app.models.client import Client
@@ -20,6 +23,9 @@ from app.models.order import Order, OrderStatus
 
 router = APIRouter(prefix="/global/dashboard", tags=["Dashboard"])
 
+# Seconds a computed dashboard is reused for the same set of schools
+DASHBOARD_CACHE_TTL = 30
+
 
 # ============= Schemas =============
 
@@ -85,100 +91,112 @@ async def get_global_dashboard_stats(
             school_count=0
         )
 
+    # Short-lived cache per user scope (set of accessible schools)
+    scope = ",".join(sorted(str(school_id) for school_id in user_school_ids))
+    cache_key = f"dashboard:global:{hashlib.sha1(scope.encode()).hexdigest()}"
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return GlobalDashboardStats(**cached)
+
     # Calculate month start for filtering
     now = datetime.utcnow()
     month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-    # ======== Global Totals ========
-
-    # Total sales count
-    total_sales_result = await db.execute(
-        select(func.count(Sale.id))
-        .where(Sale.school_id.in_(user_school_ids))
-    )
-    total_sales = total_sales_result.scalar() or 0
-
-    # Sales amount this month
-    sales_amount_result = await db.execute(
-        select(func.coalesce(func.sum(Sale.total), 0))
-        .where(Sale.school_id.in_(user_school_ids))
-        .where(Sale.created_at >= month_start)
-    )
-    sales_amount_month = float(sales_amount_result.scalar() or 0)
-
-    # Total orders count
-    total_orders_result = await db.execute(
-        select(func.count(Order.id))
-        .where(Order.school_id.in_(user_school_ids))
-    )
-    total_orders = total_orders_result.scalar() or 0
-
-    # Pending orders count (pending or in_production)
-    pending_orders_result = await db.execute(
-        select(func.count(Order.id))
-        .where(Order.school_id.in_(user_school_ids))
-        .where(Order.status.in_([OrderStatus.PENDING, OrderStatus.IN_PRODUCTION]))
-    )
-    pending_orders = pending_orders_result.scalar() or 0
-
-    # Total clients count
-    total_clients_result = await db.execute(
-        select(func.count(Client.id))
-        .where(Client.school_id.in_(user_school_ids))
-    )
-    total_clients = total_clients_result.scalar() or 0
-
-    # Total products count
-    total_products_result = await db.execute(
-        select(func.count(Product.id))
-        .where(Product.school_id.in_(user_school_ids))
+    pending_statuses = [OrderStatus.PENDING, OrderStatus.IN_PRODUCTION]
+
+    # Independent aggregates: run them concurrently on pooled connections.
+    # The per-school breakdown uses GROUP BY, so the number of queries does
+    # not grow with the number of schools.
+
+    async def scalar(session, query) -> int | float:
+        result = await session.execute(query)
+        return result.scalar() or 0
+
+    async def grouped(session, query) -> dict:
+        result = await session.execute(query)
+        return {row[0]: tuple(row[1:]) for row in result.all()}
+
+    async def accessible_schools(session) -> list[School]:
+        result = await session.execute(
+            select(School)
+            .where(School.id.in_(user_school_ids))
+            .where(School.is_active == True)
+            .order_by(School.display_order, School.name)
+        )
+        return list(result.scalars().all())
+
+    (
+        total_sales,
+        sales_amount_month,
+        total_orders,
+        pending_orders,
+        total_clients,
+        total_products,
+        schools,
+        month_sales_by_school,
+        pending_orders_by_school,
+    ) = await fan_out(
+        db,
+        # Total sales count
+        lambda s: scalar(s, select(func.count(Sale.id)).where(Sale.school_id.in_(user_school_ids))),
+        # Sales amount this month
+        lambda s: scalar(
+            s,
+            select(func.coalesce(func.sum(Sale.total), 0))
+            .where(Sale.school_id.in_(user_school_ids))
+            .where(Sale.created_at >= month_start)
+        ),
+        # Total orders count
+        lambda s: scalar(s, select(func.count(Order.id)).where(Order.school_id.in_(user_school_ids))),
+        # Pending orders count (pending or in_production)
+        lambda s: scalar(
+            s,
+            select(func.count(Order.id))
+            .where(Order.school_id.in_(user_school_ids))
+            .where(Order.status.in_(pending_statuses))
+        ),
+        # Total clients count
+        lambda s: scalar(s, select(func.count(Client.id)).where(Client.school_id.in_(user_school_ids))),
+        # Total products count
+        lambda s: scalar(s, select(func.count(Product.id)).where(Product.school_id.in_(user_school_ids))),
+        # School info for the per-school summary
+        accessible_schools,
+        # Sales count and amount this month per school
+        lambda s: grouped(
+            s,
+            select(Sale.school_id, func.count(Sale.id), func.coalesce(func.sum(Sale.total), 0))
+            .where(Sale.school_id.in_(user_school_ids))
+            .where(Sale.created_at >= month_start)
+            .group_by(Sale.school_id)
+        ),
+        # Pending orders per school
+        lambda s: grouped(
+            s,
+            select(Order.school_id, func.count(Order.id))
+            .where(Order.school_id.in_(user_school_ids))
+            .where(Order.status.in_(pending_statuses))
+            .group_by(Order.school_id)
+        ),
     )
-    total_products = total_products_result.scalar() or 0
 
     # ======== Per-School Summary ========
     schools_summary = []
-
-    # Get school info
-    schools_result = await db.execute(
-        select(School)
-        .where(School.id.in_(user_school_ids))
-        .where(School.is_active == True)
-        .order_by(School.display_order, School.name)
-    )
-    schools = schools_result.scalars().all()
-
     for school in schools:
-        # Sales count this month for this school
-        school_sales_result = await db.execute(
-            select(func.count(Sale.id), func.coalesce(func.sum(Sale.total), 0))
-            .where(Sale.school_id == school.id)
-            .where(Sale.created_at >= month_start)
-        )
-        row = school_sales_result.first()
-        school_sales_count = row[0] if row else 0
-        school_sales_amount = float(row[1]) if row else 0
-
-        # Pending orders for this school
-        school_pending_result = await db.execute(
-            select(func.count(Order.id))
-            .where(Order.school_id == school.id)
-            .where(Order.status.in_([OrderStatus.PENDING, OrderStatus.IN_PRODUCTION]))
-        )
-        school_pending_orders = school_pending_result.scalar() or 0
+        school_sales_count, school_sales_amount = month_sales_by_school.get(school.id, (0, 0))
+        (school_pending_orders,) = pending_orders_by_school.get(school.id, (0,))
 
         schools_summary.append(SchoolSummaryItem(
             school_id=str(school.id),
             school_name=school.name,
             school_code=school.code,
             sales_count=school_sales_count,
-            sales_amount=school_sales_amount,
+            sales_amount=float(school_sales_amount),
             pending_orders=school_pending_orders
         ))
 
-    return GlobalDashboardStats(
+    stats = GlobalDashboardStats(
         totals=DashboardTotals(
             total_sales=total_sales,
-            sales_amount_month=sales_amount_month,
+            sales_amount_month=float(sales_amount_month),
             total_orders=total_orders,
             pending_orders=pending_orders,
             total_clients=total_clients,
@@ -187,3 +205,5 @@ async def get_global_dashboard_stats(
         schools_summary=schools_summary,
         school_count=len(schools)
     )
+    await cache.set(cache_key, stats.model_dump(mode="json"), DASHBOARD_CACHE_TTL)
+    return stats
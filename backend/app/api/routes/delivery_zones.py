@@ -15,6 +15,7 @@ from app.api.dependencies import (
     CurrentUser,
     require_superuser,
 )
+from app.core.cache import cache
 from app.models.delivery_zone import DeliveryZone
 from app.schemas.delivery_zone import (
     DeliveryZoneCreate,
@@ -26,6 +27,9 @@ from app.schemas.delivery_zone import (
 
 router = APIRouter(prefix="/delivery-zones", tags=["Delivery Zones"])
 
+# Seconds the public zone list is cached; admin writes invalidate it
+DELIVERY_ZONES_CACHE_TTL = 600
+
 
 # ============================================
 # Public Endpoints (for web portal - no auth)
@@ -43,13 +47,18 @@ async def list_public_zones(db: DatabaseSession):
     Public endpoint - no authentication required.
     Only returns zones where is_active=True.
     """
-    result = await db.execute(
-        select(DeliveryZone)
-        .where(DeliveryZone.is_active == True)
-        .order_by(DeliveryZone.name)
+    async def build() -> list[DeliveryZonePublic]:
+        result = await db.execute(
+            select(DeliveryZone)
+            .where(DeliveryZone.is_active == True)
+            .order_by(DeliveryZone.name)
+        )
+        zones = result.scalars().all()
+        return [DeliveryZonePublic.model_validate(z) for z in zones]
+
+    return await cache.get_or_set(
+        cache.key("delivery_zones", None, "public"), DELIVERY_ZONES_CACHE_TTL, build
     )
-    zones = result.scalars().all()
-    return [DeliveryZonePublic.model_validate(z) for z in zones]
 
 
 # ============================================
@@ -100,6 +109,7 @@ async def create_zone(
     zone = DeliveryZone(**zone_data.model_dump())
     db.add(zone)
     await db.commit()
+    await cache.invalidate("delivery_zones")
     await db.refresh(zone)
     return DeliveryZoneResponse.model_validate(zone)
 
@@ -165,6 +175,7 @@ async def update_zone(
         setattr(zone, field, value)
 
     await db.commit()
+    await cache.invalidate("delivery_zones")
     await db.refresh(zone)
     return DeliveryZoneResponse.model_validate(zone)
 
@@ -199,3 +210,4 @@ async def delete_zone(
 
     zone.is_active = False
     await db.commit()
+    await cache.invalidate("delivery_zones")
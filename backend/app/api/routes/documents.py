@@ -223,18 +223,15 @@ async def upload_document(
     """
     doc_service = BusinessDocumentService(db)
 
-    # Read file content
-    content = await file.read()
-
     # Log upload attempt for debugging
-    logger.info(f"Upload attempt: filename={file.filename}, content_type={file.content_type}, size={len(content)}")
+    logger.info(f"Upload attempt: filename={file.filename}, content_type={file.content_type}, size={file.size}")
 
     try:
         document = await doc_service.create_document(
             name=name,
             description=description,
             folder_id=folder_id,
-            file_content=content,
+            file=file,
             original_filename=file.filename or "unknown",
             content_type=file.content_type or "application/octet-stream",
             created_by_id=current_user.id
@@ -396,30 +393,41 @@ async def update_document(
         update_data["folder_id"] = folder_id
 
     # Handle file replacement
-    new_content = None
     new_filename = None
     new_content_type = None
 
     if file:
-        new_content = await file.read()
         new_filename = file.filename
         new_content_type = file.content_type
 
+    old_file_path = document.file_path
     try:
         updated = await doc_service.update_document(
             document_id,
             update_data,
-            new_file_content=new_content,
+            new_file=file,
             new_filename=new_filename,
             new_content_type=new_content_type
         )
         await db.commit()
-        return BusinessDocumentResponse.model_validate(updated)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    response = BusinessDocumentResponse.model_validate(updated)
+
+    # Release the replaced file only now that the update is committed
+    if updated.file_path != old_file_path:
+        try:
+            await doc_service.release_file(old_file_path, document_id)
+            await db.commit()
+        except Exception as e:
+            # Leaves an unused file on disk; the update itself stands
+            await db.rollback()
+            logger.warning(f"Could not release replaced file {old_file_path}: {e}")
+
+    return response
 
 
 @router.delete(
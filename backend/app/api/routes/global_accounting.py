@@ -15,6 +15,7 @@ from decimal import Decimal
 from fastapi import APIRouter, HTTPException, status, Query, Depends
 
 from app.api.dependencies import DatabaseSession, CurrentUser, require_any_school_admin
+from app.db.pagination import CountMode, InvalidCursorError, count_rows, keyset_paginate, page_rows
 from app.models.user import UserRole
 from app.models.accounting import (
     TransactionType, ExpenseCategory, AccountType, AccPaymentMethod, AdjustmentReason,
@@ -30,7 +31,7 @@ from app.schemas.accounting import (
     GlobalAccountsPayableCreate, GlobalAccountsPayableResponse, AccountsPayableListResponse, AccountsPayablePayment,
     GlobalAccountsReceivableCreate, GlobalAccountsReceivableResponse, AccountsReceivableListResponse, AccountsReceivablePayment,
     BalanceGeneralSummary, BalanceGeneralDetailed,
-    TransactionListItemResponse, ExpenseCategorySummary, CashFlowPeriodItem, CashFlowReportResponse,
+    TransactionListItemResponse, ExpenseCategorySummary, CashFlowReportResponse,
     # Expense Adjustment schemas
     ExpenseAdjustmentRequest, ExpenseRevertRequest, PartialRefundRequest,
     ExpenseAdjustmentResponse, ExpenseAdjustmentListResponse,
@@ -159,6 +160,9 @@ async def set_global_account_balance(
         new_balance: The new balance amount
         description: Reason for the adjustment
     """
+    from app.services.balance_integration import BalanceIntegrationService
+    from app.services.balance_ledger import BalanceLedgerService
+
     # Get global account
     result = await db.execute(
         select(BalanceAccount).where(
@@ -175,24 +179,20 @@ async def set_global_account_balance(
             detail=f"Global account with code '{account_code}' not found. Initialize accounts first."
         )
 
+    # Lock the account with its exact balance (pending ledger entries
+    # folded) and post the difference as one movement (audit entry)
+    await BalanceLedgerService(db).lock_current([account.id])
     old_balance = account.balance
-    adjustment = Decimal(str(new_balance)) - old_balance
-
-    # Create balance entry for audit
-    entry = BalanceEntry(
-        school_id=None,  # Global
-        account_id=account.id,
-        entry_date=date.today(),
-        amount=adjustment,
-        balance_after=Decimal(str(new_balance)),
-        description=f"{description} (de ${old_balance} a ${new_balance})",
+    target_balance = Decimal(str(new_balance))
+    adjustment = target_balance - old_balance
+
+    await BalanceIntegrationService(db).apply_to_account(
+        account,
+        adjustment,
+        f"{description} (de ${old_balance} a ${target_balance})",
         reference="AJUSTE",
         created_by=current_user.id
     )
-    db.add(entry)
-
-    # Update balance
-    account.balance = Decimal(str(new_balance))
 
     await db.commit()
 
@@ -201,7 +201,7 @@ async def set_global_account_balance(
         "account_id": str(account.id),
         "account_name": account.name,
         "old_balance": float(old_balance),
-        "new_balance": float(account.balance),
+        "new_balance": float(target_balance),
         "adjustment": float(adjustment)
     }
 
@@ -464,7 +464,7 @@ async def list_global_balance_entries(
             "id": str(e.id),
             "entry_date": e.entry_date.isoformat(),
             "amount": float(e.amount),
-            "balance_after": float(e.balance_after),
+            "balance_after": float(e.balance_after) if e.balance_after is not None else None,
             "description": e.description,
             "reference": e.reference,
             "created_at": e.created_at.isoformat()
@@ -487,13 +487,16 @@ async def list_all_global_balance_entries(
     end_date: date | None = Query(None, description="Filter entries until this date"),
     account_id: UUID | None = Query(None, description="Filter by specific account"),
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="next_cursor of the previous page (replaces offset)"),
+    count: CountMode = Query(CountMode.EXACT, description="How to compute total: exact, approximate or none")
 ):
     """
     List all balance entries from global accounts (unified log)
 
     Returns entries with account info for audit/log purposes.
-    Ordered by created_at descending (most recent first).
+    Ordered by created_at descending (most recent first). Pass
+    `next_cursor` back as `cursor` to page without OFFSET.
     """
     # Build base query with join to get account info
     query = (
@@ -514,26 +517,19 @@ async def list_all_global_balance_entries(
     if account_id:
         query = query.where(BalanceEntry.account_id == account_id)
 
-    # Get total count for pagination
-    count_query = (
-        select(func.count(BalanceEntry.id))
-        .join(BalanceAccount, BalanceEntry.account_id == BalanceAccount.id)
-        .where(BalanceAccount.school_id.is_(None))
-    )
-    if start_date:
-        count_query = count_query.where(BalanceEntry.entry_date >= start_date)
-    if end_date:
-        count_query = count_query.where(BalanceEntry.entry_date <= end_date)
-    if account_id:
-        count_query = count_query.where(BalanceEntry.account_id == account_id)
-
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    total = await count_rows(db, query, count)
 
     # Get paginated entries
-    query = query.order_by(BalanceEntry.created_at.desc()).limit(limit).offset(offset)
+    try:
+        query = keyset_paginate(
+            query, (BalanceEntry.created_at, BalanceEntry.id), limit, cursor, offset
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     result = await db.execute(query)
-    rows = result.all()
+    rows, next_cursor = page_rows(
+        result.all(), limit, lambda row: (row.BalanceEntry.created_at, row.BalanceEntry.id)
+    )
 
     return {
         "items": [
@@ -545,7 +541,10 @@ async def list_all_global_balance_entries(
                 "account_code": row.account_code,
                 "account_name": row.account_name,
                 "amount": float(row.BalanceEntry.amount),
-                "balance_after": float(row.BalanceEntry.balance_after),
+                "balance_after": (
+                    float(row.BalanceEntry.balance_after)
+                    if row.BalanceEntry.balance_after is not None else None
+                ),
                 "description": row.BalanceEntry.description,
                 "reference": row.BalanceEntry.reference
             }
@@ -553,7 +552,8 @@ async def list_all_global_balance_entries(
         ],
         "total": total,
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "next_cursor": next_cursor
     }
 
 
@@ -1817,10 +1817,10 @@ async def get_cash_flow_report(
     """
     Get cash flow report for a period
 
-    Shows income vs expenses over time for line charts.
+    Shows income vs expenses over time for line charts. Periods are
+    aggregated in the database; only one row per period is loaded.
     """
-    from datetime import timedelta
-    from collections import defaultdict
+    from app.services.accounting import AccountingService
 
     # Validate group_by
     if group_by not in ("day", "week", "month"):
@@ -1829,96 +1829,7 @@ async def get_cash_flow_report(
             detail="group_by must be: day, week, or month"
         )
 
-    # Get all transactions in range
-    query = select(Transaction).where(
-        Transaction.transaction_date >= start_date,
-        Transaction.transaction_date <= end_date
-    ).order_by(Transaction.transaction_date)
-
-    result = await db.execute(query)
-    transactions = result.scalars().all()
-
-    # Group transactions by period
-    periods_data = defaultdict(lambda: {"income": Decimal("0"), "expenses": Decimal("0")})
-
-    for t in transactions:
-        # Determine period key
-        if group_by == "day":
-            period_key = t.transaction_date.isoformat()
-            period_label = t.transaction_date.strftime("%d %b")
-        elif group_by == "week":
-            # Get ISO week
-            iso_cal = t.transaction_date.isocalendar()
-            period_key = f"{iso_cal.year}-W{iso_cal.week:02d}"
-            period_label = f"Sem {iso_cal.week}"
-        else:  # month
-            period_key = t.transaction_date.strftime("%Y-%m")
-            period_label = t.transaction_date.strftime("%B %Y")
-
-        # Add amount to appropriate bucket
-        if t.type == TransactionType.INCOME:
-            periods_data[period_key]["income"] += t.amount
-        else:  # EXPENSE or TRANSFER (count transfers as expense for cash flow)
-            periods_data[period_key]["expenses"] += t.amount
-
-        periods_data[period_key]["label"] = period_label
-
-    # Also include expenses not in transactions
-    expense_query = select(Expense).where(
-        Expense.expense_date >= start_date,
-        Expense.expense_date <= end_date,
-        Expense.is_active == True,
-        Expense.is_paid == True
-    )
-    result = await db.execute(expense_query)
-    expenses = result.scalars().all()
-
-    for e in expenses:
-        if group_by == "day":
-            period_key = e.expense_date.isoformat()
-            period_label = e.expense_date.strftime("%d %b")
-        elif group_by == "week":
-            iso_cal = e.expense_date.isocalendar()
-            period_key = f"{iso_cal.year}-W{iso_cal.week:02d}"
-            period_label = f"Sem {iso_cal.week}"
-        else:
-            period_key = e.expense_date.strftime("%Y-%m")
-            period_label = e.expense_date.strftime("%B %Y")
-
-        periods_data[period_key]["expenses"] += e.amount_paid
-        periods_data[period_key]["label"] = period_label
-
-    # Convert to list and calculate net
-    periods = []
-    total_income = Decimal("0")
-    total_expenses = Decimal("0")
-
-    for period_key in sorted(periods_data.keys()):
-        data = periods_data[period_key]
-        income = data["income"]
-        expenses = data["expenses"]
-        net = income - expenses
-
-        total_income += income
-        total_expenses += expenses
-
-        periods.append(CashFlowPeriodItem(
-            period=period_key,
-            period_label=data.get("label", period_key),
-            income=income,
-            expenses=expenses,
-            net=net
-        ))
-
-    return CashFlowReportResponse(
-        period_start=start_date,
-        period_end=end_date,
-        group_by=group_by,
-        total_income=total_income,
-        total_expenses=total_expenses,
-        net_flow=total_income - total_expenses,
-        periods=periods
-    )
+    return await AccountingService(db).get_cash_flow_report(start_date, end_date, group_by)
 
 
 # ============================================
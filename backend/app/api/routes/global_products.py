@@ -3,14 +3,12 @@ Global Product Endpoints - Shared products across all schools
 """
 from uuid import UUID
 from pathlib import Path
-from datetime import datetime
-import shutil
-import uuid as uuid_lib
 
 from fastapi import APIRouter, HTTPException, status, Query, Depends, UploadFile, File
 from sqlalchemy import select, func
 
 from app.api.dependencies import DatabaseSession, CurrentUser, require_superuser
+from app.core.cache import cache
 from app.models.product import GlobalGarmentType, GlobalGarmentTypeImage
 from app.schemas.product import (
     GlobalGarmentTypeCreate, GlobalGarmentTypeUpdate, GlobalGarmentTypeResponse,
@@ -25,12 +23,16 @@ from app.services.global_product import (
     GlobalProductService,
     GlobalInventoryService
 )
+from app.services.uploads import (
+    UPLOADS_BASE_DIR, UploadTooLargeError, lock_stored_file, remove_stored_file, store_upload
+)
+from app.services.image_variants import generate_variants, remove_variants
 
 # Constants for image uploads
 ALLOWED_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
 MAX_IMAGE_SIZE = 2 * 1024 * 1024  # 2MB
 MAX_IMAGES_PER_GARMENT_TYPE = 10
-UPLOADS_BASE_DIR = Path("/var/www/uniformes-system-v2/uploads")
+GLOBAL_CATALOG_CACHE_TTL = 300
 
 router = APIRouter(prefix="/global", tags=["Global Products"])
 
@@ -73,9 +75,16 @@ async def list_global_garment_types(
     active_only: bool = Query(True)
 ):
     """List all global garment types"""
-    service = GlobalGarmentTypeService(db)
-    garment_types = await service.get_all(active_only=active_only)
-    return [GlobalGarmentTypeResponse.model_validate(gt) for gt in garment_types]
+    async def build() -> list[GlobalGarmentTypeResponse]:
+        service = GlobalGarmentTypeService(db)
+        garment_types = await service.get_all(active_only=active_only)
+        return [GlobalGarmentTypeResponse.model_validate(gt) for gt in garment_types]
+
+    return await cache.get_or_set(
+        cache.key("global_products", None, "garment_types", active_only),
+        GLOBAL_CATALOG_CACHE_TTL,
+        build
+    )
 
 
 @router.get(
@@ -184,17 +193,6 @@ async def upload_global_garment_type_image(
             detail=f"Tipo de archivo no permitido. Solo se aceptan: {', '.join(ALLOWED_IMAGE_EXTENSIONS)}"
         )
 
-    # Validate file size
-    file.file.seek(0, 2)
-    file_size = file.file.tell()
-    file.file.seek(0)
-
-    if file_size > MAX_IMAGE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Imagen muy grande. Tamano maximo: 2MB"
-        )
-
     # Verify garment type exists
     garment_result = await db.execute(
         select(GlobalGarmentType).where(GlobalGarmentType.id == garment_type_id)
@@ -219,25 +217,39 @@ async def upload_global_garment_type_image(
             detail=f"Maximo {MAX_IMAGES_PER_GARMENT_TYPE} imagenes por tipo de prenda"
         )
 
-    # Create upload directory
+    # Stream to disk (2MB max); the same image is stored once per garment type
     upload_dir = UPLOADS_BASE_DIR / "global-garment-types" / str(garment_type_id)
-    upload_dir.mkdir(parents=True, exist_ok=True)
-
-    # Generate unique filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    unique_id = uuid_lib.uuid4().hex[:8]
-    filename = f"img_{timestamp}_{unique_id}{file_ext}"
-    file_path = upload_dir / filename
-
-    # Save file
     try:
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        stored = await store_upload(file, upload_dir, file_ext, max_size=MAX_IMAGE_SIZE, db=db)
+    except UploadTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Imagen muy grande. Tamano maximo: 2MB"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al guardar imagen: {str(e)}"
         )
+    filename = stored.filename
+    image_url = f"/uploads/global-garment-types/{garment_type_id}/{filename}"
+
+    # The same file uploaded again for this garment type
+    if stored.deduplicated:
+        existing_result = await db.execute(
+            select(GlobalGarmentTypeImage.id).where(
+                GlobalGarmentTypeImage.garment_type_id == garment_type_id,
+                GlobalGarmentTypeImage.image_url == image_url
+            )
+        )
+        if existing_result.scalar_one_or_none():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Esta imagen ya existe para este tipo de prenda"
+            )
+
+    # Resized WebP/JPEG copies for catalog cards (worker pool)
+    variants = await generate_variants(stored.path, image_url)
 
     # Determine if this should be primary (first image is primary by default)
     is_primary = current_count == 0
@@ -252,15 +264,16 @@ async def upload_global_garment_type_image(
     next_order = max_order + 1
 
     # Create database record
-    image_url = f"/uploads/global-garment-types/{garment_type_id}/{filename}"
     new_image = GlobalGarmentTypeImage(
         garment_type_id=garment_type_id,
         image_url=image_url,
+        variants=variants,
         display_order=next_order,
         is_primary=is_primary
     )
     db.add(new_image)
     await db.commit()
+    await cache.invalidate("global_products")
     await db.refresh(new_image)
 
     return GlobalGarmentTypeImageResponse.model_validate(new_image)
@@ -294,13 +307,26 @@ async def delete_global_garment_type_image(
 
     was_primary = image.is_primary
 
-    # Delete file from filesystem
-    file_path = UPLOADS_BASE_DIR / image.image_url.lstrip("/uploads/")
-    if file_path.exists():
+    # Delete file from filesystem, unless another image uses the same file
+    # (locked until commit, so a concurrent upload cannot reuse it meanwhile)
+    await lock_stored_file(db, image.image_url.rsplit("/", 1)[-1])
+    shared_result = await db.execute(
+        select(func.count(GlobalGarmentTypeImage.id)).where(
+            GlobalGarmentTypeImage.image_url == image.image_url,
+            GlobalGarmentTypeImage.id != image.id
+        )
+    )
+    if not shared_result.scalar():
+        file_path = UPLOADS_BASE_DIR / image.image_url.removeprefix("/uploads/")
+        # Separately, so a failure on the original still removes the variants
         try:
-            file_path.unlink()
+            await remove_stored_file(file_path)
         except Exception:
             pass  # Ignore file deletion errors
+        try:
+            await remove_variants(UPLOADS_BASE_DIR, image.variants)
+        except Exception:
+            pass
 
     # Delete database record
     await db.delete(image)
@@ -318,6 +344,7 @@ async def delete_global_garment_type_image(
             next_primary.is_primary = True
 
     await db.commit()
+    await cache.invalidate("global_products")
 
 
 @router.put(
@@ -358,6 +385,7 @@ async def set_global_primary_image(
     # Set this image as primary
     image.is_primary = True
     await db.commit()
+    await cache.invalidate("global_products")
     await db.refresh(image)
 
     return GlobalGarmentTypeImageResponse.model_validate(image)
@@ -405,6 +433,7 @@ async def reorder_global_garment_type_images(
         images[img_id].display_order = order
 
     await db.commit()
+    await cache.invalidate("global_products")
 
     # Return updated images in new order
     updated_result = await db.execute(
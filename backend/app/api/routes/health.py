@@ -1,8 +1,40 @@
-from fastapi import APIRouter
+import secrets
 from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.api.dependencies import DatabaseSession, require_superuser
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.email_outbox import EmailOutboxService
 
 router = APIRouter()
 
+scrape_token = HTTPBearer(auto_error=False)
+
+
+async def require_metrics_token(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(scrape_token)]
+) -> None:
+    """
+    Dependency for /metrics: the scraper's bearer token must match
+    settings.METRICS_TOKEN (not served at all while it is unset)
+    """
+    if not settings.METRICS_ENABLED or not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
 
 @router.get("/health")
 async def health_check():
@@ -12,3 +44,28 @@ async def health_check():
         "version": "2.0.0",
         "service": "Uniformes System API"
     }
+
+
+@router.get("/health/cache")
+async def cache_stats():
+    """Response cache backend and hit/miss counters per namespace"""
+    return cache.stats()
+
+
+@router.get("/health/email-outbox", dependencies=[Depends(require_superuser)])
+async def email_outbox_stats(db: DatabaseSession):
+    """Queued/sent/failed email counts and age of the oldest pending email"""
+    return await EmailOutboxService(db).get_stats()
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_metrics_token)]
+)
+async def prometheus_metrics():
+    """Request latency and SQL statement metrics (Prometheus text format, this worker)"""
+    return PlainTextResponse(
+        metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -5,11 +5,17 @@ API routes for managing user notifications.
 Notifications are filtered by user access (school_id and user_id).
 """
 from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from uuid import UUID
 from typing import Optional
 
 from app.api.dependencies import DatabaseSession, CurrentUser, UserSchoolIds
 from app.services.notification import NotificationService
+from app.services.notification_stream import (
+    NotificationScope,
+    broker,
+    notification_event_stream,
+)
 from app.schemas.notification import (
     NotificationResponse,
     NotificationListResponse,
@@ -74,7 +80,8 @@ async def get_unread_count(
     Get count of unread notifications for polling.
 
     Lightweight endpoint optimized for frequent polling (every 30-60 seconds).
-    Only returns count and last notification timestamp.
+    Only returns count and last notification timestamp. Prefer /stream,
+    which pushes changes without polling.
     """
     service = NotificationService(db)
 
@@ -90,6 +97,50 @@ async def get_unread_count(
     )
 
 
+@router.get(
+    "/stream",
+    summary="Stream notifications (Server-Sent Events)"
+)
+async def stream_notifications(
+    db: DatabaseSession,
+    current_user: CurrentUser,
+    user_school_ids: UserSchoolIds
+):
+    """
+    Push notifications and unread counts instead of polling.
+
+    Sends an `unread_count` event on connect, then a `notification` event
+    for each new notification and a `read` event for each notification
+    marked as read (both carry the updated `unread_count`). Idle streams
+    get a keep-alive comment. On `resync` the client should reconnect.
+    """
+    # Subscribe before loading so no notification falls in between; one
+    # committed meanwhile is both loaded and queued, and the stream
+    # counts it once because it tracks ids
+    subscription = broker.subscribe(NotificationScope(
+        user_id=current_user.id,
+        school_ids=frozenset(user_school_ids),
+        is_superuser=current_user.is_superuser
+    ))
+    try:
+        unread_ids = await NotificationService(db).get_unread_ids(
+            user_id=current_user.id,
+            school_ids=user_school_ids,
+            is_superuser=current_user.is_superuser
+        )
+        # Release the connection; the open stream does not query
+        await db.commit()
+    except Exception:
+        broker.unsubscribe(subscription)
+        raise
+
+    return StreamingResponse(
+        notification_event_stream(subscription, unread_ids),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.patch(
     "/{notification_id}/read",
     response_model=dict,
@@ -6,14 +6,17 @@ Two types of endpoints:
 2. School-specific: /schools/{school_id}/orders - Original endpoints for specific school
 """
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, status, Query, Depends, UploadFile, File
-from sqlalchemy import select, or_
+from fastapi import APIRouter, HTTPException, status, Query, Depends, UploadFile, File, Response
+from sqlalchemy import select, or_, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
 import os
-import shutil
 from pathlib import Path
 
 from app.api.dependencies import DatabaseSession, CurrentUser, require_school_access, UserSchoolIds
+from app.db.pagination import (
+    CountMode, InvalidCursorError, count_rows, keyset_paginate, page_rows, set_page_headers
+)
 from app.models.user import UserRole
 from app.models.order import Order, OrderItem, OrderStatus, OrderItemStatus
 from app.models.client import Client
@@ -25,7 +28,9 @@ from app.schemas.order import (
 )
 from app.services.order import OrderService
 from app.services.receipt import ReceiptService
-from app.services.email import send_order_confirmation_email
+from app.services.email import send_order_confirmation_email, build_order_confirmation_email
+from app.services.email_outbox import EmailOutboxService
+from app.services.uploads import store_upload, UploadTooLargeError
 from app.models.sale import SaleSource
 from fastapi.responses import HTMLResponse
 
@@ -45,8 +50,11 @@ async def list_all_orders(
     db: DatabaseSession,
     current_user: CurrentUser,
     user_school_ids: UserSchoolIds,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page (replaces skip)"),
+    count: CountMode = Query(CountMode.NONE, description="Total in X-Total-Count: none, exact or approximate"),
     school_id: UUID | None = Query(None, description="Filter by specific school"),
     status_filter: OrderStatus | None = Query(None, alias="status", description="Filter by status"),
     search: str | None = Query(None, description="Search by code or client name")
@@ -58,6 +66,9 @@ async def list_all_orders(
     - school_id: Specific school (optional)
     - status: Order status (pending, in_production, ready, delivered, cancelled)
     - search: Search in order code or client name
+
+    Newest first. Pass the X-Next-Cursor response header as `cursor` to
+    get the next page (keyset on created_at, id); `skip` still works.
     """
     if not user_school_ids:
         return []
@@ -74,16 +85,7 @@ async def list_all_orders(
     # Combine user's schools with custom schools
     all_accessible_school_ids = list(set(list(user_school_ids) + custom_school_ids))
 
-    query = (
-        select(Order)
-        .options(
-            selectinload(Order.items),
-            joinedload(Order.client),
-            joinedload(Order.school)
-        )
-        .where(Order.school_id.in_(all_accessible_school_ids))
-        .order_by(Order.created_at.desc())
-    )
+    query = select(Order).where(Order.school_id.in_(all_accessible_school_ids))
 
     # Apply filters
     if school_id:
@@ -107,39 +109,65 @@ async def list_all_orders(
             )
         )
 
-    # Pagination
-    query = query.offset(skip).limit(limit)
+    total = await count_rows(db, query, count)
 
-    result = await db.execute(query)
-    orders = result.unique().scalars().all()
-
-    return [
-        OrderListResponse(
-            id=order.id,
-            code=order.code,
-            status=order.status,
-            source=order.source,  # Include source for filtering web_portal orders
-            client_name=order.client.name if order.client else None,
-            student_name=order.client.student_name if order.client else None,
-            delivery_date=order.delivery_date,
-            total=order.total,
-            balance=order.balance,
-            created_at=order.created_at,
-            items_count=len(order.items) if order.items else 0,
-            school_id=order.school_id,
-            school_name=order.school.name if order.school else None,
+    # List rows are a column projection with item counts aggregated in SQL
+    items_total = (
+        select(func.count(OrderItem.id))
+        .where(OrderItem.order_id == Order.id)
+        .scalar_subquery()
+    )
+    items_delivered = (
+        select(func.count(OrderItem.id))
+        .where(
+            OrderItem.order_id == Order.id,
+            OrderItem.item_status == OrderItemStatus.DELIVERED
+        )
+        .scalar_subquery()
+    )
+    query = (
+        query.with_only_columns(
+            Order.id,
+            Order.code,
+            Order.status,
+            Order.source,  # Include source for filtering web_portal orders
+            Client.name.label("client_name"),
+            Client.student_name.label("student_name"),
+            Order.delivery_date,
+            Order.total,
+            Order.balance,
+            Order.created_at,
+            Order.school_id,
+            School.name.label("school_name"),
             # Partial delivery tracking
-            items_delivered=sum(1 for item in order.items if item.item_status == OrderItemStatus.DELIVERED) if order.items else 0,
-            items_total=len(order.items) if order.items else 0,
+            items_delivered.label("items_delivered"),
+            items_total.label("items_total"),
             # Payment proof
-            payment_proof_url=order.payment_proof_url,
+            Order.payment_proof_url,
             # Delivery info
-            delivery_type=order.delivery_type,
-            delivery_fee=order.delivery_fee,
-            delivery_address=order.delivery_address,
-            delivery_neighborhood=order.delivery_neighborhood
+            Order.delivery_type,
+            Order.delivery_fee,
+            Order.delivery_address,
+            Order.delivery_neighborhood,
         )
-        for order in orders
+        .select_from(Order)
+        .outerjoin(Client, Order.client_id == Client.id)
+        .outerjoin(School, Order.school_id == School.id)
+    )
+
+    # Pagination
+    try:
+        query = keyset_paginate(query, (Order.created_at, Order.id), limit, cursor, skip)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    result = await db.execute(query)
+    rows, next_cursor = page_rows(result.all(), limit, lambda row: (row.created_at, row.id))
+    set_page_headers(response, next_cursor, total)
+
+    return [
+        OrderListResponse.model_validate({**row._mapping, "items_count": row.items_total})
+        for row in rows
     ]
 
 
@@ -282,6 +310,34 @@ async def get_order_details_global(
     )
 
 
+async def _queue_order_confirmation(db: AsyncSession, order_id: UUID) -> None:
+    """
+    Queue the order confirmation email in the order's own transaction, so
+    it is stored if and only if the order commits.
+
+    Runs in a savepoint: a failure here is logged and never fails the order.
+    """
+    receipt_service = ReceiptService(db)
+    try:
+        async with db.begin_nested():
+            order = await receipt_service.get_order_with_details(order_id)
+            if not (order and order.client and order.client.email):
+                return
+            school_name = order.school.name if order.school else "Uniformes Consuelo Rios"
+            email_html = receipt_service.generate_order_email_html(order, school_name)
+            await EmailOutboxService(db).enqueue(
+                build_order_confirmation_email(
+                    email=order.client.email,
+                    order_code=order.code,
+                    html_content=email_html
+                ),
+                kind="order_confirmation"
+            )
+    except Exception as e:
+        # Log but don't fail the order creation
+        print(f"Warning: Could not queue order confirmation email: {e}")
+
+
 # =============================================================================
 # School-Specific Orders Router (original endpoints)
 # =============================================================================
@@ -318,25 +374,10 @@ async def create_order(
 
     try:
         order = await order_service.create_order(order_data, current_user.id)
-        await db.commit()
 
-        # Send confirmation email automatically if client has email
-        receipt_service = ReceiptService(db)
-        order_with_details = await receipt_service.get_order_with_details(order.id)
-
-        if order_with_details and order_with_details.client and order_with_details.client.email:
-            try:
-                school_name = order_with_details.school.name if order_with_details.school else "Uniformes Consuelo Rios"
-                email_html = receipt_service.generate_order_email_html(order_with_details, school_name)
-                send_order_confirmation_email(
-                    email=order_with_details.client.email,
-                    name=order_with_details.client.name,
-                    order_code=order_with_details.code,
-                    html_content=email_html
-                )
-            except Exception as e:
-                # Log but don't fail the order creation
-                print(f"Warning: Could not send order confirmation email: {e}")
+        # Queue confirmation email automatically if client has email
+        await _queue_order_confirmation(db, order.id)
+        await db.commit()
 
         return OrderResponse.model_validate(order)
 
@@ -930,26 +971,11 @@ async def create_web_order(
 
         # Create the order using the web-specific method
         order = await order_service.create_web_order(order_data)
-        await db.commit()
 
-        # Send confirmation email automatically
+        # Queue confirmation email automatically
         if client.email:
-            try:
-                receipt_service = ReceiptService(db)
-                order_with_details = await receipt_service.get_order_with_details(order.id)
-
-                if order_with_details:
-                    school_name = order_with_details.school.name if order_with_details.school else "Uniformes Consuelo Rios"
-                    email_html = receipt_service.generate_order_email_html(order_with_details, school_name)
-                    send_order_confirmation_email(
-                        email=client.email,
-                        name=client.name,
-                        order_code=order.code,
-                        html_content=email_html
-                    )
-            except Exception as e:
-                # Log but don't fail the order creation
-                print(f"Warning: Could not send web order confirmation email: {e}")
+            await _queue_order_confirmation(db, order.id)
+        await db.commit()
 
         return WebOrderResponse(
             id=order.id,
@@ -1009,18 +1035,6 @@ async def upload_payment_proof(
             detail=f"Tipo de archivo no permitido. Solo se aceptan: {', '.join(allowed_extensions)}"
         )
 
-    # Check file size (5MB max)
-    max_size = 5 * 1024 * 1024  # 5MB in bytes
-    file.file.seek(0, 2)  # Seek to end
-    file_size = file.file.tell()
-    file.file.seek(0)  # Reset to beginning
-
-    if file_size > max_size:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="El archivo es muy grande. Tamaño máximo: 5MB"
-        )
-
     # Find the order
     query = select(Order).where(Order.id == order_id)
     result = await db.execute(query)
@@ -1032,21 +1046,15 @@ async def upload_payment_proof(
             detail="Pedido no encontrado"
         )
 
-    # Create upload directory if it doesn't exist
+    # Stream to disk (5MB max); identical files are stored once
     upload_dir = Path("/var/www/uniformes-system-v2/uploads/payment-proofs")
-    upload_dir.mkdir(parents=True, exist_ok=True)
-
-    # Generate unique filename
-    import uuid as uuid_lib
-    from datetime import datetime
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    unique_filename = f"{order.code}_{timestamp}_{uuid_lib.uuid4().hex[:8]}{file_ext}"
-    file_path = upload_dir / unique_filename
-
-    # Save file
     try:
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        stored = await store_upload(file, upload_dir, file_ext, max_size=5 * 1024 * 1024)
+    except UploadTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El archivo es muy grande. Tamaño máximo: 5MB"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1055,7 +1063,7 @@ async def upload_payment_proof(
 
     # Update order with payment proof URL and set status to pending
     from app.models.order import PaymentProofStatus
-    file_url = f"/uploads/payment-proofs/{unique_filename}"
+    file_url = f"/uploads/payment-proofs/{stored.filename}"
     order.payment_proof_url = file_url
     order.payment_proof_status = PaymentProofStatus.PENDING  # Marcar como pendiente de revisión
     if payment_notes:
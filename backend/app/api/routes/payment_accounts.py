@@ -10,6 +10,7 @@ from uuid import UUID
 from typing import List
 
 from app.api.dependencies import DatabaseSession, CurrentUser
+from app.core.cache import cache
 from app.models.payment_account import PaymentAccount
 from app.schemas.payment_account import (
     PaymentAccountCreate,
@@ -20,6 +21,9 @@ from app.schemas.payment_account import (
 
 router = APIRouter(prefix="/payment-accounts", tags=["Payment Accounts"])
 
+# Seconds the public account list is cached; admin writes invalidate it
+PAYMENT_ACCOUNTS_CACHE_TTL = 600
+
 
 # ==========================================
 # Public Endpoints (for web portal)
@@ -42,16 +46,21 @@ async def get_public_payment_accounts(db: DatabaseSession):
         GET /api/v1/payment-accounts/public
         ```
     """
-    query = (
-        select(PaymentAccount)
-        .where(PaymentAccount.is_active == True)
-        .order_by(PaymentAccount.display_order.asc())
-    )
+    async def build() -> List[PaymentAccountPublic]:
+        query = (
+            select(PaymentAccount)
+            .where(PaymentAccount.is_active == True)
+            .order_by(PaymentAccount.display_order.asc())
+        )
 
-    result = await db.execute(query)
-    accounts = result.scalars().all()
+        result = await db.execute(query)
+        accounts = result.scalars().all()
+
+        return [PaymentAccountPublic.model_validate(acc) for acc in accounts]
 
-    return [PaymentAccountPublic.model_validate(acc) for acc in accounts]
+    return await cache.get_or_set(
+        cache.key("payment_accounts", None, "public"), PAYMENT_ACCOUNTS_CACHE_TTL, build
+    )
 
 
 # ==========================================
@@ -140,6 +149,7 @@ async def create_payment_account(
 
     db.add(account)
     await db.commit()
+    await cache.invalidate("payment_accounts")
     await db.refresh(account)
 
     return PaymentAccountResponse.model_validate(account)
@@ -230,6 +240,7 @@ async def update_payment_account(
         setattr(account, field, value)
 
     await db.commit()
+    await cache.invalidate("payment_accounts")
     await db.refresh(account)
 
     return PaymentAccountResponse.model_validate(account)
@@ -271,3 +282,4 @@ async def delete_payment_account(
 
     await db.delete(account)
     await db.commit()
+    await cache.invalidate("payment_accounts")
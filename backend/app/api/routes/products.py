@@ -7,18 +7,16 @@ Two types of endpoints:
 """
 from uuid import UUID
 from pathlib import Path
-from datetime import datetime
-import shutil
-import uuid as uuid_lib
 
 from fastapi import APIRouter, HTTPException, status, Query, Depends, UploadFile, File
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy import select, or_, func
 from sqlalchemy.orm import selectinload, joinedload
 
 from app.api.dependencies import DatabaseSession, CurrentUser, require_school_access, UserSchoolIds
+from app.core.cache import cache
 from app.models.user import UserRole
 from app.models.product import Product, GarmentType, GarmentTypeImage, Inventory
-from app.models.order import OrderItem, Order, OrderStatus, OrderItemStatus
 from app.models.school import School
 from app.schemas.product import (
     GarmentTypeCreate, GarmentTypeUpdate, GarmentTypeResponse,
@@ -27,12 +25,20 @@ from app.schemas.product import (
     ProductListResponse
 )
 from app.services.product import GarmentTypeService, ProductService
+from app.services.product_demand import ProductDemandService
+from app.services.uploads import (
+    UPLOADS_BASE_DIR, UploadTooLargeError, lock_stored_file, remove_stored_file, store_upload
+)
+from app.services.image_variants import generate_variants, remove_variants
 
 # Constants for image uploads
 ALLOWED_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
 MAX_IMAGE_SIZE = 2 * 1024 * 1024  # 2MB
 MAX_IMAGES_PER_GARMENT_TYPE = 10
-UPLOADS_BASE_DIR = Path("/var/www/uniformes-system-v2/uploads")
+
+# Response cache TTLs (seconds); writes invalidate explicitly
+PRODUCTS_CACHE_TTL = 60
+GARMENT_TYPES_CACHE_TTL = 300
 
 
 # =============================================================================
@@ -73,6 +79,79 @@ async def list_all_products(
     if not user_school_ids:
         return []
 
+    if school_id and school_id not in user_school_ids:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No access to this school"
+        )
+
+    async def build() -> list[ProductListResponse]:
+        return await _list_products(
+            db, user_school_ids, skip, limit, school_id, garment_type_id,
+            search, active_only, with_stock, with_images
+        )
+
+    # Stock must be live; catalog-only responses can be cached
+    if with_stock:
+        products = jsonable_encoder(await build())
+    else:
+        cache_key = cache.key(
+            "products",
+            school_id,
+            None if school_id else sorted(str(s) for s in user_school_ids),
+            skip, limit, garment_type_id, search, active_only, with_images
+        )
+        products = await cache.get_or_set(cache_key, PRODUCTS_CACHE_TTL, build)
+
+    # Pending demand changes with every order, so it is never cached
+    return await _add_pending_demand(db, products)
+
+
+async def _add_pending_demand(db, products: list[dict]) -> list[dict]:
+    """
+    Fill pending_orders_qty/count on encoded product list items
+
+    Order items are matched by garment_type + size + color (not product_id)
+    because web orders don't have product_id assigned until approved.
+    Demand for the whole page comes from one grouped query. Returns new
+    dicts: the items may be the response cache's own objects.
+    """
+    if not products:
+        return products
+
+    demand = await ProductDemandService(db).get_pending_demand(
+        school_ids=list({UUID(p["school_id"]) for p in products}),
+        garment_type_ids=list({UUID(p["garment_type_id"]) for p in products})
+    )
+    result = []
+    for product in products:
+        variant = demand.get(ProductDemandService.key(
+            UUID(product["school_id"]),
+            UUID(product["garment_type_id"]),
+            product["size"],
+            product["color"]
+        ))
+        result.append({
+            **product,
+            "pending_orders_qty": variant.quantity if variant else 0,
+            "pending_orders_count": variant.order_count if variant else 0,
+        })
+    return result
+
+
+async def _list_products(
+    db,
+    user_school_ids: list[UUID],
+    skip: int,
+    limit: int,
+    school_id: UUID | None,
+    garment_type_id: UUID | None,
+    search: str | None,
+    active_only: bool,
+    with_stock: bool,
+    with_images: bool
+) -> list[ProductListResponse]:
+    """Build the multi-school product list (see list_all_products)"""
     # Build query options - avoid loader strategy conflict
     # When with_images=True, use selectinload for garment_type (to chain images)
     # When with_images=False, use joinedload for garment_type (faster for simple cases)
@@ -96,11 +175,6 @@ async def list_all_products(
 
     # Apply filters
     if school_id:
-        if school_id not in user_school_ids:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="No access to this school"
-            )
         query = query.where(Product.school_id == school_id)
 
     if garment_type_id:
@@ -136,55 +210,12 @@ async def list_all_products(
             stock_map[inv.product_id] = inv.quantity
             min_stock_map[inv.product_id] = inv.min_stock_alert
 
-    # Get pending orders information for each product
-    # Match by garment_type + size + color (not product_id) because web orders
-    # don't have product_id assigned until approved
-    pending_orders_map = {}
-    if products:
-        # Only count items that are truly pending (not yet fulfilled from stock)
-        # PENDING = not yet processed
-        # IN_PRODUCTION = being made (no stock available)
-        # READY/DELIVERED = already fulfilled, should NOT count
-        pending_item_statuses = [OrderItemStatus.PENDING, OrderItemStatus.IN_PRODUCTION]
-
-        # For each product, find matching order items by garment_type + size + color
-        for product in products:
-            # Build query to find matching order items in same school
-            matching_query = await db.execute(
-                select(
-                    func.sum(OrderItem.quantity).label('total_qty'),
-                    func.count(func.distinct(OrderItem.order_id)).label('order_count')
-                )
-                .join(Order, OrderItem.order_id == Order.id)
-                .where(
-                    Order.school_id == product.school_id,
-                    OrderItem.garment_type_id == product.garment_type_id,
-                    OrderItem.item_status.in_(pending_item_statuses),
-                    # Match size (handle NULL)
-                    or_(
-                        OrderItem.size == product.size,
-                        (OrderItem.size.is_(None)) & (product.size is None)
-                    ),
-                    # Match color (handle NULL)
-                    or_(
-                        OrderItem.color == product.color,
-                        (OrderItem.color.is_(None)) & (product.color is None)
-                    )
-                )
-            )
-            row = matching_query.first()
-            if row and (row.total_qty or 0) > 0:
-                pending_orders_map[product.id] = {
-                    'qty': int(row.total_qty or 0),
-                    'count': int(row.order_count or 0)
-                }
-
     # Build responses
     responses = []
     for product in products:
         # Get images for this garment type if requested
         images = []
-        primary_image_url = None
+        primary_image = None
         if with_images and product.garment_type:
             # Filter images by school_id (since images are per-school)
             garment_images = [
@@ -198,11 +229,10 @@ async def list_all_products(
                 for img in garment_images
             ]
             # Find primary image
-            primary = next((img for img in garment_images if img.is_primary), None)
-            if primary:
-                primary_image_url = primary.image_url
-            elif garment_images:
-                primary_image_url = garment_images[0].image_url
+            primary_image = next(
+                (img for img in images if img.is_primary),
+                images[0] if images else None
+            )
 
         responses.append(ProductListResponse(
             id=product.id,
@@ -219,10 +249,9 @@ async def list_all_products(
             school_name=product.school.name if product.school else None,
             stock=stock_map.get(product.id, 0) if with_stock else None,
             min_stock=min_stock_map.get(product.id, 5) if with_stock else None,
-            pending_orders_qty=pending_orders_map.get(product.id, {}).get('qty', 0),
-            pending_orders_count=pending_orders_map.get(product.id, {}).get('count', 0),
             garment_type_images=images if with_images else [],
-            garment_type_primary_image_url=primary_image_url
+            garment_type_primary_image_url=primary_image.image_url if primary_image else None,
+            garment_type_primary_image_variants=primary_image.variants if primary_image else None
         ))
 
     return responses
@@ -398,16 +427,19 @@ async def list_garment_types_for_school(
     """List garment types for a specific school"""
     garment_service = GarmentTypeService(db)
 
-    if active_only:
-        garments = await garment_service.get_active_garment_types(
-            school_id, skip=skip, limit=limit
-        )
-    else:
-        garments = await garment_service.get_multi(
-            school_id=school_id, skip=skip, limit=limit
-        )
+    async def build() -> list[GarmentTypeResponse]:
+        if active_only:
+            garments = await garment_service.get_active_garment_types(
+                school_id, skip=skip, limit=limit
+            )
+        else:
+            garments = await garment_service.get_multi(
+                school_id=school_id, skip=skip, limit=limit
+            )
+        return [GarmentTypeResponse.model_validate(g) for g in garments]
 
-    return [GarmentTypeResponse.model_validate(g) for g in garments]
+    cache_key = cache.key("garment_types", school_id, skip, limit, active_only)
+    return await cache.get_or_set(cache_key, GARMENT_TYPES_CACHE_TTL, build)
 
 
 @school_router.put(
@@ -509,17 +541,6 @@ async def upload_garment_type_image(
             detail=f"Tipo de archivo no permitido. Solo se aceptan: {', '.join(ALLOWED_IMAGE_EXTENSIONS)}"
         )
 
-    # Validate file size
-    file.file.seek(0, 2)
-    file_size = file.file.tell()
-    file.file.seek(0)
-
-    if file_size > MAX_IMAGE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Imagen muy grande. Tamano maximo: 2MB"
-        )
-
     # Verify garment type exists and belongs to school
     garment_result = await db.execute(
         select(GarmentType).where(
@@ -548,25 +569,40 @@ async def upload_garment_type_image(
             detail=f"Maximo {MAX_IMAGES_PER_GARMENT_TYPE} imagenes por tipo de prenda"
         )
 
-    # Create upload directory
+    # Stream to disk (2MB max); the same image is stored once per garment type
     upload_dir = UPLOADS_BASE_DIR / "garment-types" / str(school_id) / str(garment_type_id)
-    upload_dir.mkdir(parents=True, exist_ok=True)
-
-    # Generate unique filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    unique_id = uuid_lib.uuid4().hex[:8]
-    filename = f"img_{timestamp}_{unique_id}{file_ext}"
-    file_path = upload_dir / filename
-
-    # Save file
     try:
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        stored = await store_upload(file, upload_dir, file_ext, max_size=MAX_IMAGE_SIZE, db=db)
+    except UploadTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Imagen muy grande. Tamano maximo: 2MB"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al guardar imagen: {str(e)}"
         )
+    filename = stored.filename
+    image_url = f"/uploads/garment-types/{school_id}/{garment_type_id}/{filename}"
+
+    # The same file uploaded again for this garment type
+    if stored.deduplicated:
+        existing_result = await db.execute(
+            select(GarmentTypeImage.id).where(
+                GarmentTypeImage.garment_type_id == garment_type_id,
+                GarmentTypeImage.school_id == school_id,
+                GarmentTypeImage.image_url == image_url
+            )
+        )
+        if existing_result.scalar_one_or_none():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Esta imagen ya existe para este tipo de prenda"
+            )
+
+    # Resized WebP/JPEG copies for catalog cards (worker pool)
+    variants = await generate_variants(stored.path, image_url)
 
     # Determine if this should be primary (first image is primary by default)
     is_primary = current_count == 0
@@ -582,16 +618,17 @@ async def upload_garment_type_image(
     next_order = max_order + 1
 
     # Create database record
-    image_url = f"/uploads/garment-types/{school_id}/{garment_type_id}/{filename}"
     new_image = GarmentTypeImage(
         garment_type_id=garment_type_id,
         school_id=school_id,
         image_url=image_url,
+        variants=variants,
         display_order=next_order,
         is_primary=is_primary
     )
     db.add(new_image)
     await db.commit()
+    await cache.invalidate("products", school_id)
     await db.refresh(new_image)
 
     return GarmentTypeImageResponse.model_validate(new_image)
@@ -627,13 +664,26 @@ async def delete_garment_type_image(
 
     was_primary = image.is_primary
 
-    # Delete file from filesystem
-    file_path = UPLOADS_BASE_DIR / image.image_url.lstrip("/uploads/")
-    if file_path.exists():
+    # Delete file from filesystem, unless another image uses the same file
+    # (locked until commit, so a concurrent upload cannot reuse it meanwhile)
+    await lock_stored_file(db, image.image_url.rsplit("/", 1)[-1])
+    shared_result = await db.execute(
+        select(func.count(GarmentTypeImage.id)).where(
+            GarmentTypeImage.image_url == image.image_url,
+            GarmentTypeImage.id != image.id
+        )
+    )
+    if not shared_result.scalar():
+        file_path = UPLOADS_BASE_DIR / image.image_url.removeprefix("/uploads/")
+        # Separately, so a failure on the original still removes the variants
         try:
-            file_path.unlink()
+            await remove_stored_file(file_path)
         except Exception:
             pass  # Ignore file deletion errors
+        try:
+            await remove_variants(UPLOADS_BASE_DIR, image.variants)
+        except Exception:
+            pass
 
     # Delete database record
     await db.delete(image)
@@ -654,6 +704,7 @@ async def delete_garment_type_image(
             next_primary.is_primary = True
 
     await db.commit()
+    await cache.invalidate("products", school_id)
 
 
 @school_router.put(
@@ -706,6 +757,7 @@ async def set_primary_image(
     # Set this image as primary
     image.is_primary = True
     await db.commit()
+    await cache.invalidate("products", school_id)
     await db.refresh(image)
 
     return GarmentTypeImageResponse.model_validate(image)
@@ -758,6 +810,7 @@ async def reorder_garment_type_images(
         images[img_id].display_order = order
 
     await db.commit()
+    await cache.invalidate("products", school_id)
 
     # Return updated images in new order
     updated_result = await db.execute(
@@ -6,13 +6,16 @@ Two types of endpoints:
 2. School-specific: /schools/{school_id}/sales - Original endpoints for specific school
 """
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, status, Query, Depends
-from sqlalchemy import select, or_
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Response
+from sqlalchemy import select, or_, func
 from sqlalchemy.orm import selectinload, joinedload
 
 from app.api.dependencies import DatabaseSession, CurrentUser, require_school_access, UserSchoolIds
+from app.db.pagination import (
+    CountMode, InvalidCursorError, count_rows, keyset_paginate, page_rows, set_page_headers
+)
 from app.models.user import UserRole, User
-from app.models.sale import Sale, SaleItem, SaleSource, SaleStatus
+from app.models.sale import Sale, SaleItem, SalePayment, SaleSource, SaleStatus
 from app.models.client import Client
 from app.models.school import School
 from app.schemas.sale import (
@@ -42,8 +45,11 @@ async def list_all_sales(
     db: DatabaseSession,
     current_user: CurrentUser,
     user_school_ids: UserSchoolIds,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page (replaces skip)"),
+    count: CountMode = Query(CountMode.NONE, description="Total in X-Total-Count: none, exact or approximate"),
     school_id: UUID | None = Query(None, description="Filter by specific school"),
     status_filter: str | None = Query(None, alias="status", description="Filter by status"),
     source: SaleSource | None = Query(None, description="Filter by source"),
@@ -57,23 +63,15 @@ async def list_all_sales(
     - status: Sale status (pending, completed, cancelled)
     - source: Sale source (desktop_app, web_portal, api)
     - search: Search in sale code or client name
+
+    Newest first. Pass the X-Next-Cursor response header as `cursor` to
+    get the next page (keyset on created_at, id); `skip` still works.
     """
     if not user_school_ids:
         return []
 
     # Build query
-    query = (
-        select(Sale)
-        .options(
-            selectinload(Sale.items),
-            selectinload(Sale.payments),  # Include payments for fallback payment_method
-            joinedload(Sale.client),
-            joinedload(Sale.user),
-            joinedload(Sale.school)
-        )
-        .where(Sale.school_id.in_(user_school_ids))
-        .order_by(Sale.created_at.desc())
-    )
+    query = select(Sale).where(Sale.school_id.in_(user_school_ids))
 
     # Apply filters
     if school_id:
@@ -99,42 +97,59 @@ async def list_all_sales(
             )
         )
 
+    total = await count_rows(db, query, count)
+
+    # List rows are a column projection: no Sale/SaleItem/SalePayment objects
+    items_count = (
+        select(func.count(SaleItem.id))
+        .where(SaleItem.sale_id == Sale.id)
+        .scalar_subquery()
+    )
+    # Fallback payment method: first payment of the sale
+    first_payment_method = (
+        select(SalePayment.payment_method)
+        .where(SalePayment.sale_id == Sale.id)
+        .order_by(SalePayment.created_at)
+        .limit(1)
+        .scalar_subquery()
+    )
+    query = (
+        query.with_only_columns(
+            Sale.id,
+            Sale.code,
+            Sale.status,
+            Sale.source,
+            Sale.is_historical,
+            func.coalesce(Sale.payment_method, first_payment_method).label("payment_method"),
+            Sale.total,
+            Sale.paid_amount,
+            Sale.client_id,
+            Client.name.label("client_name"),
+            Sale.sale_date,
+            Sale.created_at,
+            items_count.label("items_count"),
+            Sale.user_id,
+            User.username.label("user_name"),
+            Sale.school_id,
+            School.name.label("school_name"),
+        )
+        .select_from(Sale)
+        .outerjoin(Client, Sale.client_id == Client.id)
+        .outerjoin(User, Sale.user_id == User.id)
+        .outerjoin(School, Sale.school_id == School.id)
+    )
+
     # Pagination
-    query = query.offset(skip).limit(limit)
+    try:
+        query = keyset_paginate(query, (Sale.created_at, Sale.id), limit, cursor, skip)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     result = await db.execute(query)
-    sales = result.unique().scalars().all()
+    rows, next_cursor = page_rows(result.all(), limit, lambda row: (row.created_at, row.id))
+    set_page_headers(response, next_cursor, total)
 
-    # Helper to get payment method (from sale or first payment)
-    def get_payment_method(sale: Sale) -> PaymentMethod | None:
-        if sale.payment_method:
-            return sale.payment_method
-        # Fallback: get from first payment if available
-        if sale.payments and len(sale.payments) > 0:
-            return sale.payments[0].payment_method
-        return None
-
-    return [
-        SaleListResponse(
-            id=sale.id,
-            code=sale.code,
-            status=sale.status,
-            source=sale.source,
-            payment_method=get_payment_method(sale),
-            total=sale.total,
-            paid_amount=sale.paid_amount,
-            client_id=sale.client_id,
-            client_name=sale.client.name if sale.client else None,
-            sale_date=sale.sale_date,
-            created_at=sale.created_at,
-            items_count=len(sale.items) if sale.items else 0,
-            user_id=sale.user_id,
-            user_name=sale.user.username if sale.user else None,
-            school_id=sale.school_id,
-            school_name=sale.school.name if sale.school else None
-        )
-        for sale in sales
-    ]
+    return [SaleListResponse.model_validate(row) for row in rows]
 
 
 @router.get(
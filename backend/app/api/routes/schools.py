@@ -5,6 +5,7 @@ from uuid import UUID
 from fastapi import APIRouter, HTTPException, status, Query
 
 from app.api.dependencies import DatabaseSession, CurrentSuperuser
+from app.core.cache import cache
 from app.schemas.school import (
     SchoolCreate,
     SchoolUpdate,
@@ -18,6 +19,9 @@ from app.services.school import SchoolService
 
 router = APIRouter(prefix="/schools", tags=["Schools"])
 
+# Seconds a public school page is cached; SchoolService invalidates on writes
+SCHOOL_CACHE_TTL = 600
+
 
 @router.post("", response_model=SchoolResponse, status_code=status.HTTP_201_CREATED)
 async def create_school(
@@ -111,6 +115,11 @@ async def get_school_by_slug(
     Get school by slug (URL-friendly identifier)
     Public endpoint - no authentication required
     """
+    cache_key = cache.key("schools", None, "slug", slug)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     school_service = SchoolService(db)
     school = await school_service.get_by_slug(slug)
 
@@ -120,7 +129,9 @@ async def get_school_by_slug(
             detail=f"School with slug '{slug}' not found"
         )
 
-    return SchoolResponse.model_validate(school)
+    response = SchoolResponse.model_validate(school)
+    await cache.set(cache_key, response.model_dump(mode="json"), SCHOOL_CACHE_TTL)
+    return response
 
 
 @router.put("/{school_id}", response_model=SchoolResponse)
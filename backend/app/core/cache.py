@@ -0,0 +1,308 @@
+"""
+Response cache
+
+Async key/value cache with per-entry TTL used to avoid recomputing
+read-heavy responses (catalog, school pages, dashboards). Uses Redis
+(settings.REDIS_URL) when reachable so every worker shares entries and
+invalidations, and falls back to an in-process cache when it isn't.
+
+Keys are namespaced and, where the data belongs to a school, include the
+school id so a change in one school only invalidates that school:
+
+    products:<school_id>:<params hash>
+    garment_types:<school_id>:<params hash>
+    schools:slug:<slug>
+
+The Redis-or-memory fallback itself is FallbackStore, also used by the
+ephemeral state store (app.core.ephemeral) under its own key prefix.
+
+Values must be JSON-compatible (use get_or_set, which encodes responses).
+Services that write inside a request's transaction use
+invalidate_after_commit, so entries are dropped once the change is visible.
+"""
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.hooks import after_commit
+
+logger = logging.getLogger(__name__)
+
+# Seconds before retrying Redis after a connection failure
+REDIS_RETRY_SECONDS = 60
+
+
+class MemoryCache:
+    """In-process cache (per worker) with per-entry expiration"""
+
+    def __init__(self, max_entries: int = 1024):
+        self._entries: dict[str, tuple[float, Any]] = {}
+        self._max_entries = max_entries
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        if len(self._entries) >= self._max_entries:
+            self._evict()
+        self._entries[key] = (time.monotonic() + ttl, value)
+
+    async def pop(self, key: str) -> Any | None:
+        value = await self.get(key)
+        self._entries.pop(key, None)
+        return value
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def _evict(self) -> None:
+        """Drop expired entries, or the oldest half if none expired"""
+        now = time.monotonic()
+        expired = [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]
+        if not expired:
+            expired = list(self._entries)[: len(self._entries) // 2]
+        for key in expired:
+            self._entries.pop(key, None)
+
+
+class RedisCache:
+    """Redis backend; keys live under a common prefix so clear() only touches ours"""
+
+    def __init__(self, url: str, key_prefix: str = "uniformes:cache:"):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(
+            url,
+            decode_responses=True,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+        self._key_prefix = key_prefix
+
+    async def get(self, key: str) -> Any | None:
+        raw = await self._client.get(self._key_prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        await self._client.set(self._key_prefix + key, json.dumps(value), ex=ttl)
+
+    async def pop(self, key: str) -> Any | None:
+        raw = await self._client.getdel(self._key_prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self._key_prefix + key)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        keys = [k async for k in self._client.scan_iter(match=f"{self._key_prefix}{prefix}*", count=500)]
+        if keys:
+            await self._client.delete(*keys)
+
+    async def clear(self) -> None:
+        await self.delete_prefix("")
+
+
+class FallbackStore:
+    """
+    Key/value facade: Redis when available, in-process otherwise
+
+    Any Redis error switches to the in-process backend for
+    REDIS_RETRY_SECONDS instead of failing the request. Subclasses pick
+    the Redis key prefix, so stores sharing a Redis never see each
+    other's keys.
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        key_prefix: str = "uniformes:cache:",
+        max_entries: int = 1024,
+        label: str = "cache"
+    ):
+        self._memory = MemoryCache(max_entries=max_entries)
+        self._redis: RedisCache | None = None
+        self._redis_retry_at = 0.0
+        self._label = label
+        if redis_url:
+            try:
+                self._redis = RedisCache(redis_url, key_prefix=key_prefix)
+            except ImportError:
+                logger.warning(f"redis package not installed, using in-process {label}")
+
+    @property
+    def backend_name(self) -> str:
+        return "redis" if self._redis_usable() else "memory"
+
+    def _redis_usable(self) -> bool:
+        return self._redis is not None and time.monotonic() >= self._redis_retry_at
+
+    async def _call(self, operation: str, *args) -> Any:
+        if self._redis_usable():
+            try:
+                return await getattr(self._redis, operation)(*args)
+            except Exception as e:
+                logger.warning(f"Redis {self._label} unavailable ({e}), using in-process {self._label}")
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+        return await getattr(self._memory, operation)(*args)
+
+    async def get(self, key: str) -> Any | None:
+        return await self._call("get", key)
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        """Store a JSON-compatible value for ttl seconds"""
+        await self._call("set", key, value, ttl)
+
+    async def pop(self, key: str) -> Any | None:
+        """Get and delete in one step (single use values)"""
+        return await self._call("pop", key)
+
+    async def delete(self, key: str) -> None:
+        """Drop one exact key (no keyspace scan, unlike delete_prefix)"""
+        await self._call("delete", key)
+        if self._redis is not None:
+            # Entries written while Redis was down may still be in memory
+            await self._memory.delete(key)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        await self._call("delete_prefix", prefix)
+        if self._redis is not None:
+            await self._memory.delete_prefix(prefix)
+
+    async def clear(self) -> None:
+        await self._call("clear")
+        await self._memory.clear()
+
+
+class ResponseCache(FallbackStore):
+    """
+    Response cache on a FallbackStore
+
+    Tracks hits and misses per namespace (first segment of the key).
+    """
+
+    def __init__(self, redis_url: str | None = None):
+        super().__init__(redis_url)
+        self._hits: dict[str, int] = defaultdict(int)
+        self._misses: dict[str, int] = defaultdict(int)
+
+    # ============================================
+    # Keys
+    # ============================================
+
+    @staticmethod
+    def key(namespace: str, school_id: UUID | str | None = None, *parts: Any) -> str:
+        """
+        Build a cache key
+
+        Args:
+            namespace: Data family, e.g. "products"
+            school_id: Owning school, or None for data shared by all schools
+            *parts: Request parameters that change the response (hashed)
+
+        Returns:
+            Key like "products:<school_id>:<hash>"
+        """
+        scope = str(school_id) if school_id else "all"
+        digest = hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest()[:16]
+        return f"{namespace}:{scope}:{digest}"
+
+    # ============================================
+    # Operations
+    # ============================================
+
+    async def get(self, key: str) -> Any | None:
+        value = await self._call("get", key)
+        namespace = key.split(":", 1)[0]
+        if value is None:
+            self._misses[namespace] += 1
+        else:
+            self._hits[namespace] += 1
+        return value
+
+    async def get_or_set(
+        self,
+        key: str,
+        ttl: int,
+        producer: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss
+
+        The producer's result is stored JSON-encoded and the encoded form is
+        returned on both hits and misses, so callers always see the same
+        shape (response models validate it like the original objects).
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+        value = jsonable_encoder(await producer())
+        await self.set(key, value, ttl)
+        return value
+
+    async def invalidate(self, namespace: str, school_id: UUID | str | None = None) -> None:
+        """
+        Drop cached responses for a namespace
+
+        Args:
+            namespace: Data family, e.g. "products"
+            school_id: Only this school's entries (plus multi-school ones),
+                or every entry of the namespace if None
+        """
+        if school_id is None:
+            await self.delete_prefix(f"{namespace}:")
+        else:
+            await self.delete_prefix(f"{namespace}:{school_id}:")
+            await self.delete_prefix(f"{namespace}:all:")
+
+    def invalidate_after_commit(
+        self,
+        db: AsyncSession,
+        namespace: str,
+        school_id: UUID | str | None = None
+    ) -> None:
+        """
+        Invalidate once db's transaction commits (nothing on rollback)
+
+        For writes: invalidating before the commit lets a concurrent
+        request cache the old rows again until the TTL expires.
+        """
+        after_commit(db, lambda: self.invalidate(namespace, school_id))
+
+    def stats(self) -> dict:
+        """Hit/miss counters per namespace since startup"""
+        namespaces = sorted(set(self._hits) | set(self._misses))
+        return {
+            "backend": self.backend_name,
+            "namespaces": {
+                namespace: {
+                    "hits": self._hits[namespace],
+                    "misses": self._misses[namespace],
+                }
+                for namespace in namespaces
+            },
+        }
+
+
+cache = ResponseCache(settings.REDIS_URL if settings.CACHE_REDIS_ENABLED else None)
@@ -0,0 +1,36 @@
+"""
+Ephemeral state store
+
+Short-lived values that must be visible to every worker: email/phone
+verification codes and the "email verified" marks used by web
+registration. Entries expire on their own (Redis TTL, or lazily in
+process), so there is nothing to sweep.
+
+It is the response cache's FallbackStore (app.core.cache) under a
+separate Redis prefix: it falls back to in-process storage when Redis is
+unreachable, and a fallback only lasts until Redis answers again, so a
+code issued during an outage may need to be requested again.
+
+Keys are "<namespace>:<id>", e.g. "email_code:ana@example.com".
+"""
+from app.core.cache import FallbackStore
+from app.core.config import settings
+
+
+class EphemeralStore(FallbackStore):
+    """Redis when available, in-process otherwise (tests, single worker)"""
+
+    def __init__(self, redis_url: str | None = None):
+        super().__init__(
+            redis_url,
+            key_prefix="uniformes:state:",
+            max_entries=10_000,
+            label="state store"
+        )
+
+    @staticmethod
+    def key(namespace: str, identifier: str) -> str:
+        return f"{namespace}:{identifier}"
+
+
+ephemeral_store = EphemeralStore(settings.REDIS_URL if settings.STATE_REDIS_ENABLED else None)
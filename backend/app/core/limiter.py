@@ -4,6 +4,13 @@ Rate Limiter Configuration
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-# Rate limiter global - usa memoria en desarrollo
-# En produccion se puede configurar Redis como backend
-limiter = Limiter(key_func=get_remote_address)
+from app.core.config import settings
+
+# Contadores compartidos entre workers en Redis; si Redis no responde,
+# slowapi sigue limitando en memoria de cada proceso hasta que vuelva
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=settings.REDIS_URL if settings.STATE_REDIS_ENABLED else "memory://",
+    key_prefix="uniformes:ratelimit",
+    in_memory_fallback_enabled=True,
+)
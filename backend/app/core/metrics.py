@@ -0,0 +1,255 @@
+"""
+Request performance metrics
+
+Per-request instrumentation: latency by route, number of SQL statements
+and time spent in the database. SQLAlchemy cursor events on the engine
+(install_query_hooks) add to the stats of the request running in the
+current context, and PerformanceMiddleware records them when the
+response starts:
+
+- Prometheus text exposition at GET /metrics (per worker, in process)
+- A structured (structlog) warning for slow requests and for requests
+  over the query budget, with the most repeated statement as the likely
+  N+1 culprit
+
+Routes are labelled by their path template (/api/v1/sales/{sale_id}),
+never the raw path, so label cardinality stays bounded.
+"""
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import structlog
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.config import settings
+
+logger = structlog.get_logger("app.performance")
+
+# Latency histogram buckets (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Statements per request histogram buckets
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+
+@dataclass
+class RequestStats:
+    """SQL activity of one request (or tracked block, see track_queries)"""
+    queries: int = 0
+    db_seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    # Enclosing tracked block, which also sees these statements
+    parent: "RequestStats | None" = None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        self.statements[statement] += 1
+        if self.parent is not None:
+            self.parent.record(statement, seconds)
+
+
+_current_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> RequestStats | None:
+    """Stats of the request (or tracked block) running in this context"""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[RequestStats]:
+    """
+    Collect the SQL statements executed in this context inside the block
+
+    Blocks nest: statements also count for the enclosing block (a test
+    counting around an API call still sees the request's statements).
+    """
+    stats = RequestStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+# ============================================
+# SQLAlchemy hooks
+# ============================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # On the execution context, so a failed statement leaves nothing behind
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - context._metrics_started)
+
+
+def install_query_hooks(engine: AsyncEngine) -> None:
+    """Count and time every statement the engine executes"""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ============================================
+# Registry
+# ============================================
+
+class _Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last one is +Inf
+        self.sum = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+
+class MetricsRegistry:
+    """In-process metrics rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._latency: dict[tuple[str, str], _Histogram] = {}
+        self._queries: dict[tuple[str, str], _Histogram] = {}
+        self._requests: dict[tuple[str, str, int], int] = defaultdict(int)
+        self._db_seconds: dict[tuple[str, str], float] = defaultdict(float)
+        self._budget_exceeded: dict[tuple[str, str], int] = defaultdict(int)
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        seconds: float,
+        stats: RequestStats,
+        over_budget: bool
+    ) -> None:
+        key = (method, route)
+        self._latency.setdefault(key, _Histogram(LATENCY_BUCKETS)).observe(seconds)
+        self._queries.setdefault(key, _Histogram(QUERY_COUNT_BUCKETS)).observe(stats.queries)
+        self._requests[(method, route, status_code)] += 1
+        self._db_seconds[key] += stats.db_seconds
+        if over_budget:
+            self._budget_exceeded[key] += 1
+
+    def render(self) -> str:
+        lines: list[str] = []
+
+        def labels(method: str, route: str, **extra) -> str:
+            items = {"method": method, "route": route, **extra}
+            return ",".join(f'{k}="{_escape(str(v))}"' for k, v in items.items())
+
+        def histogram(name: str, help_text: str, data: dict) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route), hist in sorted(data.items()):
+                cumulative = 0
+                for bound, count in zip((*hist.buckets, "+Inf"), hist.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{{{labels(method, route, le=bound)}}} {cumulative}")
+                lines.append(f"{name}_sum{{{labels(method, route)}}} {hist.sum}")
+                lines.append(f"{name}_count{{{labels(method, route)}}} {hist.total}")
+
+        def counter(name: str, help_text: str, data: dict) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in sorted(data.items()):
+                method, route, *rest = key
+                extra = {"status": rest[0]} if rest else {}
+                lines.append(f"{name}{{{labels(method, route, **extra)}}} {value}")
+
+        counter("http_requests_total", "Requests by route and status", self._requests)
+        histogram(
+            "http_request_duration_seconds",
+            "Time until the response starts",
+            self._latency
+        )
+        histogram(
+            "http_request_db_queries",
+            "SQL statements per request",
+            self._queries
+        )
+        counter(
+            "http_request_db_seconds_total",
+            "Cumulative time spent in SQL statements",
+            self._db_seconds
+        )
+        counter(
+            "http_request_query_budget_exceeded_total",
+            "Requests over REQUEST_QUERY_BUDGET (likely N+1)",
+            self._budget_exceeded
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = MetricsRegistry()
+
+
+# ============================================
+# Middleware
+# ============================================
+
+class PerformanceMiddleware(BaseHTTPMiddleware):
+    """Time each request and attribute its SQL statements to its route"""
+
+    async def dispatch(self, request: Request, call_next):
+        with track_queries() as stats:
+            started = time.perf_counter()
+            response = await call_next(request)
+            seconds = time.perf_counter() - started
+
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        budget = settings.REQUEST_QUERY_BUDGET
+        over_budget = budget > 0 and stats.queries > budget
+
+        metrics.observe(
+            request.method, route_path, response.status_code, seconds, stats, over_budget
+        )
+
+        if over_budget:
+            statement, repeats = stats.statements.most_common(1)[0]
+            logger.warning(
+                "query_budget_exceeded",
+                method=request.method,
+                route=route_path,
+                queries=stats.queries,
+                budget=budget,
+                repeated_statement=" ".join(statement.split())[:300],
+                repeats=repeats,
+            )
+        if seconds >= settings.SLOW_REQUEST_SECONDS:
+            logger.warning(
+                "slow_request",
+                method=request.method,
+                route=route_path,
+                status=response.status_code,
+                duration_ms=round(seconds * 1000, 1),
+                queries=stats.queries,
+                db_ms=round(stats.db_seconds * 1000, 1),
+            )
+        return response
@@ -0,0 +1,114 @@
+"""
+Concurrent fan-out for independent read-only queries
+
+Dashboards run many small aggregates that don't depend on each other.
+`fan_out` runs them at the same time, each on its own pooled connection,
+instead of one after another on the request session.
+
+Every fan-out in the process shares one connection budget per engine
+(settings.DB_FANOUT_MAX_CONNECTIONS, capped below the pool size), so many
+concurrent dashboard requests cannot take the whole pool on top of their
+own request sessions and time out waiting for connections.
+"""
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+
+ReadQuery = Callable[[AsyncSession], Awaitable[Any]]
+
+# Concurrency used when the pool doesn't report a size (e.g. NullPool)
+DEFAULT_CONCURRENCY = 4
+
+_WRITES_KEY = "fanout_has_writes"
+_FANNED_OUT_KEY = "fanout_worker"
+
+# Shared budgets: {event loop: {engine: semaphore}}
+_budgets: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_writes(session, flush_context):
+    session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_writes(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_WRITES_KEY, None)
+
+
+def _can_fan_out(db: AsyncSession) -> bool:
+    """
+    Separate connections only see committed data, so fan out only when the
+    session is bound to an engine and hasn't written anything uncommitted
+    """
+    if not settings.DB_FANOUT_ENABLED or not isinstance(db.bind, AsyncEngine):
+        return False
+    if db.info.get(_FANNED_OUT_KEY):
+        # Already a fan-out session: waiting on the budget it holds could deadlock
+        return False
+    if db.new or db.dirty or db.deleted:
+        return False
+    return not db.info.get(_WRITES_KEY, False)
+
+
+def _max_connections(engine: AsyncEngine) -> int:
+    pool = engine.sync_engine.pool
+    if not hasattr(pool, "size"):
+        return DEFAULT_CONCURRENCY
+    # Leave at least one pooled connection for request sessions
+    return max(1, min(settings.DB_FANOUT_MAX_CONNECTIONS, pool.size() - 1))
+
+
+def _budget(engine: AsyncEngine) -> asyncio.Semaphore:
+    """Semaphore shared by every fan-out on this engine (per event loop)"""
+    per_engine = _budgets.setdefault(asyncio.get_running_loop(), {})
+    semaphore = per_engine.get(engine.sync_engine)
+    if semaphore is None:
+        semaphore = per_engine[engine.sync_engine] = asyncio.Semaphore(_max_connections(engine))
+    return semaphore
+
+
+async def fan_out(db: AsyncSession, *queries: ReadQuery) -> list[Any]:
+    """
+    Run independent read-only queries concurrently and return their results
+    in order
+
+    Each query is a callable receiving the session it must use, e.g.
+    `lambda s: ReportsService(s).get_low_stock_products(school_id)`.
+    Concurrency is bounded by the engine's shared fan-out budget. When
+    fanning out isn't safe (uncommitted writes on `db`, session bound to a
+    connection, or `db` is itself a fan-out session) the queries run
+    sequentially on `db`.
+
+    Args:
+        db: Request session
+        *queries: Read-only callables taking a session
+
+    Returns:
+        Results in the same order as `queries`
+    """
+    if len(queries) < 2 or not _can_fan_out(db):
+        return [await query(db) for query in queries]
+
+    engine: AsyncEngine = db.bind
+    semaphore = _budget(engine)
+
+    async def run(query: ReadQuery) -> Any:
+        async with semaphore:
+            async with AsyncSession(
+                engine,
+                expire_on_commit=False,
+                autoflush=False,
+                info={_FANNED_OUT_KEY: True}
+            ) as session:
+                return await query(session)
+
+    return list(await asyncio.gather(*(run(query) for query in queries)))
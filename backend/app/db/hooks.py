@@ -0,0 +1,61 @@
+"""
+Post-commit callbacks
+
+Side effects that must only happen once a transaction is durable, such as
+dropping cached responses: invalidating before the commit lets a
+concurrent request cache the old rows again in between.
+
+    after_commit(db, lambda: cache.invalidate("products", school_id))
+
+Callbacks are kept on the session and scheduled on the event loop when
+its outermost transaction commits; a rollback discards them. The
+listeners are registered for every Session, so this also covers sessions
+created outside get_db (scripts, background workers, tests).
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_INFO_KEY = "after_commit"
+
+# Strong references, so pending callbacks are not garbage collected
+_running: set[asyncio.Task] = set()
+
+
+def after_commit(db: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """Run `callback()` once the session's current transaction commits"""
+    db.info.setdefault(_INFO_KEY, []).append(callback)
+
+
+async def _run(callback: Callable[[], Awaitable[None]]) -> None:
+    try:
+        await callback()
+    except Exception:
+        logger.exception("After-commit callback failed")
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule_callbacks(session: Session) -> None:
+    callbacks = session.info.pop(_INFO_KEY, None)
+    if not callbacks:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning("No event loop after commit, %d callbacks dropped", len(callbacks))
+        return
+    for callback in callbacks:
+        task = loop.create_task(_run(callback))
+        _running.add(task)
+        task.add_done_callback(_running.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_callbacks(session: Session) -> None:
+    session.info.pop(_INFO_KEY, None)
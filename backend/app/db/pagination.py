@@ -0,0 +1,194 @@
+"""
+Keyset (cursor) pagination for long, append-mostly lists
+
+OFFSET pagination reads and discards every skipped row, so deep pages of
+sales, orders or balance entries get slower as history grows. A keyset
+page instead continues after the last row of the previous one:
+
+    WHERE (created_at, id) < (:last_created_at, :last_id)
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit
+
+which a composite (created_at, id) index answers without skipping. The
+position is handed to clients as an opaque cursor (base64 JSON of the sort
+key and id) in the X-Next-Cursor header, or `next_cursor` for endpoints
+that already return an envelope. List endpoints keep `skip`/`offset` for
+old clients; a cursor, when given, takes precedence.
+
+Totals are optional (`count=exact|approximate|none`): `approximate` reads
+the planner's row estimate from EXPLAIN, which costs the same whatever the
+table size.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Sequence
+from uuid import UUID
+
+from fastapi import Response
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+class CountMode(str, Enum):
+    """How list endpoints compute the total"""
+    NONE = "none"
+    EXACT = "exact"
+    APPROXIMATE = "approximate"
+
+
+class InvalidCursorError(ValueError):
+    """Cursor was not produced by encode_cursor for this list"""
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _from_json(value: Any, python_type: type) -> Any:
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    return python_type(value)
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque cursor for a row's sort key values"""
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[InstrumentedAttribute]) -> tuple:
+    """
+    Sort key values of a cursor, converted to the columns' Python types
+
+    Raises:
+        InvalidCursorError: Malformed cursor or wrong number of values
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise InvalidCursorError("Cursor inválido")
+        return tuple(
+            _from_json(value, column.type.python_type)
+            for value, column in zip(values, columns)
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        if isinstance(e, InvalidCursorError):
+            raise
+        raise InvalidCursorError("Cursor inválido") from e
+
+
+def keyset_paginate(
+    query: Select,
+    columns: Sequence[InstrumentedAttribute],
+    limit: int,
+    cursor: str | None = None,
+    skip: int = 0,
+    descending: bool = True
+) -> Select:
+    """
+    Order `query` by `columns` and select one page
+
+    The last column must be unique (the primary key) so the order is
+    total. One extra row is fetched; pass the result to page_rows.
+
+    Args:
+        columns: Sort key, e.g. (Sale.created_at, Sale.id)
+        cursor: From a previous page's next cursor (takes precedence over skip)
+        skip: Legacy OFFSET, used only without a cursor
+        descending: Newest first (True) or ascending order
+
+    Raises:
+        InvalidCursorError: If the cursor can't be decoded
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        key = tuple_(*columns)
+        query = query.where(key < tuple_(*values) if descending else key > tuple_(*values))
+    elif skip:
+        query = query.offset(skip)
+
+    order = [c.desc() for c in columns] if descending else [c.asc() for c in columns]
+    return query.order_by(*order).limit(limit + 1)
+
+
+def page_rows(
+    rows: Sequence[Any],
+    limit: int,
+    key: Any
+) -> tuple[list[Any], str | None]:
+    """
+    Trim the extra row fetched by keyset_paginate
+
+    Args:
+        key: Function returning the sort key values of a row
+
+    Returns:
+        (rows of this page, cursor for the next page or None on the last)
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
+
+
+def set_page_headers(response: Response, next_cursor: str | None, total: int | None) -> None:
+    """X-Next-Cursor / X-Total-Count for endpoints whose body is a plain list"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a query, with its parameters bound as usual"""
+    inherit_cache = False
+
+    def __init__(self, query: Select):
+        self.query = query
+
+
+@compiles(_Explain)
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.query, **kw)
+
+
+async def count_rows(db: AsyncSession, query: Select, mode: CountMode) -> int | None:
+    """
+    Total rows matched by `query` (ignoring its order, limit and offset)
+
+    Returns:
+        None for CountMode.NONE; the planner estimate for APPROXIMATE
+    """
+    if mode == CountMode.NONE:
+        return None
+
+    query = query.order_by(None).limit(None).offset(None)
+
+    if mode == CountMode.APPROXIMATE:
+        result = await db.execute(_Explain(query))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    result = await db.execute(select(func.count()).select_from(query.subquery()))
+    return result.scalar_one()
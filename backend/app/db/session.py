@@ -3,6 +3,7 @@ Database session configuration
 """
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.core.config import settings
+from app.core.metrics import install_query_hooks
 
 # Create async engine
 engine = create_async_engine(
@@ -13,6 +14,8 @@ engine = create_async_engine(
     pool_size=10,
     max_overflow=20,
 )
+# Per-request SQL counts and time (PerformanceMiddleware)
+install_query_hooks(engine)
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
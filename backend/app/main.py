@@ -1,16 +1,24 @@
+import asyncio
 import logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from app.core.config import settings
 from app.core.limiter import limiter
+from app.core.metrics import PerformanceMiddleware
+from app.db.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.services.balance_ledger import run_compaction_loop
+from app.services.email_outbox import EmailOutboxWorker
+from app.services.notification import run_counter_reconcile_loop
+from app.services.overdue_sweep import run_overdue_sweep_loop
+from app.services.image_variants import shutdown_pool as shutdown_image_pool
 
 logger = logging.getLogger(__name__)
 from app.api.routes import health, auth, schools, products, clients, sales, orders, inventory, users, reports, accounting, global_products, global_accounting, contacts, payment_accounts, delivery_zones, dashboard, documents, fixed_expenses, employees, payroll, alterations, notifications
@@ -20,8 +28,34 @@ from app.api.routes import health, auth, schools, products, clients, sales, orde
 async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting Uniformes System API")
+    ledger_task = None
+    if settings.BALANCE_LEDGER_ENABLED and settings.BALANCE_LEDGER_COMPACT_SECONDS > 0:
+        ledger_task = asyncio.create_task(
+            run_compaction_loop(settings.BALANCE_LEDGER_COMPACT_SECONDS)
+        )
+    email_task = None
+    if settings.EMAIL_OUTBOX_WORKER_ENABLED:
+        email_task = asyncio.create_task(
+            EmailOutboxWorker().run(settings.EMAIL_OUTBOX_POLL_SECONDS)
+        )
+    counter_task = None
+    if settings.NOTIFICATION_COUNTER_RECONCILE_SECONDS > 0:
+        counter_task = asyncio.create_task(
+            run_counter_reconcile_loop(settings.NOTIFICATION_COUNTER_RECONCILE_SECONDS)
+        )
+    overdue_task = None
+    if settings.OVERDUE_SWEEP_SECONDS > 0:
+        overdue_task = asyncio.create_task(
+            run_overdue_sweep_loop(settings.OVERDUE_SWEEP_SECONDS)
+        )
     yield
     # Shutdown
+    for task in (ledger_task, email_task, counter_task, overdue_task):
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    shutdown_image_pool()
     print("🛑 Shutting down Uniformes System API")
 
 
@@ -80,6 +114,10 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
 # Logging middleware (added first so it runs after CORS)
 app.add_middleware(RequestLoggingMiddleware)
 
+# Latency / SQL statement metrics per route (app.core.metrics)
+if settings.METRICS_ENABLED:
+    app.add_middleware(PerformanceMiddleware)
+
 # CORS - Allow specific origins
 # NOTE: In FastAPI middleware is processed in LIFO order (last added = first executed)
 # CORS middleware must be added LAST so it runs FIRST and handles preflight requests
@@ -89,6 +127,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset pagination headers (app.db.pagination)
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER],
 )
 
 # Routes
@@ -14,7 +14,7 @@ from app.models.product import (
     GlobalGarmentType, GlobalGarmentTypeImage, GlobalProduct, GlobalInventory
 )
 from app.models.client import Client, ClientStudent, ClientType
-from app.models.sale import Sale, SaleItem, SalePayment, PaymentMethod, SaleStatus, SaleChange, ChangeType, ChangeStatus, SaleSource
+from app.models.sale import Sale, SaleItem, SalePayment, PaymentMethod, SaleStatus, SaleChange, ChangeType, ChangeStatus, SaleSource, SalesDailyRollup
 from app.models.order import Order, OrderItem, OrderStatus, DeliveryType, PaymentProofStatus
 from app.models.delivery_zone import DeliveryZone
 from app.models.contact import Contact, ContactType, ContactStatus
@@ -46,7 +46,9 @@ from app.models.alteration import (
     AlterationType,
     AlterationStatus,
 )
-from app.models.notification import Notification, NotificationType, ReferenceType
+from app.models.notification import Notification, NotificationCounter, NotificationType, ReferenceType
+from app.models.sequence import DocumentSequence
+from app.models.email_outbox import EmailOutbox, EmailStatus
 
 __all__ = [
     "Base",
@@ -80,6 +82,7 @@ __all__ = [
     "ChangeType",
     "ChangeStatus",
     "SaleSource",
+    "SalesDailyRollup",
     # Order models
     "Order",
     "OrderItem",
@@ -125,6 +128,12 @@ __all__ = [
     "AlterationStatus",
     # Notification models
     "Notification",
+    "NotificationCounter",
     "NotificationType",
     "ReferenceType",
+    # Sequence models
+    "DocumentSequence",
+    # Email outbox models
+    "EmailOutbox",
+    "EmailStatus",
 ]
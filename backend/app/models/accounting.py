@@ -3,7 +3,7 @@ Accounting Models - Transactions, Expenses, and Cash Flow
 """
 from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import String, Boolean, DateTime, Date, Numeric, Text, ForeignKey, Enum as SQLEnum, CheckConstraint
+from sqlalchemy import String, Boolean, DateTime, Date, Numeric, Text, ForeignKey, Enum as SQLEnum, CheckConstraint, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -474,6 +474,10 @@ class BalanceAccount(Base):
     due_date: Mapped[date | None] = mapped_column(Date)
     creditor: Mapped[str | None] = mapped_column(String(255))  # Who we owe
 
+    # Last time pending ledger entries were folded into `balance`
+    # (ledger mode: balance is a snapshot, see app.services.balance_ledger)
+    ledger_compacted_at: Mapped[datetime | None] = mapped_column(DateTime)
+
     # Status
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
@@ -520,6 +524,15 @@ class BalanceEntry(Base):
     Every change to a balance account creates an entry for audit trail.
     """
     __tablename__ = "balance_entries"
+    __table_args__ = (
+        # Pending (not yet compacted) ledger entries per account
+        Index(
+            'ix_balance_entries_pending', 'account_id',
+            postgresql_where=text('balance_after IS NULL')
+        ),
+        # Keyset pagination of the global balance entry log
+        Index('ix_balance_entries_created_at_id', 'created_at', 'id'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -545,7 +558,8 @@ class BalanceEntry(Base):
     # Entry details
     entry_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)  # Positive or negative
-    balance_after: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)  # Balance after this entry
+    # Balance after this entry; NULL while pending compaction (ledger mode)
+    balance_after: Mapped[Decimal | None] = mapped_column(Numeric(14, 2))
 
     description: Mapped[str] = mapped_column(String(500), nullable=False)
     reference: Mapped[str | None] = mapped_column(String(100))  # Invoice #, receipt, etc.
@@ -580,6 +594,11 @@ class AccountsReceivable(Base):
     __table_args__ = (
         CheckConstraint('amount > 0', name='chk_ar_amount_positive'),
         CheckConstraint('amount_paid >= 0', name='chk_ar_paid_positive'),
+        # Candidates for the overdue sweep (app.services.overdue_sweep)
+        Index(
+            'ix_accounts_receivable_overdue_sweep', 'due_date',
+            postgresql_where=text('is_paid = false AND is_overdue = false')
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -797,6 +816,11 @@ class AccountsPayable(Base):
     __table_args__ = (
         CheckConstraint('amount > 0', name='chk_ap_amount_positive'),
         CheckConstraint('amount_paid >= 0', name='chk_ap_paid_positive'),
+        # Candidates for the overdue sweep (app.services.overdue_sweep)
+        Index(
+            'ix_accounts_payable_overdue_sweep', 'due_date',
+            postgresql_where=text('is_paid = false AND is_overdue = false')
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -5,13 +5,14 @@ Clients are GLOBAL - they can purchase from multiple schools.
 Authentication is only required for web portal clients (client_type='web').
 """
 from datetime import datetime
-from sqlalchemy import String, Boolean, DateTime, Text, ForeignKey, UniqueConstraint, Enum as SQLEnum
+from sqlalchemy import String, Boolean, DateTime, Text, ForeignKey, UniqueConstraint, Index, Computed, event, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 import enum
 
 from app.db.base import Base
+from app.utils.text_search import create_search_normalize_function
 
 
 class ClientType(str, enum.Enum):
@@ -33,6 +34,13 @@ class Client(Base):
     __tablename__ = "clients"
     __table_args__ = (
         UniqueConstraint('code', name='uq_client_code'),
+        # Prefix lookups (code LIKE 'CLI-00%', phone LIKE '300%')
+        Index('ix_clients_code_prefix', 'code', postgresql_ops={'code': 'text_pattern_ops'}),
+        Index('ix_clients_phone_prefix', 'phone', postgresql_ops={'phone': 'text_pattern_ops'}),
+        # Keyset pagination of the clients list (app.db.pagination)
+        Index('ix_clients_name_id', 'name', 'id'),
+        # The pg_trgm GIN index on search_text is created by migration
+        # d6e7f8a9b0c1 (extension not required for the column itself)
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -82,6 +90,19 @@ class Client(Base):
     notes: Mapped[str | None] = mapped_column(Text)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
+    # Accent-insensitive, lowercased code/name/email/phone/student name
+    # used by client search (see app.utils.text_search)
+    search_text: Mapped[str] = mapped_column(
+        Text,
+        Computed(
+            "search_normalize("
+            "coalesce(code, '') || ' ' || coalesce(name, '') || ' ' || "
+            "coalesce(email, '') || ' ' || coalesce(phone, '') || ' ' || "
+            "coalesce(student_name, ''))",
+            persisted=True
+        )
+    )
+
     # Welcome email tracking (sent on first transaction)
     welcome_email_sent: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     welcome_email_sent_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -118,6 +139,9 @@ class Client(Base):
         return self.is_verified and self.password_hash is not None
 
 
+event.listen(Client.__table__, "before_create", create_search_normalize_function)
+
+
 class ClientStudent(Base):
     """
     Student-School relationship for a client.
@@ -0,0 +1,86 @@
+"""
+Email Outbox Model
+
+Cola durable de emails transaccionales. Los servicios insertan el email ya
+renderizado en la misma transaccion que la venta/encargo, y un worker en
+segundo plano (app.services.email_outbox) los envia a Resend por lotes,
+con reintentos y limite de velocidad. Asi la latencia del request no
+incluye al proveedor de email.
+"""
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime, Text, Index, text, Enum as SQLEnum
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+import enum
+
+from app.db.base import Base
+
+
+class EmailStatus(str, enum.Enum):
+    """Delivery status of an outbox email"""
+    PENDING = "pending"    # Waiting for (re)delivery
+    SENT = "sent"          # Accepted by the provider
+    FAILED = "failed"      # Gave up after EMAIL_OUTBOX_MAX_ATTEMPTS
+
+
+class EmailOutbox(Base):
+    """Rendered email waiting to be delivered by the outbox worker"""
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Worker poll: due pending emails in order
+        Index(
+            'ix_email_outbox_due', 'next_attempt_at',
+            postgresql_where=text("status = 'pending'")
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+
+    # Kind of email (welcome_activation, order_ready, ...) for monitoring
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+
+    # Rendered email
+    from_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    to_email: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    subject: Mapped[str] = mapped_column(String(500), nullable=False)
+    html: Mapped[str] = mapped_column(Text, nullable=False)
+
+    status: Mapped[EmailStatus] = mapped_column(
+        SQLEnum(EmailStatus, name="email_status_enum",
+                values_callable=lambda x: [e.value for e in x]),
+        default=EmailStatus.PENDING,
+        nullable=False
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False
+    )
+    last_error: Mapped[str | None] = mapped_column(Text)
+    provider_id: Mapped[str | None] = mapped_column(String(100))  # Resend email id
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    @property
+    def params(self) -> dict:
+        """Resend params for this email"""
+        return {
+            "from": self.from_email,
+            "to": self.to_email.split(", "),
+            "subject": self.subject,
+            "html": self.html
+        }
+
+    def __repr__(self) -> str:
+        return f"<EmailOutbox(kind='{self.kind}', to='{self.to_email}', status='{self.status}')>"
@@ -5,9 +5,14 @@ Sistema de notificaciones para la aplicacion desktop.
 Las notificaciones pueden ser:
 - Dirigidas a un usuario especifico (user_id)
 - Broadcast a todos los usuarios con acceso a un colegio (user_id=None)
+
+NotificationCounter mantiene los no leidos por grupo de visibilidad
+(usuario destinatario o broadcast, colegio o global), asi el conteo de un
+usuario es la suma de unas pocas filas en vez de un COUNT sobre
+notifications.
 """
 from datetime import datetime
-from sqlalchemy import String, DateTime, Text, ForeignKey, Boolean, Enum as SQLEnum
+from sqlalchemy import String, DateTime, Text, ForeignKey, Boolean, Integer, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -23,6 +28,8 @@ class NotificationType(str, enum.Enum):
     ORDER_STATUS_CHANGED = "order_status_changed"  # Cambio de estado de pedido
     PQRS_RECEIVED = "pqrs_received"           # Nuevo PQRS
     LOW_STOCK_ALERT = "low_stock_alert"       # Alerta de stock bajo
+    RECEIVABLES_OVERDUE = "receivables_overdue"  # Cuentas por cobrar vencidas
+    PAYABLES_OVERDUE = "payables_overdue"        # Cuentas por pagar vencidas
 
 
 class ReferenceType(str, enum.Enum):
@@ -105,3 +112,38 @@ class Notification(Base):
 
     def __repr__(self) -> str:
         return f"<Notification(type='{self.type.value}', title='{self.title[:30]}...')>"
+
+
+class NotificationCounter(Base):
+    """
+    Unread notifications of one visibility bucket
+
+    A bucket is a (user_id, school_id) pair as stored on notifications,
+    where None means broadcast / global. NotificationService keeps it in
+    sync in the same transaction as the notifications it changes.
+    """
+    __tablename__ = "notification_counters"
+
+    # "<user_id|*>:<school_id|*>" (unique even when ids are NULL)
+    scope_key: Mapped[str] = mapped_column(String(80), primary_key=True)
+
+    user_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=True
+    )
+    school_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("schools.id", ondelete="CASCADE"),
+        nullable=True
+    )
+
+    unread_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_notification_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    @staticmethod
+    def key_for(user_id: uuid.UUID | None, school_id: uuid.UUID | None) -> str:
+        return f"{user_id or '*'}:{school_id or '*'}"
+
+    def __repr__(self) -> str:
+        return f"<NotificationCounter(scope='{self.scope_key}', unread={self.unread_count})>"
@@ -2,7 +2,7 @@
 Custom Orders Models (Encargos)
 """
 from datetime import datetime
-from sqlalchemy import String, DateTime, Numeric, Integer, Text, ForeignKey, UniqueConstraint, CheckConstraint, Enum as SQLEnum, Computed, Boolean
+from sqlalchemy import String, DateTime, Numeric, Integer, Text, ForeignKey, UniqueConstraint, CheckConstraint, Index, Enum as SQLEnum, Computed, Boolean
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
@@ -50,6 +50,8 @@ class Order(Base):
         UniqueConstraint('school_id', 'code', name='uq_school_order_code'),
         CheckConstraint('total > 0', name='chk_order_total_positive'),
         CheckConstraint('paid_amount >= 0', name='chk_order_paid_positive'),
+        # Keyset pagination of the orders list (app.db.pagination)
+        Index('ix_orders_created_at_id', 'created_at', 'id'),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -4,7 +4,7 @@ Product and Inventory Models
 from datetime import datetime
 from sqlalchemy import String, Boolean, DateTime, Integer, Numeric, Text, ForeignKey, UniqueConstraint, CheckConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 
 from app.db.base import Base
@@ -88,6 +88,8 @@ class GarmentTypeImage(Base):
     )
 
     image_url: Mapped[str] = mapped_column(String(500), nullable=False)
+    # Resized derivatives: [{"width": 320, "format": "webp", "url": "..."}, ...]
+    variants: Mapped[list[dict] | None] = mapped_column(JSONB)
     display_order: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     is_primary: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
@@ -223,6 +225,8 @@ class GlobalGarmentTypeImage(Base):
         index=True
     )
     image_url: Mapped[str] = mapped_column(String(500), nullable=False)
+    # Resized derivatives: [{"width": 320, "format": "webp", "url": "..."}, ...]
+    variants: Mapped[list[dict] | None] = mapped_column(JSONB)
     display_order: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     is_primary: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
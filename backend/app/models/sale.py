@@ -1,8 +1,8 @@
 """
 Sales Transaction Models
 """
-from datetime import datetime
-from sqlalchemy import String, DateTime, Numeric, Text, ForeignKey, UniqueConstraint, CheckConstraint, Enum as SQLEnum
+from datetime import datetime, date
+from sqlalchemy import String, DateTime, Date, Integer, Boolean, Numeric, Text, ForeignKey, UniqueConstraint, CheckConstraint, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -47,6 +47,8 @@ class Sale(Base):
         UniqueConstraint('school_id', 'code', name='uq_school_sale_code'),
         CheckConstraint('total > 0', name='chk_sale_total_positive'),
         CheckConstraint('paid_amount >= 0', name='chk_sale_paid_positive'),
+        # Keyset pagination of the sales list (app.db.pagination)
+        Index('ix_sales_created_at_id', 'created_at', 'id'),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -325,3 +327,43 @@ class SalePayment(Base):
 
     def __repr__(self) -> str:
         return f"<SalePayment(sale_id='{self.sale_id}', amount={self.amount}, method='{self.payment_method}')>"
+
+
+class SalesDailyRollup(Base):
+    """
+    Daily sales totals per school, payment method and status.
+
+    Maintained incrementally by SalesRollupService whenever a sale is
+    created, changes status/payment method, receives a payment or has a
+    change approved, so reports read a handful of rows per day instead of
+    every sale. Can be rebuilt from raw sales (scripts/sales_rollup.py).
+    """
+    __tablename__ = "sales_daily_rollup"
+
+    school_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("schools.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    sale_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    # PaymentMethod value, or "other" when the sale has no payment method
+    payment_method: Mapped[str] = mapped_column(String(20), primary_key=True)
+    # SaleStatus value
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    is_historical: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+
+    sales_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_amount: Mapped[float] = mapped_column(Numeric(14, 2), default=0, nullable=False)
+    paid_amount: Mapped[float] = mapped_column(Numeric(14, 2), default=0, nullable=False)
+    # Net price adjustments from approved sale changes (income - refunds)
+    adjustments_amount: Mapped[float] = mapped_column(Numeric(14, 2), default=0, nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<SalesDailyRollup(school_id='{self.school_id}', date='{self.sale_date}', method='{self.payment_method}', count={self.sales_count})>"
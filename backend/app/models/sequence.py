@@ -0,0 +1,36 @@
+"""
+Document Sequence Model
+
+Contadores por colegio y prefijo para los codigos de documentos
+(VNT-2026-0001, ENC-2026-0001, ARR-2026-0001, CLI-00001, PRD-0001, ...).
+
+Cada asignacion incrementa una sola fila con UPDATE ... RETURNING, asi que
+el costo no depende del historial y el bloqueo de fila serializa a los
+cajeros concurrentes del mismo colegio sin saltos ni duplicados.
+"""
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class DocumentSequence(Base):
+    """Last allocated number per (scope, prefix)"""
+    __tablename__ = "document_sequences"
+
+    # School UUID as string, or "global" for codes shared by all schools
+    scope: Mapped[str] = mapped_column(String(36), primary_key=True)
+    prefix: Mapped[str] = mapped_column(String(50), primary_key=True)
+
+    last_value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<DocumentSequence(scope='{self.scope}', prefix='{self.prefix}', last_value={self.last_value})>"
@@ -452,7 +452,7 @@ class BalanceEntryCreate(BalanceEntryBase, SchoolIsolatedSchema):
 class BalanceEntryInDB(BalanceEntryBase, SchoolIsolatedSchema, IDModelSchema):
     """Balance entry as stored in database"""
     account_id: UUID
-    balance_after: Decimal
+    balance_after: Decimal | None  # None while pending ledger compaction
     created_by: UUID | None
     created_at: datetime
 
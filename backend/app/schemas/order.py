@@ -346,6 +346,7 @@ class OrderItemStockInfo(BaseSchema):
     # Quantities
     quantity_from_stock: int = 0  # How many can be taken from stock
     quantity_to_produce: int = 0  # How many need to be produced
+    pending_demand_qty: int = 0  # Same variant pending in other orders
     # Status suggestion
     suggested_action: str = "produce"  # "fulfill" | "partial" | "produce"
 
@@ -63,9 +63,17 @@ class GarmentTypeImageCreate(GarmentTypeImageBase):
     pass
 
 
+class ImageVariant(BaseSchema):
+    """Resized copy of a catalog image (for srcset / <picture>)"""
+    width: int
+    format: str  # "webp" | "jpeg"
+    url: str
+
+
 class GarmentTypeImageResponse(GarmentTypeImageBase, IDModelSchema):
     """GarmentTypeImage for API responses"""
     image_url: str
+    variants: list[ImageVariant] | None = None  # None until generated
     garment_type_id: UUID
     school_id: UUID
     created_at: datetime
@@ -164,6 +172,7 @@ class ProductListResponse(BaseSchema):
     # Garment type images for catalog display
     garment_type_images: list["GarmentTypeImageResponse"] = []
     garment_type_primary_image_url: str | None = None
+    garment_type_primary_image_variants: list[ImageVariant] | None = None
 
 
 # ============================================
@@ -272,6 +281,7 @@ class GlobalGarmentTypeImageCreate(GlobalGarmentTypeImageBase):
 class GlobalGarmentTypeImageResponse(GlobalGarmentTypeImageBase, IDModelSchema):
     """GlobalGarmentTypeImage for API responses"""
     image_url: str
+    variants: list[ImageVariant] | None = None  # None until generated
     garment_type_id: UUID
     created_at: datetime
 
@@ -343,6 +353,7 @@ class GlobalProductWithInventory(GlobalProductResponse):
     # Images from global garment type
     garment_type_images: list[GlobalGarmentTypeImageResponse] = []
     garment_type_primary_image_url: str | None = None
+    garment_type_primary_image_variants: list[ImageVariant] | None = None
 
 
 # ============================================
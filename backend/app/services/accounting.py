@@ -8,7 +8,7 @@ Integración de Balance:
 from uuid import UUID
 from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import select, func, and_, extract, case
+from sqlalchemy import select, func, and_, extract, case, cast, literal, union_all, Date, DateTime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -33,9 +33,13 @@ from app.schemas.accounting import (
     AccountsReceivableCreate, AccountsReceivableUpdate, AccountsReceivablePayment,
     AccountsPayableCreate, AccountsPayableUpdate, AccountsPayablePayment,
     BalanceGeneralSummary, BalanceAccountsByType, BalanceGeneralDetailed,
-    ReceivablesPayablesSummary, BalanceAccountListResponse
+    ReceivablesPayablesSummary, BalanceAccountListResponse,
+    CashFlowPeriodItem, CashFlowReportResponse
 )
+from app.db.fanout import fan_out
+from app.services.balance_integration import BalanceIntegrationService
 from app.services.base import SchoolIsolatedService
+from app.services.overdue_sweep import mark_overdue
 
 
 class TransactionService(SchoolIsolatedService[Transaction]):
@@ -486,41 +490,33 @@ class AccountingService:
         today = date.today()
         month_start = today.replace(day=1)
 
-        # Today's numbers
-        today_totals = await self.transaction_service.get_daily_totals(school_id, today)
-
-        # Month's numbers
-        month_income = await self.db.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                Transaction.school_id == school_id,
-                Transaction.type == TransactionType.INCOME,
-                Transaction.transaction_date >= month_start,
-                Transaction.transaction_date <= today
-            )
-        )
-        month_income = Decimal(str(month_income.scalar_one()))
-
-        month_expenses = await self.db.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                Transaction.school_id == school_id,
-                Transaction.type == TransactionType.EXPENSE,
-                Transaction.transaction_date >= month_start,
-                Transaction.transaction_date <= today
+        async def period_total(db: AsyncSession, transaction_type: TransactionType) -> Decimal:
+            result = await db.execute(
+                select(func.coalesce(func.sum(Transaction.amount), 0)).where(
+                    Transaction.school_id == school_id,
+                    Transaction.type == transaction_type,
+                    Transaction.transaction_date >= month_start,
+                    Transaction.transaction_date <= today
+                )
             )
+            return Decimal(str(result.scalar_one()))
+
+        # Today's numbers, month's numbers, pending expenses and recent
+        # transactions are independent: run them concurrently
+        today_totals, month_income, month_expenses, pending, recent = await fan_out(
+            self.db,
+            lambda db: TransactionService(db).get_daily_totals(school_id, today),
+            lambda db: period_total(db, TransactionType.INCOME),
+            lambda db: period_total(db, TransactionType.EXPENSE),
+            lambda db: ExpenseService(db).get_pending_expenses(school_id),
+            lambda db: TransactionService(db).get_transactions_by_date_range(
+                school_id,
+                month_start,
+                today
+            ),
         )
-        month_expenses = Decimal(str(month_expenses.scalar_one()))
-
-        # Pending expenses
-        pending = await self.expense_service.get_pending_expenses(school_id)
         pending_amount = sum(e.balance for e in pending)
 
-        # Recent transactions
-        recent = await self.transaction_service.get_transactions_by_date_range(
-            school_id,
-            today.replace(day=1),
-            today
-        )
-
         from app.schemas.accounting import TransactionListResponse
 
         return AccountingDashboard(
@@ -604,6 +600,100 @@ class AccountingService:
             expenses_by_category=expenses_by_category
         )
 
+    async def get_cash_flow_report(
+        self,
+        start_date: date,
+        end_date: date,
+        group_by: str = "day"
+    ) -> CashFlowReportResponse:
+        """
+        Income vs expenses per day, ISO week or month for all schools.
+
+        Transactions and paid expenses are bucketed in the database with
+        date_trunc, so only one row per period is returned. Transfers count
+        as expenses; expenses add their amount_paid.
+
+        Args:
+            group_by: "day", "week" or "month"
+        """
+        def bucket(column):
+            # date_trunc on a plain timestamp (not timestamptz) so buckets
+            # don't depend on the session time zone
+            return cast(func.date_trunc(group_by, cast(column, DateTime)), Date).label("bucket")
+
+        transactions = select(
+            bucket(Transaction.transaction_date),
+            func.sum(Transaction.amount).filter(
+                Transaction.type == TransactionType.INCOME
+            ).label("income"),
+            func.sum(Transaction.amount).filter(
+                Transaction.type != TransactionType.INCOME
+            ).label("expenses")
+        ).where(
+            Transaction.transaction_date >= start_date,
+            Transaction.transaction_date <= end_date
+        ).group_by("bucket")
+
+        expenses = select(
+            bucket(Expense.expense_date),
+            literal(None, Transaction.amount.type).label("income"),
+            func.sum(Expense.amount_paid).label("expenses")
+        ).where(
+            Expense.expense_date >= start_date,
+            Expense.expense_date <= end_date,
+            Expense.is_active == True,
+            Expense.is_paid == True
+        ).group_by("bucket")
+
+        combined = union_all(transactions, expenses).subquery()
+        result = await self.db.execute(
+            select(
+                combined.c.bucket,
+                func.coalesce(func.sum(combined.c.income), 0).label("income"),
+                func.coalesce(func.sum(combined.c.expenses), 0).label("expenses")
+            ).group_by(combined.c.bucket).order_by(combined.c.bucket)
+        )
+
+        periods = []
+        total_income = Decimal("0")
+        total_expenses = Decimal("0")
+
+        for row in result:
+            if group_by == "day":
+                period_key = row.bucket.isoformat()
+                period_label = row.bucket.strftime("%d %b")
+            elif group_by == "week":
+                # date_trunc('week') starts on Monday, like ISO weeks
+                iso_cal = row.bucket.isocalendar()
+                period_key = f"{iso_cal.year}-W{iso_cal.week:02d}"
+                period_label = f"Sem {iso_cal.week}"
+            else:  # month
+                period_key = row.bucket.strftime("%Y-%m")
+                period_label = row.bucket.strftime("%B %Y")
+
+            income = Decimal(str(row.income))
+            expenses_total = Decimal(str(row.expenses))
+            total_income += income
+            total_expenses += expenses_total
+
+            periods.append(CashFlowPeriodItem(
+                period=period_key,
+                period_label=period_label,
+                income=income,
+                expenses=expenses_total,
+                net=income - expenses_total
+            ))
+
+        return CashFlowReportResponse(
+            period_start=start_date,
+            period_end=end_date,
+            group_by=group_by,
+            total_income=total_income,
+            total_expenses=total_expenses,
+            net_flow=total_income - total_expenses,
+            periods=periods
+        )
+
     async def get_monthly_report(
         self,
         school_id: UUID,
@@ -771,26 +861,16 @@ class BalanceEntryService(SchoolIsolatedService[BalanceEntry]):
         if not account:
             raise ValueError("Cuenta no encontrada")
 
-        # Calculate new balance
-        new_balance = account.balance + data.amount
-
-        # Create entry
-        entry = BalanceEntry(
-            account_id=data.account_id,
-            school_id=data.school_id,
+        # Apply as a delta under the account lock (or as a ledger entry)
+        entry = await BalanceIntegrationService(self.db).apply_to_account(
+            account,
+            data.amount,
+            data.description,
             entry_date=data.entry_date,
-            amount=data.amount,
-            balance_after=new_balance,
-            description=data.description,
+            school_id=data.school_id,
             reference=data.reference,
             created_by=created_by
         )
-        self.db.add(entry)
-
-        # Update account balance
-        account.balance = new_balance
-
-        await self.db.flush()
         await self.db.refresh(entry)
         return entry
 
@@ -935,23 +1015,13 @@ class AccountsReceivableService(SchoolIsolatedService[AccountsReceivable]):
         return list(result.scalars().all())
 
     async def update_overdue_status(self, school_id: UUID) -> int:
-        """Update is_overdue flag for all receivables"""
-        today = date.today()
-        result = await self.db.execute(
-            select(AccountsReceivable).where(
-                AccountsReceivable.school_id == school_id,
-                AccountsReceivable.is_paid == False,
-                AccountsReceivable.due_date != None,
-                AccountsReceivable.due_date < today
-            )
-        )
-        count = 0
-        for receivable in result.scalars().all():
-            if not receivable.is_overdue:
-                receivable.is_overdue = True
-                count += 1
-        await self.db.flush()
-        return count
+        """
+        Update is_overdue flag for the school's receivables.
+
+        The background sweep (app.services.overdue_sweep) does this for
+        all schools; this is the same set-based UPDATE for one school.
+        """
+        return await mark_overdue(self.db, AccountsReceivable, date.today(), school_id)
 
 
 class AccountsPayableService(SchoolIsolatedService[AccountsPayable]):
@@ -1041,23 +1111,13 @@ class AccountsPayableService(SchoolIsolatedService[AccountsPayable]):
         return list(result.scalars().all())
 
     async def update_overdue_status(self, school_id: UUID) -> int:
-        """Update is_overdue flag for all payables"""
-        today = date.today()
-        result = await self.db.execute(
-            select(AccountsPayable).where(
-                AccountsPayable.school_id == school_id,
-                AccountsPayable.is_paid == False,
-                AccountsPayable.due_date != None,
-                AccountsPayable.due_date < today
-            )
-        )
-        count = 0
-        for payable in result.scalars().all():
-            if not payable.is_overdue:
-                payable.is_overdue = True
-                count += 1
-        await self.db.flush()
-        return count
+        """
+        Update is_overdue flag for the school's payables.
+
+        The background sweep (app.services.overdue_sweep) does this for
+        all schools; this is the same set-based UPDATE for one school.
+        """
+        return await mark_overdue(self.db, AccountsPayable, date.today(), school_id)
 
 
 class BalanceGeneralService:
@@ -1211,9 +1271,9 @@ class BalanceGeneralService:
         school_id: UUID
     ) -> ReceivablesPayablesSummary:
         """Get summary of accounts receivable and payable"""
-        # Update overdue statuses first
-        await self.receivable_service.update_overdue_status(school_id)
-        await self.payable_service.update_overdue_status(school_id)
+        # Overdue by due date rather than is_overdue, which the background
+        # sweep may not have flagged yet today
+        today = date.today()
 
         # Receivables summary
         receivables = await self.db.execute(
@@ -1224,7 +1284,7 @@ class BalanceGeneralService:
                 func.coalesce(
                     func.sum(
                         case(
-                            (AccountsReceivable.is_overdue == True, AccountsReceivable.amount - AccountsReceivable.amount_paid),
+                            (AccountsReceivable.due_date < today, AccountsReceivable.amount - AccountsReceivable.amount_paid),
                             else_=0
                         )
                     ), 0
@@ -1244,7 +1304,7 @@ class BalanceGeneralService:
                 func.coalesce(
                     func.sum(
                         case(
-                            (AccountsPayable.is_overdue == True, AccountsPayable.amount - AccountsPayable.amount_paid),
+                            (AccountsPayable.due_date < today, AccountsPayable.amount - AccountsPayable.amount_paid),
                             else_=0
                         )
                     ), 0
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 import logging
 
+from app.core.cache import cache
 from app.models.alteration import Alteration, AlterationPayment, AlterationType, AlterationStatus
 from app.models.accounting import Transaction, TransactionType, AccPaymentMethod
 from app.schemas.alteration import (
@@ -19,6 +20,7 @@ from app.schemas.alteration import (
     AlterationsSummary, AlterationListResponse
 )
 from app.services.balance_integration import BalanceIntegrationService
+from app.services.sequence import DocumentSequenceService
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +34,11 @@ PAYMENT_METHOD_MAP = {
 }
 
 
+def invalidate_summary_cache(db: AsyncSession) -> None:
+    """Drop the cached alterations dashboard summary once db commits"""
+    cache.invalidate_after_commit(db, "alterations_summary")
+
+
 class AlterationService:
     """
     Service for managing alterations (repairs/tailoring).
@@ -56,17 +63,12 @@ class AlterationService:
         year = datetime.now().year
         prefix = f"ARR-{year}-"
 
-        # Count existing alterations this year
-        result = await self.db.execute(
-            select(func.count(Alteration.id)).where(
-                Alteration.code.like(f"{prefix}%")
-            )
+        sequences = DocumentSequenceService(self.db)
+        return await sequences.next_code(
+            prefix,
+            4,
+            seed=lambda: sequences.max_code_number(Alteration.code, prefix)
         )
-        count = result.scalar_one()
-
-        # Generate next sequence number
-        sequence = count + 1
-        return f"{prefix}{sequence:04d}"
 
     # ============================================
     # CRUD Operations
@@ -122,6 +124,8 @@ class AlterationService:
                 created_by=created_by
             )
 
+        invalidate_summary_cache(self.db)
+
         # Re-fetch with client preloaded to avoid lazy-loading errors
         return await self.get(alteration.id)  # type: ignore
 
@@ -185,6 +189,7 @@ class AlterationService:
             alteration.delivered_date = date.today()
 
         await self.db.flush()
+        invalidate_summary_cache(self.db)
 
         # Re-fetch with client preloaded
         return await self.get(alteration_id)
@@ -209,6 +214,7 @@ class AlterationService:
             alteration.delivered_date = date.today()
 
         await self.db.flush()
+        invalidate_summary_cache(self.db)
 
         # Re-fetch with client preloaded
         return await self.get(alteration_id)
@@ -231,6 +237,7 @@ class AlterationService:
 
         alteration.status = AlterationStatus.CANCELLED
         await self.db.flush()
+        invalidate_summary_cache(self.db)
 
         # Re-fetch with client preloaded
         return await self.get(alteration_id)
@@ -325,6 +332,7 @@ class AlterationService:
         alteration.amount_paid += data.amount
         await self.db.flush()
         await self.db.refresh(payment)
+        invalidate_summary_cache(self.db)
 
         return payment
 
@@ -419,73 +427,55 @@ class AlterationService:
         """
         Get summary statistics for alterations dashboard.
 
+        All counts and totals come from one aggregate query (FILTER
+        clauses). The route caches the result; writes invalidate it.
+
         Returns:
             AlterationsSummary with counts and totals
         """
         today = date.today()
+        zero = Decimal("0")
 
-        # Total count
-        total_result = await self.db.execute(
-            select(func.count(Alteration.id))
-        )
-        total_count = total_result.scalar_one()
-
-        # Count by status
-        status_counts = {}
-        for status in AlterationStatus:
-            result = await self.db.execute(
-                select(func.count(Alteration.id)).where(
-                    Alteration.status == status
-                )
-            )
-            status_counts[status.value] = result.scalar_one()
-
-        # Total revenue (sum of amount_paid)
-        revenue_result = await self.db.execute(
-            select(func.coalesce(func.sum(Alteration.amount_paid), 0))
-        )
-        total_revenue = revenue_result.scalar_one()
-
-        # Total pending payment (sum of balance where status != CANCELLED)
-        pending_result = await self.db.execute(
+        status_columns = [
+            func.count(Alteration.id).filter(Alteration.status == status).label(status.value)
+            for status in AlterationStatus
+        ]
+        result = await self.db.execute(
             select(
+                func.count(Alteration.id).label("total_count"),
+                *status_columns,
+                # Total revenue (sum of amount_paid)
+                func.coalesce(func.sum(Alteration.amount_paid), zero).label("total_revenue"),
+                # Total pending payment (balance of non-cancelled, not fully paid)
                 func.coalesce(
-                    func.sum(Alteration.cost - Alteration.amount_paid),
-                    0
-                )
-            ).where(
-                Alteration.status != AlterationStatus.CANCELLED,
-                Alteration.amount_paid < Alteration.cost
-            )
-        )
-        total_pending = pending_result.scalar_one()
-
-        # Today's counts
-        today_received_result = await self.db.execute(
-            select(func.count(Alteration.id)).where(
-                Alteration.received_date == today
-            )
-        )
-        today_received = today_received_result.scalar_one()
-
-        today_delivered_result = await self.db.execute(
-            select(func.count(Alteration.id)).where(
-                Alteration.delivered_date == today
+                    func.sum(Alteration.cost - Alteration.amount_paid).filter(
+                        Alteration.status != AlterationStatus.CANCELLED,
+                        Alteration.amount_paid < Alteration.cost
+                    ),
+                    zero
+                ).label("total_pending"),
+                # Today's counts
+                func.count(Alteration.id).filter(
+                    Alteration.received_date == today
+                ).label("today_received"),
+                func.count(Alteration.id).filter(
+                    Alteration.delivered_date == today
+                ).label("today_delivered"),
             )
         )
-        today_delivered = today_delivered_result.scalar_one()
+        row = result.one()
 
         return AlterationsSummary(
-            total_count=total_count,
-            pending_count=status_counts.get('pending', 0),
-            in_progress_count=status_counts.get('in_progress', 0),
-            ready_count=status_counts.get('ready', 0),
-            delivered_count=status_counts.get('delivered', 0),
-            cancelled_count=status_counts.get('cancelled', 0),
-            total_revenue=Decimal(str(total_revenue)),
-            total_pending_payment=Decimal(str(total_pending)),
-            today_received=today_received,
-            today_delivered=today_delivered
+            total_count=row.total_count,
+            pending_count=row.pending,
+            in_progress_count=row.in_progress,
+            ready_count=row.ready,
+            delivered_count=row.delivered,
+            cancelled_count=row.cancelled,
+            total_revenue=Decimal(str(row.total_revenue)),
+            total_pending_payment=Decimal(str(row.total_pending)),
+            today_received=row.today_received,
+            today_delivered=row.today_delivered
         )
 
     # ============================================
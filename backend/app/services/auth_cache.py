@@ -0,0 +1,114 @@
+"""
+Authentication Cache - Short-lived user/role snapshots
+
+Every authenticated request needs the user (active flag, superuser) and
+usually its school roles. The snapshot of both is kept in the response
+cache (Redis or in-process) for AUTH_CACHE_TTL_SECONDS so the common
+case does no auth queries. UserService invalidates it once a change to
+the user or its roles commits.
+"""
+from dataclasses import dataclass
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.db.hooks import after_commit
+from app.models.user import User, UserRole, UserSchoolRole
+from app.schemas.user import UserResponse
+
+
+def _cache_key(user_id: UUID | str) -> str:
+    return f"auth:user:{user_id}"
+
+
+@dataclass
+class AuthSnapshot:
+    """User columns (without password) and its role per school"""
+    user: UserResponse
+    roles: dict[UUID, UserRole]
+
+    @property
+    def is_active(self) -> bool:
+        return self.user.is_active
+
+    @property
+    def is_superuser(self) -> bool:
+        return self.user.is_superuser
+
+    def role_for(self, school_id: UUID) -> UserRole | None:
+        """User's role in a school, or None without access"""
+        return self.roles.get(school_id)
+
+    def to_user(self) -> User:
+        """
+        Detached User built from the snapshot
+
+        Only column attributes are set (no password hash, no relationships);
+        callers read ids and flags, they never persist this instance.
+        """
+        return User(**self.user.model_dump())
+
+    def to_json(self) -> dict:
+        return {
+            "user": self.user.model_dump(mode="json"),
+            "roles": {str(school_id): role.value for school_id, role in self.roles.items()},
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "AuthSnapshot":
+        return cls(
+            user=UserResponse.model_validate(data["user"]),
+            roles={UUID(school_id): UserRole(role) for school_id, role in data["roles"].items()},
+        )
+
+
+async def load_auth_snapshot(db: AsyncSession, user_id: UUID) -> AuthSnapshot | None:
+    """
+    Snapshot of a user for authorization, from cache when fresh
+
+    Args:
+        db: Database session (only used on a cache miss)
+        user_id: User UUID from the access token
+
+    Returns:
+        AuthSnapshot, or None if the user does not exist
+    """
+    ttl = settings.AUTH_CACHE_TTL_SECONDS
+    if ttl > 0:
+        cached = await cache.get(_cache_key(user_id))
+        if cached is not None:
+            return AuthSnapshot.from_json(cached)
+
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+    if not user:
+        return None
+
+    roles_result = await db.execute(
+        select(UserSchoolRole.school_id, UserSchoolRole.role)
+        .where(UserSchoolRole.user_id == user_id)
+        .order_by(UserSchoolRole.created_at)
+    )
+    snapshot = AuthSnapshot(
+        user=UserResponse.model_validate(user),
+        roles={row.school_id: row.role for row in roles_result.all()},
+    )
+    if ttl > 0:
+        await cache.set(_cache_key(user_id), snapshot.to_json(), ttl)
+    return snapshot
+
+
+async def invalidate_auth_snapshot(user_id: UUID | str) -> None:
+    """Drop a user's cached snapshot after the user or its roles change"""
+    await cache.delete(_cache_key(user_id))
+
+
+def invalidate_auth_snapshot_after_commit(db: AsyncSession, user_id: UUID | str) -> None:
+    """
+    Drop the snapshot once db's transaction commits (nothing on rollback)
+
+    Dropping it earlier lets a concurrent request cache the old user or
+    roles again, e.g. keep a deactivated user logged in until the TTL.
+    """
+    after_commit(db, lambda: invalidate_auth_snapshot(user_id))
@@ -15,6 +15,10 @@ CUENTAS DE ACTIVO LIQUIDO:
 - 1102 Caja Mayor: Efectivo consolidado
 - 1103 Nequi: Cuenta Nequi
 - 1104 Banco: Transferencias bancarias y tarjetas
+
+MODO LEDGER (settings.BALANCE_LEDGER_ENABLED):
+Los movimientos solo insertan BalanceEntry pendientes (sin tocar la fila de
+la cuenta) y el saldo es snapshot + pendientes. Ver app.services.balance_ledger.
 """
 from uuid import UUID
 from decimal import Decimal
@@ -22,6 +26,7 @@ from datetime import datetime, date
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.accounting import (
     Transaction,
     TransactionType,
@@ -30,6 +35,12 @@ from app.models.accounting import (
     BalanceEntry,
     AccountType
 )
+from app.services.balance_ledger import BalanceLedgerService
+
+
+def is_asset_account(account: BalanceAccount) -> bool:
+    """Cuentas de activo: su saldo no puede ser negativo (chk_balance_account_sign)"""
+    return account.account_type.value.startswith("asset")
 
 
 # Códigos estándar de contabilidad para cuentas default GLOBALES
@@ -101,6 +112,95 @@ class BalanceIntegrationService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    async def apply_to_account(
+        self,
+        account: BalanceAccount,
+        amount: Decimal,
+        description: str,
+        entry_date: date | None = None,
+        school_id: UUID | None = None,
+        reference: str | None = None,
+        created_by: UUID | None = None
+    ) -> BalanceEntry:
+        """
+        Aplica un movimiento a una cuenta y crea su BalanceEntry.
+
+        En modo ledger solo inserta el movimiento pendiente (balance_after se
+        calcula al compactar); si no, bloquea la cuenta y actualiza su saldo.
+        Es la única forma de mover saldo: los llamadores pasan el delta,
+        nunca escriben account.balance.
+
+        Los débitos a cuentas de activo siempre bloquean la cuenta (también
+        en modo ledger) y se rechazan si el saldo quedaría negativo: la
+        restricción chk_balance_account_sign fallaría al compactar o al
+        hacer flush.
+
+        Args:
+            account: Cuenta de balance
+            amount: Monto con signo (positivo = dinero entra)
+            description: Descripción del movimiento
+            entry_date: Fecha contable (default: hoy)
+            school_id: Colegio para reportes (None = global)
+            reference: Código de referencia
+            created_by: ID del usuario
+
+        Returns:
+            BalanceEntry creado
+
+        Raises:
+            ValueError: Si un débito dejaría una cuenta de activo en negativo
+        """
+        checked_debit = amount < 0 and is_asset_account(account)
+        if settings.BALANCE_LEDGER_ENABLED and not checked_debit:
+            return await BalanceLedgerService(self.db).append(
+                account.id,
+                amount,
+                description,
+                entry_date=entry_date,
+                school_id=school_id,
+                reference=reference,
+                created_by=created_by
+            )
+
+        # Bloquear la fila antes de leer el saldo: sin bloqueo, dos
+        # movimientos concurrentes se sobrescriben el saldo
+        await BalanceLedgerService(self.db).lock_current([account.id])
+        new_balance = account.balance + amount
+        if checked_debit and new_balance < 0:
+            raise ValueError(
+                f"Fondos insuficientes en {account.name}. "
+                f"Disponible: ${account.balance:,.2f}, Requerido: ${-amount:,.2f}"
+            )
+        account.balance = new_balance
+
+        entry = BalanceEntry(
+            account_id=account.id,
+            school_id=school_id,
+            entry_date=entry_date or date.today(),
+            amount=amount,
+            balance_after=new_balance,
+            description=description,
+            reference=reference,
+            created_by=created_by
+        )
+        self.db.add(entry)
+
+        await self.db.flush()
+
+        return entry
+
+    async def get_current_balance(self, account: BalanceAccount) -> Decimal:
+        """
+        Saldo actual de una cuenta.
+
+        En modo ledger suma los movimientos pendientes de compactar al
+        snapshot de la cuenta; si no, es account.balance.
+        """
+        if settings.BALANCE_LEDGER_ENABLED:
+            balance = await BalanceLedgerService(self.db).get_balance(account.id)
+            return balance if balance is not None else account.balance
+        return account.balance
+
     async def get_or_create_global_accounts(
         self,
         created_by: UUID | None = None
@@ -249,30 +349,20 @@ class BalanceIntegrationService:
             # TRANSFER: se maneja diferente (requiere cuenta origen y destino)
             return None
 
-        # Actualizar balance de la cuenta
-        new_balance = account.balance + delta
-        account.balance = new_balance
-
         # Actualizar balance_account_id en la transacción
         transaction.balance_account_id = account_id
 
-        # Crear BalanceEntry para auditoría
+        # Actualizar saldo y crear BalanceEntry para auditoría
         # school_id en entry puede ser NULL (global) o el school_id de la transacción
-        entry = BalanceEntry(
-            account_id=account_id,
-            school_id=transaction.school_id,  # Puede ser NULL o UUID (para reportes)
+        return await self.apply_to_account(
+            account,
+            delta,
+            f"Auto: {transaction.description}",
             entry_date=transaction.transaction_date,
-            amount=delta,
-            balance_after=new_balance,
-            description=f"Auto: {transaction.description}",
+            school_id=transaction.school_id,  # Puede ser NULL o UUID (para reportes)
             reference=transaction.reference_code,
             created_by=created_by
         )
-        self.db.add(entry)
-
-        await self.db.flush()
-
-        return entry
 
     async def apply_transfer(
         self,
@@ -310,33 +400,31 @@ class BalanceIntegrationService:
 
         amount = transaction.amount
 
-        # Descontar de cuenta origen
-        from_account.balance -= amount
-        entry_from = BalanceEntry(
-            account_id=from_account_id,
-            school_id=None,  # Transferencias son globales
+        # Bloquear ambas cuentas en orden fijo para que dos transferencias
+        # opuestas no se bloqueen mutuamente. En modo ledger el abono solo se
+        # inserta, así que apply_to_account bloquea únicamente la cuenta origen
+        if not settings.BALANCE_LEDGER_ENABLED:
+            await BalanceLedgerService(self.db).lock_current([from_account_id, to_account_id])
+
+        # Descontar de cuenta origen (transferencias son globales)
+        entry_from = await self.apply_to_account(
+            from_account,
+            -amount,
+            f"Transferencia a {to_account.name}: {transaction.description}",
             entry_date=transaction.transaction_date,
-            amount=-amount,
-            balance_after=from_account.balance,
-            description=f"Transferencia a {to_account.name}: {transaction.description}",
             reference=transaction.reference_code,
             created_by=created_by
         )
-        self.db.add(entry_from)
 
         # Agregar a cuenta destino
-        to_account.balance += amount
-        entry_to = BalanceEntry(
-            account_id=to_account_id,
-            school_id=None,  # Transferencias son globales
+        entry_to = await self.apply_to_account(
+            to_account,
+            amount,
+            f"Transferencia desde {from_account.name}: {transaction.description}",
             entry_date=transaction.transaction_date,
-            amount=amount,
-            balance_after=to_account.balance,
-            description=f"Transferencia desde {from_account.name}: {transaction.description}",
             reference=transaction.reference_code,
             created_by=created_by
         )
-        self.db.add(entry_to)
 
         # Actualizar transaction
         transaction.balance_account_id = from_account_id
@@ -373,6 +461,7 @@ class BalanceIntegrationService:
             "total_cash": Decimal("0")
         }
 
+        accounts = {}
         for account_key in ["caja_menor", "caja_mayor", "nequi", "banco"]:
             account_id = accounts_map.get(account_key)
             if account_id:
@@ -381,17 +470,28 @@ class BalanceIntegrationService:
                 )
                 account = account_result.scalar_one_or_none()
                 if account:
-                    result[account_key] = {
-                        "id": str(account.id),
-                        "name": account.name,
-                        "code": account.code,
-                        "balance": account.balance,
-                        "last_updated": account.updated_at.isoformat() if account.updated_at else None
-                    }
-                    result["total_liquid"] += account.balance
-                    # Sumar efectivo (caja_menor + caja_mayor)
-                    if account_key in ["caja_menor", "caja_mayor"]:
-                        result["total_cash"] += account.balance
+                    accounts[account_key] = account
+
+        # Modo ledger: snapshot + movimientos pendientes, en una consulta
+        ledger_balances = {}
+        if settings.BALANCE_LEDGER_ENABLED and accounts:
+            ledger_balances = await BalanceLedgerService(self.db).get_balances(
+                [account.id for account in accounts.values()]
+            )
+
+        for account_key, account in accounts.items():
+            balance = ledger_balances.get(account.id, account.balance)
+            result[account_key] = {
+                "id": str(account.id),
+                "name": account.name,
+                "code": account.code,
+                "balance": balance,
+                "last_updated": account.updated_at.isoformat() if account.updated_at else None
+            }
+            result["total_liquid"] += balance
+            # Sumar efectivo (caja_menor + caja_mayor)
+            if account_key in ["caja_menor", "caja_mayor"]:
+                result["total_cash"] += balance
 
         return result
 
@@ -567,32 +667,23 @@ class BalanceIntegrationService:
         if not account:
             return None
 
-        # Validar fondos suficientes
-        new_balance = account.balance - amount
-        if new_balance < 0 and not allow_negative:
+        # Validar fondos suficientes con la cuenta bloqueada: sin bloqueo, dos
+        # gastos concurrentes ven el mismo saldo y ambos pasan
+        await BalanceLedgerService(self.db).lock_current([account.id])
+        available = account.balance
+        if available - amount < 0 and not allow_negative:
             raise ValueError(
                 f"Fondos insuficientes en {account.name}. "
-                f"Disponible: ${account.balance:,.2f}, Requerido: ${amount:,.2f}"
+                f"Disponible: ${available:,.2f}, Requerido: ${amount:,.2f}"
             )
 
-        # Restar del balance (gasto = dinero sale)
-        account.balance = new_balance
-
-        # Crear BalanceEntry para auditoría
-        entry = BalanceEntry(
-            account_id=account_id,
-            school_id=None,  # Pagos de gastos son globales
-            entry_date=date.today(),
-            amount=-amount,
-            balance_after=new_balance,
-            description=description,
+        # Restar del balance (gasto = dinero sale); pagos de gastos son globales
+        return await self.apply_to_account(
+            account,
+            -amount,
+            description,
             created_by=created_by
         )
-        self.db.add(entry)
-
-        await self.db.flush()
-
-        return entry
 
     async def record_income(
         self,
@@ -635,24 +726,13 @@ class BalanceIntegrationService:
             return None
 
         # Sumar al balance (ingreso = dinero entra)
-        new_balance = account.balance + amount
-        account.balance = new_balance
-
-        # Crear BalanceEntry para auditoría
-        entry = BalanceEntry(
-            account_id=account_id,
+        return await self.apply_to_account(
+            account,
+            amount,
+            description,
             school_id=school_id,  # Para reportes por colegio
-            entry_date=date.today(),
-            amount=amount,
-            balance_after=new_balance,
-            description=description,
             created_by=created_by
         )
-        self.db.add(entry)
-
-        await self.db.flush()
-
-        return entry
 
     async def get_account_balance(self, account_key: str) -> Decimal | None:
         """
@@ -679,7 +759,7 @@ class BalanceIntegrationService:
         )
         account = result.scalar_one_or_none()
 
-        return account.balance if account else None
+        return await self.get_current_balance(account) if account else None
 
     async def record_expense_payment_from_account(
         self,
@@ -727,29 +807,20 @@ class BalanceIntegrationService:
         if not account:
             return None
 
-        # Validar fondos suficientes
-        new_balance = account.balance - amount
-        if new_balance < 0 and not allow_negative:
+        # Validar fondos suficientes con la cuenta bloqueada: sin bloqueo, dos
+        # gastos concurrentes ven el mismo saldo y ambos pasan
+        await BalanceLedgerService(self.db).lock_current([account.id])
+        available = account.balance
+        if available - amount < 0 and not allow_negative:
             raise ValueError(
                 f"Fondos insuficientes en {account.name}. "
-                f"Disponible: ${account.balance:,.2f}, Requerido: ${amount:,.2f}"
+                f"Disponible: ${available:,.2f}, Requerido: ${amount:,.2f}"
             )
 
         # Restar del balance (gasto = dinero sale)
-        account.balance = new_balance
-
-        # Crear BalanceEntry para auditoría
-        entry = BalanceEntry(
-            account_id=account.id,
-            school_id=None,
-            entry_date=date.today(),
-            amount=-amount,
-            balance_after=new_balance,
-            description=description,
+        return await self.apply_to_account(
+            account,
+            -amount,
+            description,
             created_by=created_by
         )
-        self.db.add(entry)
-
-        await self.db.flush()
-
-        return entry
@@ -0,0 +1,240 @@
+"""
+Balance Ledger - Append-only movements for the global cash accounts
+
+Every sale, order payment and expense from every school lands on the same
+four global accounts (Caja Menor, Caja Mayor, Nequi, Banco). Updating
+`BalanceAccount.balance` on each movement means locking the row (see
+BalanceIntegrationService.apply_to_account, the only writer), which
+serializes all of them on those rows.
+
+In ledger mode (settings.BALANCE_LEDGER_ENABLED) movements are only
+inserted as BalanceEntry rows with `balance_after = NULL` ("pending"):
+
+- current balance = BalanceAccount.balance (snapshot) + SUM(pending amounts)
+- compact() locks the account rows, assigns each pending entry its running
+  `balance_after` and folds the total into the snapshot, one account at a
+  time. It runs
+  periodically in the background (BALANCE_LEDGER_COMPACT_SECONDS) and on
+  demand before operations that need an exact, locked balance.
+
+Inserting an entry only takes a KEY SHARE lock on the account (foreign
+key check) and compaction locks with FOR NO KEY UPDATE, so appends never
+wait for each other or for compaction. Only credits and non-asset
+movements are appended, though: debits to asset accounts lock the
+account and check the balance first (see apply_to_account), since a
+pending overdraft would make the snapshot break chk_balance_account_sign
+when folded.
+"""
+import asyncio
+import logging
+from uuid import UUID
+from decimal import Decimal
+from datetime import datetime, date
+from sqlalchemy import select, update, func, and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.models.accounting import BalanceAccount, BalanceEntry
+
+logger = logging.getLogger(__name__)
+
+
+class BalanceLedgerService:
+    """Append, read and compact ledger entries of balance accounts"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def append(
+        self,
+        account_id: UUID,
+        amount: Decimal,
+        description: str,
+        entry_date: date | None = None,
+        school_id: UUID | None = None,
+        reference: str | None = None,
+        created_by: UUID | None = None
+    ) -> BalanceEntry:
+        """
+        Record a movement without touching the account row.
+
+        Args:
+            account_id: Balance account UUID
+            amount: Signed amount (positive = money in)
+            description: Entry description
+            entry_date: Accounting date (defaults to today)
+            school_id: School for per-school reports (None = global)
+            reference: Optional reference code
+            created_by: User UUID
+
+        Returns:
+            Pending BalanceEntry (balance_after is None until compacted)
+        """
+        entry = BalanceEntry(
+            account_id=account_id,
+            school_id=school_id,
+            entry_date=entry_date or date.today(),
+            amount=amount,
+            balance_after=None,
+            description=description,
+            reference=reference,
+            created_by=created_by
+        )
+        self.db.add(entry)
+        await self.db.flush()
+        return entry
+
+    async def get_balances(self, account_ids: list[UUID]) -> dict[UUID, Decimal]:
+        """
+        Current balances (snapshot + pending entries) in one query.
+
+        Args:
+            account_ids: Balance account UUIDs
+
+        Returns:
+            Dict {account_id: balance}; unknown accounts are omitted
+        """
+        if not account_ids:
+            return {}
+
+        result = await self.db.execute(
+            select(
+                BalanceAccount.id,
+                BalanceAccount.balance,
+                func.coalesce(func.sum(BalanceEntry.amount), 0).label("pending")
+            )
+            .outerjoin(
+                BalanceEntry,
+                and_(
+                    BalanceEntry.account_id == BalanceAccount.id,
+                    BalanceEntry.balance_after.is_(None)
+                )
+            )
+            .where(BalanceAccount.id.in_(account_ids))
+            .group_by(BalanceAccount.id, BalanceAccount.balance)
+        )
+        return {row.id: row.balance + row.pending for row in result.all()}
+
+    async def get_balance(self, account_id: UUID) -> Decimal | None:
+        """Current balance of one account, or None if it does not exist"""
+        balances = await self.get_balances([account_id])
+        return balances.get(account_id)
+
+    async def lock_current(self, account_ids: list[UUID]) -> dict[UUID, BalanceAccount]:
+        """
+        Lock accounts and fold their pending entries into the snapshot.
+
+        Afterwards `account.balance` is exact and stays so until the
+        caller's transaction ends, so it can be read-modify-written safely.
+
+        Args:
+            account_ids: Balance account UUIDs
+
+        Returns:
+            Dict {account_id: locked BalanceAccount}
+        """
+        accounts = await self._lock(account_ids)
+        await self._fold(accounts)
+        return {account.id: account for account in accounts}
+
+    async def compact(self, account_ids: list[UUID] | None = None) -> int:
+        """
+        Fold pending entries into the account snapshots.
+
+        Each account is folded in its own savepoint: an account whose
+        entries cannot be folded (e.g. they would break
+        chk_balance_account_sign) is logged and left pending without
+        blocking the others.
+
+        Args:
+            account_ids: Accounts to compact (default: all with pending entries)
+
+        Returns:
+            Number of entries compacted
+        """
+        if account_ids is None:
+            result = await self.db.execute(
+                select(BalanceEntry.account_id)
+                .where(BalanceEntry.balance_after.is_(None))
+                .distinct()
+            )
+            account_ids = list(result.scalars().all())
+
+        compacted = 0
+        # Fixed order, as in _lock, so concurrent compactions cannot deadlock
+        for account_id in sorted(account_ids):
+            try:
+                async with self.db.begin_nested():
+                    compacted += await self._fold(await self._lock([account_id]))
+            except IntegrityError:
+                logger.exception("Balance ledger: account %s could not be compacted", account_id)
+        return compacted
+
+    async def _lock(self, account_ids: list[UUID]) -> list[BalanceAccount]:
+        # Fixed lock order so concurrent compactions cannot deadlock
+        result = await self.db.execute(
+            select(BalanceAccount)
+            .where(BalanceAccount.id.in_(account_ids))
+            .order_by(BalanceAccount.id)
+            .with_for_update(key_share=True)
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
+
+    async def _fold(self, accounts: list[BalanceAccount]) -> int:
+        """Assign running balance_after to pending entries of locked accounts"""
+        if not accounts:
+            return 0
+
+        # Read after taking the locks: entries folded by a compaction that
+        # committed while we waited are no longer pending
+        result = await self.db.execute(
+            select(BalanceEntry.id, BalanceEntry.account_id, BalanceEntry.amount)
+            .where(
+                BalanceEntry.account_id.in_([account.id for account in accounts]),
+                BalanceEntry.balance_after.is_(None)
+            )
+            .order_by(BalanceEntry.account_id, BalanceEntry.created_at, BalanceEntry.id)
+        )
+        pending = result.all()
+        if not pending:
+            return 0
+
+        running = {account.id: account.balance for account in accounts}
+        updates = []
+        for row in pending:
+            running[row.account_id] += row.amount
+            updates.append({"id": row.id, "balance_after": running[row.account_id]})
+
+        await self.db.execute(update(BalanceEntry), updates)
+
+        compacted_at = datetime.utcnow()
+        for account in accounts:
+            if account.balance != running[account.id]:
+                account.balance = running[account.id]
+            account.ledger_compacted_at = compacted_at
+
+        await self.db.flush()
+        return len(updates)
+
+
+async def run_compaction_loop(interval_seconds: int) -> None:
+    """
+    Compact the ledger every `interval_seconds` until cancelled.
+
+    Started from the application lifespan when ledger mode is enabled.
+    Errors are logged and retried on the next tick.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with AsyncSessionLocal() as db:
+                compacted = await BalanceLedgerService(db).compact()
+                await db.commit()
+            if compacted:
+                logger.info("Balance ledger: %s entries compacted", compacted)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Balance ledger compaction failed")
@@ -23,6 +23,7 @@ from app.services.balance_integration import (
     BalanceIntegrationService,
     DEFAULT_ACCOUNTS
 )
+from app.services.balance_ledger import BalanceLedgerService
 
 
 class CashRegisterService:
@@ -69,7 +70,7 @@ class CashRegisterService:
                 "id": str(account.id),
                 "name": account.name,
                 "code": account.code,
-                "balance": account.balance,
+                "balance": await self.balance_service.get_current_balance(account),
                 "last_updated": account.updated_at.isoformat() if account.updated_at else None
             }
 
@@ -103,7 +104,7 @@ class CashRegisterService:
                 "id": str(account.id),
                 "name": account.name,
                 "code": account.code,
-                "balance": account.balance,
+                "balance": await self.balance_service.get_current_balance(account),
                 "last_updated": account.updated_at.isoformat() if account.updated_at else None
             }
 
@@ -161,14 +162,6 @@ class CashRegisterService:
         if not caja_menor:
             raise ValueError("No se encontro la cuenta Caja Menor")
 
-        # Validar saldo suficiente
-        if caja_menor.balance < amount:
-            raise ValueError(
-                f"Saldo insuficiente en Caja Menor. "
-                f"Disponible: ${caja_menor.balance:,.2f}, "
-                f"Solicitado: ${amount:,.2f}"
-            )
-
         # Obtener cuenta Caja Mayor
         caja_mayor = await self.balance_service.get_global_account(
             DEFAULT_ACCOUNTS["caja_mayor"]["code"]
@@ -177,6 +170,18 @@ class CashRegisterService:
         if not caja_mayor:
             raise ValueError("No se encontro la cuenta Caja Mayor")
 
+        # Bloquear ambas cuentas (y en modo ledger compactar sus movimientos
+        # pendientes) para que el saldo sea exacto durante la liquidacion
+        await BalanceLedgerService(self.db).lock_current([caja_menor.id, caja_mayor.id])
+
+        # Validar saldo suficiente
+        if caja_menor.balance < amount:
+            raise ValueError(
+                f"Saldo insuficiente en Caja Menor. "
+                f"Disponible: ${caja_menor.balance:,.2f}, "
+                f"Solicitado: ${amount:,.2f}"
+            )
+
         # Realizar la transferencia
         description = notes or "Liquidacion de Caja Menor"
         timestamp = datetime.utcnow()
@@ -7,16 +7,18 @@ web clients (self-registered via web portal).
 """
 from uuid import UUID
 from datetime import datetime, timedelta
+import re
 import secrets
 from typing import Optional
 
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, case
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from passlib.context import CryptContext
 from jose import jwt
 
 from app.core.config import settings
+from app.db.pagination import CountMode, count_rows, keyset_paginate, page_rows
 from app.models.client import Client, ClientStudent, ClientType
 from app.models.sale import Sale
 from app.models.order import Order
@@ -30,11 +32,22 @@ from app.schemas.client import (
     ClientWebRegister,
 )
 from app.services.base import BaseService
+from app.services.sequence import DocumentSequenceService
+from app.utils.text_search import normalize_search_term
 
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Search terms answered by a prefix lookup on an indexed column
+CODE_PREFIX_PATTERN = re.compile(r"^[A-Za-z]{2,5}-\d*$")  # CLI-00
+PHONE_PREFIX_MIN_DIGITS = 3
+
+
+def _like_escape(value: str) -> str:
+    """Escape LIKE wildcards (escape character '/')"""
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
 
 class ClientService(BaseService[Client]):
     """
@@ -326,22 +339,29 @@ class ClientService(BaseService[Client]):
         limit: int = 100,
         search: str | None = None,
         client_type: ClientType | None = None,
-        is_active: bool | None = True
-    ) -> list[Client]:
+        is_active: bool | None = True,
+        cursor: str | None = None,
+        count: CountMode = CountMode.NONE
+    ) -> tuple[list[Client], str | None, int | None]:
         """
-        Get all clients (global).
+        Get all clients (global), ordered by name.
 
         Args:
-            skip: Pagination offset
+            skip: Pagination offset (ignored when cursor is given)
             limit: Maximum results
             search: Search term (code, name, email, phone)
             client_type: Filter by client type
             is_active: Filter by active status
+            cursor: Next cursor of the previous page
+            count: How to compute the total
 
         Returns:
-            List of clients
+            (clients, next cursor or None, total or None)
+
+        Raises:
+            InvalidCursorError: If the cursor can't be decoded
         """
-        query = select(Client).options(selectinload(Client.students))
+        query = select(Client)
 
         # Apply filters
         if is_active is not None:
@@ -350,21 +370,19 @@ class ClientService(BaseService[Client]):
         if client_type is not None:
             query = query.where(Client.client_type == client_type)
 
-        if search:
-            search_term = f"%{search}%"
-            query = query.where(
-                or_(
-                    Client.code.ilike(search_term),
-                    Client.name.ilike(search_term),
-                    Client.email.ilike(search_term),
-                    Client.phone.ilike(search_term),
-                    Client.student_name.ilike(search_term)
-                )
-            )
+        if search and search.strip():
+            query = query.where(self._search_condition(normalize_search_term(search)))
+
+        total = await count_rows(self.db, query, count)
 
-        query = query.offset(skip).limit(limit).order_by(Client.name)
+        query = keyset_paginate(
+            query, (Client.name, Client.id), limit, cursor, skip, descending=False
+        ).options(selectinload(Client.students))
         result = await self.db.execute(query)
-        return list(result.scalars().all())
+        clients, next_cursor = page_rows(
+            result.scalars().all(), limit, lambda client: (client.name, client.id)
+        )
+        return clients, next_cursor, total
 
     async def search_clients(
         self,
@@ -374,31 +392,85 @@ class ClientService(BaseService[Client]):
         """
         Search clients by code, name, email, phone, or student name.
 
+        Codes ("CLI-00") and phone numbers are first looked up by prefix on
+        their indexed columns. Otherwise (or if that finds nothing) the
+        accent-insensitive search_text column is matched (pg_trgm GIN
+        index) and results are ranked: exact code/phone/email, name
+        prefix, name word prefix, name substring, other fields.
+
         Args:
             search_term: Search term
             limit: Maximum results
 
         Returns:
-            List of matching clients
+            List of matching clients, most relevant first
         """
-        result = await self.db.execute(
+        term = search_term.strip()
+        if not term:
+            return []
+
+        base_query = (
             select(Client)
             .options(selectinload(Client.students))
-            .where(
-                Client.is_active == True,
-                or_(
-                    Client.code.ilike(f"%{search_term}%"),
-                    Client.name.ilike(f"%{search_term}%"),
-                    Client.email.ilike(f"%{search_term}%"),
-                    Client.phone.ilike(f"%{search_term}%"),
-                    Client.student_name.ilike(f"%{search_term}%")
-                )
+            .where(Client.is_active == True)
+        )
+
+        prefix_condition = self._prefix_condition(term)
+        if prefix_condition is not None:
+            result = await self.db.execute(
+                base_query.where(prefix_condition).order_by(Client.code).limit(limit)
             )
+            clients = list(result.scalars().all())
+            if clients:
+                return clients
+
+        normalized = normalize_search_term(term)
+        result = await self.db.execute(
+            base_query
+            .where(self._search_condition(normalized))
+            .order_by(self._search_rank(term, normalized), Client.name)
             .limit(limit)
-            .order_by(Client.name)
         )
         return list(result.scalars().all())
 
+    @staticmethod
+    def _prefix_condition(term: str):
+        """Indexed prefix condition for code or phone terms, else None"""
+        compact = term.replace(" ", "")
+        if CODE_PREFIX_PATTERN.match(compact):
+            return Client.code.like(f"{_like_escape(compact.upper())}%", escape="/")
+
+        digits = re.sub(r"[\s\-+()]", "", term)
+        if digits.isdigit() and len(digits) >= PHONE_PREFIX_MIN_DIGITS:
+            return Client.phone.like(f"{digits}%", escape="/")
+
+        return None
+
+    @staticmethod
+    def _search_condition(normalized: str):
+        """Substring match on search_text (served by the trigram index)"""
+        return Client.search_text.like(f"%{_like_escape(normalized)}%", escape="/")
+
+    @staticmethod
+    def _search_rank(term: str, normalized: str):
+        """Relevance rank (lower is better) for ORDER BY"""
+        escaped = _like_escape(normalized)
+        name = func.search_normalize(Client.name)
+        return case(
+            (
+                or_(
+                    Client.code == term.upper(),
+                    Client.phone == term,
+                    func.lower(Client.email) == term.lower()
+                ),
+                0
+            ),
+            (name.like(f"{escaped}%", escape="/"), 1),
+            (name.like(f"% {escaped}%", escape="/"), 2),
+            (name.like(f"%{escaped}%", escape="/"), 3),
+            else_=4
+        )
+
     async def get_by_code(self, code: str) -> Client | None:
         """Get client by code (globally unique)."""
         result = await self.db.execute(
@@ -754,35 +826,12 @@ class ClientService(BaseService[Client]):
         Returns:
             Generated client code
         """
-        # Get total count of clients
-        count_result = await self.db.execute(
-            select(func.count(Client.id))
+        sequences = DocumentSequenceService(self.db)
+        return await sequences.next_code(
+            "CLI-",
+            5,
+            seed=lambda: sequences.max_code_number(Client.code, "CLI-")
         )
-        count = count_result.scalar_one()
-
-        # Generate code with padding
-        sequence = count + 1
-        code = f"CLI-{sequence:05d}"
-
-        # Verify uniqueness
-        existing = await self.get_by_code(code)
-        if existing:
-            # Find next available number
-            result = await self.db.execute(
-                select(func.max(Client.code)).where(
-                    Client.code.like("CLI-%")
-                )
-            )
-            max_code = result.scalar_one_or_none()
-
-            if max_code:
-                try:
-                    last_num = int(max_code.split('-')[1])
-                    code = f"CLI-{last_num + 1:05d}"
-                except (IndexError, ValueError):
-                    code = f"CLI-{sequence:05d}"
-
-        return code
 
     async def count_all(self, is_active: bool | None = None) -> int:
         """
@@ -2,7 +2,6 @@
 Document Service - Business logic for document management
 """
 import os
-import uuid as uuid_module
 from pathlib import Path
 from typing import Any
 from uuid import UUID
@@ -13,6 +12,9 @@ from sqlalchemy.orm import selectinload
 
 from app.models.document import DocumentFolder, BusinessDocument
 from app.services.base import BaseService
+from app.services.uploads import (
+    AsyncReadable, StoredUpload, lock_stored_file, store_upload, remove_stored_file
+)
 from app.core.config import settings
 
 # Allowed MIME types and extensions
@@ -240,19 +242,15 @@ class BusinessDocumentService(BaseService[BusinessDocument]):
         stats = await self.get_storage_stats()
         return (stats["total_size_bytes"] + file_size) <= MAX_TOTAL_STORAGE
 
-    def validate_file(self, filename: str, content_type: str, file_size: int) -> str | None:
+    def validate_file(self, filename: str, content_type: str) -> str | None:
         """
-        Validate file before upload
+        Validate file type before upload (size is enforced while storing)
         Returns error message or None if valid
         """
         # Check MIME type
         if content_type not in ALLOWED_MIME_TYPES:
             return f"Tipo de archivo no permitido: {content_type}"
 
-        # Check file size
-        if file_size > MAX_FILE_SIZE:
-            return f"El archivo excede el tamaño máximo de 50MB"
-
         # Check extension matches MIME type
         ext = Path(filename).suffix.lower()
         expected_ext = ALLOWED_MIME_TYPES[content_type]
@@ -269,73 +267,81 @@ class BusinessDocumentService(BaseService[BusinessDocument]):
 
     async def save_file(
         self,
-        file_content: bytes,
+        file: AsyncReadable,
         original_filename: str,
-        content_type: str
-    ) -> tuple[str, int]:
+        replacing_size: int = 0
+    ) -> StoredUpload:
         """
-        Save file to disk and return (file_path, file_size)
+        Stream file to disk (deduplicated by content hash)
+
+        replacing_size: size of the file this one replaces, freed afterwards
+
+        Raises:
+            ValueError: If the file exceeds MAX_FILE_SIZE or the storage limit
         """
-        # Create uploads directory if needed
-        self.upload_path.mkdir(parents=True, exist_ok=True)
-
-        # Generate unique filename
-        ext = Path(original_filename).suffix.lower()
-        unique_filename = f"{uuid_module.uuid4()}{ext}"
-        file_path = self.upload_path / unique_filename
-
-        # Write file
-        file_path.write_bytes(file_content)
-
-        # Return relative path (for URL generation)
-        relative_path = f"documents/{unique_filename}"
-        return relative_path, len(file_content)
-
-    def delete_file(self, file_path: str) -> bool:
-        """Delete file from disk"""
-        try:
-            # file_path is relative like "documents/uuid.ext"
-            full_path = self.upload_path.parent / file_path
-            if full_path.exists():
-                full_path.unlink()
-                return True
-            return False
-        except Exception:
+        stored = await store_upload(
+            file,
+            self.upload_path,
+            Path(original_filename).suffix,
+            max_size=MAX_FILE_SIZE,
+            db=self.db
+        )
+
+        size_diff = stored.size - replacing_size
+        if size_diff > 0 and not await self.check_storage_available(size_diff):
+            if not stored.deduplicated:
+                await remove_stored_file(stored.path)
+            raise ValueError("No hay espacio de almacenamiento disponible. Límite: 2GB")
+
+        return stored
+
+    async def release_file(self, file_path: str, document_id: UUID) -> bool:
+        """
+        Delete a document's file from disk unless another document
+        (active or not) still uses the same deduplicated file
+
+        The file stays locked until the transaction ends, so a concurrent
+        upload of the same content waits and then stores it again.
+        """
+        await lock_stored_file(self.db, Path(file_path).name)
+        shared = await self.db.execute(
+            select(func.count(BusinessDocument.id)).where(
+                BusinessDocument.file_path == file_path,
+                BusinessDocument.id != document_id
+            )
+        )
+        if shared.scalar():
             return False
+        # file_path is relative like "documents/<sha256>.ext"
+        return await remove_stored_file(self.upload_path.parent / file_path)
 
     async def create_document(
         self,
         name: str,
         description: str | None,
         folder_id: UUID | None,
-        file_content: bytes,
+        file: AsyncReadable,
         original_filename: str,
         content_type: str,
         created_by_id: UUID
     ) -> BusinessDocument:
         """Create a new document with file upload"""
         # Validate file
-        error = self.validate_file(original_filename, content_type, len(file_content))
+        error = self.validate_file(original_filename, content_type)
         if error:
             raise ValueError(error)
 
-        # Check storage
-        if not await self.check_storage_available(len(file_content)):
-            raise ValueError("No hay espacio de almacenamiento disponible. Límite: 2GB")
-
         # Save file
-        file_path, file_size = await self.save_file(
-            file_content, original_filename, content_type
-        )
+        stored = await self.save_file(file, original_filename)
 
         # Create document record
         document = await self.create({
             "name": name,
             "description": description,
             "folder_id": folder_id,
-            "file_path": file_path,
+            "file_path": f"documents/{stored.filename}",
             "original_filename": original_filename,
-            "file_size": file_size,
+            "file_size": stored.size,
             "mime_type": content_type,
             "created_by": created_by_id,
         })
@@ -346,38 +352,32 @@ class BusinessDocumentService(BaseService[BusinessDocument]):
         self,
         document_id: UUID,
         data: dict[str, Any],
-        new_file_content: bytes | None = None,
+        new_file: AsyncReadable | None = None,
         new_filename: str | None = None,
         new_content_type: str | None = None
     ) -> BusinessDocument | None:
-        """Update document metadata and optionally replace file"""
+        """
+        Update document metadata and optionally replace file
+
+        A replaced file is not deleted here: the caller releases it
+        (release_file) once the update is committed, so a rollback still
+        finds the old file.
+        """
         document = await self.get(document_id)
         if not document:
             return None
 
         # If new file provided, replace it
-        if new_file_content and new_filename and new_content_type:
+        if new_file and new_filename and new_content_type:
             # Validate new file
-            error = self.validate_file(new_filename, new_content_type, len(new_file_content))
+            error = self.validate_file(new_filename, new_content_type)
             if error:
                 raise ValueError(error)
 
-            # Check storage (subtract old file size, add new)
-            size_diff = len(new_file_content) - document.file_size
-            if size_diff > 0 and not await self.check_storage_available(size_diff):
-                raise ValueError("No hay espacio de almacenamiento disponible")
-
-            # Delete old file
-            self.delete_file(document.file_path)
-
-            # Save new file
-            file_path, file_size = await self.save_file(
-                new_file_content, new_filename, new_content_type
-            )
-
-            data["file_path"] = file_path
+            stored = await self.save_file(new_file, new_filename, document.file_size)
+            data["file_path"] = f"documents/{stored.filename}"
             data["original_filename"] = new_filename
-            data["file_size"] = file_size
+            data["file_size"] = stored.size
             data["mime_type"] = new_content_type
 
         return await self.update(document_id, data)
@@ -393,7 +393,7 @@ class BusinessDocumentService(BaseService[BusinessDocument]):
 
         if hard_delete:
             # Delete file from disk
-            self.delete_file(document.file_path)
+            await self.release_file(document.file_path, document.id)
             return await super().delete(document_id)
         else:
             # Soft delete (keep file)
@@ -2,11 +2,40 @@
 Email Service using Resend
 
 Free tier: 3,000 emails/month
+
+Transactional emails triggered while handling a sale or order are not sent
+here: request handlers render them with the build_* functions and enqueue
+them in the email outbox (app.services.email_outbox), which a background
+worker delivers. The send_* functions deliver synchronously and are used
+where the caller needs the result (verification codes, explicit "send
+receipt" actions).
 """
 import resend
 from app.core.config import settings
 
 
+def _send(params: dict, dev_note: str) -> bool:
+    """
+    Send one rendered email through Resend.
+
+    Returns True if sent successfully (or in dev mode), False otherwise.
+    """
+    if not settings.RESEND_API_KEY:
+        # Dev mode - just log
+        print(f"[DEV] {dev_note}")
+        return True
+
+    resend.api_key = settings.RESEND_API_KEY
+
+    try:
+        resend.Emails.send(params)
+        print(f"✅ Email \"{params['subject']}\" sent to {', '.join(params['to'])}")
+        return True
+    except Exception as e:
+        print(f"❌ Error sending email to {', '.join(params['to'])}: {e}")
+        return False
+
+
 def send_verification_email(email: str, code: str, name: str = "Usuario") -> bool:
     """
     Send email verification code.
@@ -162,6 +191,23 @@ def send_password_reset_email(email: str, code: str, name: str = "Usuario") -> b
         return False
 
 
+def build_order_confirmation_email(email: str, order_code: str, html_content: str) -> dict:
+    """
+    Render the order confirmation email.
+
+    Args:
+        email: Client email address
+        order_code: Order code (e.g., ENC-2026-0001)
+        html_content: Pre-generated HTML content from ReceiptService
+    """
+    return {
+        "from": settings.EMAIL_FROM,
+        "to": [email],
+        "subject": f"Confirmacion de Encargo #{order_code} - Uniformes",
+        "html": html_content
+    }
+
+
 def send_order_confirmation_email(
     email: str,
     name: str,
@@ -177,24 +223,10 @@ def send_order_confirmation_email(
         order_code: Order code (e.g., ENC-2026-0001)
         html_content: Pre-generated HTML content from ReceiptService
     """
-    if not settings.RESEND_API_KEY:
-        print(f"[DEV] Order confirmation email for {email} - Order #{order_code}")
-        return True
-
-    resend.api_key = settings.RESEND_API_KEY
-
-    try:
-        resend.Emails.send({
-            "from": settings.EMAIL_FROM,
-            "to": [email],
-            "subject": f"Confirmacion de Encargo #{order_code} - Uniformes",
-            "html": html_content
-        })
-        print(f"Order confirmation email sent to {email} for order #{order_code}")
-        return True
-    except Exception as e:
-        print(f"Error sending order confirmation email: {e}")
-        return False
+    return _send(
+        build_order_confirmation_email(email, order_code, html_content),
+        f"Order confirmation email for {email} - Order #{order_code}"
+    )
 
 
 def send_sale_confirmation_email(
@@ -212,24 +244,15 @@ def send_sale_confirmation_email(
         sale_code: Sale code (e.g., VNT-2026-0001)
         html_content: Pre-generated HTML content from ReceiptService
     """
-    if not settings.RESEND_API_KEY:
-        print(f"[DEV] Sale confirmation email for {email} - Sale #{sale_code}")
-        return True
-
-    resend.api_key = settings.RESEND_API_KEY
-
-    try:
-        resend.Emails.send({
+    return _send(
+        {
             "from": settings.EMAIL_FROM,
             "to": [email],
             "subject": f"Recibo de Venta #{sale_code} - Uniformes",
             "html": html_content
-        })
-        print(f"Sale confirmation email sent to {email} for sale #{sale_code}")
-        return True
-    except Exception as e:
-        print(f"Error sending sale confirmation email: {e}")
-        return False
+        },
+        f"Sale confirmation email for {email} - Sale #{sale_code}"
+    )
 
 
 def send_activation_email(email: str, token: str, name: str) -> bool:
@@ -308,14 +331,14 @@ def send_activation_email(email: str, token: str, name: str) -> bool:
         return False
 
 
-def send_order_ready_email(
+def build_order_ready_email(
     email: str,
     name: str,
     order_code: str,
     school_name: str = ""
-) -> bool:
+) -> dict:
     """
-    Send email to client when their order is ready for pickup.
+    Render the email sent to a client when their order is ready for pickup.
 
     Args:
         email: Client email address
@@ -323,21 +346,14 @@ def send_order_ready_email(
         order_code: Order code (e.g., ENC-2026-0001)
         school_name: School name for context (optional)
     """
-    if not settings.RESEND_API_KEY:
-        print(f"[DEV] Order ready email for {email} - Order #{order_code}")
-        return True
-
-    resend.api_key = settings.RESEND_API_KEY
-
-    try:
-        school_text = f" del colegio {school_name}" if school_name else ""
-        portal_url = "https://uniformesconsuelorios.com"
-
-        resend.Emails.send({
-            "from": settings.EMAIL_FROM,
-            "to": [email],
-            "subject": f"¡Tu pedido {order_code} está listo! - Uniformes Consuelo Rios",
-            "html": f"""
+    school_text = f" del colegio {school_name}" if school_name else ""
+    portal_url = "https://uniformesconsuelorios.com"
+
+    return {
+        "from": settings.EMAIL_FROM,
+        "to": [email],
+        "subject": f"¡Tu pedido {order_code} está listo! - Uniformes Consuelo Rios",
+        "html": f"""
                 <!DOCTYPE html>
                 <html>
                 <head>
@@ -443,18 +459,25 @@ def send_order_ready_email(
                 </body>
                 </html>
             """
-        })
-        print(f"✅ Order ready email sent to {email} for order #{order_code}")
-        return True
-    except Exception as e:
-        print(f"❌ Error sending order ready email: {e}")
-        return False
+    }
 
 
 def send_welcome_with_activation_email(email: str, token: str, name: str, transaction_type: str = "encargo") -> bool:
     """
     Send welcome email on first transaction with activation link and business info.
 
+    See build_welcome_with_activation_email.
+    """
+    return _send(
+        build_welcome_with_activation_email(email, token, name, transaction_type),
+        f"Welcome email for {name} ({email}): {settings.FRONTEND_URL}/activar-cuenta/{token}"
+    )
+
+
+def build_welcome_with_activation_email(email: str, token: str, name: str, transaction_type: str = "encargo") -> dict:
+    """
+    Render the welcome email on first transaction with activation link and business info.
+
     This is sent when a client has their first order or sale, not on registration.
     Includes:
     - Personalized welcome
@@ -468,21 +491,14 @@ def send_welcome_with_activation_email(email: str, token: str, name: str, transa
         name: Client name
         transaction_type: "encargo" or "venta" for personalized message
     """
-    if not settings.RESEND_API_KEY:
-        print(f"[DEV] Welcome email for {name} ({email}): {settings.FRONTEND_URL}/activar-cuenta/{token}")
-        return True
-
-    try:
-        resend.api_key = settings.RESEND_API_KEY
-
-        activation_link = f"{settings.FRONTEND_URL}/activar-cuenta/{token}"
-        portal_url = "https://uniformesconsuelorios.com"
-
-        params = {
-            "from": settings.EMAIL_FROM,
-            "to": [email],
-            "subject": "¡Bienvenido a Uniformes Consuelo Rios! - Tu cuenta está lista",
-            "html": f"""
+    activation_link = f"{settings.FRONTEND_URL}/activar-cuenta/{token}"
+    portal_url = "https://uniformesconsuelorios.com"
+
+    return {
+        "from": settings.EMAIL_FROM,
+        "to": [email],
+        "subject": "¡Bienvenido a Uniformes Consuelo Rios! - Tu cuenta está lista",
+        "html": f"""
                 <!DOCTYPE html>
                 <html>
                 <head>
@@ -599,12 +615,4 @@ def send_welcome_with_activation_email(email: str, token: str, name: str, transa
                 </body>
                 </html>
             """
-        }
-
-        resend.Emails.send(params)
-        print(f"✅ Welcome email with activation sent to {email}")
-        return True
-
-    except Exception as e:
-        print(f"❌ Error sending welcome email to {email}: {e}")
-        return False
+    }
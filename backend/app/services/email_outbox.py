@@ -0,0 +1,253 @@
+"""
+Email Outbox - Durable queue and background delivery of transactional emails
+
+Request handlers never talk to the email provider. They render the email
+(app.services.email build_* functions) and enqueue it in the
+`email_outbox` table within their own transaction, so it is stored only if
+the sale/order commits. EmailOutboxWorker then:
+
+- claims due emails with FOR UPDATE SKIP LOCKED (several workers can run)
+- sends them in batches (Resend batch API), at most
+  EMAIL_RATE_LIMIT_PER_SECOND provider calls per second
+- retries failures with exponential backoff, giving up after
+  EMAIL_OUTBOX_MAX_ATTEMPTS
+
+The provider is behind EmailClient, so tests and development can plug in
+a fake client instead of Resend.
+"""
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Protocol
+
+import resend
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.email_outbox import EmailOutbox, EmailStatus
+
+logger = logging.getLogger(__name__)
+
+
+class EmailClient(Protocol):
+    """Email provider used by the outbox worker (blocking calls)"""
+
+    def send_batch(self, emails: list[dict]) -> list[str | None]:
+        """Send rendered emails; returns provider ids in the same order"""
+        ...
+
+
+class ResendEmailClient:
+    """Resend SDK client (a batch is one API call)"""
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+
+    def send_batch(self, emails: list[dict]) -> list[str | None]:
+        resend.api_key = self.api_key
+        if len(emails) == 1:
+            return [resend.Emails.send(emails[0]).get("id")]
+        response = resend.Batch.send(emails)
+        return [item.get("id") for item in response["data"]]
+
+
+class ConsoleEmailClient:
+    """Development client (no RESEND_API_KEY): prints instead of sending"""
+
+    def send_batch(self, emails: list[dict]) -> list[str | None]:
+        for email in emails:
+            print(f"[DEV] Email \"{email['subject']}\" to {', '.join(email['to'])}")
+        return [None] * len(emails)
+
+
+def default_email_client() -> EmailClient:
+    """Resend when an API key is configured, console output otherwise"""
+    if settings.RESEND_API_KEY:
+        return ResendEmailClient(settings.RESEND_API_KEY)
+    return ConsoleEmailClient()
+
+
+class RateLimiter:
+    """Spaces calls so there are at most `rate_per_second` per second"""
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.interval = 1 / rate_per_second if rate_per_second > 0 else 0
+        self.clock = clock
+        self._next_at = 0.0
+
+    async def acquire(self) -> None:
+        now = self.clock()
+        if self._next_at > now:
+            await asyncio.sleep(self._next_at - now)
+            now = self._next_at
+        self._next_at = now + self.interval
+
+
+class EmailOutboxService:
+    """Enqueue emails and track their delivery"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue(self, params: dict, kind: str) -> EmailOutbox:
+        """
+        Queue a rendered email for delivery after the transaction commits.
+
+        Args:
+            params: Resend params (from, to, subject, html)
+            kind: Email kind for monitoring (e.g. "order_ready")
+
+        Returns:
+            Pending EmailOutbox row
+        """
+        email = EmailOutbox(
+            kind=kind,
+            from_email=params["from"],
+            to_email=", ".join(params["to"]),
+            subject=params["subject"],
+            html=params["html"],
+            status=EmailStatus.PENDING,
+            next_attempt_at=datetime.utcnow()
+        )
+        self.db.add(email)
+        await self.db.flush()
+        return email
+
+    async def claim_due(self, limit: int) -> list[EmailOutbox]:
+        """Lock up to `limit` due pending emails, skipping rows other workers hold"""
+        result = await self.db.execute(
+            select(EmailOutbox)
+            .where(
+                EmailOutbox.status == EmailStatus.PENDING,
+                EmailOutbox.next_attempt_at <= datetime.utcnow()
+            )
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    def mark_sent(email: EmailOutbox, provider_id: str | None) -> None:
+        email.status = EmailStatus.SENT
+        email.attempts += 1
+        email.provider_id = provider_id
+        email.sent_at = datetime.utcnow()
+        email.last_error = None
+
+    @staticmethod
+    def mark_failed(email: EmailOutbox, error: str) -> None:
+        """Schedule a retry with exponential backoff, or give up"""
+        email.attempts += 1
+        email.last_error = error[:2000]
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = EmailStatus.FAILED
+            return
+        delay = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** (email.attempts - 1)
+        email.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+
+    async def get_stats(self) -> dict:
+        """Email count per status plus the age of the oldest pending email"""
+        result = await self.db.execute(
+            select(EmailOutbox.status, func.count(), func.min(EmailOutbox.created_at))
+            .group_by(EmailOutbox.status)
+        )
+        stats = {status.value: 0 for status in EmailStatus}
+        oldest_pending = None
+        for status, count, oldest in result.all():
+            stats[status.value] = count
+            if status == EmailStatus.PENDING:
+                oldest_pending = oldest
+        stats["oldest_pending_seconds"] = (
+            int((datetime.utcnow() - oldest_pending).total_seconds())
+            if oldest_pending else None
+        )
+        return stats
+
+
+class EmailOutboxWorker:
+    """Delivers queued emails in rate-limited batches"""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        client: EmailClient | None = None,
+        batch_size: int | None = None,
+        rate_per_second: float | None = None
+    ):
+        self.session_factory = session_factory
+        self.client = client or default_email_client()
+        self.batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+        self.limiter = RateLimiter(
+            rate_per_second if rate_per_second is not None
+            else settings.EMAIL_RATE_LIMIT_PER_SECOND
+        )
+
+    async def run_once(self) -> int:
+        """
+        Deliver one batch of due emails.
+
+        Returns:
+            Number of emails processed (sent or rescheduled)
+        """
+        async with self.session_factory() as db:
+            service = EmailOutboxService(db)
+            emails = await service.claim_due(self.batch_size)
+            if not emails:
+                return 0
+
+            await self._deliver(emails)
+            await db.commit()
+            return len(emails)
+
+    async def _deliver(self, emails: list[EmailOutbox]) -> None:
+        await self.limiter.acquire()
+        try:
+            # The provider SDK blocks; keep it off the event loop
+            ids = await asyncio.to_thread(
+                self.client.send_batch, [email.params for email in emails]
+            )
+        except Exception as e:
+            if len(emails) == 1:
+                logger.warning("Email %s to %s failed: %s", emails[0].kind, emails[0].to_email, e)
+                EmailOutboxService.mark_failed(emails[0], str(e))
+                return
+            # A batch is rejected as a whole; retry one by one so a single
+            # bad address does not hold back the rest
+            for email in emails:
+                await self._deliver([email])
+            return
+
+        if len(ids) != len(emails):
+            # The call succeeded, so the batch was accepted: resending would
+            # duplicate. Record ids by position and log the rows left without one.
+            logger.warning(
+                "Provider returned %d ids for %d emails; no id for: %s",
+                len(ids), len(emails),
+                ", ".join(str(email.id) for email in emails[len(ids):]) or "-"
+            )
+            ids = [*ids[:len(emails)], *[None] * (len(emails) - len(ids))]
+
+        for email, provider_id in zip(emails, ids, strict=True):
+            EmailOutboxService.mark_sent(email, provider_id)
+
+    async def run(self, poll_seconds: float) -> None:
+        """Deliver emails until cancelled, polling when the queue is drained"""
+        while True:
+            try:
+                processed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Email outbox worker failed")
+                processed = 0
+            if processed < self.batch_size:
+                await asyncio.sleep(poll_seconds)
@@ -6,7 +6,7 @@ from decimal import Decimal
 from datetime import date
 from sqlalchemy import select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, lazyload
 
 from app.models.payroll import Employee, EmployeeBonus, BonusType
 from app.schemas.payroll import (
@@ -56,6 +56,30 @@ class EmployeeService:
         result = await db.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_payroll_employees(
+        self,
+        db: AsyncSession,
+        employee_ids: list[UUID] | None = None,
+    ) -> list[Employee]:
+        """
+        Get the active employees to include in a payroll, in one query.
+
+        Bonuses and payroll history are not loaded (see
+        get_active_bonuses_by_employee); None means all active employees.
+        """
+        stmt = (
+            select(Employee)
+            .options(lazyload(Employee.bonuses), lazyload(Employee.payroll_items))
+            .where(Employee.is_active == True)
+        )
+
+        if employee_ids is not None:
+            stmt = stmt.where(Employee.id.in_(employee_ids))
+
+        stmt = stmt.order_by(Employee.full_name)
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
     async def get_employee_by_document(
         self,
         db: AsyncSession,
@@ -239,6 +263,35 @@ class EmployeeService:
         result = await db.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_active_bonuses_by_employee(
+        self,
+        db: AsyncSession,
+        employee_ids: list[UUID],
+        target_date: date,
+    ) -> dict[UUID, list[EmployeeBonus]]:
+        """Get active bonuses on a date for many employees, keyed by employee"""
+        bonuses_by_employee: dict[UUID, list[EmployeeBonus]] = {
+            employee_id: [] for employee_id in employee_ids
+        }
+        if not employee_ids:
+            return bonuses_by_employee
+
+        stmt = select(EmployeeBonus).where(
+            and_(
+                EmployeeBonus.employee_id.in_(employee_ids),
+                EmployeeBonus.is_active == True,
+                EmployeeBonus.start_date <= target_date,
+                or_(
+                    EmployeeBonus.end_date == None,
+                    EmployeeBonus.end_date >= target_date,
+                ),
+            )
+        )
+        result = await db.execute(stmt)
+        for bonus in result.scalars().all():
+            bonuses_by_employee[bonus.employee_id].append(bonus)
+        return bonuses_by_employee
+
     async def calculate_employee_totals(
         self,
         db: AsyncSession,
@@ -256,37 +309,46 @@ class EmployeeService:
         # Get active bonuses
         bonuses = await self.get_active_bonuses_for_date(db, employee_id, target_date)
 
-        total_bonuses = sum(b.amount for b in bonuses if b.is_recurring or b.bonus_type == BonusType.ONE_TIME)
-        total_deductions = (
-            employee.health_deduction +
-            employee.pension_deduction +
-            employee.other_deductions
-        )
-
-        bonus_breakdown = [
-            {"name": b.name, "amount": float(b.amount)}
-            for b in bonuses
-            if b.is_recurring or b.bonus_type == BonusType.ONE_TIME
-        ]
-
-        deduction_breakdown = []
-        if employee.health_deduction > 0:
-            deduction_breakdown.append({"name": "Salud", "amount": float(employee.health_deduction)})
-        if employee.pension_deduction > 0:
-            deduction_breakdown.append({"name": "Pensión", "amount": float(employee.pension_deduction)})
-        if employee.other_deductions > 0:
-            deduction_breakdown.append({"name": "Otras deducciones", "amount": float(employee.other_deductions)})
-
-        net_amount = employee.base_salary + total_bonuses - total_deductions
-
-        return {
-            "base_salary": employee.base_salary,
-            "total_bonuses": total_bonuses,
-            "total_deductions": total_deductions,
-            "net_amount": net_amount,
-            "bonus_breakdown": bonus_breakdown,
-            "deduction_breakdown": deduction_breakdown,
-        }
+        return compute_employee_totals(employee, bonuses)
+
+
+def compute_employee_totals(employee: Employee, bonuses: list[EmployeeBonus]) -> dict:
+    """
+    Totals and breakdowns for one employee from already-loaded bonuses.
+
+    Shared by calculate_employee_totals and the batched payroll run.
+    """
+    total_bonuses = sum(b.amount for b in bonuses if b.is_recurring or b.bonus_type == BonusType.ONE_TIME)
+    total_deductions = (
+        employee.health_deduction +
+        employee.pension_deduction +
+        employee.other_deductions
+    )
+
+    bonus_breakdown = [
+        {"name": b.name, "amount": float(b.amount)}
+        for b in bonuses
+        if b.is_recurring or b.bonus_type == BonusType.ONE_TIME
+    ]
+
+    deduction_breakdown = []
+    if employee.health_deduction > 0:
+        deduction_breakdown.append({"name": "Salud", "amount": float(employee.health_deduction)})
+    if employee.pension_deduction > 0:
+        deduction_breakdown.append({"name": "Pensión", "amount": float(employee.pension_deduction)})
+    if employee.other_deductions > 0:
+        deduction_breakdown.append({"name": "Otras deducciones", "amount": float(employee.other_deductions)})
+
+    net_amount = employee.base_salary + total_bonuses - total_deductions
+
+    return {
+        "base_salary": employee.base_salary,
+        "total_bonuses": total_bonuses,
+        "total_deductions": total_deductions,
+        "net_amount": net_amount,
+        "bonus_breakdown": bonus_breakdown,
+        "deduction_breakdown": deduction_breakdown,
+    }
 
 
 # Create singleton instance
@@ -22,9 +22,10 @@ from app.models.accounting import (
     ExpenseAdjustment,
     AdjustmentReason,
     BalanceAccount,
-    BalanceEntry,
     AccPaymentMethod,
 )
+from app.services.balance_integration import BalanceIntegrationService
+from app.services.balance_ledger import BalanceLedgerService
 
 
 class ExpenseAdjustmentService:
@@ -79,6 +80,23 @@ class ExpenseAdjustmentService:
         )
         return result.scalar_one_or_none()
 
+    async def lock_accounts(self, *account_ids: UUID | None) -> dict[UUID, BalanceAccount]:
+        """
+        Lock active balance accounts with their exact current balance.
+
+        Pending ledger entries are folded first, so a balance can be checked
+        and moved without racing concurrent writers. Movements then go
+        through BalanceIntegrationService.apply_to_account as deltas.
+        """
+        locked = await BalanceLedgerService(self.db).lock_current(
+            [account_id for account_id in account_ids if account_id]
+        )
+        return {
+            account_id: account
+            for account_id, account in locked.items()
+            if account.is_active
+        }
+
     async def adjust_expense(
         self,
         expense_id: UUID,
@@ -167,62 +185,48 @@ class ExpenseAdjustmentService:
         new_payment_entry = None
 
         if account_changing and expense.payment_account_id:
-            # Get old and new accounts
-            old_account = await self.get_account_by_id(expense.payment_account_id)
-            new_account = await self.get_account_by_id(new_payment_account_id) if new_payment_account_id else None
+            # Lock old and new accounts together (fixed lock order)
+            accounts = await self.lock_accounts(expense.payment_account_id, new_payment_account_id)
+            old_account = accounts.get(expense.payment_account_id)
+            new_account = accounts.get(new_payment_account_id) if new_payment_account_id else None
+
+            if new_account and new_account.balance < new_amount_paid:
+                raise ValueError(
+                    f"Fondos insuficientes en {new_account.name}. "
+                    f"Disponible: ${new_account.balance:,.2f}, Requerido: ${new_amount_paid:,.2f}"
+                )
 
             if old_account:
                 # Refund to old account (add back the payment)
-                old_account.balance += expense.amount_paid
-                refund_entry = BalanceEntry(
-                    account_id=old_account.id,
-                    school_id=None,
-                    entry_date=date.today(),
-                    amount=expense.amount_paid,
-                    balance_after=old_account.balance,
-                    description=f"Ajuste gasto: devolución de {expense.description}",
+                refund_entry = await BalanceIntegrationService(self.db).apply_to_account(
+                    old_account,
+                    expense.amount_paid,
+                    f"Ajuste gasto: devolución de {expense.description}",
                     reference=f"ADJ-{expense_id}",
                     created_by=adjusted_by
                 )
-                self.db.add(refund_entry)
 
             if new_account:
                 # Deduct from new account
-                new_balance = new_account.balance - new_amount_paid
-                if new_balance < Decimal("0"):
-                    raise ValueError(
-                        f"Fondos insuficientes en {new_account.name}. "
-                        f"Disponible: ${new_account.balance:,.2f}, Requerido: ${new_amount_paid:,.2f}"
-                    )
-                new_account.balance = new_balance
-                new_payment_entry = BalanceEntry(
-                    account_id=new_account.id,
-                    school_id=None,
-                    entry_date=date.today(),
-                    amount=-new_amount_paid,
-                    balance_after=new_balance,
-                    description=f"Ajuste gasto: pago de {expense.description}",
+                new_payment_entry = await BalanceIntegrationService(self.db).apply_to_account(
+                    new_account,
+                    -new_amount_paid,
+                    f"Ajuste gasto: pago de {expense.description}",
                     reference=f"ADJ-{expense_id}",
                     created_by=adjusted_by
                 )
-                self.db.add(new_payment_entry)
 
         elif amount_changing and refund_amount > Decimal("0") and expense.payment_account_id:
             # Only amount changing with refund needed
             old_account = await self.get_account_by_id(expense.payment_account_id)
             if old_account:
-                old_account.balance += refund_amount
-                refund_entry = BalanceEntry(
-                    account_id=old_account.id,
-                    school_id=None,
-                    entry_date=date.today(),
-                    amount=refund_amount,
-                    balance_after=old_account.balance,
-                    description=f"Ajuste gasto: reembolso parcial de {expense.description}",
+                refund_entry = await BalanceIntegrationService(self.db).apply_to_account(
+                    old_account,
+                    refund_amount,
+                    f"Ajuste gasto: reembolso parcial de {expense.description}",
                     reference=f"ADJ-{expense_id}",
                     created_by=adjusted_by
                 )
-                self.db.add(refund_entry)
 
         await self.db.flush()
 
@@ -312,18 +316,13 @@ class ExpenseAdjustmentService:
             account = await self.get_account_by_id(expense.payment_account_id)
             if account:
                 # Add back the full payment
-                account.balance += expense.amount_paid
-                refund_entry = BalanceEntry(
-                    account_id=account.id,
-                    school_id=None,
-                    entry_date=date.today(),
-                    amount=expense.amount_paid,
-                    balance_after=account.balance,
-                    description=f"Reversión de gasto: {expense.description}",
+                refund_entry = await BalanceIntegrationService(self.db).apply_to_account(
+                    account,
+                    expense.amount_paid,
+                    f"Reversión de gasto: {expense.description}",
                     reference=f"REV-{expense_id}",
                     created_by=adjusted_by
                 )
-                self.db.add(refund_entry)
 
         await self.db.flush()
 
@@ -482,18 +481,13 @@ class ExpenseAdjustmentService:
         if expense.payment_account_id:
             account = await self.get_account_by_id(expense.payment_account_id)
             if account:
-                account.balance += refund_amount
-                refund_entry = BalanceEntry(
-                    account_id=account.id,
-                    school_id=None,
-                    entry_date=date.today(),
-                    amount=refund_amount,
-                    balance_after=account.balance,
-                    description=f"Reembolso parcial de gasto: {expense.description}",
+                refund_entry = await BalanceIntegrationService(self.db).apply_to_account(
+                    account,
+                    refund_amount,
+                    f"Reembolso parcial de gasto: {expense.description}",
                     reference=f"REF-{expense_id}",
                     created_by=adjusted_by
                 )
-                self.db.add(refund_entry)
 
         await self.db.flush()
 
@@ -3,10 +3,12 @@ Global Product Service - Handles shared products across all schools
 """
 from uuid import UUID
 from decimal import Decimal
-from sqlalchemy import select, func
+from datetime import datetime
+from sqlalchemy import select, update, case
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import cache
 from app.models.product import GlobalGarmentType, GlobalGarmentTypeImage, GlobalProduct, GlobalInventory
 from app.schemas.product import (
     GlobalGarmentTypeCreate, GlobalGarmentTypeUpdate,
@@ -15,6 +17,7 @@ from app.schemas.product import (
     GlobalInventoryCreate, GlobalInventoryUpdate, GlobalInventoryAdjust,
     GlobalProductWithInventory
 )
+from app.services.sequence import DocumentSequenceService
 
 
 class GlobalGarmentTypeService:
@@ -34,6 +37,7 @@ class GlobalGarmentTypeService:
         self.db.add(garment_type)
         await self.db.flush()
         await self.db.refresh(garment_type)
+        cache.invalidate_after_commit(self.db, "global_products")
         return garment_type
 
     async def get(self, garment_type_id: UUID) -> GlobalGarmentType | None:
@@ -73,6 +77,7 @@ class GlobalGarmentTypeService:
 
         await self.db.flush()
         await self.db.refresh(garment_type)
+        cache.invalidate_after_commit(self.db, "global_products")
         return garment_type
 
 
@@ -85,17 +90,14 @@ class GlobalProductService:
     async def _generate_code(self, garment_type_name: str) -> str:
         """Generate unique product code: GLB-XXX-NNN"""
         # Get prefix from garment type (first 3 letters)
-        prefix = garment_type_name[:3].upper()
+        prefix = f"GLB-{garment_type_name[:3].upper()}-"
 
-        # Count existing products with this prefix
-        result = await self.db.execute(
-            select(func.count(GlobalProduct.id)).where(
-                GlobalProduct.code.like(f"GLB-{prefix}-%")
-            )
+        sequences = DocumentSequenceService(self.db)
+        return await sequences.next_code(
+            prefix,
+            3,
+            seed=lambda: sequences.max_code_number(GlobalProduct.code, prefix)
         )
-        count = result.scalar() or 0
-
-        return f"GLB-{prefix}-{count + 1:03d}"
 
     async def create(self, data: GlobalProductCreate) -> GlobalProduct:
         """Create a new global product"""
@@ -131,6 +133,7 @@ class GlobalProductService:
         )
         self.db.add(inventory)
         await self.db.flush()
+        cache.invalidate_after_commit(self.db, "global_products")
 
         return product
 
@@ -187,16 +190,15 @@ class GlobalProductService:
         for p in products:
             # Get images from garment type if available
             images = []
-            primary_image_url = None
+            primary_image = None
             if with_images and p.garment_type and p.garment_type.images:
                 sorted_images = sorted(p.garment_type.images, key=lambda x: x.display_order)
                 images = [GlobalGarmentTypeImageResponse.model_validate(img) for img in sorted_images]
                 # Find primary image
-                primary = next((img for img in sorted_images if img.is_primary), None)
-                if primary:
-                    primary_image_url = primary.image_url
-                elif sorted_images:
-                    primary_image_url = sorted_images[0].image_url
+                primary_image = next(
+                    (img for img in images if img.is_primary),
+                    images[0] if images else None
+                )
 
             responses.append(GlobalProductWithInventory(
                 id=p.id,
@@ -216,7 +218,8 @@ class GlobalProductService:
                 inventory_quantity=p.inventory.quantity if p.inventory else 0,
                 inventory_min_stock=p.inventory.min_stock_alert if p.inventory else 5,
                 garment_type_images=images,
-                garment_type_primary_image_url=primary_image_url
+                garment_type_primary_image_url=primary_image.image_url if primary_image else None,
+                garment_type_primary_image_variants=primary_image.variants if primary_image else None
             ))
 
         return responses
@@ -250,6 +253,7 @@ class GlobalProductService:
 
         await self.db.flush()
         await self.db.refresh(product)
+        cache.invalidate_after_commit(self.db, "global_products")
         return product
 
     async def search(self, query: str, limit: int = 20) -> list[GlobalProduct]:
@@ -305,6 +309,61 @@ class GlobalInventoryService:
         )
         return result.scalar_one_or_none()
 
+    async def get_by_products(
+        self, product_ids: list[UUID]
+    ) -> dict[UUID, GlobalInventory]:
+        """Get inventories for several global products in a single query"""
+        if not product_ids:
+            return {}
+
+        result = await self.db.execute(
+            select(GlobalInventory).where(GlobalInventory.product_id.in_(product_ids))
+        )
+        return {inv.product_id: inv for inv in result.scalars().all()}
+
+    async def bulk_remove_stock(
+        self, quantities: dict[UUID, int]
+    ) -> list[GlobalInventory]:
+        """
+        Decrement stock for several global products with a single UPDATE
+
+        Rows without enough stock are not matched, so the batch fails as a
+        whole if any product ran out after validation.
+
+        Raises:
+            ValueError: If any product has no inventory or insufficient stock
+        """
+        if not quantities:
+            return []
+
+        if any(qty <= 0 for qty in quantities.values()):
+            raise ValueError("Quantity must be positive")
+
+        requested = case(quantities, value=GlobalInventory.product_id)
+        result = await self.db.execute(
+            update(GlobalInventory)
+            .where(
+                GlobalInventory.product_id.in_(list(quantities.keys())),
+                GlobalInventory.quantity >= requested
+            )
+            .values(
+                quantity=GlobalInventory.quantity - requested,
+                last_updated=datetime.utcnow()
+            )
+            .returning(GlobalInventory)
+            .execution_options(synchronize_session="fetch")
+        )
+        updated = list(result.scalars().all())
+
+        if len(updated) != len(quantities):
+            missing = set(quantities) - {inv.product_id for inv in updated}
+            raise ValueError(
+                f"Insufficient stock for global products: "
+                f"{', '.join(str(pid) for pid in missing)}"
+            )
+
+        return updated
+
     async def update(
         self, product_id: UUID, data: GlobalInventoryUpdate
     ) -> GlobalInventory | None:
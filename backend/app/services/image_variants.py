@@ -0,0 +1,136 @@
+"""
+Image Variants - Resized WebP/JPEG derivatives of catalog images
+
+Garment type images are uploaded at full resolution (up to 2MB). For
+each one we store smaller copies next to the original, one per width in
+VARIANT_WIDTHS and format (WebP plus JPEG as fallback):
+
+    img.png -> img_w320.webp, img_w320.jpg, img_w800.webp, img_w800.jpg
+
+Resizing is CPU-bound, so it runs in a process pool (IMAGE_VARIANT_WORKERS;
+0 runs it in a thread instead). The variant list is stored on the image
+row and returned in product listings so clients can build a srcset.
+Widths larger than the original are skipped (no upscaling), except the
+smallest, which is always generated at the original width and named and
+recorded by that width (a 200px image gives img_w200.*).
+
+scripts/backfill_image_variants.py generates variants for images that
+were uploaded before this existed.
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+VARIANT_WIDTHS = (320, 800)
+VARIANT_FORMATS = {"webp": ".webp", "jpeg": ".jpg"}
+VARIANT_QUALITY = 80
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def variant_filename(original_name: str, width: int, fmt: str) -> str:
+    stem = original_name.rsplit(".", 1)[0]
+    return f"{stem}_w{width}{VARIANT_FORMATS[fmt]}"
+
+
+def _save_atomic(image, path: Path, fmt: str) -> None:
+    temp_path = path.with_name(f".{path.name}.part")
+    image.save(temp_path, format=fmt.upper(), quality=VARIANT_QUALITY, optimize=True)
+    os.replace(temp_path, path)
+
+
+def _generate(original_path: str) -> list[tuple[int, str, str]]:
+    """
+    Write the variants of one image (runs in a worker process).
+
+    Returns:
+        (width, format, filename) of each variant
+    """
+    from PIL import Image, ImageOps
+
+    original = Path(original_path)
+    created = []
+    with Image.open(original) as source:
+        image = ImageOps.exif_transpose(source)
+        # JPEG has no alpha: flatten transparent images on white
+        if image.mode in ("RGBA", "LA", "P"):
+            rgba = image.convert("RGBA")
+            flat = Image.new("RGB", rgba.size, (255, 255, 255))
+            flat.paste(rgba, mask=rgba.getchannel("A"))
+            image = flat
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+
+        for width in VARIANT_WIDTHS:
+            if width > image.width and width != VARIANT_WIDTHS[0]:
+                continue
+            target_width = min(width, image.width)
+            height = max(1, round(image.height * target_width / image.width))
+            resized = image.resize((target_width, height), Image.Resampling.LANCZOS)
+            for fmt in VARIANT_FORMATS:
+                filename = variant_filename(original.name, target_width, fmt)
+                _save_atomic(resized, original.with_name(filename), fmt)
+                created.append((target_width, fmt, filename))
+    return created
+
+
+def _executor() -> Executor | None:
+    global _pool
+    if settings.IMAGE_VARIANT_WORKERS <= 0:
+        return None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.IMAGE_VARIANT_WORKERS)
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the worker processes (application shutdown)"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def generate_variants(original_path: Path, image_url: str) -> list[dict] | None:
+    """
+    Create the resized variants of an uploaded image.
+
+    Args:
+        original_path: Stored original on disk
+        image_url: Public URL of the original (variants share its folder)
+
+    Returns:
+        [{"width", "format", "url"}, ...], or None if the file could not
+        be read as an image (the original is still served)
+    """
+    executor = _executor()
+    try:
+        if executor is None:
+            created = await asyncio.to_thread(_generate, str(original_path))
+        else:
+            loop = asyncio.get_running_loop()
+            created = await loop.run_in_executor(executor, _generate, str(original_path))
+    except Exception as e:
+        logger.warning("Could not create variants for %s: %s", image_url, e)
+        return None
+
+    base_url = image_url.rsplit("/", 1)[0]
+    return [
+        {"width": width, "format": fmt, "url": f"{base_url}/{filename}"}
+        for width, fmt, filename in created
+    ]
+
+
+async def remove_variants(base_dir: Path, variants: list[dict] | None) -> None:
+    """Delete the variant files of an image"""
+    def _remove() -> None:
+        for variant in variants or []:
+            (base_dir / variant["url"].removeprefix("/uploads/")).unlink(missing_ok=True)
+
+    await asyncio.to_thread(_remove)
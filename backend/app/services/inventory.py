@@ -3,7 +3,8 @@ Inventory Service
 """
 from uuid import UUID
 from decimal import Decimal
-from sqlalchemy import select, func, and_
+from datetime import datetime
+from sqlalchemy import select, update, func, and_, case
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
@@ -103,6 +104,100 @@ class InventoryService(SchoolIsolatedService[Inventory]):
         )
         return result.scalar_one_or_none()
 
+    async def get_by_products(
+        self,
+        product_ids: list[UUID],
+        school_id: UUID
+    ) -> dict[UUID, Inventory]:
+        """
+        Get inventories for several products in a single query
+
+        Args:
+            product_ids: Product UUIDs
+            school_id: School UUID
+
+        Returns:
+            Dict mapping product_id to its Inventory (missing products are absent)
+        """
+        if not product_ids:
+            return {}
+
+        result = await self.db.execute(
+            select(Inventory).where(
+                Inventory.product_id.in_(product_ids),
+                Inventory.school_id == school_id
+            )
+        )
+        return {inv.product_id: inv for inv in result.scalars().all()}
+
+    async def bulk_remove_stock(
+        self,
+        quantities: dict[UUID, int],
+        school_id: UUID
+    ) -> list[Inventory]:
+        """
+        Decrement stock for several products with a single UPDATE
+
+        The UPDATE only matches rows that still have enough stock, so a
+        concurrent sale that consumed the stock after validation makes the
+        whole batch fail instead of driving inventory negative.
+
+        Args:
+            quantities: Dict mapping product_id to quantity to remove (positive)
+            school_id: School UUID
+
+        Returns:
+            Updated inventories
+
+        Raises:
+            ValueError: If any product has no inventory or insufficient stock
+        """
+        if not quantities:
+            return []
+
+        if any(qty <= 0 for qty in quantities.values()):
+            raise ValueError("Quantity must be positive")
+
+        requested = case(quantities, value=Inventory.product_id)
+        result = await self.db.execute(
+            update(Inventory)
+            .where(
+                Inventory.school_id == school_id,
+                Inventory.product_id.in_(list(quantities.keys())),
+                Inventory.quantity >= requested
+            )
+            .values(
+                quantity=Inventory.quantity - requested,
+                last_updated=datetime.utcnow()
+            )
+            .returning(Inventory)
+            .execution_options(synchronize_session="fetch")
+        )
+        updated = list(result.scalars().all())
+
+        if len(updated) != len(quantities):
+            missing = set(quantities) - {inv.product_id for inv in updated}
+            raise ValueError(
+                f"Insufficient inventory for products: "
+                f"{', '.join(str(pid) for pid in missing)}"
+            )
+
+        # === LOW STOCK NOTIFICATION ===
+        for inventory in updated:
+            old_quantity = inventory.quantity + quantities[inventory.product_id]
+            if (
+                inventory.quantity < inventory.min_stock_alert
+                and old_quantity >= inventory.min_stock_alert
+            ):
+                await self._notify_low_stock(
+                    inventory.product_id,
+                    school_id,
+                    inventory.quantity,
+                    inventory.min_stock_alert
+                )
+
+        return updated
+
     async def adjust_quantity(
         self,
         product_id: UUID,
@@ -3,17 +3,62 @@ Notification Service
 
 Handles creation, retrieval, and management of notifications.
 Provides methods to create notifications triggered by business events.
+
+Unread counts come from NotificationCounter rows (one per visibility
+bucket), updated in the same transaction as the notifications;
+reconcile_unread_counters rebuilds them from the notifications table.
 """
+import asyncio
+import logging
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import select, func, update, or_, and_
+from sqlalchemy import select, func, update, delete, or_, and_, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.notification import Notification, NotificationType, ReferenceType
+from app.db.session import AsyncSessionLocal
+from app.models.notification import (
+    Notification,
+    NotificationCounter,
+    NotificationType,
+    ReferenceType,
+)
 from app.models.order import Order
 from app.models.sale import Sale
-from app.schemas.notification import NotificationCreate
+from app.schemas.notification import NotificationCreate, NotificationResponse
+from app.services.notification_stream import NotificationEvent, publish_after_commit
+
+logger = logging.getLogger(__name__)
+
+
+def _access_conditions(
+    model: type[Notification] | type[NotificationCounter],
+    user_id: UUID,
+    school_ids: list[UUID],
+    is_superuser: bool
+):
+    """
+    Rows of `model` (notifications or counters) visible to a user.
+
+    Visible if:
+    - They are specifically for this user (user_id matches), OR
+    - They are broadcast (user_id is None)
+    AND:
+    - They belong to a school the user has access to, OR
+    - They are global (school_id is None)
+    """
+    user_condition = or_(model.user_id == user_id, model.user_id.is_(None))
+
+    if is_superuser:
+        # Superusers see all notifications
+        return user_condition
+    if school_ids:
+        school_condition = or_(model.school_id.in_(school_ids), model.school_id.is_(None))
+    else:
+        # No school access, only see global notifications
+        school_condition = model.school_id.is_(None)
+    return and_(user_condition, school_condition)
 
 
 class NotificationService:
@@ -23,7 +68,7 @@ class NotificationService:
         self.db = db
 
     async def create(self, notification_data: NotificationCreate) -> Notification:
-        """Create a new notification"""
+        """Create a new notification (pushed to open streams on commit)"""
         notification = Notification(
             user_id=notification_data.user_id,
             type=notification_data.type,
@@ -36,6 +81,32 @@ class NotificationService:
         self.db.add(notification)
         await self.db.flush()
         await self.db.refresh(notification)
+
+        counter = insert(NotificationCounter).values(
+            scope_key=NotificationCounter.key_for(notification.user_id, notification.school_id),
+            user_id=notification.user_id,
+            school_id=notification.school_id,
+            unread_count=1,
+            last_notification_at=notification.created_at
+        )
+        await self.db.execute(counter.on_conflict_do_update(
+            index_elements=[NotificationCounter.scope_key],
+            set_={
+                "unread_count": NotificationCounter.unread_count + 1,
+                "last_notification_at": func.greatest(
+                    NotificationCounter.last_notification_at,
+                    counter.excluded.last_notification_at
+                )
+            }
+        ))
+
+        publish_after_commit(self.db, [NotificationEvent(
+            kind="created",
+            notification_id=notification.id,
+            user_id=notification.user_id,
+            school_id=notification.school_id,
+            data=NotificationResponse.model_validate(notification).model_dump(mode="json")
+        )])
         return notification
 
     async def get_for_user(
@@ -50,50 +121,19 @@ class NotificationService:
         """
         Get notifications for a user.
 
-        Notifications are visible if:
-        - They are specifically for this user (user_id matches), OR
-        - They are broadcast (user_id is None)
-        AND:
-        - They belong to a school the user has access to, OR
-        - They are global (school_id is None)
+        Notifications are visible per _access_conditions.
 
         Returns:
             Tuple of (notifications, total_count, unread_count)
         """
-        # Build base conditions for user access
-        user_condition = or_(
-            Notification.user_id == user_id,
-            Notification.user_id.is_(None)
-        )
-
-        # Build school access conditions
-        if is_superuser:
-            # Superusers see all notifications
-            school_condition = True
-        elif school_ids:
-            school_condition = or_(
-                Notification.school_id.in_(school_ids),
-                Notification.school_id.is_(None)
-            )
-        else:
-            # No school access, only see global notifications
-            school_condition = Notification.school_id.is_(None)
-
-        # Combine conditions
-        base_conditions = and_(user_condition, school_condition)
+        base_conditions = _access_conditions(Notification, user_id, school_ids, is_superuser)
 
         # Count total matching notifications
         count_query = select(func.count(Notification.id)).where(base_conditions)
         total_result = await self.db.execute(count_query)
         total = total_result.scalar() or 0
 
-        # Count unread notifications
-        unread_query = select(func.count(Notification.id)).where(
-            base_conditions,
-            Notification.is_read == False
-        )
-        unread_result = await self.db.execute(unread_query)
-        unread_count = unread_result.scalar() or 0
+        unread_count, _ = await self.get_unread_count(user_id, school_ids, is_superuser)
 
         # Build main query
         query = select(Notification).where(base_conditions)
@@ -119,40 +159,39 @@ class NotificationService:
         """
         Get unread count and last notification timestamp.
 
-        Optimized for frequent polling - only counts, no full data fetch.
+        Optimized for frequent polling - sums the few counter rows the
+        user can see instead of counting notifications.
         """
-        # Build access conditions
-        user_condition = or_(
-            Notification.user_id == user_id,
-            Notification.user_id.is_(None)
-        )
-
-        if is_superuser:
-            school_condition = True
-        elif school_ids:
-            school_condition = or_(
-                Notification.school_id.in_(school_ids),
-                Notification.school_id.is_(None)
+        result = await self.db.execute(
+            select(
+                func.coalesce(func.sum(NotificationCounter.unread_count), 0),
+                func.max(NotificationCounter.last_notification_at)
+            ).where(
+                _access_conditions(NotificationCounter, user_id, school_ids, is_superuser)
             )
-        else:
-            school_condition = Notification.school_id.is_(None)
-
-        base_conditions = and_(user_condition, school_condition)
-
-        # Count unread
-        count_query = select(func.count(Notification.id)).where(
-            base_conditions,
-            Notification.is_read == False
         )
-        count_result = await self.db.execute(count_query)
-        count = count_result.scalar() or 0
+        count, last_at = result.one()
+        return int(count), last_at
 
-        # Get latest notification timestamp (for detecting new notifications)
-        latest_query = select(func.max(Notification.created_at)).where(base_conditions)
-        latest_result = await self.db.execute(latest_query)
-        last_at = latest_result.scalar()
+    async def get_unread_ids(
+        self,
+        user_id: UUID,
+        school_ids: list[UUID],
+        is_superuser: bool = False
+    ) -> set[UUID]:
+        """
+        Ids of the unread notifications a user can see.
 
-        return count, last_at
+        Used by the notification stream, which tracks ids so an event that
+        races this query is not counted twice.
+        """
+        result = await self.db.execute(
+            select(Notification.id).where(
+                Notification.is_read.is_(False),
+                _access_conditions(Notification, user_id, school_ids, is_superuser)
+            )
+        )
+        return set(result.scalars().all())
 
     async def mark_as_read(
         self,
@@ -164,7 +203,9 @@ class NotificationService:
         """
         Mark notifications as read.
 
-        Only marks notifications the user has access to.
+        Only marks notifications the user has access to and decrements
+        their unread counters. Open streams receive a `read` event per
+        notification on commit.
 
         Args:
             notification_ids: List of IDs to mark, or None to mark all unread
@@ -175,43 +216,107 @@ class NotificationService:
         Returns:
             Number of notifications marked as read
         """
-        # Build access conditions
-        user_condition = or_(
-            Notification.user_id == user_id,
-            Notification.user_id.is_(None)
-        )
-
-        if is_superuser:
-            school_condition = True
-        elif school_ids:
-            school_condition = or_(
-                Notification.school_id.in_(school_ids),
-                Notification.school_id.is_(None)
-            )
-        else:
-            school_condition = Notification.school_id.is_(None)
-
-        # Build update conditions
         conditions = [
-            user_condition,
-            school_condition,
+            _access_conditions(Notification, user_id, school_ids, is_superuser),
             Notification.is_read == False
         ]
 
         if notification_ids:
             conditions.append(Notification.id.in_(notification_ids))
 
-        # Update
+        # Update, returning the affected rows so open streams can follow
         stmt = (
             update(Notification)
             .where(*conditions)
             .values(is_read=True, read_at=datetime.utcnow())
+            .returning(Notification.id, Notification.user_id, Notification.school_id)
         )
 
         result = await self.db.execute(stmt)
+        marked = result.all()
+
+        read_per_bucket: dict[str, int] = {}
+        for row in marked:
+            key = NotificationCounter.key_for(row.user_id, row.school_id)
+            read_per_bucket[key] = read_per_bucket.get(key, 0) + 1
+        # Same key order in every transaction, so concurrent calls cannot deadlock
+        for key in sorted(read_per_bucket):
+            await self.db.execute(
+                update(NotificationCounter)
+                .where(NotificationCounter.scope_key == key)
+                .values(unread_count=func.greatest(
+                    NotificationCounter.unread_count - read_per_bucket[key], 0
+                ))
+            )
         await self.db.flush()
 
-        return result.rowcount
+        publish_after_commit(self.db, [
+            NotificationEvent(
+                kind="read",
+                notification_id=row.id,
+                user_id=row.user_id,
+                school_id=row.school_id
+            )
+            for row in marked
+        ])
+        return len(marked)
+
+    async def reconcile_unread_counters(self) -> int:
+        """
+        Rebuild the unread counters from the notifications table.
+
+        Fixes drift from notifications removed by cascades or written
+        outside this service. Blocks counter updates (not reads) while it
+        runs, so no concurrent create/mark_as_read is lost.
+
+        Returns:
+            Number of counter rows corrected, added or removed
+        """
+        await self.db.execute(text("LOCK TABLE notification_counters IN EXCLUSIVE MODE"))
+
+        actual_result = await self.db.execute(
+            select(
+                Notification.user_id,
+                Notification.school_id,
+                func.count().filter(Notification.is_read == False),
+                func.max(Notification.created_at)
+            ).group_by(Notification.user_id, Notification.school_id)
+        )
+        actual = {
+            NotificationCounter.key_for(user_id, school_id): (user_id, school_id, unread, last_at)
+            for user_id, school_id, unread, last_at in actual_result.all()
+        }
+        stored = {
+            counter.scope_key: counter
+            for counter in (await self.db.execute(select(NotificationCounter))).scalars()
+        }
+
+        corrected = 0
+        for key, (user_id, school_id, unread, last_at) in actual.items():
+            counter = stored.get(key)
+            if counter is None:
+                self.db.add(NotificationCounter(
+                    scope_key=key,
+                    user_id=user_id,
+                    school_id=school_id,
+                    unread_count=unread,
+                    last_notification_at=last_at
+                ))
+                corrected += 1
+            elif (counter.unread_count, counter.last_notification_at) != (unread, last_at):
+                counter.unread_count = unread
+                counter.last_notification_at = last_at
+                corrected += 1
+
+        orphaned = [key for key in stored if key not in actual]
+        if orphaned:
+            await self.db.execute(
+                delete(NotificationCounter).where(NotificationCounter.scope_key.in_(orphaned))
+            )
+            corrected += len(orphaned)
+
+        await self.db.flush()
+        return corrected
 
     # ==========================================
     # Notification Triggers (Business Events)
@@ -318,3 +423,47 @@ class NotificationService:
             user_id=None  # Broadcast
         )
         return await self.create(notification_data)
+
+    async def notify_accounts_overdue(
+        self,
+        notification_type: NotificationType,
+        school_id: UUID | None,
+        count: int,
+        pending_total: Decimal
+    ) -> Notification:
+        """Create one notification for receivables/payables that just became overdue"""
+        kind = "cobrar" if notification_type == NotificationType.RECEIVABLES_OVERDUE else "pagar"
+        if count == 1:
+            title = f"1 cuenta por {kind} vencida"
+        else:
+            title = f"{count} cuentas por {kind} vencidas"
+
+        notification_data = NotificationCreate(
+            type=notification_type,
+            title=title,
+            message=f"Saldo pendiente: ${pending_total:,.0f}",
+            school_id=school_id,
+            user_id=None  # Broadcast
+        )
+        return await self.create(notification_data)
+
+
+async def run_counter_reconcile_loop(interval_seconds: int) -> None:
+    """
+    Reconcile the unread counters every `interval_seconds` until cancelled.
+
+    Started from the application lifespan. Errors are logged and retried
+    on the next tick.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with AsyncSessionLocal() as db:
+                corrected = await NotificationService(db).reconcile_unread_counters()
+                await db.commit()
+            if corrected:
+                logger.warning("Notification counters: %s buckets corrected", corrected)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Notification counter reconciliation failed")
@@ -0,0 +1,181 @@
+"""
+Notification Stream - In-process pub/sub for pushed notifications
+
+Admin clients used to poll /notifications/unread-count. Instead they can
+keep one Server-Sent Events connection open (GET /notifications/stream):
+
+- NotificationService queues an event when a notification is created or
+  marked as read (publish_after_commit); it is published to the broker
+  only when the session commits, and dropped on rollback.
+- Each stream subscribes with its user's scope (user id, schools,
+  superuser) and receives the events it can see. On connect it loads the
+  ids of the user's unread notifications and sends their count, then
+  keeps that set up to date from the events, so an open stream costs no
+  queries. Keeping ids rather than a count makes events that race the
+  initial query harmless: a notification committed between subscribing
+  and loading is already in the set and is not counted twice.
+
+The broker lives in the API process (the API runs as a single uvicorn
+process). A subscriber that falls too far behind gets a `resync` event
+and the stream ends; the client reconnects and starts from a fresh count.
+"""
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+_PENDING_KEY = "notification_events"
+
+
+@dataclass(frozen=True)
+class NotificationEvent:
+    """A notification that was created or marked as read"""
+    kind: str  # "created" | "read"
+    notification_id: UUID
+    user_id: UUID | None
+    school_id: UUID | None
+    data: dict | None = None  # NotificationResponse (JSON) for "created"
+
+
+@dataclass(frozen=True)
+class NotificationScope:
+    """Which notifications a user sees (same rules as NotificationService)"""
+    user_id: UUID
+    school_ids: frozenset[UUID]
+    is_superuser: bool = False
+
+    def can_see(self, event: NotificationEvent) -> bool:
+        if event.user_id is not None and event.user_id != self.user_id:
+            return False
+        return (
+            self.is_superuser
+            or event.school_id is None
+            or event.school_id in self.school_ids
+        )
+
+
+@dataclass(eq=False)
+class Subscription:
+    """One open stream: its scope and pending event batches"""
+    broker: "NotificationBroker"
+    scope: NotificationScope
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(
+        maxsize=settings.NOTIFICATION_STREAM_QUEUE_SIZE
+    ))
+    overflowed: bool = False
+
+
+class NotificationBroker:
+    """Fan-out of committed notification events to open streams"""
+
+    def __init__(self):
+        self._subscriptions: set[Subscription] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, scope: NotificationScope) -> Subscription:
+        subscription = Subscription(self, scope)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def publish(self, events: list[NotificationEvent]) -> None:
+        """Deliver one committed batch to every subscriber that can see part of it"""
+        for subscription in self._subscriptions:
+            if subscription.overflowed:
+                continue
+            visible = [e for e in events if subscription.scope.can_see(e)]
+            if not visible:
+                continue
+            try:
+                subscription.queue.put_nowait(visible)
+            except asyncio.QueueFull:
+                # Too far behind: drop its backlog and leave only an empty
+                # batch so the stream wakes up and asks for a resync
+                subscription.overflowed = True
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait([])
+
+
+broker = NotificationBroker()
+
+
+def publish_after_commit(db: AsyncSession, events: list[NotificationEvent]) -> None:
+    """Publish events to the broker once the session's transaction commits"""
+    db.info.setdefault(_PENDING_KEY, []).extend(events)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    events = session.info.pop(_PENDING_KEY, None)
+    if events:
+        broker.publish(events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def format_sse(event_name: str, data: dict) -> str:
+    """Server-Sent Events frame"""
+    return f"event: {event_name}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def notification_event_stream(
+    subscription: Subscription,
+    unread_ids: set[UUID],
+    heartbeat_seconds: float | None = None
+) -> AsyncIterator[str]:
+    """
+    SSE frames for one subscriber until it disconnects.
+
+    Args:
+        subscription: Broker subscription (unsubscribed when the stream ends)
+        unread_ids: Unread notifications loaded after subscribing; may
+            already include notifications whose events are queued
+        heartbeat_seconds: Idle time before a keep-alive comment
+
+    Yields:
+        `unread_count`, `notification`, `read` and `resync` events
+    """
+    if heartbeat_seconds is None:
+        heartbeat_seconds = settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS
+    unread_ids = set(unread_ids)
+    try:
+        yield format_sse("unread_count", {"unread_count": len(unread_ids)})
+        while True:
+            try:
+                events = await asyncio.wait_for(subscription.queue.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            if subscription.overflowed:
+                yield format_sse("resync", {})
+                return
+
+            for item in events:
+                if item.kind == "created":
+                    unread_ids.add(item.notification_id)
+                    yield format_sse("notification", {**item.data, "unread_count": len(unread_ids)})
+                else:
+                    unread_ids.discard(item.notification_id)
+                    yield format_sse("read", {
+                        "id": str(item.notification_id),
+                        "unread_count": len(unread_ids)
+                    })
+    finally:
+        subscription.broker.unsubscribe(subscription)
@@ -21,7 +21,11 @@ from app.models.client import Client
 from app.schemas.order import OrderCreate, OrderUpdate, OrderPayment
 from app.schemas.accounting import AccountsReceivableCreate
 from app.services.base import SchoolIsolatedService
-from app.services.email import send_welcome_with_activation_email
+from app.services.sequence import DocumentSequenceService
+from app.services.product_demand import ProductDemandService
+from app.services.stock_matching import ProductStockIndex
+from app.services.email import build_welcome_with_activation_email
+from app.services.email_outbox import EmailOutboxService
 import secrets
 
 # Required measurements for yomber orders
@@ -837,55 +841,19 @@ class OrderService(SchoolIsolatedService[Order]):
         return order
 
     async def _generate_order_code(self, school_id: UUID) -> str:
-        """
-        Generate unique order code: ENC-YYYY-NNNN
-
-        Uses MAX() + 1 strategy with retry logic to handle race conditions.
-        If duplicate is detected, retries with incremented sequence.
-        """
+        """Generate unique order code: ENC-YYYY-NNNN"""
         year = datetime.now().year
         prefix = f"ENC-{year}-"
 
-        # Get highest existing sequence number for this year
-        max_code_result = await self.db.execute(
-            select(func.max(Order.code)).where(
-                Order.school_id == school_id,
-                Order.code.like(f"{prefix}%")
+        sequences = DocumentSequenceService(self.db)
+        return await sequences.next_code(
+            prefix,
+            4,
+            school_id=school_id,
+            seed=lambda: sequences.max_code_number(
+                Order.code, prefix, Order.school_id == school_id
             )
         )
-        max_code = max_code_result.scalar_one_or_none()
-
-        if max_code:
-            # Extract sequence number from code (e.g., "ENC-2025-0003" -> 3)
-            try:
-                sequence = int(max_code.split('-')[-1]) + 1
-            except (ValueError, IndexError):
-                sequence = 1
-        else:
-            sequence = 1
-
-        # Try up to 10 times to find an unused code
-        for attempt in range(10):
-            code = f"{prefix}{sequence:04d}"
-
-            # Check if this code already exists
-            existing = await self.db.execute(
-                select(func.count(Order.id)).where(
-                    Order.school_id == school_id,
-                    Order.code == code
-                )
-            )
-
-            if existing.scalar_one() == 0:
-                return code
-
-            # Code exists, try next sequence number
-            sequence += 1
-
-        # Fallback: use timestamp-based suffix if all retries fail
-        from time import time
-        timestamp_suffix = int(time() * 1000) % 10000
-        return f"{prefix}{timestamp_suffix:04d}"
 
     async def update_item_status(
         self,
@@ -1050,29 +1018,37 @@ class OrderService(SchoolIsolatedService[Order]):
         Returns:
             Dictionary with stock verification results
         """
-        from app.models.product import Product, Inventory
-
         order = await self.get_order_with_items(order_id, school_id)
         if not order:
             raise ValueError("Pedido no encontrado")
 
-        # First, load all products with their stock for this school
-        all_products_query = (
-            select(Product, Inventory.quantity)
-            .outerjoin(Inventory, Product.id == Inventory.product_id)
-            .where(
-                Product.school_id == school_id,
-                Product.is_active == True
-            )
+        return await self._verify_stock_for_order(order, school_id)
+
+    async def _verify_stock_for_order(
+        self,
+        order: Order,
+        school_id: UUID
+    ) -> dict:
+        """Stock verification for an order already loaded with its items"""
+        garment_type_ids = list({item.garment_type_id for item in order.items})
+
+        # Only products of the garment types in this order, indexed by
+        # (garment_type, size, color). The index tracks "virtual" stock
+        # as we assign items
+        stock_index = await ProductStockIndex.load(self.db, school_id, garment_type_ids)
+
+        # Demand for the same variants from other pending orders (one query)
+        other_demand = await ProductDemandService(self.db).get_pending_demand(
+            [school_id],
+            garment_type_ids=garment_type_ids,
+            exclude_order_id=order.id
         )
-        result = await self.db.execute(all_products_query)
-        all_products = result.all()
 
-        # Build a map of product_id -> (product, available_stock)
-        # This will track "virtual" stock as we assign items
-        product_stock_map: dict[UUID, tuple[Product, int]] = {}
-        for product, inv_qty in all_products:
-            product_stock_map[product.id] = (product, inv_qty or 0)
+        def pending_demand_qty(item: OrderItem) -> int:
+            demand = other_demand.get(ProductDemandService.key(
+                school_id, item.garment_type_id, item.size, item.color
+            ))
+            return demand.quantity if demand else 0
 
         items_info = []
         items_in_stock = 0
@@ -1102,41 +1078,16 @@ class OrderService(SchoolIsolatedService[Order]):
                     "quantity_to_produce": item.quantity,
                     "suggested_action": "produce",
                     "has_custom_measurements": True,
+                    "pending_demand_qty": pending_demand_qty(item),
                     "item_status": item.item_status.value
                 })
                 continue
 
-            # Find matching products by garment_type, size, color
-            matching_products = []
-            for product_id, (product, stock) in product_stock_map.items():
-                if product.garment_type_id != item.garment_type_id:
-                    continue
-                # Match size if specified
-                if item.size and product.size != item.size:
-                    continue
-                # Match color if specified
-                if item.color and product.color != item.color:
-                    continue
-                matching_products.append((product, stock))
-
-            # Sort by available stock descending to pick best match
-            matching_products.sort(key=lambda x: x[1], reverse=True)
-
-            # Pick the best match (most stock available)
-            best_match = None
-            best_stock = 0
-            if matching_products:
-                best_match, best_stock = matching_products[0]
-
-            # If no exact match, try any product of same garment type (fallback)
-            if not best_match:
-                fallback_products = [
-                    (p, s) for pid, (p, s) in product_stock_map.items()
-                    if p.garment_type_id == item.garment_type_id
-                ]
-                fallback_products.sort(key=lambda x: x[1], reverse=True)
-                if fallback_products:
-                    best_match, best_stock = fallback_products[0]
+            # Best-stocked product matching garment_type, size, color
+            # (falls back to any product of the same garment type)
+            best_match, best_stock = stock_index.best_match(
+                item.garment_type_id, item.size, item.color
+            )
 
             # Determine fulfillment based on CURRENT virtual stock
             can_fulfill = best_stock >= item.quantity
@@ -1157,8 +1108,7 @@ class OrderService(SchoolIsolatedService[Order]):
             # IMPORTANT: Virtually consume the stock for this item
             # so next items see the reduced availability
             if best_match and quantity_from_stock > 0:
-                current_product, current_stock = product_stock_map[best_match.id]
-                product_stock_map[best_match.id] = (current_product, current_stock - quantity_from_stock)
+                stock_index.consume(best_match.id, quantity_from_stock)
 
             items_info.append({
                 "item_id": str(item.id),
@@ -1175,6 +1125,7 @@ class OrderService(SchoolIsolatedService[Order]):
                 "quantity_to_produce": quantity_to_produce,
                 "suggested_action": suggested_action,
                 "has_custom_measurements": False,
+                "pending_demand_qty": pending_demand_qty(item),
                 "item_status": item.item_status.value
             })
 
@@ -1242,8 +1193,8 @@ class OrderService(SchoolIsolatedService[Order]):
         if order.status not in [OrderStatus.PENDING]:
             raise ValueError(f"Solo se pueden aprobar pedidos pendientes. Estado actual: {order.status.value}")
 
-        # Get stock verification
-        stock_info = await self.verify_order_stock(order_id, school_id)
+        # Get stock verification (same stock index as verify_order_stock)
+        stock_info = await self._verify_stock_for_order(order, school_id)
 
         # Build action map from item_actions if provided
         action_map = {}
@@ -1251,6 +1202,23 @@ class OrderService(SchoolIsolatedService[Order]):
             for action in item_actions:
                 action_map[action.get("item_id")] = action
 
+        # Items are already loaded; inventories of every product we may
+        # take stock from are fetched in one query
+        items_by_id = {str(item.id): item for item in order.items}
+        product_ids = {
+            str(action_map.get(info["item_id"], {}).get("product_id") or info.get("product_id"))
+            for info in stock_info["items"]
+            if action_map.get(info["item_id"], {}).get("product_id") or info.get("product_id")
+        }
+        inventories_by_product: dict[str, Inventory] = {}
+        if product_ids:
+            inv_result = await self.db.execute(
+                select(Inventory).where(Inventory.product_id.in_(product_ids))
+            )
+            inventories_by_product = {
+                str(inv.product_id): inv for inv in inv_result.scalars().all()
+            }
+
         # Process each item
         for item_info in stock_info["items"]:
             item_id = item_info["item_id"]
@@ -1266,11 +1234,7 @@ class OrderService(SchoolIsolatedService[Order]):
                 else:
                     action = "produce"
 
-            # Get the item
-            result = await self.db.execute(
-                select(OrderItem).where(OrderItem.id == item_id)
-            )
-            item = result.scalar_one_or_none()
+            item = items_by_id.get(item_id)
             if not item:
                 continue
 
@@ -1281,10 +1245,7 @@ class OrderService(SchoolIsolatedService[Order]):
 
                 if product_id and qty_from_stock > 0:
                     # Decrement inventory
-                    inv_result = await self.db.execute(
-                        select(Inventory).where(Inventory.product_id == product_id)
-                    )
-                    inventory = inv_result.scalar_one_or_none()
+                    inventory = inventories_by_product.get(str(product_id))
 
                     if inventory and inventory.quantity >= qty_from_stock:
                         inventory.quantity -= qty_from_stock
@@ -1325,7 +1286,7 @@ class OrderService(SchoolIsolatedService[Order]):
         order_code: str
     ) -> bool:
         """
-        Send welcome email with activation link on client's FIRST transaction.
+        Queue welcome email with activation link on client's FIRST transaction.
 
         This is the preferred approach:
         - NOT sent when client is created
@@ -1337,7 +1298,7 @@ class OrderService(SchoolIsolatedService[Order]):
             order_code: Order code for context in email
 
         Returns:
-            True if email was sent, False otherwise
+            True if the email was queued, False otherwise
         """
         # Get client
         result = await self.db.execute(
@@ -1371,42 +1332,31 @@ class OrderService(SchoolIsolatedService[Order]):
 
         await self.db.flush()
 
-        # Send welcome email with activation link
-        try:
-            sent = send_welcome_with_activation_email(
+        # Queue welcome email with activation link (delivered by the outbox
+        # worker, committed together with the order)
+        await EmailOutboxService(self.db).enqueue(
+            build_welcome_with_activation_email(
                 email=client.email,
                 token=activation_token,
                 name=client.name,
                 transaction_type="encargo"
-            )
-            if sent:
-                print(f"✅ [ORDER] Welcome email sent to {client.email} for order {order_code}")
-            else:
-                print(f"⚠️ [ORDER] Failed to send welcome email to {client.email}")
-                # Rollback the flag if email failed
-                client.welcome_email_sent = False
-                client.welcome_email_sent_at = None
-                await self.db.flush()
-            return sent
-        except Exception as e:
-            print(f"❌ [ORDER] Error sending welcome email: {e}")
-            # Rollback the flag if email failed
-            client.welcome_email_sent = False
-            client.welcome_email_sent_at = None
-            await self.db.flush()
-            return False
+            ),
+            kind="welcome_activation"
+        )
+        print(f"✅ [ORDER] Welcome email queued for {client.email} for order {order_code}")
+        return True
 
     async def _send_order_ready_email(self, order: Order) -> bool:
         """
-        Send email to client when their order is ready for pickup.
+        Queue email to client when their order is ready for pickup.
 
         Args:
             order: Order object with client loaded
 
         Returns:
-            True if email was sent, False otherwise
+            True if the email was queued, False otherwise
         """
-        from app.services.email import send_order_ready_email
+        from app.services.email import build_order_ready_email
         from app.models.school import School
 
         # Get client
@@ -1430,21 +1380,17 @@ class OrderService(SchoolIsolatedService[Order]):
         school = school_result.scalar_one_or_none()
         school_name = school.name if school else ""
 
-        try:
-            sent = send_order_ready_email(
+        await EmailOutboxService(self.db).enqueue(
+            build_order_ready_email(
                 email=client.email,
                 name=client.name,
                 order_code=order.code,
                 school_name=school_name
-            )
-            if sent:
-                print(f"✅ [ORDER] Ready notification sent to {client.email} for order {order.code}")
-            else:
-                print(f"⚠️ [ORDER] Failed to send ready notification to {client.email}")
-            return sent
-        except Exception as e:
-            print(f"❌ [ORDER] Error sending ready notification: {e}")
-            return False
+            ),
+            kind="order_ready"
+        )
+        print(f"✅ [ORDER] Ready notification queued for {client.email} for order {order.code}")
+        return True
 
     async def cancel_order(
         self,
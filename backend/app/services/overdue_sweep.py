@@ -0,0 +1,124 @@
+"""
+Overdue Sweep - Flags receivables and payables past their due date
+
+Unpaid accounts receivable/payable with due_date before today are marked
+is_overdue by a periodic background task (run_overdue_sweep_loop, started
+from the application lifespan) instead of on request paths. Each table is
+swept for all schools (and global accounts) with a single
+
+    UPDATE ... SET is_overdue = true
+    WHERE NOT is_paid AND NOT is_overdue AND due_date < today
+    RETURNING id, school_id, amount - amount_paid
+
+so only rows that just became overdue come back. Concurrent sweeps (one per
+API worker) cannot return the same row twice: the second UPDATE re-checks
+is_overdue after the first commits. The returned rows become one broadcast
+notification per school and kind, not one per item.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.models.accounting import AccountsReceivable, AccountsPayable
+from app.models.notification import NotificationType
+from app.services.notification import NotificationService
+
+logger = logging.getLogger(__name__)
+
+OVERDUE_NOTIFICATION_TYPES = {
+    AccountsReceivable: NotificationType.RECEIVABLES_OVERDUE,
+    AccountsPayable: NotificationType.PAYABLES_OVERDUE,
+}
+
+
+async def mark_overdue(
+    db: AsyncSession,
+    model: type[AccountsReceivable] | type[AccountsPayable],
+    today: date,
+    school_id: UUID | None = None
+) -> int:
+    """
+    Flag newly overdue rows of `model` and notify them.
+
+    Args:
+        model: AccountsReceivable or AccountsPayable
+        today: Rows due before this date are overdue
+        school_id: Limit to one school (None sweeps every school and global rows)
+
+    Returns:
+        Number of rows that became overdue
+    """
+    stmt = (
+        update(model)
+        .where(
+            model.is_paid == False,
+            model.is_overdue == False,
+            model.due_date < today
+        )
+        .values(is_overdue=True)
+        .returning(model.id, model.school_id, model.amount - model.amount_paid)
+    )
+    if school_id is not None:
+        stmt = stmt.where(model.school_id == school_id)
+
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        return 0
+
+    by_school: dict[UUID | None, list[Decimal]] = defaultdict(list)
+    for _, row_school_id, pending in rows:
+        by_school[row_school_id].append(pending)
+
+    notifications = NotificationService(db)
+    for row_school_id, pending_amounts in by_school.items():
+        await notifications.notify_accounts_overdue(
+            OVERDUE_NOTIFICATION_TYPES[model],
+            row_school_id,
+            len(pending_amounts),
+            sum(pending_amounts, Decimal("0"))
+        )
+    return len(rows)
+
+
+async def sweep_overdue(db: AsyncSession, today: date | None = None) -> tuple[int, int]:
+    """
+    Flag overdue receivables and payables for all schools.
+
+    Returns:
+        (receivables, payables) that became overdue
+    """
+    today = today or date.today()
+    receivables = await mark_overdue(db, AccountsReceivable, today)
+    payables = await mark_overdue(db, AccountsPayable, today)
+    return receivables, payables
+
+
+async def run_overdue_sweep_loop(interval_seconds: int) -> None:
+    """
+    Sweep overdue accounts now and every `interval_seconds` until cancelled.
+
+    Started from the application lifespan. Errors are logged and retried
+    on the next tick.
+    """
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                receivables, payables = await sweep_overdue(db)
+                await db.commit()
+            if receivables or payables:
+                logger.info(
+                    "Overdue sweep: %s receivables, %s payables flagged",
+                    receivables, payables
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Overdue sweep failed")
+        await asyncio.sleep(interval_seconds)
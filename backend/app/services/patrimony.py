@@ -18,13 +18,14 @@ from sqlalchemy.orm import selectinload
 
 from app.models.accounting import (
     BalanceAccount,
-    BalanceEntry,
     AccountType,
     AccountsReceivable,
     AccountsPayable
 )
 from app.models.product import Product, Inventory, GlobalProduct, GlobalInventory
+from app.db.fanout import fan_out
 from app.services.balance_integration import BalanceIntegrationService
+from app.services.balance_ledger import BalanceLedgerService
 
 
 # Margen de costo por defecto (80% del precio de venta)
@@ -397,13 +398,18 @@ class PatrimonyService:
                 }
             }
         """
-        # Obtener todos los componentes
+        # Caja/Banco puede crear las cuentas globales: usa la sesión principal
         cash_and_bank = await self.get_cash_and_bank(school_id)
-        inventory = await self.get_inventory_valuation(school_id)
-        accounts_receivable = await self.get_accounts_receivable_total(school_id)
-        fixed_assets = await self.get_fixed_assets(school_id)
-        accounts_payable = await self.get_accounts_payable_total(school_id)
-        debts = await self.get_debts(school_id)
+
+        # El resto son agregados independientes de solo lectura
+        inventory, accounts_receivable, fixed_assets, accounts_payable, debts = await fan_out(
+            self.db,
+            lambda db: PatrimonyService(db).get_inventory_valuation(school_id),
+            lambda db: PatrimonyService(db).get_accounts_receivable_total(school_id),
+            lambda db: PatrimonyService(db).get_fixed_assets(school_id),
+            lambda db: PatrimonyService(db).get_accounts_payable_total(school_id),
+            lambda db: PatrimonyService(db).get_debts(school_id),
+        )
 
         # Calcular totales
         total_liquid = Decimal(str(cash_and_bank.get("total_liquid", 0)))
@@ -475,7 +481,8 @@ class PatrimonyService:
         """
         Establece el saldo inicial de una cuenta (Caja o Banco).
 
-        Crea un BalanceEntry con la descripción "Saldo inicial".
+        Registra la diferencia con el saldo actual como un BalanceEntry de
+        ajuste, con la cuenta bloqueada.
         """
         # Buscar cuenta por código
         result = await self.db.execute(
@@ -491,30 +498,24 @@ class PatrimonyService:
         if not account:
             raise ValueError(f"Cuenta con código {account_code} no encontrada")
 
-        # Calcular diferencia con el saldo actual
+        # Calcular diferencia con el saldo actual, con la cuenta bloqueada
+        await BalanceLedgerService(self.db).lock_current([account.id])
         difference = initial_balance - account.balance
 
         if difference == 0:
             return account  # No hay cambio
 
-        # Actualizar balance
-        account.balance = initial_balance
-
-        # Crear entrada de ajuste
-        entry = BalanceEntry(
-            account_id=account.id,
+        # Registrar la diferencia como movimiento de ajuste
+        await BalanceIntegrationService(self.db).apply_to_account(
+            account,
+            difference,
+            "Ajuste de saldo inicial",
             school_id=school_id,
-            entry_date=date.today(),
-            amount=difference,
-            balance_after=initial_balance,
-            description="Ajuste de saldo inicial",
             reference="INICIAL",
             created_by=created_by
         )
-        self.db.add(entry)
-
-        await self.db.flush()
-        await self.db.refresh(account)
+        # Modo ledger: plegar el movimiento para devolver el saldo exacto
+        await BalanceLedgerService(self.db).compact([account.id])
 
         return account
 
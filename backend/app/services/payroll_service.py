@@ -4,7 +4,7 @@ Payroll Service - Business logic for payroll management
 from uuid import UUID
 from decimal import Decimal
 from datetime import date, datetime
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -16,7 +16,7 @@ from app.models.payroll import (
 )
 from app.models.accounting import Expense, ExpenseCategory
 from app.schemas.payroll import PayrollRunCreate, PayrollRunUpdate, PayrollItemUpdate
-from app.services.employee_service import employee_service
+from app.services.employee_service import employee_service, compute_employee_totals
 
 
 class PayrollService:
@@ -72,19 +72,17 @@ class PayrollService:
         if data.period_end < data.period_start:
             raise ValueError("La fecha de fin debe ser mayor o igual a la fecha de inicio")
 
-        # Get employees (specific list or all active)
-        if data.employee_ids:
-            employees = []
-            for emp_id in data.employee_ids:
-                emp = await employee_service.get_employee(db, emp_id)
-                if emp and emp.is_active:
-                    employees.append(emp)
-        else:
-            employees = await employee_service.get_employees(db, is_active=True)
+        # Get employees (specific list or all active) and their bonuses
+        # for the period in two queries, however many employees there are
+        employees = await employee_service.get_payroll_employees(db, data.employee_ids or None)
 
         if not employees:
             raise ValueError("No hay empleados activos para incluir en la nómina")
 
+        bonuses_by_employee = await employee_service.get_active_bonuses_by_employee(
+            db, [employee.id for employee in employees], data.period_end
+        )
+
         # Create payroll run
         payroll_run = PayrollRun(
             period_start=data.period_start,
@@ -98,43 +96,44 @@ class PayrollService:
         db.add(payroll_run)
         await db.flush()  # Get the ID
 
-        # Create items for each employee
+        # Build items for each employee
         total_base = Decimal("0")
         total_bonuses = Decimal("0")
         total_deductions = Decimal("0")
         total_net = Decimal("0")
+        items = []
 
         for employee in employees:
-            # Calculate employee totals
-            totals = await employee_service.calculate_employee_totals(
-                db, employee.id, data.period_end
-            )
-
-            item = PayrollItem(
-                payroll_run_id=payroll_run.id,
-                employee_id=employee.id,
-                base_salary=totals["base_salary"],
-                total_bonuses=totals["total_bonuses"],
-                total_deductions=totals["total_deductions"],
-                net_amount=totals["net_amount"],
-                bonus_breakdown=totals["bonus_breakdown"],
-                deduction_breakdown=totals["deduction_breakdown"],
-            )
-            db.add(item)
+            totals = compute_employee_totals(employee, bonuses_by_employee[employee.id])
+
+            items.append({
+                "payroll_run_id": payroll_run.id,
+                "employee_id": employee.id,
+                "base_salary": totals["base_salary"],
+                "total_bonuses": totals["total_bonuses"],
+                "total_deductions": totals["total_deductions"],
+                "net_amount": totals["net_amount"],
+                "bonus_breakdown": totals["bonus_breakdown"],
+                "deduction_breakdown": totals["deduction_breakdown"],
+            })
 
             total_base += totals["base_salary"]
             total_bonuses += totals["total_bonuses"]
             total_deductions += totals["total_deductions"]
             total_net += totals["net_amount"]
 
+        # One batched INSERT for all items
+        await db.execute(insert(PayrollItem), items)
+
         # Update payroll run totals
         payroll_run.total_base_salary = total_base
         payroll_run.total_bonuses = total_bonuses
         payroll_run.total_deductions = total_deductions
         payroll_run.total_net = total_net
 
+        # No refresh: every column is already set, and refreshing would
+        # reload all items (and their employees) through PayrollRun.items
         await db.commit()
-        await db.refresh(payroll_run)
         return payroll_run
 
     async def update_payroll_run(
@@ -378,13 +377,16 @@ class PayrollService:
         db: AsyncSession,
     ) -> dict:
         """Get summary of payroll data"""
-        # Count active employees
-        employees = await employee_service.get_employees(db, is_active=True)
+        # Active employees and today's bonuses, in two queries
+        employees = await employee_service.get_payroll_employees(db)
+        bonuses_by_employee = await employee_service.get_active_bonuses_by_employee(
+            db, [emp.id for emp in employees], date.today()
+        )
 
         # Calculate monthly payroll estimate
         total_monthly = Decimal("0")
         for emp in employees:
-            totals = await employee_service.calculate_employee_totals(db, emp.id)
+            totals = compute_employee_totals(emp, bonuses_by_employee[emp.id])
             total_monthly += totals["net_amount"]
 
         # Count pending payroll runs
@@ -2,9 +2,10 @@
 Product and GarmentType Service
 """
 from uuid import UUID
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache
 from app.models.product import GarmentType, Product
 from app.schemas.product import (
     GarmentTypeCreate,
@@ -14,6 +15,13 @@ from app.schemas.product import (
     ProductWithInventory,
 )
 from app.services.base import SchoolIsolatedService
+from app.services.sequence import DocumentSequenceService
+
+
+def invalidate_catalog_cache(db: AsyncSession, school_id: UUID) -> None:
+    """Drop a school's cached garment type and product lists after commit"""
+    cache.invalidate_after_commit(db, "garment_types", school_id)
+    cache.invalidate_after_commit(db, "products", school_id)
 
 
 class GarmentTypeService(SchoolIsolatedService[GarmentType]):
@@ -48,7 +56,9 @@ class GarmentTypeService(SchoolIsolatedService[GarmentType]):
         if existing.scalar_one_or_none():
             raise ValueError(f"Garment type '{garment_data.name}' already exists in this school")
 
-        return await self.create(garment_data.model_dump())
+        garment_type = await self.create(garment_data.model_dump())
+        invalidate_catalog_cache(self.db, garment_data.school_id)
+        return garment_type
 
     async def update_garment_type(
         self,
@@ -68,7 +78,9 @@ class GarmentTypeService(SchoolIsolatedService[GarmentType]):
             Updated garment type or None
         """
         update_dict = garment_data.model_dump(exclude_unset=True)
-        return await self.update(garment_id, school_id, update_dict)
+        garment_type = await self.update(garment_id, school_id, update_dict)
+        invalidate_catalog_cache(self.db, school_id)
+        return garment_type
 
     async def get_active_garment_types(
         self,
@@ -144,7 +156,9 @@ class ProductService(SchoolIsolatedService[Product]):
         product_dict = product_data.model_dump()
         product_dict['code'] = code
 
-        return await self.create(product_dict)
+        product = await self.create(product_dict)
+        cache.invalidate_after_commit(self.db, "products", product_data.school_id)
+        return product
 
     async def update_product(
         self,
@@ -164,7 +178,9 @@ class ProductService(SchoolIsolatedService[Product]):
             Updated product or None
         """
         update_dict = product_data.model_dump(exclude_unset=True)
-        return await self.update(product_id, school_id, update_dict)
+        product = await self.update(product_id, school_id, update_dict)
+        cache.invalidate_after_commit(self.db, "products", school_id)
+        return product
 
     async def get_active_products(
         self,
@@ -322,33 +338,15 @@ class ProductService(SchoolIsolatedService[Product]):
         Returns:
             Generated product code
         """
-        # Get count of products in school
-        count = await self.count(school_id)
-
-        # Generate code with padding
-        sequence = count + 1
-        code = f"PRD-{sequence:04d}"
-
-        # Verify uniqueness (in case of deletions)
-        existing = await self.get_by_code(code, school_id)
-        if existing:
-            # Find next available number
-            result = await self.db.execute(
-                select(func.max(Product.code)).where(
-                    Product.school_id == school_id,
-                    Product.code.like("PRD-%")
-                )
+        sequences = DocumentSequenceService(self.db)
+        return await sequences.next_code(
+            "PRD-",
+            4,
+            school_id=school_id,
+            seed=lambda: sequences.max_code_number(
+                Product.code, "PRD-", Product.school_id == school_id
             )
-            max_code = result.scalar_one_or_none()
-
-            if max_code:
-                try:
-                    last_num = int(max_code.split('-')[1])
-                    code = f"PRD-{last_num + 1:04d}"
-                except (IndexError, ValueError):
-                    code = f"PRD-{sequence:04d}"
-
-        return code
+        )
 
     async def get_by_size_and_color(
         self,
@@ -0,0 +1,104 @@
+"""
+Product Demand Service - Pending order demand per product variant
+
+Order items are matched to products by garment type + size + color (web
+orders have no product_id until approved). This service computes the
+pending quantity for every variant in one grouped query so callers can
+join it in memory instead of querying once per product.
+"""
+from dataclasses import dataclass
+from uuid import UUID
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.order import Order, OrderItem, OrderItemStatus
+
+
+# Only items not yet fulfilled from stock count as demand:
+# PENDING = not yet processed, IN_PRODUCTION = being made.
+# READY/DELIVERED are already fulfilled and must not count.
+PENDING_ITEM_STATUSES = [OrderItemStatus.PENDING, OrderItemStatus.IN_PRODUCTION]
+
+# (school_id, garment_type_id, size, color); size/color may be None
+DemandKey = tuple[UUID, UUID, str | None, str | None]
+
+
+@dataclass(frozen=True)
+class VariantDemand:
+    """Pending demand for one product variant"""
+    quantity: int
+    order_count: int
+
+
+class ProductDemandService:
+    """Service for pending order demand"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def key(
+        school_id: UUID,
+        garment_type_id: UUID,
+        size: str | None,
+        color: str | None
+    ) -> DemandKey:
+        """Demand key for a product or order item"""
+        return (school_id, garment_type_id, size, color)
+
+    async def get_pending_demand(
+        self,
+        school_ids: list[UUID],
+        garment_type_ids: list[UUID] | None = None,
+        exclude_order_id: UUID | None = None
+    ) -> dict[DemandKey, VariantDemand]:
+        """
+        Pending quantity and number of orders per variant
+
+        Args:
+            school_ids: Schools to include
+            garment_type_ids: Limit to these garment types (all if None)
+            exclude_order_id: Leave out one order (e.g. the one being verified)
+
+        Returns:
+            Dict mapping (school_id, garment_type_id, size, color) to its
+            demand; variants without pending items are absent
+        """
+        if not school_ids or garment_type_ids == []:
+            return {}
+
+        query = (
+            select(
+                Order.school_id,
+                OrderItem.garment_type_id,
+                OrderItem.size,
+                OrderItem.color,
+                func.sum(OrderItem.quantity).label("total_qty"),
+                func.count(func.distinct(OrderItem.order_id)).label("order_count")
+            )
+            .join(Order, OrderItem.order_id == Order.id)
+            .where(
+                Order.school_id.in_(school_ids),
+                OrderItem.item_status.in_(PENDING_ITEM_STATUSES)
+            )
+            .group_by(
+                Order.school_id,
+                OrderItem.garment_type_id,
+                OrderItem.size,
+                OrderItem.color
+            )
+        )
+        if garment_type_ids is not None:
+            query = query.where(OrderItem.garment_type_id.in_(garment_type_ids))
+        if exclude_order_id:
+            query = query.where(OrderItem.order_id != exclude_order_id)
+
+        result = await self.db.execute(query)
+        return {
+            self.key(row.school_id, row.garment_type_id, row.size, row.color): VariantDemand(
+                quantity=int(row.total_qty or 0),
+                order_count=int(row.order_count or 0)
+            )
+            for row in result.all()
+            if (row.total_qty or 0) > 0
+        }
@@ -11,6 +11,8 @@ from app.models.sale import Sale, SaleItem, SaleStatus, PaymentMethod
 from app.models.product import Product, Inventory
 from app.models.client import Client
 from app.models.order import Order, OrderStatus
+from app.db.fanout import fan_out
+from app.services.sales_rollup import SalesRollupService
 
 
 class ReportsService:
@@ -27,6 +29,8 @@ class ReportsService:
     ) -> dict:
         """
         Get sales summary for a period
+
+        Reads the daily rollup instead of scanning sales.
         """
         # Default to today if no dates provided
         if not start_date:
@@ -34,56 +38,24 @@ class ReportsService:
         if not end_date:
             end_date = date.today()
 
-        # Build date filter
-        start_datetime = datetime.combine(start_date, datetime.min.time())
-        end_datetime = datetime.combine(end_date, datetime.max.time())
-
-        # Query sales
-        query = select(
-            func.count(Sale.id).label('total_sales'),
-            func.coalesce(func.sum(Sale.total), 0).label('total_revenue'),
-            func.coalesce(func.avg(Sale.total), 0).label('average_ticket'),
-        ).where(
-            and_(
-                Sale.school_id == school_id,
-                Sale.status == SaleStatus.COMPLETED,
-                Sale.sale_date >= start_datetime,
-                Sale.sale_date <= end_datetime
-            )
-        )
-
-        result = await self.db.execute(query)
-        row = result.one()
-
-        # Sales by payment method
-        payment_query = select(
-            Sale.payment_method,
-            func.count(Sale.id).label('count'),
-            func.coalesce(func.sum(Sale.total), 0).label('total')
-        ).where(
-            and_(
-                Sale.school_id == school_id,
-                Sale.status == SaleStatus.COMPLETED,
-                Sale.sale_date >= start_datetime,
-                Sale.sale_date <= end_datetime
-            )
-        ).group_by(Sale.payment_method)
-
-        payment_result = await self.db.execute(payment_query)
-        payment_rows = payment_result.all()
+        rows = await SalesRollupService(self.db).get_rows(school_id, start_date, end_date)
 
+        total_sales = 0
+        total_revenue = Decimal("0")
         sales_by_payment = {}
-        for p_row in payment_rows:
-            method = p_row.payment_method.value if p_row.payment_method else 'other'
-            sales_by_payment[method] = {
-                'count': p_row.count,
-                'total': float(p_row.total)
-            }
+        for row in rows:
+            if row.status != SaleStatus.COMPLETED.value or not row.sales_count:
+                continue
+            total_sales += row.sales_count
+            total_revenue += row.total_amount
+            method = sales_by_payment.setdefault(row.payment_method, {'count': 0, 'total': 0.0})
+            method['count'] += row.sales_count
+            method['total'] += float(row.total_amount)
 
         return {
-            'total_sales': row.total_sales,
-            'total_revenue': float(row.total_revenue),
-            'average_ticket': float(row.average_ticket),
+            'total_sales': total_sales,
+            'total_revenue': float(total_revenue),
+            'average_ticket': float(total_revenue / total_sales) if total_sales else 0.0,
             'sales_by_payment': sales_by_payment,
             'start_date': start_date.isoformat(),
             'end_date': end_date.isoformat()
@@ -96,45 +68,36 @@ class ReportsService:
     ) -> dict:
         """
         Get sales for a specific day
+
+        Reads the daily rollup instead of loading every sale of the day.
         """
         if not target_date:
             target_date = date.today()
 
-        start_datetime = datetime.combine(target_date, datetime.min.time())
-        end_datetime = datetime.combine(target_date, datetime.max.time())
-
-        # Query sales
-        query = select(Sale).where(
-            and_(
-                Sale.school_id == school_id,
-                Sale.sale_date >= start_datetime,
-                Sale.sale_date <= end_datetime
-            )
-        )
-
-        result = await self.db.execute(query)
-        sales = result.scalars().all()
+        rows = await SalesRollupService(self.db).get_rows(school_id, target_date, target_date)
 
-        completed = [s for s in sales if s.status == SaleStatus.COMPLETED]
-        pending = [s for s in sales if s.status == SaleStatus.PENDING]
-        cancelled = [s for s in sales if s.status == SaleStatus.CANCELLED]
+        counts = {status.value: 0 for status in SaleStatus}
+        completed_by_method = {}
+        for row in rows:
+            counts[row.status] = counts.get(row.status, 0) + row.sales_count
+            if row.status == SaleStatus.COMPLETED.value:
+                completed_by_method[row.payment_method] = (
+                    completed_by_method.get(row.payment_method, Decimal("0")) + row.total_amount
+                )
 
-        cash_total = sum(s.total for s in completed if s.payment_method == PaymentMethod.CASH)
-        transfer_total = sum(s.total for s in completed if s.payment_method == PaymentMethod.TRANSFER)
-        card_total = sum(s.total for s in completed if s.payment_method == PaymentMethod.CARD)
-        credit_total = sum(s.total for s in completed if s.payment_method == PaymentMethod.CREDIT)
+        completed_count = counts[SaleStatus.COMPLETED.value]
 
         return {
             'date': target_date.isoformat(),
-            'total_sales': len(completed),
-            'total_revenue': float(sum(s.total for s in completed)),
-            'completed_count': len(completed),
-            'pending_count': len(pending),
-            'cancelled_count': len(cancelled),
-            'cash_sales': float(cash_total),
-            'transfer_sales': float(transfer_total),
-            'card_sales': float(card_total),
-            'credit_sales': float(credit_total)
+            'total_sales': completed_count,
+            'total_revenue': float(sum(completed_by_method.values(), Decimal("0"))),
+            'completed_count': completed_count,
+            'pending_count': counts[SaleStatus.PENDING.value],
+            'cancelled_count': counts[SaleStatus.CANCELLED.value],
+            'cash_sales': float(completed_by_method.get(PaymentMethod.CASH.value, 0)),
+            'transfer_sales': float(completed_by_method.get(PaymentMethod.TRANSFER.value, 0)),
+            'card_sales': float(completed_by_method.get(PaymentMethod.CARD.value, 0)),
+            'credit_sales': float(completed_by_method.get(PaymentMethod.CREDIT.value, 0))
         }
 
     async def get_top_products(
@@ -352,20 +315,16 @@ class ReportsService:
         today = date.today()
         month_start = today.replace(day=1)
 
-        # Today's sales
-        daily = await self.get_daily_sales(school_id, today)
-
-        # This month's sales
-        monthly = await self.get_sales_summary(school_id, month_start, today)
-
-        # Low stock count
-        low_stock = await self.get_low_stock_products(school_id)
-
-        # Pending orders count
-        pending_orders = await self.get_pending_orders(school_id)
-
-        # Inventory value
-        inventory = await self.get_inventory_value(school_id)
+        # Today's sales, this month's sales, low stock, pending orders
+        # and inventory value are independent: run them concurrently
+        daily, monthly, low_stock, pending_orders, inventory = await fan_out(
+            self.db,
+            lambda db: ReportsService(db).get_daily_sales(school_id, today),
+            lambda db: ReportsService(db).get_sales_summary(school_id, month_start, today),
+            lambda db: ReportsService(db).get_low_stock_products(school_id),
+            lambda db: ReportsService(db).get_pending_orders(school_id),
+            lambda db: ReportsService(db).get_inventory_value(school_id),
+        )
 
         return {
             'today': {
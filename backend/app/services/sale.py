@@ -9,7 +9,7 @@ Contabilidad de Ventas:
 from uuid import UUID
 from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -20,7 +20,10 @@ from app.models.accounting import Transaction, TransactionType, AccPaymentMethod
 from app.schemas.sale import SaleCreate, SaleUpdate, SaleChangeCreate, SaleChangeUpdate, AddPaymentToSale
 from app.services.base import SchoolIsolatedService
 from app.services.global_product import GlobalInventoryService
-from app.services.email import send_welcome_with_activation_email
+from app.services.sequence import DocumentSequenceService
+from app.services.sales_rollup import SalesRollupService
+from app.services.email import build_welcome_with_activation_email
+from app.services.email_outbox import EmailOutboxService
 import secrets
 from datetime import timedelta
 
@@ -49,7 +52,6 @@ class SaleService(SchoolIsolatedService[Sale]):
             ValueError: If products not found or insufficient inventory
         """
         from app.services.inventory import InventoryService
-        from app.schemas.product import GlobalInventoryAdjust
 
         inv_service = InventoryService(self.db)
         global_inv_service = GlobalInventoryService(self.db)
@@ -65,31 +67,53 @@ class SaleService(SchoolIsolatedService[Sale]):
         # Generate sale code
         code = await self._generate_sale_code(sale_data.school_id)
 
+        # Resolve all products (and their inventory) up front with IN queries
+        school_product_ids = list({
+            item.product_id for item in sale_data.items if not item.is_global
+        })
+        global_product_ids = list({
+            item.product_id for item in sale_data.items if item.is_global
+        })
+
+        products: dict[UUID, Product] = {}
+        if school_product_ids:
+            result = await self.db.execute(
+                select(Product).where(
+                    Product.id.in_(school_product_ids),
+                    Product.school_id == sale_data.school_id,
+                    Product.is_active == True
+                )
+            )
+            products = {p.id: p for p in result.scalars().all()}
+
+        global_products: dict[UUID, GlobalProduct] = {}
+        if global_product_ids:
+            result = await self.db.execute(
+                select(GlobalProduct).where(
+                    GlobalProduct.id.in_(global_product_ids),
+                    GlobalProduct.is_active == True
+                )
+            )
+            global_products = {p.id: p for p in result.scalars().all()}
+
         # Calculate totals and validate products
         items_data = []
         subtotal = Decimal("0")
+        # Quantities requested per product (a ticket may repeat a product)
+        school_demand: dict[UUID, int] = {}
+        global_demand: dict[UUID, int] = {}
 
         for item_data in sale_data.items:
             if item_data.is_global:
                 # Handle global product
-                result = await self.db.execute(
-                    select(GlobalProduct).where(
-                        GlobalProduct.id == item_data.product_id,
-                        GlobalProduct.is_active == True
-                    )
-                )
-                global_product = result.scalar_one_or_none()
+                global_product = global_products.get(item_data.product_id)
 
                 if not global_product:
                     raise ValueError(f"Producto global {item_data.product_id} no encontrado")
 
-                # Check global inventory ONLY for non-historical sales
-                if not is_historical:
-                    global_inv = await global_inv_service.get_by_product(global_product.id)
-                    if not global_inv or global_inv.quantity < item_data.quantity:
-                        raise ValueError(
-                            f"Stock insuficiente para el producto global {global_product.code}"
-                        )
+                global_demand[global_product.id] = (
+                    global_demand.get(global_product.id, 0) + item_data.quantity
+                )
 
                 # Calculate item totals
                 unit_price = global_product.price
@@ -107,30 +131,14 @@ class SaleService(SchoolIsolatedService[Sale]):
                 subtotal += item_subtotal
             else:
                 # Handle school product (original logic)
-                result = await self.db.execute(
-                    select(Product).where(
-                        Product.id == item_data.product_id,
-                        Product.school_id == sale_data.school_id,
-                        Product.is_active == True
-                    )
-                )
-                product = result.scalar_one_or_none()
+                product = products.get(item_data.product_id)
 
                 if not product:
                     raise ValueError(f"Producto {item_data.product_id} no encontrado")
 
-                # Check inventory ONLY for non-historical sales
-                if not is_historical:
-                    has_stock = await inv_service.check_availability(
-                        product.id,
-                        sale_data.school_id,
-                        item_data.quantity
-                    )
-
-                    if not has_stock:
-                        raise ValueError(
-                            f"Stock insuficiente para el producto {product.code}"
-                        )
+                school_demand[product.id] = (
+                    school_demand.get(product.id, 0) + item_data.quantity
+                )
 
                 # Calculate item totals
                 unit_price = product.price
@@ -147,6 +155,29 @@ class SaleService(SchoolIsolatedService[Sale]):
 
                 subtotal += item_subtotal
 
+        # Check inventory ONLY for non-historical sales (validated in memory)
+        if not is_historical:
+            inventories = await inv_service.get_by_products(
+                list(school_demand.keys()),
+                sale_data.school_id
+            )
+            for product_id, quantity in school_demand.items():
+                inventory = inventories.get(product_id)
+                if not inventory or inventory.quantity < quantity:
+                    raise ValueError(
+                        f"Stock insuficiente para el producto {products[product_id].code}"
+                    )
+
+            global_inventories = await global_inv_service.get_by_products(
+                list(global_demand.keys())
+            )
+            for product_id, quantity in global_demand.items():
+                global_inv = global_inventories.get(product_id)
+                if not global_inv or global_inv.quantity < quantity:
+                    raise ValueError(
+                        f"Stock insuficiente para el producto global {global_products[product_id].code}"
+                    )
+
         # Total = subtotal (no tax for now)
         total = subtotal
 
@@ -183,30 +214,21 @@ class SaleService(SchoolIsolatedService[Sale]):
         await self.db.flush()
         await self.db.refresh(sale)
 
-        # Create sale items and reserve inventory (SKIP inventory for historical sales)
+        # Create sale items
         for item_dict in items_data:
             item_dict["sale_id"] = sale.id
-            sale_item = SaleItem(**item_dict)
-            self.db.add(sale_item)
-
-            # Only adjust inventory for NON-historical sales
-            if not is_historical:
-                if item_dict["is_global_product"]:
-                    # Reserve global stock
-                    await global_inv_service.adjust_quantity(
-                        item_dict["global_product_id"],
-                        GlobalInventoryAdjust(
-                            adjustment=-item_dict["quantity"],
-                            reason=f"Venta {code}"
-                        )
-                    )
-                else:
-                    # Reserve school stock
-                    await inv_service.reserve_stock(
-                        item_dict["product_id"],
-                        sale_data.school_id,
-                        item_dict["quantity"]
-                    )
+            self.db.add(SaleItem(**item_dict))
+
+        # Reserve inventory with one bulk UPDATE per inventory table
+        # (SKIP inventory for historical sales)
+        if not is_historical:
+            try:
+                await inv_service.bulk_remove_stock(school_demand, sale_data.school_id)
+                await global_inv_service.bulk_remove_stock(global_demand)
+            except ValueError as e:
+                raise ValueError(
+                    "Stock insuficiente: el inventario cambió durante la venta"
+                ) from e
 
         await self.db.flush()
 
@@ -324,6 +346,9 @@ class SaleService(SchoolIsolatedService[Sale]):
 
         await self.db.flush()
 
+        # Keep daily report totals in sync
+        await SalesRollupService(self.db).add_sale(sale)
+
         # Refresh sale with items and payments loaded
         await self.db.refresh(sale, ["items", "payments"])
 
@@ -334,6 +359,25 @@ class SaleService(SchoolIsolatedService[Sale]):
 
         return sale
 
+    async def update(
+        self,
+        id: UUID,
+        school_id: UUID,
+        obj_data: dict
+    ) -> Sale | None:
+        """Update a sale, moving it between daily rollup rows if needed"""
+        existing = await self.get(id, school_id)
+        if not existing:
+            return None
+
+        rollup = SalesRollupService(self.db)
+        rollup_key = rollup.sale_key(existing)
+        old_paid_amount = existing.paid_amount
+
+        sale = await super().update(id, school_id, obj_data)
+        await rollup.move_sale(rollup_key, sale, old_paid_amount)
+        return sale
+
     async def get_sale_with_items(
         self,
         sale_id: UUID,
@@ -371,17 +415,16 @@ class SaleService(SchoolIsolatedService[Sale]):
         year = datetime.now().year
         prefix = f"VNT-{year}-"
 
-        # Count sales for this year
-        count = await self.db.execute(
-            select(func.count(Sale.id)).where(
-                Sale.school_id == school_id,
-                Sale.code.like(f"{prefix}%")
+        sequences = DocumentSequenceService(self.db)
+        return await sequences.next_code(
+            prefix,
+            4,
+            school_id=school_id,
+            seed=lambda: sequences.max_code_number(
+                Sale.code, prefix, Sale.school_id == school_id
             )
         )
 
-        sequence = count.scalar_one() + 1
-        return f"{prefix}{sequence:04d}"
-
     # ============================================
     # Sale Changes (Cambios y Devoluciones)
     # ============================================
@@ -624,6 +667,12 @@ class SaleService(SchoolIsolatedService[Sale]):
             # Update balance account (Caja/Banco)
             await balance_service.apply_transaction_to_balance(transaction, approved_by)
 
+            # Net revenue adjustment for daily reports
+            signed_amount = transaction.amount if transaction.type == TransactionType.INCOME else -transaction.amount
+            await SalesRollupService(self.db).add_adjustment(
+                school_id, transaction.transaction_date, payment_method_str, signed_amount
+            )
+
         # 4. Update change status
         change.status = ChangeStatus.APPROVED
         await self.db.flush()
@@ -829,8 +878,12 @@ class SaleService(SchoolIsolatedService[Sale]):
         await self.db.refresh(payment)
 
         # Update sale's paid_amount
+        rollup = SalesRollupService(self.db)
+        rollup_key = rollup.sale_key(sale)
+        old_paid_amount = sale.paid_amount
         sale.paid_amount = existing_payments_total + payment_data.amount
         await self.db.flush()
+        await rollup.move_sale(rollup_key, sale, old_paid_amount)
 
         return payment
 
@@ -844,7 +897,7 @@ class SaleService(SchoolIsolatedService[Sale]):
         sale_code: str
     ) -> bool:
         """
-        Send welcome email with activation link on client's FIRST transaction.
+        Queue welcome email with activation link on client's FIRST transaction.
 
         This is the preferred approach:
         - NOT sent when client is created
@@ -856,7 +909,7 @@ class SaleService(SchoolIsolatedService[Sale]):
             sale_code: Sale code for context in email
 
         Returns:
-            True if email was sent, False otherwise
+            True if the email was queued, False otherwise
         """
         # Get client
         result = await self.db.execute(
@@ -890,27 +943,16 @@ class SaleService(SchoolIsolatedService[Sale]):
 
         await self.db.flush()
 
-        # Send welcome email with activation link
-        try:
-            sent = send_welcome_with_activation_email(
+        # Queue welcome email with activation link (delivered by the outbox
+        # worker, committed together with the sale)
+        await EmailOutboxService(self.db).enqueue(
+            build_welcome_with_activation_email(
                 email=client.email,
                 token=activation_token,
                 name=client.name,
                 transaction_type="compra"
-            )
-            if sent:
-                print(f"✅ [SALE] Welcome email sent to {client.email} for sale {sale_code}")
-            else:
-                print(f"⚠️ [SALE] Failed to send welcome email to {client.email}")
-                # Rollback the flag if email failed
-                client.welcome_email_sent = False
-                client.welcome_email_sent_at = None
-                await self.db.flush()
-            return sent
-        except Exception as e:
-            print(f"❌ [SALE] Error sending welcome email: {e}")
-            # Rollback the flag if email failed
-            client.welcome_email_sent = False
-            client.welcome_email_sent_at = None
-            await self.db.flush()
-            return False
+            ),
+            kind="welcome_activation"
+        )
+        print(f"✅ [SALE] Welcome email queued for {client.email} for sale {sale_code}")
+        return True
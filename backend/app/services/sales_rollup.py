@@ -0,0 +1,338 @@
+"""
+Sales Rollup Service - Incrementally maintained daily sales totals
+
+Keeps `sales_daily_rollup` in sync with sales so that reports and
+dashboards read a few rows per day instead of scanning every sale.
+"""
+from uuid import UUID
+from datetime import datetime, date
+from decimal import Decimal
+from sqlalchemy import select, delete, func, cast, Date
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sale import Sale, SaleStatus, SalesDailyRollup
+from app.models.accounting import Transaction, TransactionType
+
+
+NO_PAYMENT_METHOD = "other"
+CHANGES_CATEGORY = "sale_changes"
+
+# Rollup dimensions in primary key order
+RollupKey = tuple[UUID, date, str, str, bool]
+
+
+def _enum_value(value) -> str:
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def _day(value: datetime | date) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+class SalesRollupService:
+    """Service for the sales_daily_rollup table"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    # ============================================
+    # Incremental maintenance
+    # ============================================
+
+    @staticmethod
+    def sale_key(sale: Sale) -> RollupKey:
+        """Rollup row a sale is counted in"""
+        return (
+            sale.school_id,
+            _day(sale.sale_date),
+            _enum_value(sale.payment_method) if sale.payment_method else NO_PAYMENT_METHOD,
+            _enum_value(sale.status),
+            bool(sale.is_historical),
+        )
+
+    async def add_sale(self, sale: Sale) -> None:
+        """Count a newly created sale"""
+        await self._upsert(
+            self.sale_key(sale),
+            sales_count=1,
+            total_amount=Decimal(str(sale.total)),
+            paid_amount=Decimal(str(sale.paid_amount or 0)),
+        )
+
+    async def move_sale(
+        self,
+        old_key: RollupKey,
+        sale: Sale,
+        old_paid_amount: Decimal | None = None
+    ) -> None:
+        """
+        Move a sale between rollup rows after its status, payment method or
+        paid amount changed
+
+        Args:
+            old_key: sale_key(sale) captured before the change
+            sale: Sale with its new values
+            old_paid_amount: paid_amount before the change (defaults to current)
+        """
+        total = Decimal(str(sale.total))
+        paid = Decimal(str(sale.paid_amount or 0))
+        old_paid = paid if old_paid_amount is None else Decimal(str(old_paid_amount))
+        new_key = self.sale_key(sale)
+
+        if new_key == old_key:
+            if paid != old_paid:
+                await self._upsert(new_key, paid_amount=paid - old_paid)
+            return
+
+        await self._upsert(old_key, sales_count=-1, total_amount=-total, paid_amount=-old_paid)
+        await self._upsert(new_key, sales_count=1, total_amount=total, paid_amount=paid)
+
+    async def add_adjustment(
+        self,
+        school_id: UUID,
+        day: date,
+        payment_method: str,
+        amount: Decimal
+    ) -> None:
+        """Record the net price adjustment of an approved sale change"""
+        await self._upsert(
+            (school_id, day, payment_method, SaleStatus.COMPLETED.value, False),
+            adjustments_amount=amount,
+        )
+
+    async def _upsert(
+        self,
+        key: RollupKey,
+        sales_count: int = 0,
+        total_amount: Decimal = Decimal("0"),
+        paid_amount: Decimal = Decimal("0"),
+        adjustments_amount: Decimal = Decimal("0")
+    ) -> None:
+        school_id, sale_date, payment_method, status, is_historical = key
+        stmt = insert(SalesDailyRollup).values(
+            school_id=school_id,
+            sale_date=sale_date,
+            payment_method=payment_method,
+            status=status,
+            is_historical=is_historical,
+            sales_count=sales_count,
+            total_amount=total_amount,
+            paid_amount=paid_amount,
+            adjustments_amount=adjustments_amount,
+            updated_at=datetime.utcnow(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                SalesDailyRollup.school_id,
+                SalesDailyRollup.sale_date,
+                SalesDailyRollup.payment_method,
+                SalesDailyRollup.status,
+                SalesDailyRollup.is_historical,
+            ],
+            set_={
+                "sales_count": SalesDailyRollup.sales_count + stmt.excluded.sales_count,
+                "total_amount": SalesDailyRollup.total_amount + stmt.excluded.total_amount,
+                "paid_amount": SalesDailyRollup.paid_amount + stmt.excluded.paid_amount,
+                "adjustments_amount": SalesDailyRollup.adjustments_amount + stmt.excluded.adjustments_amount,
+                "updated_at": stmt.excluded.updated_at,
+            }
+        )
+        await self.db.execute(stmt)
+
+    # ============================================
+    # Reads
+    # ============================================
+
+    async def get_rows(
+        self,
+        school_id: UUID,
+        start_date: date,
+        end_date: date
+    ) -> list[SalesDailyRollup]:
+        """Rollup rows for a school and inclusive date range"""
+        result = await self.db.execute(
+            select(SalesDailyRollup).where(
+                SalesDailyRollup.school_id == school_id,
+                SalesDailyRollup.sale_date >= start_date,
+                SalesDailyRollup.sale_date <= end_date
+            )
+        )
+        return list(result.scalars().all())
+
+    # ============================================
+    # Backfill and consistency check
+    # ============================================
+
+    async def compute_from_sales(
+        self,
+        school_id: UUID | None = None
+    ) -> dict[RollupKey, dict]:
+        """
+        Aggregate rollup values straight from sales and sale change transactions
+
+        Args:
+            school_id: Limit to one school (all schools if None)
+
+        Returns:
+            Dict mapping rollup key to its aggregated values
+        """
+        sale_day = cast(Sale.sale_date, Date)
+        query = select(
+            Sale.school_id,
+            sale_day.label("sale_date"),
+            Sale.payment_method,
+            Sale.status,
+            Sale.is_historical,
+            func.count(Sale.id).label("sales_count"),
+            func.coalesce(func.sum(Sale.total), 0).label("total_amount"),
+            func.coalesce(func.sum(Sale.paid_amount), 0).label("paid_amount"),
+        ).group_by(
+            Sale.school_id, sale_day, Sale.payment_method, Sale.status, Sale.is_historical
+        )
+        if school_id:
+            query = query.where(Sale.school_id == school_id)
+
+        computed: dict[RollupKey, dict] = {}
+
+        def entry(key: RollupKey) -> dict:
+            return computed.setdefault(key, {
+                "sales_count": 0,
+                "total_amount": Decimal("0"),
+                "paid_amount": Decimal("0"),
+                "adjustments_amount": Decimal("0"),
+            })
+
+        for row in (await self.db.execute(query)).all():
+            key = (
+                row.school_id,
+                row.sale_date,
+                _enum_value(row.payment_method) if row.payment_method else NO_PAYMENT_METHOD,
+                _enum_value(row.status),
+                bool(row.is_historical),
+            )
+            values = entry(key)
+            values["sales_count"] += row.sales_count
+            values["total_amount"] += Decimal(str(row.total_amount))
+            values["paid_amount"] += Decimal(str(row.paid_amount))
+
+        # Approved sale changes post INCOME/EXPENSE transactions
+        adjustment_query = select(
+            Transaction.school_id,
+            Transaction.transaction_date,
+            Transaction.payment_method,
+            Transaction.type,
+            func.sum(Transaction.amount).label("amount"),
+        ).where(
+            Transaction.category == CHANGES_CATEGORY,
+            Transaction.school_id.isnot(None)
+        ).group_by(
+            Transaction.school_id,
+            Transaction.transaction_date,
+            Transaction.payment_method,
+            Transaction.type
+        )
+        if school_id:
+            adjustment_query = adjustment_query.where(Transaction.school_id == school_id)
+
+        for row in (await self.db.execute(adjustment_query)).all():
+            key = (
+                row.school_id,
+                row.transaction_date,
+                _enum_value(row.payment_method),
+                SaleStatus.COMPLETED.value,
+                False,
+            )
+            amount = Decimal(str(row.amount))
+            if row.type == TransactionType.EXPENSE:
+                amount = -amount
+            entry(key)["adjustments_amount"] += amount
+
+        return computed
+
+    async def rebuild(self, school_id: UUID | None = None) -> int:
+        """
+        Recompute rollup rows from raw data (backfill)
+
+        Args:
+            school_id: Limit to one school (all schools if None)
+
+        Returns:
+            Number of rollup rows written
+        """
+        computed = await self.compute_from_sales(school_id)
+
+        stmt = delete(SalesDailyRollup)
+        if school_id:
+            stmt = stmt.where(SalesDailyRollup.school_id == school_id)
+        await self.db.execute(stmt)
+
+        if computed:
+            now = datetime.utcnow()
+            await self.db.execute(
+                insert(SalesDailyRollup),
+                [
+                    {
+                        "school_id": key[0],
+                        "sale_date": key[1],
+                        "payment_method": key[2],
+                        "status": key[3],
+                        "is_historical": key[4],
+                        "updated_at": now,
+                        **values,
+                    }
+                    for key, values in computed.items()
+                ]
+            )
+        await self.db.flush()
+        return len(computed)
+
+    async def find_inconsistencies(
+        self,
+        school_id: UUID | None = None
+    ) -> list[dict]:
+        """
+        Compare rollup rows against raw sales
+
+        Args:
+            school_id: Limit to one school (all schools if None)
+
+        Returns:
+            One dict per mismatching key with expected and stored values
+        """
+        computed = await self.compute_from_sales(school_id)
+
+        query = select(SalesDailyRollup)
+        if school_id:
+            query = query.where(SalesDailyRollup.school_id == school_id)
+        stored = {
+            (r.school_id, r.sale_date, r.payment_method, r.status, r.is_historical): {
+                "sales_count": r.sales_count,
+                "total_amount": Decimal(str(r.total_amount)),
+                "paid_amount": Decimal(str(r.paid_amount)),
+                "adjustments_amount": Decimal(str(r.adjustments_amount)),
+            }
+            for r in (await self.db.execute(query)).scalars().all()
+        }
+
+        empty = {
+            "sales_count": 0,
+            "total_amount": Decimal("0"),
+            "paid_amount": Decimal("0"),
+            "adjustments_amount": Decimal("0"),
+        }
+        mismatches = []
+        for key in sorted(computed.keys() | stored.keys(), key=str):
+            expected = computed.get(key, empty)
+            actual = stored.get(key, empty)
+            if expected != actual:
+                mismatches.append({
+                    "school_id": str(key[0]),
+                    "sale_date": key[1].isoformat(),
+                    "payment_method": key[2],
+                    "status": key[3],
+                    "is_historical": key[4],
+                    "expected": expected,
+                    "stored": actual,
+                })
+        return mismatches
@@ -5,6 +5,7 @@ from uuid import UUID
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache
 from app.models.school import School
 from app.schemas.school import SchoolCreate, SchoolUpdate, SchoolSummary
 from app.services.base import BaseService
@@ -39,7 +40,16 @@ class SchoolService(BaseService[School]):
         if hasattr(school_data.settings, 'model_dump'):
             data_dict['settings'] = school_data.settings.model_dump()
 
-        return await self.create(data_dict)
+        school = await self.create(data_dict)
+        cache.invalidate_after_commit(self.db, "schools")
+        return school
+
+    async def update(self, id: UUID, obj_data: dict) -> School | None:
+        """Update school and drop cached school pages and product lists"""
+        school = await super().update(id, obj_data)
+        cache.invalidate_after_commit(self.db, "schools")
+        cache.invalidate_after_commit(self.db, "products", id)
+        return school
 
     async def update_school(self, school_id: UUID, school_data: SchoolUpdate) -> School | None:
         """
@@ -117,6 +127,7 @@ class SchoolService(BaseService[School]):
             if school:
                 school.display_order = item["display_order"]
         await self.db.flush()
+        cache.invalidate_after_commit(self.db, "schools")
 
     async def get_school_summary(self, school_id: UUID) -> SchoolSummary | None:
         """
@@ -0,0 +1,125 @@
+"""
+Document Sequence Service
+
+Shared allocator for human-readable document codes. Every code generator
+(sales, orders, alterations, clients, products, global products) goes
+through here instead of counting or MAX()-scanning its own table.
+"""
+import re
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy import select, update, func, cast, Integer
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sequence import DocumentSequence
+
+
+GLOBAL_SCOPE = "global"
+
+
+class DocumentSequenceService:
+    """Service for allocating sequential document numbers"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def next_value(
+        self,
+        prefix: str,
+        school_id: UUID | None = None,
+        seed: Callable[[], Awaitable[int]] | None = None
+    ) -> int:
+        """
+        Allocate the next number for a prefix
+
+        The counter row stays locked until the surrounding transaction ends,
+        so concurrent allocations for the same (school, prefix) are serialized
+        and a rolled back transaction gives its number back (no gaps).
+
+        Args:
+            prefix: Code prefix, e.g. "VNT-2026-"
+            school_id: School UUID, or None for codes shared by all schools
+            seed: Returns the highest number already used, consulted only
+                the first time a prefix is seen (codes created before the
+                counter existed)
+
+        Returns:
+            Allocated number (1-based)
+        """
+        scope = str(school_id) if school_id else GLOBAL_SCOPE
+
+        # Fast path: the counter already exists
+        result = await self.db.execute(
+            update(DocumentSequence)
+            .where(
+                DocumentSequence.scope == scope,
+                DocumentSequence.prefix == prefix
+            )
+            .values(last_value=DocumentSequence.last_value + 1)
+            .returning(DocumentSequence.last_value)
+            .execution_options(synchronize_session=False)
+        )
+        value = result.scalar_one_or_none()
+        if value is not None:
+            return value
+
+        # First allocation for this prefix: start after existing codes.
+        # ON CONFLICT covers a concurrent transaction creating the row first.
+        start = await seed() if seed else 0
+        result = await self.db.execute(
+            insert(DocumentSequence)
+            .values(scope=scope, prefix=prefix, last_value=start + 1)
+            .on_conflict_do_update(
+                index_elements=[DocumentSequence.scope, DocumentSequence.prefix],
+                set_={"last_value": DocumentSequence.last_value + 1}
+            )
+            .returning(DocumentSequence.last_value)
+        )
+        return result.scalar_one()
+
+    async def next_code(
+        self,
+        prefix: str,
+        width: int,
+        school_id: UUID | None = None,
+        seed: Callable[[], Awaitable[int]] | None = None
+    ) -> str:
+        """
+        Allocate the next code for a prefix, e.g. "VNT-2026-0001"
+
+        Args:
+            prefix: Code prefix
+            width: Zero padding of the numeric part
+            school_id: School UUID, or None for global codes
+            seed: See next_value
+
+        Returns:
+            Formatted code
+        """
+        value = await self.next_value(prefix, school_id, seed)
+        return f"{prefix}{value:0{width}d}"
+
+    async def max_code_number(self, column, prefix: str, *criteria) -> int:
+        """
+        Highest numeric suffix among existing codes with a prefix
+
+        Used as seed when a counter is created for data that predates it.
+
+        Args:
+            column: Code column, e.g. Sale.code
+            prefix: Code prefix
+            *criteria: Extra WHERE clauses (e.g. school filter)
+
+        Returns:
+            Highest number found, 0 if none
+        """
+        suffix = func.substr(column, len(prefix) + 1)
+        result = await self.db.execute(
+            select(func.max(cast(suffix, Integer))).where(
+                column.regexp_match(f"^{re.escape(prefix)}[0-9]+$"),
+                *criteria
+            )
+        )
+        return result.scalar_one_or_none() or 0
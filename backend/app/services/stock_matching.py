@@ -0,0 +1,112 @@
+"""
+Stock Matching - Lookup index of products and available stock
+
+Order items reference garment type + size + color, not a product. This
+index resolves them to the best-stocked matching product in constant
+time per lookup and tracks "virtual consumption" so that several items
+asking for the same product see the reduced availability.
+"""
+from collections import defaultdict
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import Product, Inventory
+
+
+class ProductStockIndex:
+    """
+    Products of one school indexed by (garment_type_id, size, color)
+
+    Size or color left empty on the item act as wildcards, so products are
+    also indexed by (garment_type_id, size), (garment_type_id, color) and
+    garment_type_id alone. Candidates keep load order, and ties on stock
+    resolve to the first loaded product.
+    """
+
+    def __init__(self, rows: list[tuple[Product, int | None]]):
+        self._products: dict[UUID, Product] = {}
+        self._stock: dict[UUID, int] = {}
+        self._by_variant: dict[tuple, list[UUID]] = defaultdict(list)
+        self._by_size: dict[tuple, list[UUID]] = defaultdict(list)
+        self._by_color: dict[tuple, list[UUID]] = defaultdict(list)
+        self._by_type: dict[UUID, list[UUID]] = defaultdict(list)
+
+        for product, quantity in rows:
+            self._products[product.id] = product
+            self._stock[product.id] = quantity or 0
+            gt_id = product.garment_type_id
+            self._by_variant[(gt_id, product.size, product.color)].append(product.id)
+            self._by_size[(gt_id, product.size)].append(product.id)
+            self._by_color[(gt_id, product.color)].append(product.id)
+            self._by_type[gt_id].append(product.id)
+
+    @classmethod
+    async def load(
+        cls,
+        db: AsyncSession,
+        school_id: UUID,
+        garment_type_ids: list[UUID]
+    ) -> "ProductStockIndex":
+        """
+        Load active products of the given garment types with their stock
+
+        Args:
+            db: Database session
+            school_id: School UUID
+            garment_type_ids: Garment types present in the order
+
+        Returns:
+            Index over the matching products
+        """
+        if not garment_type_ids:
+            return cls([])
+
+        result = await db.execute(
+            select(Product, Inventory.quantity)
+            .outerjoin(Inventory, Product.id == Inventory.product_id)
+            .where(
+                Product.school_id == school_id,
+                Product.is_active == True,
+                Product.garment_type_id.in_(garment_type_ids)
+            )
+        )
+        return cls(result.all())
+
+    def _candidates(self, garment_type_id: UUID, size: str | None, color: str | None) -> list[UUID]:
+        if size and color:
+            return self._by_variant.get((garment_type_id, size, color), [])
+        if size:
+            return self._by_size.get((garment_type_id, size), [])
+        if color:
+            return self._by_color.get((garment_type_id, color), [])
+        return self._by_type.get(garment_type_id, [])
+
+    def best_match(
+        self,
+        garment_type_id: UUID,
+        size: str | None,
+        color: str | None
+    ) -> tuple[Product | None, int]:
+        """
+        Product with the most remaining stock for an order item
+
+        Falls back to any product of the same garment type when no
+        product matches size/color.
+
+        Returns:
+            (product, remaining stock) or (None, 0) if the garment type
+            has no products
+        """
+        candidates = (
+            self._candidates(garment_type_id, size, color)
+            or self._by_type.get(garment_type_id, [])
+        )
+        if not candidates:
+            return None, 0
+        product_id = max(candidates, key=self._stock.__getitem__)
+        return self._products[product_id], self._stock[product_id]
+
+    def consume(self, product_id: UUID, quantity: int) -> None:
+        """Reserve stock so later lookups see the reduced availability"""
+        self._stock[product_id] -= quantity
@@ -0,0 +1,157 @@
+"""
+Upload Storage - Streaming, deduplicated writes of uploaded files
+
+Used by documents, order payment proofs and garment type images. The
+upload is copied in chunks (never fully in memory) to a temporary file
+in the target directory; disk writes and hashing run in the thread pool
+so the event loop keeps serving requests. The size limit is checked as
+chunks arrive, so an oversized upload is rejected without writing it
+all.
+
+Files are content-addressed: the final name is the SHA-256 of the
+content, and the temp file is renamed into place atomically. Uploading
+an identical file again reuses the stored one. Callers that delete files
+must first check that no other record still points to the same path.
+
+Reusing a file and deleting it are serialized per file name with a
+PostgreSQL advisory lock (lock_stored_file), held until the transaction
+ends: an upload passes its session to store_upload, which takes the lock
+before checking for an existing file, and a delete takes it before
+counting references. Otherwise a delete could count no references and
+remove the file just as a concurrent upload decided to reuse it.
+"""
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Protocol
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Public at /uploads (StaticFiles mount in app.main)
+UPLOADS_BASE_DIR = Path("/var/www/uniformes-system-v2/uploads")
+
+
+class AsyncReadable(Protocol):
+    """Upload source (fastapi.UploadFile)"""
+
+    async def read(self, size: int = -1) -> bytes:
+        ...
+
+
+class UploadTooLargeError(ValueError):
+    """The upload exceeded the allowed size"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"El archivo excede el tamaño máximo de {max_size // (1024 * 1024)}MB")
+
+
+@dataclass(frozen=True)
+class StoredUpload:
+    """A file saved by store_upload"""
+    path: Path
+    size: int
+    sha256: str
+    deduplicated: bool  # An identical file was already stored
+
+    @property
+    def filename(self) -> str:
+        return self.path.name
+
+
+def _open_temp(directory: Path) -> tuple[BinaryIO, Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    return os.fdopen(fd, "wb"), Path(name)
+
+
+def _write_chunk(temp: BinaryIO, digest, chunk: bytes) -> None:
+    digest.update(chunk)
+    temp.write(chunk)
+
+
+def _finish(temp: BinaryIO, temp_path: Path, final_path: Path) -> bool:
+    """Persist the temp file as final_path; True if it already existed"""
+    temp.flush()
+    os.fsync(temp.fileno())
+    temp.close()
+    if final_path.exists():
+        temp_path.unlink()
+        return True
+    os.replace(temp_path, final_path)
+    return False
+
+
+def _discard(temp: BinaryIO, temp_path: Path) -> None:
+    temp.close()
+    temp_path.unlink(missing_ok=True)
+
+
+async def lock_stored_file(db: AsyncSession, filename: str) -> None:
+    """Hold the dedup/delete lock of a stored file until the transaction ends"""
+    await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(filename))))
+
+
+async def store_upload(
+    source: AsyncReadable,
+    directory: Path,
+    extension: str,
+    max_size: int,
+    db: AsyncSession | None = None
+) -> StoredUpload:
+    """
+    Stream an upload to `directory` as `<sha256><extension>`.
+
+    Args:
+        source: File to read in chunks (e.g. UploadFile)
+        directory: Target directory (created if needed)
+        extension: File extension including the dot, e.g. ".pdf"
+        max_size: Maximum size in bytes
+        db: Session of the transaction that will reference the file; the
+            file is locked in it before deduplicating. Required where
+            stored files can be deleted.
+
+    Returns:
+        StoredUpload with the final path, size and hash
+
+    Raises:
+        UploadTooLargeError: If the upload is larger than max_size
+    """
+    temp, temp_path = await asyncio.to_thread(_open_temp, directory)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        while chunk := await source.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                raise UploadTooLargeError(max_size)
+            await asyncio.to_thread(_write_chunk, temp, digest, chunk)
+
+        sha256 = digest.hexdigest()
+        final_path = directory / f"{sha256}{extension.lower()}"
+        if db is not None:
+            await lock_stored_file(db, final_path.name)
+        deduplicated = await asyncio.to_thread(_finish, temp, temp_path, final_path)
+    except BaseException:
+        await asyncio.to_thread(_discard, temp, temp_path)
+        raise
+
+    return StoredUpload(path=final_path, size=size, sha256=sha256, deduplicated=deduplicated)
+
+
+async def remove_stored_file(path: Path) -> bool:
+    """Delete a stored file (off the event loop); False if it did not exist"""
+    def _remove() -> bool:
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    return await asyncio.to_thread(_remove)
@@ -18,6 +18,7 @@ from app.schemas.user import (
     TokenData,
     PasswordChange,
 )
+from app.services.auth_cache import invalidate_auth_snapshot_after_commit
 from app.services.base import BaseService
 
 
@@ -114,6 +115,18 @@ class UserService(BaseService[User]):
 
         return await self.update(user_id, update_dict)
 
+    async def update(self, id: UUID, obj_data: dict) -> User | None:
+        """Update user and drop its cached auth snapshot"""
+        user = await super().update(id, obj_data)
+        invalidate_auth_snapshot_after_commit(self.db, id)
+        return user
+
+    async def delete(self, id: UUID) -> bool:
+        """Delete user and drop its cached auth snapshot"""
+        deleted = await super().delete(id)
+        invalidate_auth_snapshot_after_commit(self.db, id)
+        return deleted
+
     async def get_by_username(self, username: str) -> User | None:
         """
         Get user by username
@@ -197,6 +210,7 @@ class UserService(BaseService[User]):
             .values(last_login=datetime.utcnow())
         )
         await self.db.flush()
+        invalidate_auth_snapshot_after_commit(self.db, user.id)
 
         return user
 
@@ -358,6 +372,7 @@ class UserService(BaseService[User]):
         self.db.add(school_role)
         await self.db.flush()
         await self.db.refresh(school_role)
+        invalidate_auth_snapshot_after_commit(self.db, user_id)
 
         return school_role
 
@@ -387,6 +402,7 @@ class UserService(BaseService[User]):
             .values(role=role)
         )
         await self.db.flush()
+        invalidate_auth_snapshot_after_commit(self.db, user_id)
 
         result = await self.db.execute(
             select(UserSchoolRole).where(
@@ -420,6 +436,7 @@ class UserService(BaseService[User]):
             )
         )
         await self.db.flush()
+        invalidate_auth_snapshot_after_commit(self.db, user_id)
         return result.rowcount > 0
 
     async def get_user_schools(self, user_id: UUID, include_school: bool = False) -> list[UserSchoolRole]:
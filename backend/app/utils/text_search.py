@@ -0,0 +1,34 @@
+"""
+Accent-insensitive text normalization for search columns
+
+The database computes search columns with `search_normalize()` (a plain
+SQL function, so it works without the unaccent extension) and queries
+normalize the user's term with normalize_search_term(). Both use the
+same character map so "Pérez", "PEREZ" and "perez" match each other.
+"""
+from sqlalchemy import DDL
+
+# Accented characters and their plain equivalents (same length)
+ACCENTED = "áéíóúüñàèìòùâêîôûäëïöçÁÉÍÓÚÜÑÀÈÌÒÙÂÊÎÔÛÄËÏÖÇ"
+PLAIN = "aeiouunaeiouaeiouaeiocAEIOUUNAEIOUAEIOUAEIOC"
+
+_TRANSLATION = str.maketrans(ACCENTED, PLAIN)
+
+# IMMUTABLE so it can back generated columns and expression indexes
+SEARCH_NORMALIZE_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION search_normalize(value TEXT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+PARALLEL SAFE
+AS $$
+    SELECT lower(translate(value, '{ACCENTED}', '{PLAIN}'))
+$$;
+"""
+
+create_search_normalize_function = DDL(SEARCH_NORMALIZE_FUNCTION)
+
+
+def normalize_search_term(value: str) -> str:
+    """Normalize a search term the same way search_normalize() does"""
+    return " ".join(value.translate(_TRANSLATION).lower().split())
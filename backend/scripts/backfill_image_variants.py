@@ -0,0 +1,82 @@
+"""
+Genera las variantes (WebP/JPEG redimensionadas) de imágenes de prendas.
+
+Recorre las imágenes de tipos de prenda (por colegio y globales) que aún
+no tienen variantes y las crea junto al original con el mismo pool de
+procesos que usa la subida. Es idempotente: con --force regenera todas.
+
+Uso:
+    cd backend
+    source venv/bin/activate
+    python -m scripts.backfill_image_variants
+    python -m scripts.backfill_image_variants --force --batch 20
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from app.db.session import AsyncSessionLocal
+from app.models.product import GarmentTypeImage, GlobalGarmentTypeImage
+from app.services.image_variants import generate_variants, shutdown_pool
+from app.services.uploads import UPLOADS_BASE_DIR
+
+
+async def backfill(model, force: bool, batch_size: int) -> tuple[int, int]:
+    """Devuelve (imágenes procesadas, imágenes sin archivo o ilegibles)"""
+    done = skipped = 0
+    last_id = None
+    while True:
+        async with AsyncSessionLocal() as db:
+            query = select(model).order_by(model.id).limit(batch_size)
+            if not force:
+                query = query.where(model.variants.is_(None))
+            if last_id is not None:
+                query = query.where(model.id > last_id)
+            images = (await db.execute(query)).scalars().all()
+            if not images:
+                return done, skipped
+
+            # Cada lote se procesa en paralelo en el pool
+            originals = [
+                UPLOADS_BASE_DIR / image.image_url.removeprefix("/uploads/")
+                for image in images
+            ]
+            results = await asyncio.gather(*(
+                generate_variants(path, image.image_url) if path.exists() else asyncio.sleep(0)
+                for path, image in zip(originals, images)
+            ))
+            for image, variants in zip(images, results):
+                if variants is None:
+                    skipped += 1
+                    continue
+                image.variants = variants
+                done += 1
+            await db.commit()
+            last_id = images[-1].id
+
+
+async def main(force: bool, batch_size: int) -> None:
+    try:
+        for model, label in (
+            (GarmentTypeImage, "por colegio"),
+            (GlobalGarmentTypeImage, "globales"),
+        ):
+            done, skipped = await backfill(model, force, batch_size)
+            print(f"✓ Imágenes {label}: {done} con variantes, {skipped} omitidas")
+    finally:
+        shutdown_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--force", action="store_true", help="Regenerar también las que ya tienen variantes")
+    parser.add_argument("--batch", type=int, default=50, help="Imágenes por lote")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.force, args.batch))
@@ -0,0 +1,114 @@
+"""
+Microbenchmark del costo de autenticación por request.
+
+Mide la cadena de dependencias de un endpoint protegido por colegio
+(get_auth_snapshot + require_school_access) con el snapshot de usuario en
+caché y sin caché (AUTH_CACHE_TTL_SECONDS=0), contando sentencias SQL y
+latencia por request. Crea un usuario temporal con roles en varios colegios
+dentro de una transacción que se revierte al final.
+
+Uso:
+    cd backend
+    source venv/bin/activate
+    python -m scripts.benchmark_auth
+    python -m scripts.benchmark_auth --schools 20 --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.api.dependencies import get_auth_snapshot, require_school_access
+from app.core.cache import cache
+from app.core.config import settings
+from app.models.school import School
+from app.models.user import User, UserRole, UserSchoolRole
+from app.services.user import UserService
+
+
+async def run_benchmark(schools: int, requests: int) -> None:
+    """Compara el costo de autenticación con y sin snapshot en caché"""
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+
+    statements = 0
+
+    def count_statement(*args, **kwargs):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+        original_ttl = settings.AUTH_CACHE_TTL_SECONDS
+
+        try:
+            unique = uuid4().hex[:8]
+            user = User(username=f"auth_{unique}", email=f"auth_{unique}@example.com", hashed_password="x")
+            db.add(user)
+            await db.flush()
+
+            school_ids = []
+            for i in range(schools):
+                school = School(code=f"AB-{unique}-{i}", name=f"Auth {unique} {i}", slug=f"ab-{unique}-{i}")
+                db.add(school)
+                await db.flush()
+                db.add(UserSchoolRole(user_id=user.id, school_id=school.id, role=UserRole.SELLER))
+                school_ids.append(school.id)
+            await db.flush()
+
+            token = UserService(db).create_access_token(user_id=user.id, username=user.username)
+            credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token.access_token)
+            check_access = require_school_access(UserRole.SELLER)
+
+            async def authorize(school_id):
+                snapshot = await get_auth_snapshot(credentials, db)
+                await check_access(school_id, snapshot)
+
+            print(f"colegios={schools} requests={requests}")
+            print(f"{'modo':<10} {'caché':<7} {'SQL/request':>12} {'mediana us':>11} {'p95 us':>9}")
+            for label, ttl in (("sin caché", 0), ("en caché", original_ttl or 30)):
+                settings.AUTH_CACHE_TTL_SECONDS = ttl
+                await cache.clear()
+                # Calentar (y poblar la caché cuando está activa)
+                await authorize(school_ids[0])
+
+                statements = 0
+                elapsed = []
+                for n in range(requests):
+                    start = time.perf_counter()
+                    await authorize(school_ids[n % schools])
+                    elapsed.append((time.perf_counter() - start) * 1_000_000)
+
+                elapsed.sort()
+                p95 = elapsed[int(len(elapsed) * 0.95) - 1]
+                print(
+                    f"{label:<10} {cache.backend_name:<7} {statements / requests:>12.2f} "
+                    f"{statistics.median(elapsed):>11.0f} {p95:>9.0f}"
+                )
+        finally:
+            settings.AUTH_CACHE_TTL_SECONDS = original_ttl
+            await db.close()
+            await trans.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--schools", type=int, default=5, help="Colegios con rol para el usuario")
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.schools, args.requests))
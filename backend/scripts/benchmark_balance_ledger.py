@@ -0,0 +1,105 @@
+"""
+Prueba de carga del registro de movimientos en cuentas globales.
+
+Lanza escritores concurrentes (cada uno en su propia transacción) que
+registran movimientos sobre una misma cuenta, primero con la ruta
+lectura-modificación-escritura de BalanceAccount.balance y luego en modo
+ledger (BALANCE_LEDGER_ENABLED). Reporta movimientos por segundo y
+actualizaciones perdidas (saldo final vs. suma esperada).
+
+Los movimientos se confirman (commit) para que haya concurrencia real; la
+cuenta temporal y sus movimientos se eliminan al terminar.
+
+Uso:
+    cd backend
+    source venv/bin/activate
+    python -m scripts.benchmark_balance_ledger
+    python -m scripts.benchmark_balance_ledger --writers 20 --movements 50
+"""
+import argparse
+import asyncio
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+from uuid import UUID, uuid4
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.models.accounting import BalanceAccount, AccountType
+from app.services.balance_integration import BalanceIntegrationService
+from app.services.balance_ledger import BalanceLedgerService
+
+AMOUNT = Decimal("1000")
+
+
+async def writer(engine, account_id: UUID, movements: int) -> None:
+    """Registra `movements` ventas, una transacción por movimiento"""
+    for _ in range(movements):
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            account = await db.get(BalanceAccount, account_id)
+            await BalanceIntegrationService(db).apply_to_account(account, AMOUNT, "Venta benchmark")
+            await db.commit()
+
+
+async def run_mode(engine, label: str, ledger: bool, writers: int, movements: int) -> None:
+    settings.BALANCE_LEDGER_ENABLED = ledger
+
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        account = BalanceAccount(
+            account_type=AccountType.ASSET_CURRENT,
+            name=f"Benchmark {label}",
+            code=f"BENCH-{uuid4().hex[:8]}",
+            balance=Decimal("0")
+        )
+        db.add(account)
+        await db.commit()
+        account_id = account.id
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(writer(engine, account_id, movements) for _ in range(writers)))
+        elapsed = time.perf_counter() - start
+
+        async with AsyncSession(engine) as db:
+            if ledger:
+                await BalanceLedgerService(db).compact([account_id])
+                await db.commit()
+            final = (await db.get(BalanceAccount, account_id)).balance
+
+        total = writers * movements
+        lost = (AMOUNT * total - final) / AMOUNT
+        print(f"{label:<22} {total / elapsed:>10.0f} {elapsed:>9.2f} {lost:>9.0f}")
+    finally:
+        async with AsyncSession(engine) as db:
+            await db.execute(delete(BalanceAccount).where(BalanceAccount.id == account_id))
+            await db.commit()
+
+
+async def run_benchmark(writers: int, movements: int) -> None:
+    """Compara ambas rutas con la misma carga"""
+    engine = create_async_engine(settings.DATABASE_URL, echo=False, pool_size=writers, max_overflow=0)
+    original = settings.BALANCE_LEDGER_ENABLED
+
+    print(f"escritores={writers} movimientos por escritor={movements}")
+    print(f"{'modo':<22} {'mov/seg':>10} {'segundos':>9} {'perdidas':>9}")
+    try:
+        await run_mode(engine, "lectura-escritura", False, writers, movements)
+        await run_mode(engine, "ledger", True, writers, movements)
+    finally:
+        settings.BALANCE_LEDGER_ENABLED = original
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=10, help="Transacciones concurrentes")
+    parser.add_argument("--movements", type=int, default=50, help="Movimientos por escritor")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.writers, args.movements))
@@ -0,0 +1,145 @@
+"""
+Benchmark del reporte de flujo de caja global (GET /global/accounting/cash-flow).
+
+Inserta un año de transacciones y gastos sintéticos y compara el agrupado
+anterior (cargar cada Transaction/Expense y agrupar en Python) con el
+agrupado en SQL de AccountingService.get_cash_flow_report, por día, semana
+y mes. Todo se ejecuta dentro de una transacción que se revierte al final,
+así que no deja datos en la base.
+
+Uso:
+    cd backend
+    source venv/bin/activate
+    python -m scripts.benchmark_cash_flow
+    python -m scripts.benchmark_cash_flow --per-day 200 --runs 5
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.models.accounting import (
+    Transaction, TransactionType, AccPaymentMethod, Expense, ExpenseCategory
+)
+from app.services.accounting import AccountingService
+
+# Año sintético lejos de los datos reales
+START = date(1990, 1, 1)
+END = date(1990, 12, 31)
+
+
+async def python_bucketing(db: AsyncSession, group_by: str) -> int:
+    """Agrupado anterior: carga todas las filas como objetos ORM"""
+    transactions = (await db.execute(
+        select(Transaction).where(
+            Transaction.transaction_date >= START,
+            Transaction.transaction_date <= END
+        )
+    )).scalars().all()
+    expenses = (await db.execute(
+        select(Expense).where(
+            Expense.expense_date >= START,
+            Expense.expense_date <= END,
+            Expense.is_active == True,
+            Expense.is_paid == True
+        )
+    )).scalars().all()
+
+    def key(day: date) -> str:
+        if group_by == "day":
+            return day.isoformat()
+        if group_by == "week":
+            iso_cal = day.isocalendar()
+            return f"{iso_cal.year}-W{iso_cal.week:02d}"
+        return day.strftime("%Y-%m")
+
+    periods = defaultdict(lambda: [Decimal("0"), Decimal("0")])
+    for t in transactions:
+        periods[key(t.transaction_date)][0 if t.type == TransactionType.INCOME else 1] += t.amount
+    for e in expenses:
+        periods[key(e.expense_date)][1] += e.amount_paid
+    db.expunge_all()
+    return len(periods)
+
+
+async def run_benchmark(per_day: int, runs: int) -> None:
+    """Compara el agrupado en Python con el agrupado en SQL"""
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+
+        try:
+            rng = random.Random(42)
+            days = [START + timedelta(days=i) for i in range((END - START).days + 1)]
+            await db.execute(insert(Transaction), [
+                {
+                    "type": rng.choice([TransactionType.INCOME, TransactionType.INCOME, TransactionType.EXPENSE]),
+                    "amount": Decimal(rng.randrange(5_000, 300_000, 1_000)),
+                    "payment_method": AccPaymentMethod.CASH,
+                    "description": "Movimiento sintético",
+                    "transaction_date": day,
+                }
+                for day in days
+                for _ in range(per_day)
+            ])
+            await db.execute(insert(Expense), [
+                {
+                    "category": ExpenseCategory.OTHER,
+                    "description": "Gasto sintético",
+                    "amount": Decimal("50000"),
+                    "amount_paid": Decimal("50000"),
+                    "expense_date": day,
+                    "is_paid": True,
+                }
+                for day in days
+                for _ in range(max(1, per_day // 10))
+            ])
+
+            service = AccountingService(db)
+            print(f"{len(days) * per_day} transacciones en {START.year}")
+            print(f"{'group_by':>8} {'periods':>8} {'python ms':>10} {'sql ms':>10}")
+            for group_by in ("day", "week", "month"):
+                python_ms = []
+                sql_ms = []
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    period_count = await python_bucketing(db, group_by)
+                    python_ms.append((time.perf_counter() - start) * 1000)
+
+                    start = time.perf_counter()
+                    report = await service.get_cash_flow_report(START, END, group_by)
+                    sql_ms.append((time.perf_counter() - start) * 1000)
+                    assert len(report.periods) == period_count
+
+                print(
+                    f"{group_by:>8} {period_count:>8} "
+                    f"{sum(python_ms) / runs:>10.1f} {sum(sql_ms) / runs:>10.1f}"
+                )
+        finally:
+            await db.close()
+            await trans.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--per-day", type=int, default=100, help="Transacciones por día")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.per_day, args.runs))
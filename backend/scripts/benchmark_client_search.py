@@ -0,0 +1,124 @@
+"""
+Benchmark de la búsqueda de clientes.
+
+Compara la búsqueda anterior (cinco ILIKE '%term%' unidos con OR sobre
+code, name, email, phone y student_name) contra ClientService.search_clients
+(columna search_text normalizada + índice trigram y atajos por prefijo de
+código/teléfono). Inserta clientes sintéticos con generate_series dentro de
+una transacción que se revierte al final.
+
+Uso:
+    cd backend
+    source venv/bin/activate
+    python -m scripts.benchmark_client_search
+    python -m scripts.benchmark_client_search --clients 200000 --repeat 20
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.models.client import Client
+from app.services.client import ClientService
+
+TERMS = ["perez", "García", "BNC-0001", "300 55", "maria lo", "zzzz"]
+
+SEED_SQL = """
+INSERT INTO clients (id, code, name, phone, email, student_name, client_type,
+                     is_verified, welcome_email_sent, is_active, created_at, updated_at)
+SELECT gen_random_uuid(),
+       'BNC-' || lpad(n::text, 6, '0'),
+       (ARRAY['María', 'José', 'Ana', 'Luis', 'Camila', 'Andrés'])[1 + n % 6] || ' ' ||
+       (ARRAY['Pérez', 'García', 'López', 'Martínez', 'Gómez', 'Ruiz'])[1 + (n / 6) % 6] || ' ' || n,
+       '300' || lpad((n * 7919 % 10000000)::text, 7, '0'),
+       'cliente' || n || '@example.com',
+       CASE WHEN n % 3 = 0 THEN 'Estudiante ' || n END,
+       'regular', false, false, true, now(), now()
+FROM generate_series(1, :count) AS n
+"""
+
+
+def legacy_search(term: str, limit: int = 20):
+    """Consulta anterior: ILIKE sobre cada columna, sin índice utilizable"""
+    pattern = f"%{term}%"
+    return (
+        select(Client)
+        .where(
+            Client.is_active == True,
+            or_(
+                Client.code.ilike(pattern),
+                Client.name.ilike(pattern),
+                Client.email.ilike(pattern),
+                Client.phone.ilike(pattern),
+                Client.student_name.ilike(pattern),
+            )
+        )
+        .order_by(Client.name)
+        .limit(limit)
+    )
+
+
+async def timed(fn, repeat: int) -> tuple[float, int]:
+    """Mediana en ms y cantidad de filas de la última ejecución"""
+    elapsed = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = await fn()
+        elapsed.append((time.perf_counter() - start) * 1000)
+    return statistics.median(elapsed), rows
+
+
+async def run_benchmark(clients: int, repeat: int) -> None:
+    """Mide ambas búsquedas para cada término de prueba"""
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+
+        try:
+            await db.execute(text(SEED_SQL), {"count": clients})
+            await db.execute(text("ANALYZE clients"))
+
+            has_trgm = (await db.execute(text(
+                "SELECT 1 FROM pg_indexes WHERE indexname = 'ix_clients_search_text_trgm'"
+            ))).scalar() is not None
+            print(f"clientes={clients} repeticiones={repeat} índice trigram={'sí' if has_trgm else 'no'}")
+            print(f"{'término':<12} {'ILIKE ms':>9} {'filas':>6} {'nuevo ms':>9} {'filas':>6}")
+
+            service = ClientService(db)
+            for term in TERMS:
+                async def run_legacy():
+                    result = await db.execute(legacy_search(term))
+                    return len(result.scalars().all())
+
+                async def run_new():
+                    return len(await service.search_clients(term))
+
+                legacy_ms, legacy_rows = await timed(run_legacy, repeat)
+                new_ms, new_rows = await timed(run_new, repeat)
+                print(f"{term:<12} {legacy_ms:>9.2f} {legacy_rows:>6} {new_ms:>9.2f} {new_rows:>6}")
+        finally:
+            await db.close()
+            await trans.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=100_000, help="Clientes sintéticos a insertar")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.clients, args.repeat))
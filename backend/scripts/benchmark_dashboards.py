@@ -0,0 +1,183 @@
+"""
+Benchmark de latencia de los dashboards (consultas secuenciales vs. fan-out).
+
+Mide ReportsService.get_dashboard_summary, AccountingService.get_dashboard,
+PatrimonyService.get_patrimony_summary y GET /global/dashboard/stats con
+DB_FANOUT_ENABLED desactivado y activado.
+
+Por defecto usa los colegios activos de la base configurada. Con --seed N
+crea N colegios temporales con productos, inventario y ventas (datos
+confirmados, porque el fan-out usa otras conexiones) y los elimina al final.
+
+Uso:
+    cd backend
+    source venv/bin/activate
+    python -m scripts.benchmark_dashboards
+    python -m scripts.benchmark_dashboards --seed 10 --runs 20
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from uuid import UUID, uuid4
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.models.school import School
+from app.models.user import User
+from app.models.product import GarmentType, Product, Inventory
+from app.models.sale import Sale, SaleStatus, PaymentMethod, SalesDailyRollup
+from app.services.reports import ReportsService
+from app.services.accounting import AccountingService
+from app.services.patrimony import PatrimonyService
+from app.services.sales_rollup import SalesRollupService
+from app.api.routes.dashboard import get_global_dashboard_stats
+
+
+async def seed(engine, schools: int, products: int, sales: int) -> tuple[list[UUID], UUID]:
+    """Crea colegios temporales con datos confirmados"""
+    unique = uuid4().hex[:8]
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        user = User(username=f"bench_{unique}", email=f"bench_{unique}@example.com", hashed_password="x")
+        db.add(user)
+        await db.flush()
+
+        school_ids = []
+        for i in range(schools):
+            school = School(code=f"BD-{unique}-{i}", name=f"Benchmark {unique} {i}", slug=f"bd-{unique}-{i}")
+            db.add(school)
+            await db.flush()
+            school_ids.append(school.id)
+
+            garment_type = GarmentType(school_id=school.id, name="Camisa")
+            db.add(garment_type)
+            await db.flush()
+
+            items = [
+                Product(
+                    school_id=school.id,
+                    garment_type_id=garment_type.id,
+                    code=f"PRD-{p:04d}",
+                    size=str(p),
+                    price=Decimal("45000"),
+                )
+                for p in range(products)
+            ]
+            db.add_all(items)
+            await db.flush()
+            db.add_all([
+                Inventory(school_id=school.id, product_id=p.id, quantity=(n % 7) * 3)
+                for n, p in enumerate(items)
+            ])
+
+            methods = list(PaymentMethod)
+            db.add_all([
+                Sale(
+                    school_id=school.id,
+                    code=f"VNT-{unique}-{s:05d}",
+                    user_id=user.id,
+                    status=SaleStatus.COMPLETED,
+                    payment_method=methods[s % len(methods)],
+                    total=Decimal("45000"),
+                    paid_amount=Decimal("45000"),
+                    sale_date=datetime.now(),
+                )
+                for s in range(sales)
+            ])
+            await db.flush()
+            await SalesRollupService(db).rebuild(school.id)
+
+        await db.commit()
+        return school_ids, user.id
+
+
+async def cleanup(engine, school_ids: list[UUID], user_id: UUID) -> None:
+    """Elimina los datos creados por seed()"""
+    async with AsyncSession(engine) as db:
+        await db.execute(delete(SalesDailyRollup).where(SalesDailyRollup.school_id.in_(school_ids)))
+        await db.execute(delete(Sale).where(Sale.school_id.in_(school_ids)))
+        await db.execute(delete(Inventory).where(Inventory.school_id.in_(school_ids)))
+        await db.execute(delete(Product).where(Product.school_id.in_(school_ids)))
+        await db.execute(delete(GarmentType).where(GarmentType.school_id.in_(school_ids)))
+        await db.execute(delete(School).where(School.id.in_(school_ids)))
+        await db.execute(delete(User).where(User.id == user_id))
+        await db.commit()
+
+
+async def measure(engine, call, runs: int) -> float:
+    """Mediana en ms de `runs` ejecuciones, cada una con su propia sesión"""
+    elapsed = []
+    for _ in range(runs):
+        # Measure the computation, not the response cache
+        await cache.clear()
+        async with AsyncSession(engine, expire_on_commit=False, autoflush=False) as db:
+            start = time.perf_counter()
+            await call(db)
+            elapsed.append((time.perf_counter() - start) * 1000)
+    return statistics.median(elapsed)
+
+
+async def run_benchmark(seed_schools: int, products: int, sales: int, runs: int) -> None:
+    """Compara latencias secuenciales y con fan-out"""
+    engine = create_async_engine(settings.DATABASE_URL, echo=False, pool_size=10, max_overflow=20)
+
+    seeded = None
+    if seed_schools:
+        seeded = await seed(engine, seed_schools, products, sales)
+        school_ids = seeded[0]
+    else:
+        async with AsyncSession(engine) as db:
+            result = await db.execute(select(School.id).where(School.is_active == True))
+            school_ids = list(result.scalars().all())
+
+    if not school_ids:
+        print("No hay colegios activos; use --seed N")
+        await engine.dispose()
+        return
+
+    school_id = school_ids[0]
+    endpoints = {
+        "reports.dashboard": lambda db: ReportsService(db).get_dashboard_summary(school_id),
+        "accounting.dashboard": lambda db: AccountingService(db).get_dashboard(school_id),
+        "patrimony.summary": lambda db: PatrimonyService(db).get_patrimony_summary(school_id),
+        "global.dashboard.stats": lambda db: get_global_dashboard_stats(db, None, school_ids),
+    }
+
+    try:
+        print(f"colegios={len(school_ids)} runs={runs}")
+        print(f"{'endpoint':<24} {'secuencial ms':>14} {'fan-out ms':>11}")
+        for name, call in endpoints.items():
+            # Calentar el pool y los planes de consulta
+            await measure(engine, call, 1)
+
+            settings.DB_FANOUT_ENABLED = False
+            sequential = await measure(engine, call, runs)
+            settings.DB_FANOUT_ENABLED = True
+            concurrent = await measure(engine, call, runs)
+            print(f"{name:<24} {sequential:>14.1f} {concurrent:>11.1f}")
+    finally:
+        settings.DB_FANOUT_ENABLED = True
+        if seeded:
+            await cleanup(engine, *seeded)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed", type=int, default=0, help="Colegios temporales a crear")
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--sales", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.seed, args.products, args.sales, args.runs))
@@ -0,0 +1,135 @@
+"""
+Benchmark de paginación del listado de ventas (GET /sales).
+
+Inserta un colegio con muchas ventas sintéticas (un millón por defecto) y
+compara, a distintas profundidades, la página con OFFSET contra la página
+por cursor (keyset sobre created_at, id), y el total exacto (COUNT) contra
+el aproximado (estimación de EXPLAIN). Todo se ejecuta dentro de una
+transacción que se revierte al final, así que no deja datos en la base.
+
+Requiere la migración d2e3f4a5b6c7 (índice ix_sales_created_at_id).
+
+Uso:
+    cd backend
+    source venv/bin/activate
+    python -m scripts.benchmark_pagination
+    python -m scripts.benchmark_pagination --rows 200000 --limit 50 --runs 5
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.db.pagination import CountMode, count_rows, encode_cursor, keyset_paginate
+from app.models.sale import Sale, SaleStatus
+from app.models.school import School
+from app.models.user import User
+
+BATCH_SIZE = 10_000
+
+
+async def timed(db: AsyncSession, query, runs: int) -> float:
+    """Milisegundos promedio de ejecutar la consulta"""
+    elapsed = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        (await db.execute(query)).all()
+        elapsed.append((time.perf_counter() - start) * 1000)
+    return sum(elapsed) / runs
+
+
+async def run_benchmark(rows: int, limit: int, runs: int) -> None:
+    """Compara OFFSET con cursor y COUNT exacto con aproximado"""
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+
+        try:
+            unique = uuid4().hex[:8]
+            school = School(
+                code=f"BENCH-{unique}",
+                name=f"Benchmark {unique}",
+                slug=f"benchmark-{unique}",
+            )
+            user = User(
+                username=f"bench_{unique}",
+                email=f"bench_{unique}@example.com",
+                hashed_password="x",
+            )
+            db.add_all([school, user])
+            await db.flush()
+
+            start_at = datetime(1990, 1, 1)
+            for offset in range(0, rows, BATCH_SIZE):
+                await db.execute(insert(Sale), [
+                    {
+                        "id": uuid4(),
+                        "school_id": school.id,
+                        "user_id": user.id,
+                        "code": f"VNT-B{unique}-{i:07d}",
+                        "total": Decimal("45000"),
+                        "paid_amount": Decimal("45000"),
+                        "status": SaleStatus.COMPLETED,
+                        "sale_date": start_at + timedelta(minutes=i),
+                        "created_at": start_at + timedelta(minutes=i),
+                        "updated_at": start_at + timedelta(minutes=i),
+                    }
+                    for i in range(offset, min(offset + BATCH_SIZE, rows))
+                ])
+            await db.execute(text("ANALYZE sales"))
+
+            base = select(Sale.id, Sale.created_at).where(Sale.school_id == school.id)
+            columns = (Sale.created_at, Sale.id)
+            print(f"{rows} ventas, páginas de {limit}")
+            print(f"{'depth':>9} {'offset ms':>10} {'cursor ms':>10}")
+
+            depth = limit
+            while depth < rows:
+                # Cursor equivalente a haber recorrido `depth` filas
+                last = (await db.execute(
+                    base.order_by(Sale.created_at.desc(), Sale.id.desc())
+                    .offset(depth - 1).limit(1)
+                )).one()
+                cursor = encode_cursor(last.created_at, last.id)
+
+                offset_ms = await timed(db, keyset_paginate(base, columns, limit, skip=depth), runs)
+                cursor_ms = await timed(db, keyset_paginate(base, columns, limit, cursor=cursor), runs)
+                print(f"{depth:>9} {offset_ms:>10.1f} {cursor_ms:>10.1f}")
+                depth *= 10
+
+            print(f"{'count':>11} {'total':>10} {'ms':>8}")
+            for mode in (CountMode.EXACT, CountMode.APPROXIMATE):
+                elapsed = []
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    total = await count_rows(db, base, mode)
+                    elapsed.append((time.perf_counter() - start) * 1000)
+                print(f"{mode.value:>11} {total:>10} {sum(elapsed) / runs:>8.1f}")
+        finally:
+            await db.close()
+            await trans.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Ventas sintéticas")
+    parser.add_argument("--limit", type=int, default=100, help="Tamaño de página")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.rows, args.limit, args.runs))
@@ -0,0 +1,117 @@
+"""
+Benchmark de generación de nómina (PayrollService.create_payroll_run).
+
+Crea cientos de empleados temporales con bonos, genera una liquidación para
+todos y cuenta cuántas sentencias SQL y cuánto tiempo toma. Todo se ejecuta
+dentro de una transacción que se revierte al final, así que no deja datos en
+la base.
+
+Uso:
+    cd backend
+    source venv/bin/activate
+    python -m scripts.benchmark_payroll_run
+    python -m scripts.benchmark_payroll_run --employees 100 500 --runs 5
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.models.payroll import Employee, EmployeeBonus, BonusType
+from app.schemas.payroll import PayrollRunCreate
+from app.services.payroll_service import PayrollService
+
+
+async def run_benchmark(sizes: list[int], runs: int) -> None:
+    """Cuenta consultas y latencia de create_payroll_run por número de empleados"""
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+
+    statements = 0
+
+    def count_statement(*args, **kwargs):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+
+        try:
+            unique = uuid4().hex[:8]
+            employees = [
+                Employee(
+                    full_name=f"Empleado {unique} {i:04d}",
+                    document_id=f"BENCH-{unique}-{i:04d}",
+                    position="Vendedor",
+                    hire_date=date.today() - timedelta(days=365),
+                    base_salary=Decimal("1300000"),
+                    health_deduction=Decimal("52000"),
+                    pension_deduction=Decimal("52000"),
+                )
+                for i in range(max(sizes))
+            ]
+            db.add_all(employees)
+            await db.flush()
+
+            db.add_all([
+                EmployeeBonus(
+                    employee_id=employee.id,
+                    name="Auxilio de transporte",
+                    bonus_type=BonusType.FIXED,
+                    amount=Decimal("162000"),
+                    start_date=date.today() - timedelta(days=365),
+                )
+                for employee in employees
+            ])
+            await db.flush()
+
+            service = PayrollService()
+
+            print(f"{'employees':>10} {'queries':>8} {'ms':>10}")
+            for size in sizes:
+                data = PayrollRunCreate(
+                    period_start=date.today().replace(day=1),
+                    period_end=date.today(),
+                    employee_ids=[e.id for e in employees[:size]],
+                )
+
+                query_counts = []
+                elapsed = []
+                for _ in range(runs):
+                    statements = 0
+                    start = time.perf_counter()
+                    await service.create_payroll_run(db, data)
+                    elapsed.append((time.perf_counter() - start) * 1000)
+                    query_counts.append(statements)
+
+                print(
+                    f"{size:>10} {max(query_counts):>8} "
+                    f"{sum(elapsed) / len(elapsed):>10.1f}"
+                )
+        finally:
+            await db.close()
+            await trans.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.employees, args.runs))
@@ -0,0 +1,218 @@
+"""
+Benchmark del listado de ventas (GET /sales) con páginas de 500 filas.
+
+Crea un colegio temporal con ventas sintéticas (varios ítems y un pago por
+venta) y compara la carga anterior del grafo ORM completo (Sale con items,
+payments, client, user y school) contra la proyección de columnas con
+conteos en SQL que usa list_all_sales: tiempo promedio y pico de memoria
+(tracemalloc) por página. Todo se ejecuta dentro de una transacción que se
+revierte al final, así que no deja datos en la base.
+
+Uso:
+    cd backend
+    source venv/bin/activate
+    python -m scripts.benchmark_sale_list
+    python -m scripts.benchmark_sale_list --sales 2000 --items 5 --runs 5
+"""
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import Response
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.api.routes.sales import list_all_sales
+from app.core.config import settings
+from app.db.pagination import CountMode
+from app.models.client import Client
+from app.models.product import GarmentType, Product
+from app.models.sale import PaymentMethod, Sale, SaleItem, SalePayment, SaleStatus
+from app.models.school import School
+from app.models.user import User
+from app.schemas.sale import SaleListResponse
+
+PAGE_SIZE = 500
+
+
+async def orm_graph_page(db: AsyncSession, school_ids: list) -> list[SaleListResponse]:
+    """Listado anterior: objetos Sale con todas sus relaciones"""
+    result = await db.execute(
+        select(Sale)
+        .options(
+            selectinload(Sale.items),
+            selectinload(Sale.payments),
+            joinedload(Sale.client),
+            joinedload(Sale.user),
+            joinedload(Sale.school)
+        )
+        .where(Sale.school_id.in_(school_ids))
+        .order_by(Sale.created_at.desc())
+        .limit(PAGE_SIZE)
+    )
+    return [
+        SaleListResponse(
+            id=sale.id,
+            code=sale.code,
+            status=sale.status,
+            source=sale.source,
+            payment_method=sale.payment_method or (
+                sale.payments[0].payment_method if sale.payments else None
+            ),
+            total=sale.total,
+            paid_amount=sale.paid_amount,
+            client_id=sale.client_id,
+            client_name=sale.client.name if sale.client else None,
+            sale_date=sale.sale_date,
+            created_at=sale.created_at,
+            items_count=len(sale.items),
+            user_id=sale.user_id,
+            user_name=sale.user.username if sale.user else None,
+            school_id=sale.school_id,
+            school_name=sale.school.name if sale.school else None
+        )
+        for sale in result.unique().scalars().all()
+    ]
+
+
+async def projection_page(db: AsyncSession, school_ids: list) -> list[SaleListResponse]:
+    """Listado actual (list_all_sales)"""
+    return await list_all_sales(
+        db=db,
+        current_user=None,
+        user_school_ids=school_ids,
+        response=Response(),
+        skip=0,
+        limit=PAGE_SIZE,
+        cursor=None,
+        count=CountMode.NONE,
+        school_id=None,
+        status_filter=None,
+        source=None,
+        search=None
+    )
+
+
+async def measure(db: AsyncSession, page, school_ids: list, runs: int) -> tuple[float, float]:
+    """(ms promedio, pico de memoria promedio en MB)"""
+    elapsed = []
+    peaks = []
+    for _ in range(runs):
+        db.expunge_all()
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = await page(db, school_ids)
+        elapsed.append((time.perf_counter() - start) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024 / 1024)
+        tracemalloc.stop()
+        assert len(rows) == PAGE_SIZE
+    return sum(elapsed) / runs, sum(peaks) / runs
+
+
+async def run_benchmark(sales: int, items: int, runs: int) -> None:
+    """Compara el grafo ORM con la proyección"""
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+
+        try:
+            unique = uuid4().hex[:8]
+            school = School(
+                code=f"BENCH-{unique}",
+                name=f"Benchmark {unique}",
+                slug=f"benchmark-{unique}",
+            )
+            user = User(
+                username=f"bench_{unique}",
+                email=f"bench_{unique}@example.com",
+                hashed_password="x",
+            )
+            client = Client(code=f"CLI-B{unique}", name="Cliente Benchmark")
+            db.add_all([school, user, client])
+            await db.flush()
+
+            garment_type = GarmentType(school_id=school.id, name=f"Camisa {unique}")
+            db.add(garment_type)
+            await db.flush()
+            product = Product(
+                school_id=school.id,
+                garment_type_id=garment_type.id,
+                code=f"BENCH-{unique}",
+                name="Camisa",
+                size="10",
+                price=Decimal("45000"),
+            )
+            db.add(product)
+            await db.flush()
+
+            start_at = datetime(1990, 1, 1)
+            sale_ids = [uuid4() for _ in range(sales)]
+            await db.execute(insert(Sale), [
+                {
+                    "id": sale_id,
+                    "school_id": school.id,
+                    "client_id": client.id,
+                    "user_id": user.id,
+                    "code": f"VNT-B{unique}-{i:06d}",
+                    "total": Decimal("45000") * items,
+                    "paid_amount": Decimal("45000") * items,
+                    "status": SaleStatus.COMPLETED,
+                    "sale_date": start_at + timedelta(minutes=i),
+                    "created_at": start_at + timedelta(minutes=i),
+                    "updated_at": start_at + timedelta(minutes=i),
+                }
+                for i, sale_id in enumerate(sale_ids)
+            ])
+            await db.execute(insert(SaleItem), [
+                {
+                    "sale_id": sale_id,
+                    "product_id": product.id,
+                    "quantity": 1,
+                    "unit_price": Decimal("45000"),
+                    "subtotal": Decimal("45000"),
+                }
+                for sale_id in sale_ids
+                for _ in range(items)
+            ])
+            await db.execute(insert(SalePayment), [
+                {
+                    "sale_id": sale_id,
+                    "amount": Decimal("45000") * items,
+                    "payment_method": PaymentMethod.CASH,
+                }
+                for sale_id in sale_ids
+            ])
+
+            school_ids = [school.id]
+            print(f"{sales} ventas con {items} ítems, página de {PAGE_SIZE}")
+            print(f"{'listado':>12} {'ms':>8} {'pico MB':>8}")
+            for name, page in (("grafo ORM", orm_graph_page), ("proyección", projection_page)):
+                ms, mb = await measure(db, page, school_ids, runs)
+                print(f"{name:>12} {ms:>8.1f} {mb:>8.2f}")
+        finally:
+            await db.close()
+            await trans.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sales", type=int, default=1000, help="Ventas sintéticas (mínimo 500)")
+    parser.add_argument("--items", type=int, default=3, help="Ítems por venta")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(max(args.sales, PAGE_SIZE), args.items, args.runs))
@@ -0,0 +1,132 @@
+"""
+Benchmark de consultas SQL por venta (SaleService.create_sale).
+
+Crea un colegio temporal con productos e inventario, registra ventas de
+distintos tamaños de ticket y cuenta cuántas sentencias SQL y cuánto tiempo
+toma cada una. Todo se ejecuta dentro de una transacción que se revierte al
+final, así que no deja datos en la base.
+
+Uso:
+    cd backend
+    source venv/bin/activate
+    python -m scripts.benchmark_sale_queries
+    python -m scripts.benchmark_sale_queries --sizes 1 10 20 --runs 5
+"""
+import argparse
+import asyncio
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.models.school import School
+from app.models.user import User
+from app.models.product import GarmentType, Product, Inventory
+from app.models.sale import PaymentMethod
+from app.schemas.sale import SaleCreate, SaleItemCreate
+from app.services.sale import SaleService
+
+
+async def run_benchmark(sizes: list[int], runs: int) -> None:
+    """Cuenta consultas y latencia de create_sale por tamaño de ticket"""
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+
+    statements = 0
+
+    def count_statement(*args, **kwargs):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+
+        try:
+            unique = uuid4().hex[:8]
+            school = School(
+                code=f"BENCH-{unique}",
+                name=f"Benchmark {unique}",
+                slug=f"benchmark-{unique}",
+            )
+            user = User(
+                username=f"bench_{unique}",
+                email=f"bench_{unique}@example.com",
+                hashed_password="x",
+            )
+            db.add_all([school, user])
+            await db.flush()
+
+            garment_type = GarmentType(school_id=school.id, name=f"Camisa {unique}")
+            db.add(garment_type)
+            await db.flush()
+
+            products = []
+            for i in range(max(sizes)):
+                product = Product(
+                    school_id=school.id,
+                    garment_type_id=garment_type.id,
+                    code=f"BENCH-{unique}-{i:03d}",
+                    name=f"Camisa T{i}",
+                    size=str(i),
+                    price=Decimal("45000"),
+                )
+                products.append(product)
+            db.add_all(products)
+            await db.flush()
+
+            db.add_all([
+                Inventory(school_id=school.id, product_id=p.id, quantity=100_000)
+                for p in products
+            ])
+            await db.flush()
+
+            service = SaleService(db)
+
+            print(f"{'items':>6} {'queries':>8} {'ms':>10}")
+            for size in sizes:
+                sale_data = SaleCreate(
+                    school_id=school.id,
+                    items=[
+                        SaleItemCreate(product_id=p.id, quantity=1)
+                        for p in products[:size]
+                    ],
+                    payment_method=PaymentMethod.CREDIT,
+                )
+
+                query_counts = []
+                elapsed = []
+                for _ in range(runs):
+                    statements = 0
+                    start = time.perf_counter()
+                    await service.create_sale(sale_data, user_id=user.id)
+                    elapsed.append((time.perf_counter() - start) * 1000)
+                    query_counts.append(statements)
+
+                print(
+                    f"{size:>6} {max(query_counts):>8} "
+                    f"{sum(elapsed) / len(elapsed):>10.1f}"
+                )
+        finally:
+            await db.close()
+            await trans.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.sizes, args.runs))
@@ -0,0 +1,45 @@
+"""
+Worker de envío de emails de la cola (email_outbox).
+
+La API ya arranca este worker dentro del proceso (EMAIL_OUTBOX_WORKER_ENABLED).
+Este script permite correrlo como proceso separado (por ejemplo con
+EMAIL_OUTBOX_WORKER_ENABLED=false en la API) o vaciar la cola una vez.
+
+Uso:
+    cd backend
+    source venv/bin/activate
+    python -m scripts.email_worker
+    python -m scripts.email_worker --once
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.services.email_outbox import EmailOutboxWorker
+
+
+async def drain() -> None:
+    """Envía los emails pendientes que ya deben salir y termina"""
+    worker = EmailOutboxWorker()
+    total = 0
+    while processed := await worker.run_once():
+        total += processed
+    print(f"✓ Emails procesados: {total}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--once", action="store_true", help="Vaciar la cola una vez y salir")
+    args = parser.parse_args()
+
+    if args.once:
+        asyncio.run(drain())
+    else:
+        print(f"📧 Worker de emails (lotes de {settings.EMAIL_OUTBOX_BATCH_SIZE}, "
+              f"{settings.EMAIL_RATE_LIMIT_PER_SECOND}/s)")
+        asyncio.run(EmailOutboxWorker().run(settings.EMAIL_OUTBOX_POLL_SECONDS))
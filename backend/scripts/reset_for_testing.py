@@ -62,6 +62,7 @@ async def reset_database():
             # 1.3. Eliminar ventas
             print("  🛒 Eliminando ventas...")
             await db.execute(text("DELETE FROM sales"))
+            await db.execute(text("DELETE FROM sales_daily_rollup"))
 
             # 1.4. Eliminar items de encargos
             print("  📋 Eliminando items de encargos...")
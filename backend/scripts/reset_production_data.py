@@ -61,6 +61,7 @@ async def reset_production_data():
             # 3. Delete sales
             result = await db.execute(text("DELETE FROM sales"))
             print(f"  ✓ sales eliminadas: {result.rowcount}")
+            await db.execute(text("DELETE FROM sales_daily_rollup"))
 
             # 4. Delete order_items first
             result = await db.execute(text("DELETE FROM order_items"))
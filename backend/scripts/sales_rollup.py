@@ -0,0 +1,72 @@
+"""
+Mantenimiento del resumen diario de ventas (sales_daily_rollup).
+
+Subcomandos:
+    backfill  Recalcula el resumen desde las ventas y cambios aprobados
+    check     Compara el resumen contra las ventas y reporta diferencias
+              (sale con código 1 si encuentra inconsistencias)
+
+Uso:
+    cd backend
+    source venv/bin/activate
+    python -m scripts.sales_rollup check
+    python -m scripts.sales_rollup backfill
+    python -m scripts.sales_rollup backfill --school-id <uuid>
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from uuid import UUID
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.session import AsyncSessionLocal
+from app.services.sales_rollup import SalesRollupService
+
+
+async def backfill(school_id: UUID | None) -> None:
+    """Reconstruye el resumen diario"""
+    async with AsyncSessionLocal() as db:
+        try:
+            rows = await SalesRollupService(db).rebuild(school_id)
+            await db.commit()
+            print(f"✓ Resumen reconstruido: {rows} filas")
+        except Exception as e:
+            await db.rollback()
+            print(f"❌ Error: {e}")
+            raise
+
+
+async def check(school_id: UUID | None) -> int:
+    """Reporta filas del resumen que no coinciden con las ventas"""
+    async with AsyncSessionLocal() as db:
+        mismatches = await SalesRollupService(db).find_inconsistencies(school_id)
+
+    if not mismatches:
+        print("✓ El resumen diario coincide con las ventas")
+        return 0
+
+    print(f"❌ {len(mismatches)} filas inconsistentes:")
+    for m in mismatches:
+        print(
+            f"  {m['sale_date']} colegio={m['school_id']} método={m['payment_method']} "
+            f"estado={m['status']} histórica={m['is_historical']}"
+        )
+        print(f"    esperado: {m['expected']}")
+        print(f"    guardado: {m['stored']}")
+    print("Ejecute 'python -m scripts.sales_rollup backfill' para corregirlo")
+    return 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", choices=["backfill", "check"])
+    parser.add_argument("--school-id", type=UUID, default=None)
+    args = parser.parse_args()
+
+    if args.command == "backfill":
+        asyncio.run(backfill(args.school_id))
+    else:
+        sys.exit(asyncio.run(check(args.school_id)))
@@ -297,6 +297,27 @@ class TestGetCurrentUser:
 
         assert data["is_superuser"] is True
 
+    async def test_deactivated_user_rejected_despite_cached_snapshot(
+        self,
+        api_client,
+        auth_headers,
+        superuser_headers,
+        test_user
+    ):
+        """Updating a user should drop its cached auth snapshot."""
+        response = await api_client.get("/api/v1/auth/me", headers=auth_headers)
+        assert_success_response(response)
+
+        response = await api_client.put(
+            f"/api/v1/users/{test_user.id}",
+            headers=superuser_headers,
+            json={"is_active": False}
+        )
+        assert_success_response(response)
+
+        response = await api_client.get("/api/v1/auth/me", headers=auth_headers)
+        assert response.status_code == 403
+
 
 # ============================================================================
 # CHANGE PASSWORD TESTS
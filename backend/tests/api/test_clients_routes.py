@@ -6,6 +6,7 @@ Tests cover:
 - Client search and filtering
 - Student management
 - Client summary/history
+- Web portal verification (phone codes, email marks)
 """
 import pytest
 from uuid import uuid4
@@ -20,6 +21,7 @@ from tests.fixtures.assertions import (
     assert_bad_request,
     assert_client_valid,
 )
+from app.core.ephemeral import ephemeral_store
 from tests.fixtures.builders import build_client_request
 
 
@@ -125,6 +127,51 @@ class TestClientRetrieval:
         assert isinstance(data, list)
         assert len(data) >= 1
 
+    async def test_list_clients_cursor_pages(
+        self,
+        api_client,
+        superuser_headers,
+        test_client,
+    ):
+        """Following X-Next-Cursor should walk the same rows as one big page."""
+        response = await api_client.get(
+            "/api/v1/clients",
+            headers=superuser_headers,
+            params={"limit": 500, "count": "exact"}
+        )
+        expected = [c["id"] for c in assert_success_response(response)]
+        assert int(response.headers["X-Total-Count"]) == len(expected)
+
+        seen = []
+        params = {"limit": 2}
+        while True:
+            response = await api_client.get(
+                "/api/v1/clients",
+                headers=superuser_headers,
+                params=params
+            )
+            seen.extend(c["id"] for c in assert_success_response(response))
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if not next_cursor:
+                break
+            params = {"limit": 2, "cursor": next_cursor}
+
+        assert seen == expected
+
+    async def test_list_clients_invalid_cursor(
+        self,
+        api_client,
+        superuser_headers,
+    ):
+        """Should reject a cursor it did not issue."""
+        response = await api_client.get(
+            "/api/v1/clients",
+            headers=superuser_headers,
+            params={"cursor": "not-a-cursor"}
+        )
+
+        assert_bad_request(response)
+
     async def test_get_single_client(
         self,
         api_client,
@@ -340,3 +387,78 @@ class TestClientValidation:
 
         # May accept or reject depending on validation
         assert response.status_code in [201, 422]
+
+
+# ============================================================================
+# WEB PORTAL VERIFICATION TESTS
+# ============================================================================
+
+class TestPhoneVerification:
+    """Tests for phone verification codes (shared ephemeral store)."""
+
+    async def test_code_is_single_use(self, api_client):
+        """A confirmed code can't be confirmed again."""
+        phone = "300 123 4567"
+        response = await api_client.post(
+            "/api/v1/portal/clients/verify-phone/send",
+            json={"phone": phone}
+        )
+        code = assert_success_response(response)["dev_code"]
+
+        response = await api_client.post(
+            "/api/v1/portal/clients/verify-phone/confirm",
+            json={"phone": phone, "code": code}
+        )
+        assert assert_success_response(response)["verified"] is True
+
+        response = await api_client.post(
+            "/api/v1/portal/clients/verify-phone/confirm",
+            json={"phone": phone, "code": code}
+        )
+        assert_bad_request(response)
+
+    async def test_wrong_code_is_rejected(self, api_client):
+        """Should reject a code that doesn't match."""
+        response = await api_client.post(
+            "/api/v1/portal/clients/verify-phone/send",
+            json={"phone": "3007654321"}
+        )
+        code = assert_success_response(response)["dev_code"]
+        wrong = "000000" if code != "000000" else "111111"
+
+        response = await api_client.post(
+            "/api/v1/portal/clients/verify-phone/confirm",
+            json={"phone": "3007654321", "code": wrong}
+        )
+        assert_bad_request(response)
+
+
+class TestWebRegistration:
+    """Tests for web portal registration with a verified email."""
+
+    async def test_failed_commit_keeps_email_verification(
+        self, api_client, db_session, test_school, monkeypatch
+    ):
+        """If the registration isn't committed, the email stays verified for a retry."""
+        email = f"web-{uuid4().hex[:8]}@example.com"
+        verified_key = ephemeral_store.key("verified_email", email)
+        await ephemeral_store.set(verified_key, True, ttl=60)
+
+        async def failing_commit():
+            raise RuntimeError("commit failed")
+
+        monkeypatch.setattr(db_session, "commit", failing_commit)
+        with pytest.raises(RuntimeError):
+            await api_client.post(
+                "/api/v1/portal/clients/register",
+                json={
+                    "name": "Cliente Web",
+                    "email": email,
+                    "password": "secreta123",
+                    "students": [
+                        {"student_name": "Ana Pérez", "school_id": str(test_school.id)}
+                    ]
+                }
+            )
+
+        assert await ephemeral_store.get(verified_key) is True
@@ -166,6 +166,40 @@ class TestGlobalDashboardStats:
         assert isinstance(totals["sales_amount_month"], (int, float))
         assert totals["sales_amount_month"] >= 0
 
+    async def test_get_dashboard_stats_per_school_breakdown(
+        self, api_client, superuser_headers, complete_test_setup
+    ):
+        """Test that each school's summary counts only its own sales."""
+        from tests.fixtures.assertions import assert_created_response, assert_success_response
+        from tests.fixtures.builders import build_sale_request, build_sale_item
+
+        setup = complete_test_setup
+        school_id = str(setup["school"].id)
+
+        total = 0
+        for quantity in (1, 2):
+            response = await api_client.post(
+                f"/api/v1/schools/{school_id}/sales",
+                headers=superuser_headers,
+                json=build_sale_request(
+                    client_id=setup["client"].id,
+                    items=[build_sale_item(product_id=setup["product"].id, quantity=quantity)]
+                )
+            )
+            total += float(assert_created_response(response)["total"])
+
+        response = await api_client.get(
+            "/api/v1/global/dashboard/stats",
+            headers=superuser_headers
+        )
+        data = assert_success_response(response)
+
+        summary = next(s for s in data["schools_summary"] if s["school_id"] == school_id)
+        assert summary["sales_count"] == 2
+        assert summary["sales_amount"] == total
+        assert summary["pending_orders"] == 0
+        assert data["school_count"] == len(data["schools_summary"])
+
 
 class TestDashboardSchoolAccess:
     """Tests for school-based access control on dashboard."""
@@ -1019,6 +1019,68 @@ class TestCashFlow:
 
         assert data["group_by"] == "month"
 
+    async def test_get_cash_flow_buckets_by_iso_week(
+        self,
+        api_client,
+        superuser_headers,
+        db_session,
+        test_superuser
+    ):
+        """Should sum transactions and paid expenses per ISO week."""
+        from app.models.accounting import (
+            Transaction, TransactionType, AccPaymentMethod, Expense, ExpenseCategory
+        )
+
+        # 2001-03-05 is a Monday (ISO week 10); far from any other test data
+        def transaction(day: int, transaction_type, amount: str) -> Transaction:
+            return Transaction(
+                school_id=None,
+                type=transaction_type,
+                amount=Decimal(amount),
+                payment_method=AccPaymentMethod.CASH,
+                description="Movimiento de prueba",
+                transaction_date=date(2001, 3, day),
+                created_by=test_superuser.id
+            )
+
+        db_session.add_all([
+            transaction(5, TransactionType.INCOME, "100000"),
+            transaction(13, TransactionType.INCOME, "50000"),
+            transaction(12, TransactionType.EXPENSE, "30000"),
+            Expense(
+                school_id=None,
+                category=ExpenseCategory.UTILITIES,
+                description="Pago de Luz",
+                amount=Decimal("20000"),
+                amount_paid=Decimal("20000"),
+                expense_date=date(2001, 3, 6),
+                is_paid=True,
+                is_active=True,
+                created_by=test_superuser.id
+            ),
+        ])
+        await db_session.flush()
+
+        response = await api_client.get(
+            "/api/v1/global/accounting/cash-flow",
+            headers=superuser_headers,
+            params={
+                "start_date": "2001-03-01",
+                "end_date": "2001-03-31",
+                "group_by": "week"
+            }
+        )
+
+        data = assert_success_response(response)
+
+        assert [p["period"] for p in data["periods"]] == ["2001-W10", "2001-W11"]
+        week_10, week_11 = data["periods"]
+        assert Decimal(str(week_10["income"])) == Decimal("100000")
+        assert Decimal(str(week_10["expenses"])) == Decimal("20000")
+        assert Decimal(str(week_11["income"])) == Decimal("50000")
+        assert Decimal(str(week_11["expenses"])) == Decimal("30000")
+        assert Decimal(str(data["net_flow"])) == Decimal("100000")
+
     async def test_get_cash_flow_invalid_group_by(
         self,
         api_client,
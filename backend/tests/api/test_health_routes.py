@@ -0,0 +1,56 @@
+"""
+Tests for Health API endpoints.
+
+Tests cover:
+- /metrics requires the scrape token (and is not served without one)
+- Email outbox stats are superuser only
+"""
+import pytest
+
+from app.core.config import settings
+from tests.fixtures.assertions import assert_success_response, assert_unauthorized
+
+
+pytestmark = pytest.mark.api
+
+
+class TestMetricsEndpoint:
+    """Tests for the Prometheus scrape endpoint."""
+
+    async def test_not_served_without_configured_token(self, api_client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+
+        response = await api_client.get("/metrics")
+
+        assert response.status_code == 404
+
+    async def test_requires_matching_token(self, api_client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+
+        assert_unauthorized(await api_client.get("/metrics"))
+        assert_unauthorized(await api_client.get(
+            "/metrics", headers={"Authorization": "Bearer wrong"}
+        ))
+
+        response = await api_client.get(
+            "/metrics", headers={"Authorization": "Bearer scrape-secret"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+
+class TestEmailOutboxStats:
+    """Tests for the email outbox health endpoint."""
+
+    async def test_anonymous_is_rejected(self, api_client):
+        assert_unauthorized(await api_client.get("/health/email-outbox"))
+
+    async def test_non_superuser_is_forbidden(self, api_client, auth_headers):
+        response = await api_client.get("/health/email-outbox", headers=auth_headers)
+
+        assert response.status_code == 403
+
+    async def test_superuser_gets_stats(self, api_client, superuser_headers):
+        response = await api_client.get("/health/email-outbox", headers=superuser_headers)
+
+        assert isinstance(assert_success_response(response), dict)
@@ -200,6 +200,30 @@ class TestOrderRetrieval:
         assert isinstance(data, list)
         assert len(data) >= 1
 
+    async def test_list_all_orders_row_fields(
+        self,
+        api_client,
+        superuser_headers,
+        test_order,
+        test_client,
+        test_school
+    ):
+        """List rows should carry names and item counts from the projection."""
+        response = await api_client.get(
+            "/api/v1/orders",
+            headers=superuser_headers,
+            params={"school_id": str(test_school.id)}
+        )
+
+        data = assert_success_response(response)
+        row = next(o for o in data if o["id"] == str(test_order.id))
+        assert row["items_count"] == 1
+        assert row["items_total"] == 1
+        assert row["items_delivered"] == 0
+        assert row["client_name"] == test_client.name
+        assert row["school_name"] == test_school.name
+        assert float(row["balance"]) == 39500
+
     async def test_list_school_orders(
         self,
         api_client,
@@ -407,6 +431,108 @@ class TestWebOrders:
         assert response.status_code in [200, 201, 400, 404, 422]
 
 
+class TestOrderStockVerification:
+    """Tests for the stock verification endpoint."""
+
+    async def test_reports_demand_from_other_orders(
+        self,
+        api_client,
+        db_session,
+        superuser_headers,
+        test_school,
+        test_order,
+        test_garment_type
+    ):
+        """Should report pending quantity of the same variant in other orders."""
+        from app.models.order import Order, OrderItem, OrderStatus
+        from app.models.sale import SaleSource
+
+        other = Order(
+            id=str(uuid4()),
+            school_id=test_school.id,
+            user_id=test_order.user_id,
+            client_id=test_order.client_id,
+            code=f"ENC-TEST-{uuid4().hex[:8]}",
+            status=OrderStatus.PENDING,
+            subtotal=Decimal("45000"),
+            tax=Decimal("0"),
+            total=Decimal("45000"),
+            paid_amount=Decimal("0"),
+            source=SaleSource.DESKTOP_APP
+        )
+        db_session.add(other)
+        await db_session.flush()
+        db_session.add(OrderItem(
+            id=str(uuid4()),
+            order_id=other.id,
+            school_id=test_school.id,
+            garment_type_id=test_garment_type.id,
+            quantity=4,
+            unit_price=Decimal("50000"),
+            subtotal=Decimal("200000"),
+            size="M"
+        ))
+        await db_session.flush()
+
+        response = await api_client.get(
+            f"/api/v1/schools/{test_school.id}/orders/{test_order.id}/stock-verification",
+            headers=superuser_headers
+        )
+
+        data = assert_success_response(response)
+        assert len(data["items"]) == 1
+        assert data["items"][0]["pending_demand_qty"] == 4
+
+
+    async def test_approve_fulfills_from_best_stocked_product(
+        self,
+        api_client,
+        db_session,
+        superuser_headers,
+        test_school,
+        test_order,
+        test_garment_type
+    ):
+        """Should take the item from the matching product with most stock."""
+        from app.models import Product, Inventory
+
+        products = []
+        for code, size, quantity in (("LOW", "M", 1), ("HIGH", "M", 6), ("OTHER", "L", 50)):
+            product = Product(
+                id=str(uuid4()),
+                school_id=test_school.id,
+                garment_type_id=test_garment_type.id,
+                code=f"{code}-{uuid4().hex[:6]}",
+                name=f"Camisa {code}",
+                size=size,
+                price=Decimal("50000"),
+                is_active=True
+            )
+            db_session.add(product)
+            await db_session.flush()
+            inventory = Inventory(
+                id=str(uuid4()),
+                product_id=product.id,
+                school_id=test_school.id,
+                quantity=quantity
+            )
+            db_session.add(inventory)
+            products.append((product, inventory))
+        await db_session.flush()
+
+        response = await api_client.post(
+            f"/api/v1/schools/{test_school.id}/orders/{test_order.id}/approve",
+            headers=superuser_headers,
+            json={"notify_client": False}
+        )
+
+        assert_success_response(response)
+        for _, inventory in products:
+            await db_session.refresh(inventory)
+        (_, low_inv), (_, high_inv), (_, other_inv) = products
+        assert (low_inv.quantity, high_inv.quantity, other_inv.quantity) == (1, 5, 50)
+
+
 # ============================================================================
 # MULTI-TENANCY TESTS
 # ============================================================================
@@ -402,6 +402,97 @@ class TestProductUpdate:
         assert data["is_active"] is False
 
 
+class TestProductListCache:
+    """Tests for the cached multi-school product list."""
+
+    async def test_update_invalidates_cached_list(
+        self,
+        api_client,
+        superuser_headers,
+        test_product,
+        test_school
+    ):
+        """Should not serve a stale product name after an update."""
+        url = f"/api/v1/products?school_id={test_school.id}"
+
+        first = assert_success_response(await api_client.get(url, headers=superuser_headers))
+        assert any(p["id"] == str(test_product.id) for p in first)
+
+        response = await api_client.put(
+            f"/api/v1/schools/{test_school.id}/products/{test_product.id}",
+            headers=superuser_headers,
+            json={"name": "Camisa Renombrada"}
+        )
+        assert_success_response(response)
+
+        second = assert_success_response(await api_client.get(url, headers=superuser_headers))
+        names = [p["name"] for p in second if p["id"] == str(test_product.id)]
+        assert names == ["Camisa Renombrada"]
+
+
+class TestProductPendingOrders:
+    """Tests for pending order demand in the multi-school product list."""
+
+    async def _add_order_item(self, db_session, test_school, test_user, test_client, garment_type_id, size, color, quantity):
+        from app.models.order import Order, OrderItem, OrderStatus
+        from app.models.sale import SaleSource
+
+        order = Order(
+            id=str(uuid4()),
+            school_id=test_school.id,
+            user_id=test_user.id,
+            client_id=test_client.id,
+            code=f"ENC-TEST-{uuid4().hex[:8]}",
+            status=OrderStatus.PENDING,
+            subtotal=Decimal("45000"),
+            tax=Decimal("0"),
+            total=Decimal("45000"),
+            paid_amount=Decimal("0"),
+            source=SaleSource.DESKTOP_APP
+        )
+        db_session.add(order)
+        await db_session.flush()
+        db_session.add(OrderItem(
+            id=str(uuid4()),
+            order_id=order.id,
+            school_id=test_school.id,
+            garment_type_id=garment_type_id,
+            quantity=quantity,
+            unit_price=Decimal("45000"),
+            subtotal=Decimal("45000") * quantity,
+            size=size,
+            color=color
+        ))
+        await db_session.flush()
+
+    async def test_pending_orders_matched_by_variant(
+        self,
+        api_client,
+        db_session,
+        superuser_headers,
+        test_user,
+        test_client,
+        test_product,
+        test_school
+    ):
+        """Should sum pending items with the same garment type, size and color."""
+        for size, quantity in (("T12", 2), ("T12", 3), ("T14", 7)):
+            await self._add_order_item(
+                db_session, test_school, test_user, test_client,
+                test_product.garment_type_id, size, "Blanco", quantity
+            )
+
+        response = await api_client.get(
+            f"/api/v1/products?school_id={test_school.id}",
+            headers=superuser_headers
+        )
+
+        data = assert_success_response(response)
+        product = next(p for p in data if p["id"] == str(test_product.id))
+        assert product["pending_orders_qty"] == 5
+        assert product["pending_orders_count"] == 2
+
+
 # ============================================================================
 # INVENTORY TESTS
 # ============================================================================
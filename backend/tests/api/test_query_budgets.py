@@ -0,0 +1,410 @@
+"""
+SQL statement budgets for the heaviest endpoints.
+
+Guards against N+1 regressions:
+- Writes stay within a fixed budget regardless of the number of items
+- Lists and dashboards cost the same number of statements with few or
+  many rows (schools, for the dashboard)
+
+Counts come from the test engine's cursor hooks (tests.fixtures.query_budget).
+Each measured call starts with an empty response cache so it always runs
+its queries.
+"""
+import pytest
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+from app.core.cache import cache
+from app.models import Inventory, Order, OrderItem, Product, Sale, SaleItem, School
+from app.models.accounting import AccountType, BalanceAccount, BalanceEntry
+from app.models.order import OrderStatus
+from app.models.sale import PaymentMethod, SalePayment, SaleStatus
+from tests.fixtures.assertions import assert_created_response, assert_success_response
+from tests.fixtures.builders import build_sale_item, build_sale_request
+from tests.fixtures.query_budget import describe_queries
+
+
+pytestmark = pytest.mark.api
+
+# Fixed budgets (auth and school access checks included)
+CREATE_SALE_BUDGET = 40
+LIST_BUDGET = 15
+REPORT_BUDGET = 15
+
+
+async def _measure(api_client, count_queries, url: str, headers: dict, **params):
+    """Statements run by one GET, with a cold response cache"""
+    await cache.clear()
+    with count_queries() as stats:
+        response = await api_client.get(url, headers=headers, params=params)
+    assert_success_response(response)
+    return stats
+
+
+def _assert_constant(few, many, budget: int):
+    assert many.queries == few.queries, (
+        f"Statements grow with rows: {few.queries} -> {many.queries}\n{describe_queries(many)}"
+    )
+    assert many.queries <= budget, describe_queries(many)
+
+
+# ============================================================================
+# DATA HELPERS
+# ============================================================================
+
+async def _add_products(db_session, school, garment_type, count: int) -> list[Product]:
+    products = [
+        Product(
+            id=str(uuid4()),
+            school_id=school.id,
+            garment_type_id=garment_type.id,
+            code=f"PRD-{uuid4().hex[:8]}",
+            name=f"Camisa T{i}",
+            size=f"T{i}",
+            price=Decimal("45000"),
+            is_active=True
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(products)
+    await db_session.flush()
+    db_session.add_all([
+        Inventory(id=str(uuid4()), product_id=p.id, school_id=school.id, quantity=100)
+        for p in products
+    ])
+    await db_session.flush()
+    return products
+
+
+async def _add_sales(db_session, school, user, client, product, count: int) -> None:
+    for _ in range(count):
+        sale = Sale(
+            id=str(uuid4()),
+            school_id=school.id,
+            user_id=user.id,
+            client_id=client.id,
+            code=f"VNT-2025-{uuid4().hex[:8]}",
+            status=SaleStatus.COMPLETED,
+            total=Decimal("90000"),
+            paid_amount=Decimal("90000")
+        )
+        db_session.add(sale)
+        await db_session.flush()
+        db_session.add_all([
+            SaleItem(
+                id=str(uuid4()),
+                sale_id=sale.id,
+                product_id=product.id,
+                quantity=1,
+                unit_price=Decimal("45000"),
+                subtotal=Decimal("45000")
+            )
+            for _ in range(2)
+        ])
+        db_session.add(SalePayment(
+            sale_id=sale.id, amount=Decimal("90000"), payment_method=PaymentMethod.CASH
+        ))
+    await db_session.flush()
+
+
+async def _add_orders(db_session, school, user, client, garment_type, count: int) -> None:
+    for _ in range(count):
+        order = Order(
+            id=str(uuid4()),
+            school_id=school.id,
+            user_id=user.id,
+            client_id=client.id,
+            code=f"ENC-2025-{uuid4().hex[:8]}",
+            status=OrderStatus.PENDING,
+            subtotal=Decimal("50000"),
+            tax=Decimal("0"),
+            total=Decimal("50000"),
+            paid_amount=Decimal("0")
+        )
+        db_session.add(order)
+        await db_session.flush()
+        db_session.add_all([
+            OrderItem(
+                id=str(uuid4()),
+                order_id=order.id,
+                school_id=school.id,
+                garment_type_id=garment_type.id,
+                quantity=1,
+                unit_price=Decimal("25000"),
+                subtotal=Decimal("25000"),
+                size="M"
+            )
+            for _ in range(2)
+        ])
+    await db_session.flush()
+
+
+# ============================================================================
+# SALES
+# ============================================================================
+
+class TestSalesQueryBudget:
+    """Statement budgets for sales endpoints."""
+
+    async def test_create_sale_does_not_scale_with_items(
+        self,
+        api_client,
+        superuser_headers,
+        db_session,
+        test_school,
+        test_garment_type,
+        count_queries,
+    ):
+        """A 20-item sale should cost (almost) the same as a 1-item sale."""
+        products = await _add_products(db_session, test_school, test_garment_type, 21)
+        url = f"/api/v1/schools/{test_school.id}/sales"
+
+        with count_queries() as one_item:
+            response = await api_client.post(
+                url,
+                headers=superuser_headers,
+                json=build_sale_request(
+                    school_id=test_school.id,
+                    items=[build_sale_item(product_id=products[0].id)]
+                )
+            )
+        assert_created_response(response)
+
+        with count_queries() as twenty_items:
+            response = await api_client.post(
+                url,
+                headers=superuser_headers,
+                json=build_sale_request(
+                    school_id=test_school.id,
+                    items=[build_sale_item(product_id=p.id) for p in products[1:]]
+                )
+            )
+        assert len(assert_created_response(response)["items"]) == 20
+
+        assert twenty_items.queries <= one_item.queries + 3, describe_queries(twenty_items)
+        assert twenty_items.queries <= CREATE_SALE_BUDGET, describe_queries(twenty_items)
+
+    async def test_list_sales_constant_queries(
+        self,
+        api_client,
+        superuser_headers,
+        db_session,
+        test_school,
+        test_user,
+        test_client,
+        test_product,
+        count_queries,
+    ):
+        """The sales list should not query per sale."""
+        params = {"school_id": str(test_school.id)}
+        await _add_sales(db_session, test_school, test_user, test_client, test_product, 3)
+        few = await _measure(api_client, count_queries, "/api/v1/sales", superuser_headers, **params)
+
+        await _add_sales(db_session, test_school, test_user, test_client, test_product, 12)
+        many = await _measure(api_client, count_queries, "/api/v1/sales", superuser_headers, **params)
+
+        _assert_constant(few, many, LIST_BUDGET)
+
+
+# ============================================================================
+# ORDERS
+# ============================================================================
+
+class TestOrdersQueryBudget:
+    """Statement budgets for orders endpoints."""
+
+    async def test_list_orders_constant_queries(
+        self,
+        api_client,
+        superuser_headers,
+        db_session,
+        test_school,
+        test_user,
+        test_client,
+        test_garment_type,
+        count_queries,
+    ):
+        """The orders list should not query per order."""
+        params = {"school_id": str(test_school.id)}
+        await _add_orders(db_session, test_school, test_user, test_client, test_garment_type, 3)
+        few = await _measure(api_client, count_queries, "/api/v1/orders", superuser_headers, **params)
+
+        await _add_orders(db_session, test_school, test_user, test_client, test_garment_type, 12)
+        many = await _measure(api_client, count_queries, "/api/v1/orders", superuser_headers, **params)
+
+        _assert_constant(few, many, LIST_BUDGET)
+
+
+# ============================================================================
+# PRODUCTS
+# ============================================================================
+
+class TestProductsQueryBudget:
+    """Statement budgets for product catalog endpoints."""
+
+    async def test_list_products_constant_queries(
+        self,
+        api_client,
+        superuser_headers,
+        db_session,
+        test_school,
+        test_garment_type,
+        count_queries,
+    ):
+        """The global product list should not query per product."""
+        params = {"school_id": str(test_school.id)}
+        await _add_products(db_session, test_school, test_garment_type, 3)
+        few = await _measure(api_client, count_queries, "/api/v1/products", superuser_headers, **params)
+
+        await _add_products(db_session, test_school, test_garment_type, 12)
+        many = await _measure(api_client, count_queries, "/api/v1/products", superuser_headers, **params)
+
+        _assert_constant(few, many, LIST_BUDGET)
+
+    async def test_school_products_constant_queries(
+        self,
+        api_client,
+        superuser_headers,
+        db_session,
+        test_school,
+        test_garment_type,
+        count_queries,
+    ):
+        """The school product list (with inventory) should not query per product."""
+        url = f"/api/v1/schools/{test_school.id}/products"
+        await _add_products(db_session, test_school, test_garment_type, 3)
+        few = await _measure(api_client, count_queries, url, superuser_headers)
+
+        await _add_products(db_session, test_school, test_garment_type, 12)
+        many = await _measure(api_client, count_queries, url, superuser_headers)
+
+        _assert_constant(few, many, LIST_BUDGET)
+
+
+# ============================================================================
+# DASHBOARD
+# ============================================================================
+
+class TestDashboardQueryBudget:
+    """Statement budgets for the global dashboard."""
+
+    async def test_dashboard_constant_queries_per_school(
+        self,
+        api_client,
+        superuser_headers,
+        db_session,
+        test_school,
+        count_queries,
+    ):
+        """The per-school breakdown should not query per school."""
+        url = "/api/v1/global/dashboard/stats"
+        few = await _measure(api_client, count_queries, url, superuser_headers)
+
+        for _ in range(4):
+            unique = uuid4().hex[:6]
+            db_session.add(School(
+                id=str(uuid4()),
+                code=f"TST-{unique.upper()}",
+                name=f"Budget School {unique}",
+                slug=f"budget-school-{unique}",
+                is_active=True
+            ))
+        await db_session.flush()
+        many = await _measure(api_client, count_queries, url, superuser_headers)
+
+        _assert_constant(few, many, REPORT_BUDGET)
+
+
+# ============================================================================
+# GLOBAL ACCOUNTING
+# ============================================================================
+
+class TestGlobalAccountingQueryBudget:
+    """Statement budgets for global accounting endpoints."""
+
+    async def _add_accounts(self, db_session, count: int) -> list[BalanceAccount]:
+        accounts = [
+            BalanceAccount(
+                id=str(uuid4()),
+                school_id=None,
+                account_type=AccountType.ASSET_CURRENT,
+                name=f"Caja presupuesto {i}",
+                code=f"1{uuid4().hex[:6]}",
+                balance=Decimal("0")
+            )
+            for i in range(count)
+        ]
+        db_session.add_all(accounts)
+        await db_session.flush()
+        return accounts
+
+    async def test_balance_accounts_constant_queries(
+        self,
+        api_client,
+        superuser_headers,
+        db_session,
+        count_queries,
+    ):
+        """Listing global balance accounts should not query per account."""
+        url = "/api/v1/global/accounting/balance-accounts"
+        await self._add_accounts(db_session, 2)
+        few = await _measure(api_client, count_queries, url, superuser_headers)
+
+        await self._add_accounts(db_session, 10)
+        many = await _measure(api_client, count_queries, url, superuser_headers)
+
+        _assert_constant(few, many, LIST_BUDGET)
+
+    async def test_balance_entries_constant_queries(
+        self,
+        api_client,
+        superuser_headers,
+        db_session,
+        count_queries,
+    ):
+        """The unified balance entry log should not query per entry."""
+        account, = await self._add_accounts(db_session, 1)
+        url = "/api/v1/global/accounting/balance-entries"
+        params = {"account_id": str(account.id)}
+
+        def add_entries(count: int) -> None:
+            db_session.add_all([
+                BalanceEntry(
+                    account_id=account.id,
+                    entry_date=date.today(),
+                    amount=Decimal("1000"),
+                    description="Movimiento de prueba"
+                )
+                for _ in range(count)
+            ])
+
+        add_entries(3)
+        await db_session.flush()
+        few = await _measure(api_client, count_queries, url, superuser_headers, **params)
+
+        add_entries(20)
+        await db_session.flush()
+        many = await _measure(api_client, count_queries, url, superuser_headers, **params)
+
+        _assert_constant(few, many, LIST_BUDGET)
+
+    async def test_cash_flow_report_budget(
+        self,
+        api_client,
+        superuser_headers,
+        assert_max_queries,
+    ):
+        """The cash flow report is bucketed in SQL: a handful of statements."""
+        await cache.clear()
+        with assert_max_queries(REPORT_BUDGET):
+            response = await api_client.get(
+                "/api/v1/global/accounting/cash-flow",
+                headers=superuser_headers,
+                params={
+                    "start_date": "2001-01-01",
+                    "end_date": "2001-12-31",
+                    "group_by": "day"
+                }
+            )
+        assert_success_response(response)
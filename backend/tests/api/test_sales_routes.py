@@ -165,6 +165,60 @@ class TestSaleCreation:
 
         assert_bad_request(response, detail_contains="stock")
 
+    async def test_create_sale_repeated_product_decrements_inventory(
+        self,
+        api_client,
+        superuser_headers,
+        complete_test_setup,
+        db_session
+    ):
+        """Repeated lines of a product should decrement inventory by their sum."""
+        setup = complete_test_setup
+        inventory = setup["inventory"]
+        initial_quantity = inventory.quantity
+
+        response = await api_client.post(
+            f"/api/v1/schools/{setup['school'].id}/sales",
+            headers=superuser_headers,
+            json=build_sale_request(
+                client_id=setup["client"].id,
+                items=[
+                    build_sale_item(product_id=setup["product"].id, quantity=2),
+                    build_sale_item(product_id=setup["product"].id, quantity=3)
+                ]
+            )
+        )
+
+        data = assert_created_response(response)
+        assert len(data["items"]) == 2
+
+        await db_session.refresh(inventory)
+        assert inventory.quantity == initial_quantity - 5
+
+    async def test_create_sale_repeated_product_insufficient_stock(
+        self,
+        api_client,
+        superuser_headers,
+        complete_test_setup
+    ):
+        """Should reject lines that fit individually but exceed stock together."""
+        setup = complete_test_setup
+        quantity = setup["inventory"].quantity
+
+        response = await api_client.post(
+            f"/api/v1/schools/{setup['school'].id}/sales",
+            headers=superuser_headers,
+            json=build_sale_request(
+                client_id=setup["client"].id,
+                items=[
+                    build_sale_item(product_id=setup["product"].id, quantity=quantity),
+                    build_sale_item(product_id=setup["product"].id, quantity=1)
+                ]
+            )
+        )
+
+        assert_bad_request(response, detail_contains="stock")
+
     async def test_create_sale_product_not_found(
         self,
         api_client,
@@ -309,6 +363,28 @@ class TestSaleRetrieval:
         assert isinstance(data, list)
         assert len(data) >= 1
 
+    async def test_list_all_sales_row_fields(
+        self,
+        api_client,
+        superuser_headers,
+        test_sale,
+        test_client,
+        test_school
+    ):
+        """List rows should carry names and item counts from the projection."""
+        response = await api_client.get(
+            "/api/v1/sales",
+            headers=superuser_headers,
+            params={"school_id": str(test_school.id)}
+        )
+
+        data = assert_success_response(response)
+        row = next(s for s in data if s["id"] == str(test_sale.id))
+        assert row["items_count"] == 1
+        assert row["client_name"] == test_client.name
+        assert row["school_name"] == test_school.name
+        assert row["payment_method"] == "cash"
+
     async def test_list_school_sales(
         self,
         api_client,
@@ -718,3 +794,86 @@ class TestSaleCodeGeneration:
         # Should be sequential
         for i in range(1, len(numbers)):
             assert numbers[i] == numbers[i-1] + 1
+
+
+# ============================================================================
+# DAILY ROLLUP TESTS
+# ============================================================================
+
+class TestSalesDailyRollup:
+    """Tests for the daily sales rollup behind the sales reports."""
+
+    async def test_daily_report_includes_new_sale(
+        self,
+        api_client,
+        superuser_headers,
+        complete_test_setup,
+        db_session
+    ):
+        """A created sale should show up in the daily report and keep the rollup consistent."""
+        from app.services.sales_rollup import SalesRollupService
+
+        setup = complete_test_setup
+        school_id = setup["school"].id
+
+        response = await api_client.post(
+            f"/api/v1/schools/{school_id}/sales",
+            headers=superuser_headers,
+            json=build_sale_request(
+                client_id=setup["client"].id,
+                items=[build_sale_item(product_id=setup["product"].id, quantity=2)],
+                payment_method="transfer"
+            )
+        )
+        sale = assert_created_response(response)
+        sale_date = sale["sale_date"][:10]
+
+        response = await api_client.get(
+            f"/api/v1/schools/{school_id}/reports/sales/daily",
+            headers=superuser_headers,
+            params={"target_date": sale_date}
+        )
+        daily = assert_success_response(response)
+
+        assert daily["completed_count"] == 1
+        assert daily["total_revenue"] == float(sale["total"])
+        assert daily["transfer_sales"] == float(sale["total"])
+        assert daily["cash_sales"] == 0
+
+        mismatches = await SalesRollupService(db_session).find_inconsistencies(school_id)
+        assert mismatches == []
+
+    async def test_sales_summary_groups_payment_methods(
+        self,
+        api_client,
+        superuser_headers,
+        complete_test_setup
+    ):
+        """The summary should aggregate rollup rows by payment method."""
+        setup = complete_test_setup
+        school_id = setup["school"].id
+
+        for method in ("cash", "cash", "card"):
+            response = await api_client.post(
+                f"/api/v1/schools/{school_id}/sales",
+                headers=superuser_headers,
+                json=build_sale_request(
+                    client_id=setup["client"].id,
+                    items=[build_sale_item(product_id=setup["product"].id, quantity=1)],
+                    payment_method=method
+                )
+            )
+            sale = assert_created_response(response)
+
+        sale_date = sale["sale_date"][:10]
+        response = await api_client.get(
+            f"/api/v1/schools/{school_id}/reports/sales/summary",
+            headers=superuser_headers,
+            params={"start_date": sale_date, "end_date": sale_date}
+        )
+        summary = assert_success_response(response)
+
+        assert summary["total_sales"] == 3
+        assert summary["sales_by_payment"]["cash"]["count"] == 2
+        assert summary["sales_by_payment"]["card"]["count"] == 1
+        assert summary["average_ticket"] == float(sale["total"])
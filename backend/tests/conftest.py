@@ -25,6 +25,7 @@ from app.models.sale import SaleStatus, PaymentMethod, ChangeType, ChangeStatus
 from app.models.order import OrderStatus
 from app.models.user import UserRole
 from app.core.config import settings
+from app.core.metrics import install_query_hooks
 
 
 # ============================================================================
@@ -60,6 +61,8 @@ async def async_engine():
         pool_size=5,
         max_overflow=10
     )
+    # Same per-request SQL counting as the app engine (app.db.session)
+    install_query_hooks(engine)
 
     # Create all tables once at session start
     async with engine.begin() as conn:
@@ -111,6 +114,7 @@ def mock_db_session():
     session.execute = AsyncMock()
     session.scalar = AsyncMock()
     session.scalars = AsyncMock()
+    session.info = {}  # Post-commit callbacks (app.db.hooks)
     return session
 
 
@@ -535,8 +539,14 @@ async def api_client(app, db_session) -> AsyncGenerator[AsyncClient, None]:
             response = await api_client.get("/api/v1/health")
             assert response.status_code == 200
     """
+    from app.core.cache import cache
+    from app.core.ephemeral import ephemeral_store
     from app.db.session import get_db
 
+    # Cached responses would outlive the rolled-back test data
+    await cache.clear()
+    await ephemeral_store.clear()
+
     # Override database dependency
     async def override_get_db():
         yield db_session
@@ -551,6 +561,26 @@ async def api_client(app, db_session) -> AsyncGenerator[AsyncClient, None]:
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def assert_max_queries():
+    """
+    SQL statement budget around an API call (tests.fixtures.query_budget).
+
+    Usage:
+        with assert_max_queries(10):
+            await api_client.get("/api/v1/sales", headers=superuser_headers)
+    """
+    from tests.fixtures.query_budget import assert_max_queries
+    return assert_max_queries
+
+
+@pytest.fixture
+def count_queries():
+    """Count SQL statements inside a block, for comparing two calls."""
+    from tests.fixtures.query_budget import count_queries
+    return count_queries
+
+
 @pytest.fixture
 async def test_user(db_session) -> User:
     """Create a test user in the database."""
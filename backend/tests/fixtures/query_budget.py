@@ -0,0 +1,46 @@
+"""
+SQL statement budgets for API tests.
+
+Counts the statements the test engine executes (app.core.metrics hooks,
+installed in conftest) while a block runs, so tests can guard endpoints
+against N+1 regressions:
+
+    async def test_list_sales_budget(api_client, superuser_headers, assert_max_queries):
+        with assert_max_queries(10):
+            await api_client.get("/api/v1/sales", headers=superuser_headers)
+
+Use count_queries to compare two calls, e.g. that a list costs the same
+number of statements with 3 rows and with 30.
+"""
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.core.metrics import RequestStats, track_queries
+
+
+def count_queries():
+    """Context manager yielding the stats of the statements run inside it."""
+    return track_queries()
+
+
+def describe_queries(stats: RequestStats, top: int = 3) -> str:
+    """Statement count and the most repeated statements (N+1 suspects)."""
+    lines = [f"{stats.queries} statements, {stats.db_seconds * 1000:.1f} ms in DB"]
+    for statement, repeats in stats.statements.most_common(top):
+        lines.append(f"  {repeats}x {' '.join(statement.split())[:200]}")
+    return "\n".join(lines)
+
+
+@contextmanager
+def assert_max_queries(budget: int) -> Iterator[RequestStats]:
+    """
+    Assert the block executes at most `budget` SQL statements.
+
+    Raises:
+        AssertionError: With the most repeated statements if over budget
+    """
+    with track_queries() as stats:
+        yield stats
+    assert stats.queries <= budget, (
+        f"Query budget exceeded ({budget}): {describe_queries(stats)}"
+    )
@@ -0,0 +1,146 @@
+"""
+Concurrency stress test for the append-only balance ledger.
+
+Many sessions record movements on the same account at once (each in its
+own transaction, committed) while compactions run in between. The final
+balance must equal the sum of every movement: no lost updates. The same
+holds without the ledger, where apply_to_account locks the account row.
+Concurrent expenses cannot overdraw an account in either mode.
+
+Requires PostgreSQL (uses the async_engine fixture).
+"""
+import asyncio
+import pytest
+from decimal import Decimal
+from uuid import uuid4
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.accounting import BalanceAccount, BalanceEntry, AccountType
+from app.services.balance_integration import BalanceIntegrationService, DEFAULT_ACCOUNTS
+from app.services.balance_ledger import BalanceLedgerService
+
+
+pytestmark = pytest.mark.integration
+
+WRITERS = 40
+AMOUNT = Decimal("1000")
+
+
+@pytest.fixture
+async def committed_account(async_engine):
+    """Account committed outside the per-test transaction, deleted afterwards"""
+    async with AsyncSession(async_engine, expire_on_commit=False) as db:
+        account = BalanceAccount(
+            account_type=AccountType.ASSET_CURRENT,
+            name="Caja Stress",
+            code=f"S-{uuid4().hex[:8]}",
+            balance=Decimal("0")
+        )
+        db.add(account)
+        await db.commit()
+        account_id = account.id
+
+    yield account_id
+
+    async with AsyncSession(async_engine) as db:
+        await db.execute(delete(BalanceAccount).where(BalanceAccount.id == account_id))
+        await db.commit()
+
+
+async def record_movement(async_engine, account_id) -> None:
+    async with AsyncSession(async_engine, expire_on_commit=False) as db:
+        service = BalanceIntegrationService(db)
+        account = await db.get(BalanceAccount, account_id)
+        await service.apply_to_account(account, AMOUNT, "Venta concurrente")
+        await db.commit()
+
+
+async def compact(async_engine, account_id) -> None:
+    async with AsyncSession(async_engine) as db:
+        await BalanceLedgerService(db).compact([account_id])
+        await db.commit()
+
+
+async def test_concurrent_movements_lose_nothing(async_engine, committed_account, monkeypatch):
+    """Concurrent appends and compactions add up to the exact balance."""
+    monkeypatch.setattr(settings, "BALANCE_LEDGER_ENABLED", True)
+
+    tasks = [record_movement(async_engine, committed_account) for _ in range(WRITERS)]
+    # Interleave compactions with the writers
+    for position in (WRITERS // 4, WRITERS // 2, 3 * WRITERS // 4):
+        tasks.insert(position, compact(async_engine, committed_account))
+    await asyncio.gather(*tasks)
+    await compact(async_engine, committed_account)
+
+    async with AsyncSession(async_engine) as db:
+        account = await db.get(BalanceAccount, committed_account)
+        result = await db.execute(
+            select(BalanceEntry.balance_after)
+            .where(BalanceEntry.account_id == committed_account)
+            .order_by(BalanceEntry.balance_after)
+        )
+        balances_after = list(result.scalars().all())
+
+    expected = AMOUNT * WRITERS
+    assert account.balance == expected
+    # Every entry got its own running balance: 1000, 2000, ..., 40000
+    assert balances_after == [AMOUNT * n for n in range(1, WRITERS + 1)]
+
+
+async def test_direct_mode_movements_lose_nothing(async_engine, committed_account, monkeypatch):
+    """Without the ledger, apply_to_account locks the row: no lost updates."""
+    monkeypatch.setattr(settings, "BALANCE_LEDGER_ENABLED", False)
+
+    await asyncio.gather(*[
+        record_movement(async_engine, committed_account) for _ in range(WRITERS)
+    ])
+
+    async with AsyncSession(async_engine) as db:
+        account = await db.get(BalanceAccount, committed_account)
+
+    assert account.balance == AMOUNT * WRITERS
+
+
+async def pay_expense(async_engine, amount: Decimal) -> bool:
+    """One expense from Caja Mayor in its own transaction; False if rejected"""
+    async with AsyncSession(async_engine, expire_on_commit=False) as db:
+        try:
+            await BalanceIntegrationService(db).record_expense_payment_from_account(
+                amount, "caja_mayor", "Gasto concurrente"
+            )
+        except ValueError:
+            return False
+        await db.commit()
+        return True
+
+
+@pytest.mark.parametrize("ledger_enabled", [True, False])
+async def test_concurrent_expenses_cannot_overdraw(
+    async_engine, committed_account, monkeypatch, ledger_enabled
+):
+    """Five $80 expenses on $100: one is paid, the rest get "Fondos insuficientes"."""
+    monkeypatch.setattr(settings, "BALANCE_LEDGER_ENABLED", ledger_enabled)
+    async with AsyncSession(async_engine) as db:
+        account = await db.get(BalanceAccount, committed_account)
+        monkeypatch.setitem(
+            DEFAULT_ACCOUNTS, "caja_mayor", {**DEFAULT_ACCOUNTS["caja_mayor"], "code": account.code}
+        )
+        await db.execute(
+            update(BalanceAccount)
+            .where(BalanceAccount.id == committed_account)
+            .values(balance=Decimal("100"))
+        )
+        await db.commit()
+
+    paid = await asyncio.gather(*[
+        pay_expense(async_engine, Decimal("80")) for _ in range(5)
+    ])
+    await compact(async_engine, committed_account)
+
+    async with AsyncSession(async_engine) as db:
+        account = await db.get(BalanceAccount, committed_account)
+
+    assert paid.count(True) == 1
+    assert account.balance == Decimal("20")
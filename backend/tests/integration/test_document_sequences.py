@@ -0,0 +1,148 @@
+"""
+Load test for document code sequences.
+
+Fires hundreds of concurrent sales at a single school, each in its own
+session/transaction (like concurrent cashiers), and verifies the generated
+VNT codes are unique and gap-free.
+
+Requires PostgreSQL (uses the async_engine fixture and commits real data,
+cleaning it up at the end).
+"""
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import (
+    School, User, GarmentType, Product, Inventory, Sale, SaleItem,
+    AccountsReceivable, DocumentSequence,
+)
+from app.models.sale import PaymentMethod
+from app.schemas.sale import SaleCreate, SaleItemCreate
+from app.services.sale import SaleService
+from app.services.sequence import DocumentSequenceService
+
+
+pytestmark = [pytest.mark.integration, pytest.mark.slow]
+
+CONCURRENT_SALES = 200
+
+
+@pytest.fixture
+async def sequence_school(async_engine):
+    """Committed school with one product in stock; removed after the test."""
+    session_factory = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    unique = uuid4().hex[:8]
+
+    async with session_factory() as db:
+        school = School(code=f"SEQ-{unique}", name=f"Seq {unique}", slug=f"seq-{unique}")
+        user = User(
+            username=f"seq_{unique}",
+            email=f"seq_{unique}@test.com",
+            hashed_password="x",
+        )
+        db.add_all([school, user])
+        await db.flush()
+
+        garment_type = GarmentType(school_id=school.id, name=f"Camisa {unique}")
+        db.add(garment_type)
+        await db.flush()
+
+        product = Product(
+            school_id=school.id,
+            garment_type_id=garment_type.id,
+            code="PRD-0007",
+            size="M",
+            price=Decimal("45000"),
+        )
+        db.add(product)
+        await db.flush()
+
+        db.add(Inventory(school_id=school.id, product_id=product.id, quantity=CONCURRENT_SALES))
+        await db.commit()
+
+    yield {
+        "session_factory": session_factory,
+        "school": school,
+        "user": user,
+        "product": product,
+    }
+
+    async with session_factory() as db:
+        sale_ids = select(Sale.id).where(Sale.school_id == school.id)
+        await db.execute(delete(AccountsReceivable).where(AccountsReceivable.sale_id.in_(sale_ids)))
+        await db.execute(delete(SaleItem).where(SaleItem.sale_id.in_(sale_ids)))
+        await db.execute(delete(Sale).where(Sale.school_id == school.id))
+        await db.execute(delete(Inventory).where(Inventory.school_id == school.id))
+        await db.execute(delete(Product).where(Product.school_id == school.id))
+        await db.execute(delete(GarmentType).where(GarmentType.school_id == school.id))
+        await db.execute(delete(DocumentSequence).where(DocumentSequence.scope == str(school.id)))
+        await db.execute(delete(User).where(User.id == user.id))
+        await db.execute(delete(School).where(School.id == school.id))
+        await db.commit()
+
+
+async def test_concurrent_sales_get_unique_gap_free_codes(sequence_school):
+    """Concurrent cashiers at one school never share or skip a sale code."""
+    session_factory = sequence_school["session_factory"]
+    school = sequence_school["school"]
+
+    async def cashier_sale() -> str:
+        async with session_factory() as db:
+            sale = await SaleService(db).create_sale(
+                SaleCreate(
+                    school_id=school.id,
+                    items=[SaleItemCreate(product_id=sequence_school["product"].id, quantity=1)],
+                    payment_method=PaymentMethod.CREDIT,
+                ),
+                user_id=sequence_school["user"].id,
+            )
+            await db.commit()
+            return sale.code
+
+    codes = await asyncio.gather(*(cashier_sale() for _ in range(CONCURRENT_SALES)))
+
+    prefix = f"VNT-{datetime.now().year}-"
+    assert len(set(codes)) == CONCURRENT_SALES
+    numbers = sorted(int(code.removeprefix(prefix)) for code in codes)
+    assert numbers == list(range(1, CONCURRENT_SALES + 1))
+
+
+async def test_rolled_back_allocation_is_reused(sequence_school):
+    """A number allocated by a rolled back transaction is handed out again."""
+    session_factory = sequence_school["session_factory"]
+    school_id = sequence_school["school"].id
+
+    async with session_factory() as db:
+        first = await DocumentSequenceService(db).next_value("TST-", school_id)
+        await db.rollback()
+
+    async with session_factory() as db:
+        second = await DocumentSequenceService(db).next_value("TST-", school_id)
+        await db.commit()
+
+    assert first == second == 1
+
+
+async def test_counter_seeds_from_existing_codes(sequence_school):
+    """A new counter continues after codes created before it existed."""
+    session_factory = sequence_school["session_factory"]
+    school_id = sequence_school["school"].id
+
+    async with session_factory() as db:
+        sequences = DocumentSequenceService(db)
+        value = await sequences.next_value(
+            "PRD-",
+            school_id,
+            seed=lambda: sequences.max_code_number(
+                Product.code, "PRD-", Product.school_id == school_id
+            ),
+        )
+        await db.commit()
+
+    # The fixture product is PRD-0007
+    assert value == 8
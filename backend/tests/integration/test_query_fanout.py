@@ -0,0 +1,105 @@
+"""
+Tests for the concurrent query fan-out helper (app.db.fanout).
+
+Requires PostgreSQL (uses the async_engine fixture).
+"""
+import asyncio
+import weakref
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db import fanout
+from app.db.fanout import fan_out
+from app.models import School
+
+
+pytestmark = pytest.mark.integration
+
+
+async def backend_pid(session: AsyncSession) -> int:
+    # The sleep keeps each connection busy so concurrent queries overlap
+    result = await session.execute(text("SELECT pg_backend_pid() FROM pg_sleep(0.05)"))
+    return result.scalar_one()
+
+
+async def test_read_queries_run_on_separate_connections(async_engine):
+    """A clean session fans out to one pooled connection per query."""
+    async with AsyncSession(async_engine) as db:
+        pids = await fan_out(db, backend_pid, backend_pid, backend_pid)
+
+    assert len(set(pids)) == 3
+
+
+async def test_results_keep_query_order(async_engine):
+    """Results come back in the order the queries were given."""
+    def constant(value: int):
+        # Later queries finish first
+        async def query(session: AsyncSession) -> int:
+            result = await session.execute(
+                text(f"SELECT {value} FROM pg_sleep({(3 - value) * 0.02})")
+            )
+            return result.scalar_one()
+        return query
+
+    async with AsyncSession(async_engine) as db:
+        results = await fan_out(db, constant(1), constant(2), constant(3))
+
+    assert results == [1, 2, 3]
+
+
+async def test_uncommitted_writes_stay_on_request_session(db_session):
+    """After a flush, queries run on the same session so they see its writes."""
+    school = School(code="FAN-OUT", name="Fan Out", slug="fan-out")
+    db_session.add(school)
+    await db_session.flush()
+
+    async def count_schools(session: AsyncSession) -> int:
+        result = await session.execute(
+            text("SELECT count(*) FROM schools WHERE code = 'FAN-OUT'")
+        )
+        return result.scalar_one()
+
+    own_pid = await backend_pid(db_session)
+    pids = await fan_out(db_session, backend_pid, backend_pid)
+    counts = await fan_out(db_session, count_schools, count_schools)
+
+    assert pids == [own_pid, own_pid]
+    assert counts == [1, 1]
+
+
+async def test_disabled_by_setting(async_engine, monkeypatch):
+    """DB_FANOUT_ENABLED=False runs everything sequentially on the session."""
+    monkeypatch.setattr(settings, "DB_FANOUT_ENABLED", False)
+
+    async with AsyncSession(async_engine) as db:
+        pids = await fan_out(db, backend_pid, backend_pid)
+
+    assert pids[0] == pids[1]
+
+
+async def test_concurrent_fan_outs_share_one_budget(async_engine, monkeypatch):
+    """Several requests fanning out at once stay within one connection budget."""
+    monkeypatch.setattr(settings, "DB_FANOUT_MAX_CONNECTIONS", 2)
+    monkeypatch.setattr(fanout, "_budgets", weakref.WeakKeyDictionary())
+    running = peak = 0
+
+    async def tracked(session: AsyncSession) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            return await backend_pid(session)
+        finally:
+            running -= 1
+
+    async def dashboard() -> list[int]:
+        async with AsyncSession(async_engine) as db:
+            return await fan_out(db, tracked, tracked, tracked)
+
+    results = await asyncio.gather(*(dashboard() for _ in range(3)))
+
+    assert [len(pids) for pids in results] == [3, 3, 3]
+    assert peak == 2
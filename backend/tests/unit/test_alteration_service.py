@@ -24,6 +24,7 @@ def mock_db_session():
     session.refresh = AsyncMock()
     session.commit = AsyncMock()
     session.execute = AsyncMock()
+    session.info = {}
     return session
 
 
@@ -53,7 +54,7 @@ async def test_create_alteration_generates_code(mock_db_session, alteration_serv
 
     # Mock code generation query (first call) and get() query (second call)
     code_gen_result = MagicMock()
-    code_gen_result.scalar_one.return_value = 0  # No existing alterations
+    code_gen_result.scalar_one_or_none.return_value = 1  # Sequence counter
 
     get_result = MagicMock()
     get_result.scalar_one_or_none.return_value = mock_alteration
@@ -92,7 +93,7 @@ async def test_create_alteration_with_initial_payment(mock_db_session, alteratio
 
     # Mock code generation query (first call) and get() query (second call)
     code_gen_result = MagicMock()
-    code_gen_result.scalar_one.return_value = 0
+    code_gen_result.scalar_one_or_none.return_value = 1
 
     get_result = MagicMock()
     get_result.scalar_one_or_none.return_value = mock_alteration
@@ -254,39 +255,52 @@ async def test_list_alterations_with_filters(mock_db_session, alteration_service
 
 @pytest.mark.asyncio
 async def test_get_summary_returns_statistics(mock_db_session, alteration_service):
-    """Test that get_summary returns correct statistics."""
-    # Mock multiple execute calls for different queries
-    total_result = MagicMock()
-    total_result.scalar_one.return_value = 10  # total count
-
-    status_result = MagicMock()
-    status_result.scalar_one.return_value = 3  # count per status
-
-    revenue_result = MagicMock()
-    revenue_result.scalar_one.return_value = Decimal("150000")
-
-    pending_result = MagicMock()
-    pending_result.scalar_one.return_value = Decimal("50000")
-
-    today_result = MagicMock()
-    today_result.scalar_one.return_value = 2
-
-    # Set up execute to return different results for each call
-    mock_db_session.execute.side_effect = [
-        total_result,
-        status_result, status_result, status_result,  # For each status
-        status_result, status_result,
-        revenue_result,
-        pending_result,
-        today_result,
-        today_result
-    ]
+    """Test that get_summary returns correct statistics from one query."""
+    summary_row = MagicMock(
+        total_count=10,
+        pending=3,
+        in_progress=2,
+        ready=1,
+        delivered=3,
+        cancelled=1,
+        total_revenue=Decimal("150000"),
+        total_pending=Decimal("50000"),
+        today_received=2,
+        today_delivered=1
+    )
+    summary_result = MagicMock()
+    summary_result.one.return_value = summary_row
+    mock_db_session.execute.return_value = summary_result
 
     result = await alteration_service.get_summary()
 
+    mock_db_session.execute.assert_called_once()
     assert result.total_count == 10
+    assert result.pending_count == 3
+    assert result.cancelled_count == 1
     assert result.total_revenue == Decimal("150000")
     assert result.total_pending_payment == Decimal("50000")
+    assert result.today_received == 2
+    assert result.today_delivered == 1
+
+
+@pytest.mark.asyncio
+async def test_cancel_invalidates_summary_cache(mock_db_session, alteration_service):
+    """Test that writes drop the cached dashboard summary."""
+    mock_alteration = MagicMock(spec=Alteration)
+    mock_alteration.amount_paid = Decimal("0")
+
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = mock_alteration
+    mock_db_session.execute.return_value = mock_result
+
+    with patch("app.services.alteration.cache") as mock_cache:
+        await alteration_service.cancel(uuid4())
+
+    mock_cache.invalidate.assert_not_called()
+    mock_cache.invalidate_after_commit.assert_called_once_with(
+        mock_db_session, "alterations_summary"
+    )
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,131 @@
+"""
+Unit Tests for the authentication snapshot cache (app.services.auth_cache)
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from app.core.cache import ResponseCache
+from app.models.user import User, UserRole
+from app.services import auth_cache
+from app.services.auth_cache import (
+    AuthSnapshot,
+    load_auth_snapshot,
+    invalidate_auth_snapshot,
+)
+
+
+def make_user(**overrides) -> User:
+    values = dict(
+        id=uuid4(),
+        username="vendedor",
+        email="vendedor@example.com",
+        hashed_password="hash",
+        full_name="Vendedor",
+        is_active=True,
+        is_superuser=False,
+        created_at=datetime(2026, 1, 1),
+        updated_at=datetime(2026, 1, 1),
+        last_login=None,
+    )
+    values.update(overrides)
+    return User(**values)
+
+
+def mock_db_for(user: User, roles: list[tuple]) -> MagicMock:
+    """Session whose first query returns the user and second the roles"""
+    user_result = MagicMock()
+    user_result.scalar_one_or_none = MagicMock(return_value=user)
+    roles_result = MagicMock()
+    roles_result.all = MagicMock(return_value=[
+        MagicMock(school_id=school_id, role=role) for school_id, role in roles
+    ])
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=[user_result, roles_result])
+    return db
+
+
+@pytest.fixture
+def memory_cache():
+    """Isolated in-process cache for each test"""
+    with patch.object(auth_cache, "cache", ResponseCache()) as cache:
+        yield cache
+
+
+class TestAuthSnapshot:
+    """Tests for snapshot serialization"""
+
+    def test_json_round_trip(self):
+        school_id = uuid4()
+        user = make_user()
+        snapshot = AuthSnapshot.from_json(
+            AuthSnapshot(
+                user=auth_cache.UserResponse.model_validate(user),
+                roles={school_id: UserRole.ADMIN},
+            ).to_json()
+        )
+
+        assert snapshot.user.id == user.id
+        assert snapshot.role_for(school_id) == UserRole.ADMIN
+        assert snapshot.role_for(uuid4()) is None
+
+    def test_to_user_is_detached_copy_without_password(self):
+        user = make_user(is_superuser=True)
+        snapshot = AuthSnapshot(user=auth_cache.UserResponse.model_validate(user), roles={})
+
+        detached = snapshot.to_user()
+
+        assert detached.id == user.id
+        assert detached.is_superuser is True
+        assert detached.hashed_password is None
+
+
+class TestLoadAuthSnapshot:
+    """Tests for cached loading and invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_second_load_does_no_queries(self, memory_cache):
+        school_id = uuid4()
+        user = make_user()
+        db = mock_db_for(user, [(school_id, UserRole.SELLER)])
+
+        first = await load_auth_snapshot(db, user.id)
+        second = await load_auth_snapshot(db, user.id)
+
+        assert db.execute.await_count == 2
+        assert second.user == first.user
+        assert second.role_for(school_id) == UserRole.SELLER
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_reload(self, memory_cache):
+        user = make_user()
+        await load_auth_snapshot(mock_db_for(user, []), user.id)
+
+        await invalidate_auth_snapshot(user.id)
+        db = mock_db_for(make_user(id=user.id, is_active=False), [])
+        snapshot = await load_auth_snapshot(db, user.id)
+
+        assert db.execute.await_count == 2
+        assert snapshot.is_active is False
+
+    @pytest.mark.asyncio
+    async def test_ttl_zero_disables_cache(self, memory_cache):
+        user = make_user()
+
+        with patch.object(auth_cache.settings, "AUTH_CACHE_TTL_SECONDS", 0):
+            await load_auth_snapshot(mock_db_for(user, []), user.id)
+            db = mock_db_for(user, [])
+            await load_auth_snapshot(db, user.id)
+
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_user_is_not_cached(self, memory_cache):
+        user_result = MagicMock()
+        user_result.scalar_one_or_none = MagicMock(return_value=None)
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=user_result)
+
+        assert await load_auth_snapshot(db, uuid4()) is None
+        assert memory_cache.stats()["namespaces"]["auth"]["hits"] == 0
@@ -0,0 +1,168 @@
+"""
+Unit Tests for the append-only balance ledger (app.services.balance_ledger)
+
+Tests cover:
+- Appending entries without touching the account row
+- Current balance = snapshot + pending entries
+- Compaction (running balance_after, idempotence, one account at a time)
+- BalanceIntegrationService in ledger mode (asset debits are checked)
+"""
+import pytest
+from decimal import Decimal
+from uuid import uuid4
+
+from app.core.config import settings
+from app.models.accounting import BalanceAccount, BalanceEntry, AccountType
+from app.services.balance_integration import BalanceIntegrationService
+from app.services.balance_ledger import BalanceLedgerService
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+async def account(db_session) -> BalanceAccount:
+    account = BalanceAccount(
+        account_type=AccountType.ASSET_CURRENT,
+        name="Caja Test",
+        code=f"T-{uuid4().hex[:8]}",
+        balance=Decimal("1000")
+    )
+    db_session.add(account)
+    await db_session.flush()
+    return account
+
+
+@pytest.fixture
+def ledger_mode(monkeypatch):
+    monkeypatch.setattr(settings, "BALANCE_LEDGER_ENABLED", True)
+
+
+class TestLedgerAppend:
+    """Tests for appending and reading balances"""
+
+    async def test_append_leaves_account_row_untouched(self, db_session, account):
+        ledger = BalanceLedgerService(db_session)
+
+        entry = await ledger.append(account.id, Decimal("250"), "Venta")
+
+        await db_session.refresh(account)
+        assert entry.balance_after is None
+        assert account.balance == Decimal("1000")
+
+    async def test_balance_includes_pending_entries(self, db_session, account):
+        ledger = BalanceLedgerService(db_session)
+        await ledger.append(account.id, Decimal("250"), "Venta")
+        await ledger.append(account.id, Decimal("-100"), "Gasto")
+
+        assert await ledger.get_balance(account.id) == Decimal("1150")
+        assert await ledger.get_balance(uuid4()) is None
+
+
+class TestLedgerCompaction:
+    """Tests for folding pending entries into the snapshot"""
+
+    async def test_compact_assigns_running_balances(self, db_session, account):
+        ledger = BalanceLedgerService(db_session)
+        entries = [
+            await ledger.append(account.id, amount, "Movimiento")
+            for amount in (Decimal("250"), Decimal("-100"), Decimal("50"))
+        ]
+
+        compacted = await ledger.compact([account.id])
+
+        for entry in entries:
+            await db_session.refresh(entry)
+        assert compacted == 3
+        assert [e.balance_after for e in entries] == [
+            Decimal("1250"), Decimal("1150"), Decimal("1200")
+        ]
+        assert account.balance == Decimal("1200")
+        assert account.ledger_compacted_at is not None
+        assert await ledger.get_balance(account.id) == Decimal("1200")
+
+    async def test_compact_is_idempotent(self, db_session, account):
+        ledger = BalanceLedgerService(db_session)
+        await ledger.append(account.id, Decimal("250"), "Venta")
+
+        assert await ledger.compact([account.id]) == 1
+        assert await ledger.compact([account.id]) == 0
+        assert account.balance == Decimal("1250")
+
+    async def test_compact_all_finds_pending_accounts(self, db_session, account):
+        ledger = BalanceLedgerService(db_session)
+        await ledger.append(account.id, Decimal("10"), "Venta")
+
+        assert await ledger.compact() >= 1
+        assert account.balance == Decimal("1010")
+
+
+    async def test_compact_skips_account_that_cannot_fold(self, db_session, account):
+        ledger = BalanceLedgerService(db_session)
+        overdrawn = BalanceAccount(
+            account_type=AccountType.ASSET_CURRENT,
+            name="Caja Sobregirada",
+            code=f"T-{uuid4().hex[:8]}",
+            balance=Decimal("100")
+        )
+        db_session.add(overdrawn)
+        await db_session.flush()
+        await ledger.append(overdrawn.id, Decimal("-500"), "Gasto sin validar")
+        await ledger.append(account.id, Decimal("10"), "Venta")
+
+        await ledger.compact([overdrawn.id, account.id])
+
+        assert account.balance == Decimal("1010")
+        await db_session.refresh(overdrawn)
+        assert overdrawn.balance == Decimal("100")
+        assert await ledger.get_balance(overdrawn.id) == Decimal("-400")
+
+
+class TestIntegrationServiceLedgerMode:
+    """BalanceIntegrationService with BALANCE_LEDGER_ENABLED"""
+
+    async def test_apply_to_account_appends_pending_entry(
+        self, db_session, account, ledger_mode
+    ):
+        service = BalanceIntegrationService(db_session)
+
+        entry = await service.apply_to_account(account, Decimal("300"), "Venta")
+
+        await db_session.refresh(account)
+        assert entry.balance_after is None
+        assert account.balance == Decimal("1000")
+        assert await service.get_current_balance(account) == Decimal("1300")
+
+    async def test_apply_to_account_legacy_mode_updates_row(self, db_session, account):
+        service = BalanceIntegrationService(db_session)
+
+        entry = await service.apply_to_account(account, Decimal("300"), "Venta")
+
+        assert entry.balance_after == Decimal("1300")
+        assert account.balance == Decimal("1300")
+
+    async def test_asset_debit_is_locked_and_checked(self, db_session, account, ledger_mode):
+        service = BalanceIntegrationService(db_session)
+
+        entry = await service.apply_to_account(account, Decimal("-400"), "Gasto")
+
+        assert entry.balance_after == Decimal("600")
+        assert account.balance == Decimal("600")
+        with pytest.raises(ValueError, match="Fondos insuficientes"):
+            await service.apply_to_account(account, Decimal("-601"), "Gasto")
+        assert await service.get_current_balance(account) == Decimal("600")
+
+    async def test_lock_current_gives_exact_balance(self, db_session, account, ledger_mode):
+        await BalanceLedgerService(db_session).append(account.id, Decimal("-400"), "Gasto")
+
+        locked = await BalanceLedgerService(db_session).lock_current([account.id])
+
+        assert locked[account.id] is account
+        assert account.balance == Decimal("600")
+        pending = await db_session.execute(
+            BalanceEntry.__table__.select().where(
+                BalanceEntry.account_id == account.id,
+                BalanceEntry.balance_after.is_(None)
+            )
+        )
+        assert pending.all() == []
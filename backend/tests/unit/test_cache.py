@@ -0,0 +1,139 @@
+"""
+Unit Tests for the response cache (app.core.cache)
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+from sqlalchemy import select
+
+from app.core.cache import MemoryCache, ResponseCache
+
+
+class TestMemoryCache:
+    """Tests for the in-process cache backend"""
+
+    @pytest.mark.asyncio
+    async def test_get_returns_value_until_expired(self):
+        cache = MemoryCache()
+
+        with patch("app.core.cache.time.monotonic", return_value=100.0):
+            await cache.set("dashboard:a", {"total": 1}, ttl=30)
+            assert await cache.get("dashboard:a") == {"total": 1}
+
+        with patch("app.core.cache.time.monotonic", return_value=130.0):
+            assert await cache.get("dashboard:a") is None
+
+    @pytest.mark.asyncio
+    async def test_delete_prefix_only_removes_matching_keys(self):
+        cache = MemoryCache()
+        await cache.set("dashboard:a", 1, ttl=30)
+        await cache.set("dashboard:b", 2, ttl=30)
+        await cache.set("products:a", 3, ttl=30)
+
+        await cache.delete_prefix("dashboard:")
+
+        assert await cache.get("dashboard:a") is None
+        assert await cache.get("dashboard:b") is None
+        assert await cache.get("products:a") == 3
+
+    @pytest.mark.asyncio
+    async def test_evicts_when_full(self):
+        cache = MemoryCache(max_entries=4)
+        for i in range(10):
+            await cache.set(f"key:{i}", i, ttl=30)
+
+        assert len(cache._entries) <= 4
+        assert await cache.get("key:9") == 9
+
+
+class TestResponseCache:
+    """Tests for the cache facade"""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_memory_when_redis_unreachable(self):
+        cache = ResponseCache("redis://127.0.0.1:1/0")
+
+        await cache.set("products:a:1", [1, 2], ttl=30)
+
+        assert cache.backend_name == "memory"
+        assert await cache.get("products:a:1") == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_get_or_set_counts_hits_and_misses(self):
+        cache = ResponseCache()
+        calls = []
+
+        async def producer():
+            calls.append(1)
+            return {"name": "Camisa"}
+
+        key = cache.key("products", "school-1", 0, 100)
+        assert await cache.get_or_set(key, 60, producer) == {"name": "Camisa"}
+        assert await cache.get_or_set(key, 60, producer) == {"name": "Camisa"}
+
+        assert len(calls) == 1
+        assert cache.stats() == {
+            "backend": "memory",
+            "namespaces": {"products": {"hits": 1, "misses": 1}},
+        }
+
+    @pytest.mark.asyncio
+    async def test_invalidate_school_keeps_other_schools(self):
+        cache = ResponseCache()
+        key_a = cache.key("products", "school-a", 1)
+        key_b = cache.key("products", "school-b", 1)
+        key_all = cache.key("products", None, ["school-a", "school-b"])
+        for key in (key_a, key_b, key_all):
+            await cache.set(key, 1, ttl=60)
+
+        await cache.invalidate("products", "school-a")
+
+        assert await cache.get(key_a) is None
+        assert await cache.get(key_all) is None
+        assert await cache.get(key_b) == 1
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_only_the_exact_key(self):
+        cache = ResponseCache()
+        await cache.set("auth:user-1", 1, ttl=60)
+        await cache.set("auth:user-10", 2, ttl=60)
+
+        await cache.delete("auth:user-1")
+
+        assert await cache.get("auth:user-1") is None
+        assert await cache.get("auth:user-10") == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_after_commit_waits_for_commit(self, db_session):
+        cache = ResponseCache()
+        key = cache.key("schools", None, "slug", "x")
+        await cache.set(key, 1, ttl=60)
+
+        await db_session.execute(select(1))
+        cache.invalidate_after_commit(db_session, "schools")
+        await asyncio.sleep(0)
+        assert await cache.get(key) == 1
+
+        await db_session.commit()
+        await asyncio.sleep(0)
+        assert await cache.get(key) is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_after_commit_dropped_on_rollback(self, db_session):
+        cache = ResponseCache()
+        key = cache.key("schools", None, "slug", "x")
+        await cache.set(key, 1, ttl=60)
+
+        await db_session.execute(select(1))
+        cache.invalidate_after_commit(db_session, "schools")
+        await db_session.rollback()
+        await db_session.execute(select(1))
+        await db_session.commit()
+        await asyncio.sleep(0)
+
+        assert await cache.get(key) == 1
+
+    def test_key_depends_on_parameters(self):
+        assert ResponseCache.key("products", "s", 0, 100) == ResponseCache.key("products", "s", 0, 100)
+        assert ResponseCache.key("products", "s", 0, 100) != ResponseCache.key("products", "s", 100, 100)
+        assert ResponseCache.key("schools", None, "slug", "x").startswith("schools:all:")
@@ -398,6 +398,82 @@ class TestClientServiceSearch:
 
         assert len(results) >= 1
 
+    async def test_search_ranks_name_prefix_first(self, db_session):
+        """Clients whose name starts with the term come before substring matches."""
+        from app.services.client import ClientService
+        from app.schemas.client import ClientCreate
+
+        service = ClientService(db_session)
+        tag = uuid4().hex[:6]
+        contains = await service.create_client(ClientCreate(name=f"Ana Mazq{tag}lo"))
+        word = await service.create_client(ClientCreate(name=f"Luis Zq{tag}"))
+        prefix = await service.create_client(ClientCreate(name=f"Zq{tag} Rojas"))
+
+        results = await service.search_clients(f"zq{tag}")
+
+        assert [c.id for c in results] == [prefix.id, word.id, contains.id]
+
+    async def test_search_matches_student_name_case_insensitive(self, db_session):
+        """Should match other fields regardless of case."""
+        from app.services.client import ClientService
+        from app.schemas.client import ClientCreate
+
+        service = ClientService(db_session)
+        tag = uuid4().hex[:6]
+        client = await service.create_client(
+            ClientCreate(name="Madre Test", student_name=f"Hijo{tag.upper()}")
+        )
+
+        results = await service.search_clients(f"hijo{tag}")
+
+        assert [c.id for c in results] == [client.id]
+
+    async def test_search_code_prefix(self, db_session):
+        """Code-like terms are looked up by prefix."""
+        from app.services.client import ClientService
+        from app.schemas.client import ClientCreate
+
+        service = ClientService(db_session)
+        created = await service.create_client(ClientCreate(name="Prefix Test"))
+
+        results = await service.search_clients(created.code.lower())
+
+        assert [c.id for c in results] == [created.id]
+
+    async def test_search_wildcards_are_literal(self, db_session):
+        """A '%' term must not match every client."""
+        from app.services.client import ClientService
+        from app.schemas.client import ClientCreate
+
+        service = ClientService(db_session)
+        await service.create_client(ClientCreate(name="Wildcard Test"))
+
+        assert await service.search_clients("%") == []
+
+    async def test_search_is_accent_insensitive(self, db_session):
+        """'perez' finds 'Pérez' (needs a UTF8 database)."""
+        from sqlalchemy import text
+        from app.services.client import ClientService
+        from app.schemas.client import ClientCreate
+
+        encoding = (await db_session.execute(text("SHOW server_encoding"))).scalar()
+        if encoding != "UTF8":
+            pytest.skip("translate() folds accents only on UTF8 databases")
+
+        service = ClientService(db_session)
+        tag = uuid4().hex[:6]
+        client = await service.create_client(ClientCreate(name=f"José Pérez {tag}"))
+
+        results = await service.search_clients(f"jose perez {tag}")
+
+        assert [c.id for c in results] == [client.id]
+
+    def test_normalize_search_term(self):
+        """Terms are folded the same way as the search_text column."""
+        from app.utils.text_search import normalize_search_term
+
+        assert normalize_search_term("  PÉREZ   Ñoño ") == "perez nono"
+
     async def test_get_client_by_code(self, db_session):
         """Test getting client by code."""
         from app.services.client import ClientService
@@ -0,0 +1,196 @@
+"""
+Unit Tests for the email outbox (app.services.email_outbox)
+
+Tests cover:
+- Enqueueing rendered emails
+- Batched delivery through a fake Resend client
+- Retries with exponential backoff and giving up
+- Falling back to single sends when a batch is rejected
+- Short provider responses
+- Rate limiting
+"""
+import time
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.email_outbox import EmailOutbox, EmailStatus
+from app.services.email import build_order_ready_email
+from app.services.email_outbox import (
+    EmailOutboxService,
+    EmailOutboxWorker,
+    RateLimiter,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+class FakeResendClient:
+    """Records provider calls; addresses in `rejected` make the call fail"""
+
+    def __init__(self, rejected: set[str] = frozenset(), max_ids: int | None = None):
+        self.calls: list[list[str]] = []
+        self.rejected = rejected
+        self.max_ids = max_ids
+
+    def send_batch(self, emails: list[dict]) -> list[str | None]:
+        recipients = [email["to"][0] for email in emails]
+        self.calls.append(recipients)
+        if self.rejected.intersection(recipients):
+            raise RuntimeError("422 invalid recipient")
+        return [f"re_{recipient}" for recipient in recipients][:self.max_ids]
+
+
+@pytest.fixture
+async def outbox_sessions(async_engine):
+    """
+    Session factory for the worker whose commits stay inside one outer
+    transaction, rolled back after the test. Starts from an empty queue.
+    """
+    async with async_engine.connect() as conn:
+        trans = await conn.begin()
+        await conn.execute(delete(EmailOutbox))
+        factory = async_sessionmaker(
+            bind=conn,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint"
+        )
+        yield factory
+        await trans.rollback()
+
+
+async def enqueue(factory, *recipients: str) -> None:
+    async with factory() as db:
+        service = EmailOutboxService(db)
+        for recipient in recipients:
+            await service.enqueue(
+                build_order_ready_email(recipient, "Cliente", "ENC-2026-0001"),
+                kind="order_ready"
+            )
+        await db.commit()
+
+
+async def load_all(factory) -> dict[str, EmailOutbox]:
+    async with factory() as db:
+        result = await db.execute(select(EmailOutbox))
+        return {email.to_email: email for email in result.scalars().all()}
+
+
+class TestEmailOutboxDelivery:
+    """Tests for the worker delivery loop"""
+
+    async def test_enqueue_stores_rendered_email(self, outbox_sessions):
+        await enqueue(outbox_sessions, "ana@example.com")
+
+        email = (await load_all(outbox_sessions))["ana@example.com"]
+        assert email.status == EmailStatus.PENDING
+        assert email.kind == "order_ready"
+        assert "ENC-2026-0001" in email.subject
+        assert email.params["to"] == ["ana@example.com"]
+
+    async def test_sends_due_emails_in_one_batch(self, outbox_sessions):
+        await enqueue(outbox_sessions, "a@example.com", "b@example.com", "c@example.com")
+        client = FakeResendClient()
+        worker = EmailOutboxWorker(outbox_sessions, client, batch_size=10, rate_per_second=0)
+
+        assert await worker.run_once() == 3
+        assert await worker.run_once() == 0
+
+        emails = await load_all(outbox_sessions)
+        assert len(client.calls) == 1
+        assert all(e.status == EmailStatus.SENT for e in emails.values())
+        assert emails["a@example.com"].provider_id == "re_a@example.com"
+
+    async def test_failure_is_retried_with_backoff(self, outbox_sessions, monkeypatch):
+        monkeypatch.setattr(settings, "EMAIL_OUTBOX_RETRY_BASE_SECONDS", 30)
+        await enqueue(outbox_sessions, "bad@example.com")
+        client = FakeResendClient(rejected={"bad@example.com"})
+        worker = EmailOutboxWorker(outbox_sessions, client, rate_per_second=0)
+
+        await worker.run_once()
+        # Not due yet: the retry waits for the backoff
+        assert await worker.run_once() == 0
+
+        email = (await load_all(outbox_sessions))["bad@example.com"]
+        assert email.status == EmailStatus.PENDING
+        assert email.attempts == 1
+        assert email.last_error == "422 invalid recipient"
+        assert email.next_attempt_at > datetime.utcnow() + timedelta(seconds=25)
+
+    async def test_gives_up_after_max_attempts(self, outbox_sessions, monkeypatch):
+        monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 2)
+        monkeypatch.setattr(settings, "EMAIL_OUTBOX_RETRY_BASE_SECONDS", 0)
+        await enqueue(outbox_sessions, "bad@example.com")
+        worker = EmailOutboxWorker(
+            outbox_sessions, FakeResendClient(rejected={"bad@example.com"}), rate_per_second=0
+        )
+
+        await worker.run_once()
+        await worker.run_once()
+
+        email = (await load_all(outbox_sessions))["bad@example.com"]
+        assert email.status == EmailStatus.FAILED
+        assert email.attempts == 2
+        assert await worker.run_once() == 0
+
+    async def test_rejected_batch_falls_back_to_single_sends(self, outbox_sessions):
+        await enqueue(outbox_sessions, "a@example.com", "bad@example.com", "c@example.com")
+        client = FakeResendClient(rejected={"bad@example.com"})
+        worker = EmailOutboxWorker(outbox_sessions, client, batch_size=10, rate_per_second=0)
+
+        await worker.run_once()
+
+        emails = await load_all(outbox_sessions)
+        assert len(client.calls) == 4  # batch + one per email
+        assert emails["a@example.com"].status == EmailStatus.SENT
+        assert emails["c@example.com"].status == EmailStatus.SENT
+        assert emails["bad@example.com"].status == EmailStatus.PENDING
+
+    async def test_short_id_list_marks_every_email_sent(self, outbox_sessions):
+        await enqueue(outbox_sessions, "a@example.com", "b@example.com", "c@example.com")
+        worker = EmailOutboxWorker(
+            outbox_sessions, FakeResendClient(max_ids=2), batch_size=10, rate_per_second=0
+        )
+
+        assert await worker.run_once() == 3
+
+        emails = await load_all(outbox_sessions)
+        assert all(e.status == EmailStatus.SENT for e in emails.values())
+        assert sorted(e.provider_id is None for e in emails.values()) == [False, False, True]
+
+    async def test_stats_count_by_status(self, outbox_sessions):
+        await enqueue(outbox_sessions, "a@example.com")
+
+        async with outbox_sessions() as db:
+            stats = await EmailOutboxService(db).get_stats()
+
+        assert stats["pending"] == 1
+        assert stats["sent"] == 0
+        assert stats["oldest_pending_seconds"] is not None
+
+
+class TestRateLimiter:
+    """Tests for provider call spacing"""
+
+    async def test_spaces_calls(self):
+        limiter = RateLimiter(rate_per_second=20)
+
+        start = time.monotonic()
+        for _ in range(4):
+            await limiter.acquire()
+
+        # First call is immediate, the next three wait 50ms each
+        assert time.monotonic() - start >= 0.14
+
+    async def test_zero_rate_disables_limit(self):
+        limiter = RateLimiter(rate_per_second=0)
+
+        start = time.monotonic()
+        for _ in range(100):
+            await limiter.acquire()
+
+        assert time.monotonic() - start < 0.05
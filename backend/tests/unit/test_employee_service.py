@@ -238,6 +238,28 @@ async def test_calculate_employee_totals_with_bonuses(mock_db_session, employee_
     assert len(result["bonus_breakdown"]) == 1
 
 
+@pytest.mark.asyncio
+async def test_get_active_bonuses_by_employee_groups_one_query(mock_db_session, employee_service_instance):
+    """Test that bonuses for many employees come from one query, grouped by employee."""
+    with_bonus, without_bonus = uuid4(), uuid4()
+
+    mock_bonus = MagicMock(spec=EmployeeBonus)
+    mock_bonus.employee_id = with_bonus
+
+    bonuses_result = MagicMock()
+    bonuses_result.scalars.return_value.all.return_value = [mock_bonus]
+    mock_db_session.execute.return_value = bonuses_result
+
+    result = await employee_service_instance.get_active_bonuses_by_employee(
+        mock_db_session,
+        [with_bonus, without_bonus],
+        date.today()
+    )
+
+    mock_db_session.execute.assert_awaited_once()
+    assert result == {with_bonus: [mock_bonus], without_bonus: []}
+
+
 @pytest.mark.asyncio
 async def test_create_bonus_for_employee(mock_db_session, employee_service_instance):
     """Test creating a bonus for an employee."""
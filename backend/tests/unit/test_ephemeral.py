@@ -0,0 +1,39 @@
+"""
+Unit Tests for the shared ephemeral state store (app.core.ephemeral)
+"""
+import pytest
+from unittest.mock import patch
+
+from app.core.ephemeral import EphemeralStore
+
+
+class TestEphemeralStore:
+    """Tests for verification-code storage"""
+
+    @pytest.mark.asyncio
+    async def test_values_expire_after_ttl(self):
+        store = EphemeralStore()
+
+        with patch("app.core.cache.time.monotonic", return_value=100.0):
+            await store.set("email_code:ana@example.com", "123456", ttl=600)
+            assert await store.get("email_code:ana@example.com") == "123456"
+
+        with patch("app.core.cache.time.monotonic", return_value=700.0):
+            assert await store.get("email_code:ana@example.com") is None
+
+    @pytest.mark.asyncio
+    async def test_pop_returns_value_once(self):
+        store = EphemeralStore()
+        await store.set("phone_code:3001234567", "654321", ttl=300)
+
+        assert await store.pop("phone_code:3001234567") == "654321"
+        assert await store.pop("phone_code:3001234567") is None
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_memory_when_redis_unreachable(self):
+        store = EphemeralStore("redis://127.0.0.1:1/0")
+
+        await store.set(store.key("verified_email", "ana@example.com"), True, ttl=30)
+
+        assert store.backend_name == "memory"
+        assert await store.get("verified_email:ana@example.com") is True
@@ -10,6 +10,7 @@ from uuid import uuid4
 from datetime import date
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from app.services.balance_ledger import BalanceLedgerService
 from app.services.expense_adjustment import ExpenseAdjustmentService
 from app.models.accounting import (
     Expense, ExpenseAdjustment, AdjustmentReason,
@@ -34,6 +35,16 @@ def mock_db_session():
     return session
 
 
+@pytest.fixture(autouse=True)
+def no_row_locks():
+    """Accounts here are mocks: take no balance row locks"""
+    async def lock_current(self, account_ids):
+        return {}
+
+    with patch.object(BalanceLedgerService, "lock_current", lock_current):
+        yield
+
+
 @pytest.fixture
 def sample_expense():
     """Create a sample paid expense for testing."""
@@ -230,12 +241,12 @@ class TestAdjustExpenseAccount:
         original_old_balance = sample_account.balance
         original_new_balance = sample_new_account.balance
 
-        async def mock_get_account(account_id):
-            if account_id == sample_expense.payment_account_id:
-                return sample_account
-            return sample_new_account
+        locked = {
+            sample_expense.payment_account_id: sample_account,
+            sample_new_account.id: sample_new_account
+        }
 
-        with patch.object(service, 'get_account_by_id', side_effect=mock_get_account):
+        with patch.object(service, 'lock_accounts', AsyncMock(return_value=locked)):
             # Act
             result = await service.adjust_expense(
                 expense_id=sample_expense.id,
@@ -263,12 +274,12 @@ class TestAdjustExpenseAccount:
         mock_result.scalar_one_or_none = MagicMock(return_value=sample_expense)
         mock_db_session.execute.return_value = mock_result
 
-        async def mock_get_account(account_id):
-            if account_id == sample_expense.payment_account_id:
-                return sample_account
-            return sample_new_account
+        locked = {
+            sample_expense.payment_account_id: sample_account,
+            sample_new_account.id: sample_new_account
+        }
 
-        with patch.object(service, 'get_account_by_id', side_effect=mock_get_account):
+        with patch.object(service, 'lock_accounts', AsyncMock(return_value=locked)):
             # Act & Assert
             with pytest.raises(ValueError, match="Fondos insuficientes"):
                 await service.adjust_expense(
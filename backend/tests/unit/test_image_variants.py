@@ -0,0 +1,75 @@
+"""
+Unit Tests for catalog image variants (app.services.image_variants)
+
+Tests cover:
+- WebP/JPEG variants per width, in the process pool and in a thread
+- No upscaling of small images
+- Unreadable files keep serving the original
+- Removing variant files
+"""
+import pytest
+from PIL import Image
+
+from app.core.config import settings
+from app.services import image_variants
+from app.services.image_variants import generate_variants, remove_variants
+
+
+pytestmark = pytest.mark.unit
+
+
+def make_image(path, size, mode="RGBA"):
+    Image.new(mode, size, (200, 30, 30, 128)[:len(mode)]).save(path)
+    return path
+
+
+@pytest.fixture(params=[0, 1], ids=["thread", "process-pool"])
+def workers(request, monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_VARIANT_WORKERS", request.param)
+    yield request.param
+    image_variants.shutdown_pool()
+
+
+class TestGenerateVariants:
+    """Tests for generate_variants"""
+
+    async def test_creates_each_width_and_format(self, tmp_path, workers):
+        original = make_image(tmp_path / "abc123.png", (1600, 1200))
+
+        variants = await generate_variants(original, "/uploads/garment-types/s/g/abc123.png")
+
+        assert [(v["width"], v["format"]) for v in variants] == [
+            (320, "webp"), (320, "jpeg"), (800, "webp"), (800, "jpeg")
+        ]
+        assert variants[0]["url"] == "/uploads/garment-types/s/g/abc123_w320.webp"
+        with Image.open(tmp_path / "abc123_w800.jpg") as resized:
+            assert resized.size == (800, 600)
+            assert resized.mode == "RGB"
+
+    async def test_small_image_is_not_upscaled(self, tmp_path, workers):
+        original = make_image(tmp_path / "small.jpg", (200, 100), mode="RGB")
+
+        variants = await generate_variants(original, "/uploads/x/small.jpg")
+
+        assert [(v["width"], v["format"]) for v in variants] == [(200, "webp"), (200, "jpeg")]
+        assert variants[0]["url"] == "/uploads/x/small_w200.webp"
+        assert not (tmp_path / "small_w320.webp").exists()
+        with Image.open(tmp_path / "small_w200.webp") as resized:
+            assert resized.size == (200, 100)
+
+    async def test_unreadable_file_returns_none(self, tmp_path, workers):
+        original = tmp_path / "broken.png"
+        original.write_bytes(b"not an image")
+
+        assert await generate_variants(original, "/uploads/x/broken.png") is None
+
+
+async def test_remove_variants(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_VARIANT_WORKERS", 0)
+    (tmp_path / "x").mkdir()
+    original = make_image(tmp_path / "x" / "img.png", (900, 900))
+
+    variants = await generate_variants(original, "/uploads/x/img.png")
+    await remove_variants(tmp_path, variants)
+
+    assert sorted(p.name for p in (tmp_path / "x").iterdir()) == ["img.png"]
@@ -0,0 +1,80 @@
+"""
+Unit Tests for request performance metrics (app.core.metrics)
+"""
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from app.core.metrics import (
+    MetricsRegistry, PerformanceMiddleware, RequestStats, current_stats, metrics
+)
+
+
+def _app_running(statements: list[str]) -> FastAPI:
+    """App whose route "executes" the given statements"""
+    app = FastAPI()
+    app.add_middleware(PerformanceMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        for statement in statements:
+            current_stats().record(statement, 0.002)
+        return {"id": item_id}
+
+    return app
+
+
+class TestMetricsRegistry:
+    """Tests for the Prometheus text rendering"""
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        stats = RequestStats()
+        stats.record("SELECT 1", 0.01)
+
+        registry.observe("GET", "/items/{item_id}", 200, 0.03, stats, False)
+        registry.observe("GET", "/items/{item_id}", 200, 0.3, stats, False)
+        text = registry.render()
+
+        labels = 'method="GET",route="/items/{item_id}"'
+        assert f'http_requests_total{{{labels},status="200"}} 2' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="0.05"}} 1' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="0.5"}} 2' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert f'http_request_duration_seconds_count{{{labels}}} 2' in text
+        assert f'http_request_db_queries_bucket{{{labels},le="1"}} 2' in text
+
+
+class TestPerformanceMiddleware:
+    """Tests for per-request attribution"""
+
+    @pytest.mark.asyncio
+    async def test_records_route_template_and_query_count(self):
+        metrics.reset()
+        app = _app_running(["SELECT 1", "SELECT 2"])
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/items/1")
+            await client.get("/items/2")
+
+        text = metrics.render()
+        labels = 'method="GET",route="/items/{item_id}"'
+        assert f'http_requests_total{{{labels},status="200"}} 2' in text
+        assert f'http_request_db_queries_sum{{{labels}}} 4' in text
+        assert "/items/1" not in text
+
+    @pytest.mark.asyncio
+    async def test_flags_requests_over_query_budget(self):
+        metrics.reset()
+        app = _app_running(["SELECT * FROM sale_items WHERE sale_id = $1"] * 5)
+
+        with patch("app.core.metrics.settings.REQUEST_QUERY_BUDGET", 3), \
+                patch("app.core.metrics.logger") as logger:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                await client.get("/items/1")
+
+        assert 'http_request_query_budget_exceeded_total{method="GET",route="/items/{item_id}"} 1' in metrics.render()
+        event, = [c for c in logger.warning.call_args_list if c.args[0] == "query_budget_exceeded"]
+        assert event.kwargs["queries"] == 5
+        assert event.kwargs["repeats"] == 5
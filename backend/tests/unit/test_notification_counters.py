@@ -0,0 +1,148 @@
+"""
+Unit Tests for the unread notification counters (NotificationService)
+
+Tests cover:
+- Counters maintained by create and mark_as_read
+- Visibility per user, school and superuser
+- Reconciliation against the notifications table
+"""
+import pytest
+from uuid import uuid4
+from sqlalchemy import select, update
+
+from app.models.notification import Notification, NotificationCounter, NotificationType
+from app.models.school import School
+from app.schemas.notification import NotificationCreate
+from app.services.notification import NotificationService
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+async def other_school(db_session) -> School:
+    unique_id = uuid4().hex[:8]
+    school = School(
+        code=f"OTR-{unique_id}",
+        name=f"Other School {unique_id}",
+        slug=f"other-school-{unique_id}",
+        is_active=True
+    )
+    db_session.add(school)
+    await db_session.flush()
+    return school
+
+
+def notification(school_id=None, user_id=None) -> NotificationCreate:
+    return NotificationCreate(
+        type=NotificationType.LOW_STOCK_ALERT,
+        title="Stock bajo: CAM-001",
+        message="Camisa tiene 1 unidades (minimo: 5)",
+        school_id=school_id,
+        user_id=user_id
+    )
+
+
+async def unread(service: NotificationService, user, school_ids) -> int:
+    count, _ = await service.get_unread_count(user.id, school_ids, user.is_superuser)
+    return count
+
+
+async def counted_unread(db_session, user, school_ids) -> int:
+    """Unread count straight from notifications (what the counters must match)"""
+    notifications, _, _ = await NotificationService(db_session).get_for_user(
+        user.id, school_ids, user.is_superuser, unread_only=True, limit=100
+    )
+    return len(notifications)
+
+
+class TestUnreadCounters:
+    """Tests for counters kept in sync by the service"""
+
+    async def test_create_counts_only_visible_notifications(
+        self, db_session, test_user_with_school_role, other_school
+    ):
+        user, school = test_user_with_school_role
+        service = NotificationService(db_session)
+        before = await unread(service, user, [school.id])
+
+        await service.create(notification(school_id=school.id))
+        await service.create(notification(school_id=school.id, user_id=user.id))
+        await service.create(notification(school_id=other_school.id))
+
+        assert await unread(service, user, [school.id]) == before + 2
+        assert await unread(service, user, [school.id]) == await counted_unread(
+            db_session, user, [school.id]
+        )
+
+    async def test_user_specific_notification_is_not_counted_for_others(
+        self, db_session, test_user_with_school_role, test_superuser
+    ):
+        user, school = test_user_with_school_role
+        service = NotificationService(db_session)
+        before = await unread(service, test_superuser, [])
+
+        await service.create(notification(school_id=school.id, user_id=user.id))
+        await service.create(notification(school_id=school.id))
+
+        # Superuser sees every school, but not another user's notification
+        assert await unread(service, test_superuser, []) == before + 1
+
+    async def test_mark_as_read_decrements(self, db_session, test_user_with_school_role):
+        user, school = test_user_with_school_role
+        service = NotificationService(db_session)
+        first = await service.create(notification(school_id=school.id))
+        await service.create(notification(school_id=school.id, user_id=user.id))
+        before = await unread(service, user, [school.id])
+
+        assert await service.mark_as_read([first.id], user.id, [school.id]) == 1
+        assert await unread(service, user, [school.id]) == before - 1
+
+        await service.mark_as_read(None, user.id, [school.id])
+        assert await unread(service, user, [school.id]) == 0
+
+    async def test_last_notification_at(self, db_session, test_user_with_school_role):
+        user, school = test_user_with_school_role
+        service = NotificationService(db_session)
+        created = await service.create(notification(school_id=school.id))
+
+        _, last_at = await service.get_unread_count(user.id, [school.id])
+
+        assert last_at >= created.created_at
+
+
+class TestReconcileUnreadCounters:
+    """Tests for rebuilding counters from notifications"""
+
+    async def test_fixes_drift(self, db_session, test_user_with_school_role):
+        user, school = test_user_with_school_role
+        service = NotificationService(db_session)
+        created = await service.create(notification(school_id=school.id))
+        await service.create(notification(school_id=school.id))
+        await service.reconcile_unread_counters()
+
+        # Written behind the service's back
+        await db_session.execute(
+            update(Notification).where(Notification.id == created.id).values(is_read=True)
+        )
+        key = NotificationCounter.key_for(None, school.id)
+
+        assert await service.reconcile_unread_counters() == 1
+        counter = await db_session.get(NotificationCounter, key, populate_existing=True)
+        assert counter.unread_count == 1
+        assert await service.reconcile_unread_counters() == 0
+
+    async def test_removes_buckets_without_notifications(self, db_session, test_school):
+        db_session.add(NotificationCounter(
+            scope_key=NotificationCounter.key_for(None, test_school.id),
+            school_id=test_school.id,
+            unread_count=3
+        ))
+        await db_session.flush()
+
+        await NotificationService(db_session).reconcile_unread_counters()
+
+        result = await db_session.execute(
+            select(NotificationCounter).where(NotificationCounter.school_id == test_school.id)
+        )
+        assert result.scalars().all() == []
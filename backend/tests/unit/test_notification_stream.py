@@ -0,0 +1,222 @@
+"""
+Unit Tests for the notification stream (app.services.notification_stream)
+
+Tests cover:
+- Visibility of events per user scope
+- Fan-out to many simulated SSE clients with per-client unread counts
+- Events racing the initial unread snapshot are counted once
+- Resync when a client falls behind
+- Publishing on commit (and not on rollback) from NotificationService
+"""
+import asyncio
+import json
+import pytest
+from uuid import uuid4
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.notification import NotificationType
+from app.schemas.notification import NotificationCreate
+from app.services.notification import NotificationService
+from app.services.notification_stream import (
+    NotificationBroker,
+    NotificationEvent,
+    NotificationScope,
+    broker,
+    notification_event_stream,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+def created(school_id=None, user_id=None) -> NotificationEvent:
+    notification_id = uuid4()
+    return NotificationEvent(
+        kind="created",
+        notification_id=notification_id,
+        user_id=user_id,
+        school_id=school_id,
+        data={"id": str(notification_id), "title": "Nuevo pedido web"}
+    )
+
+
+def read(event: NotificationEvent) -> NotificationEvent:
+    return NotificationEvent(
+        kind="read",
+        notification_id=event.notification_id,
+        user_id=event.user_id,
+        school_id=event.school_id
+    )
+
+
+def parse(frame: str) -> tuple[str, dict]:
+    """(event name, data) of an SSE frame"""
+    name, data = frame.strip().split("\n")
+    return name.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+async def next_frames(stream, count: int) -> list[tuple[str, dict]]:
+    return [parse(await asyncio.wait_for(anext(stream), 1)) for _ in range(count)]
+
+
+class TestNotificationScope:
+    """Tests for per-user visibility"""
+
+    def test_school_and_global_notifications(self):
+        school_id = uuid4()
+        scope = NotificationScope(user_id=uuid4(), school_ids=frozenset({school_id}))
+
+        assert scope.can_see(created(school_id=school_id))
+        assert scope.can_see(created(school_id=None))
+        assert not scope.can_see(created(school_id=uuid4()))
+
+    def test_user_specific_notifications(self):
+        user_id = uuid4()
+        scope = NotificationScope(user_id=user_id, school_ids=frozenset())
+
+        assert scope.can_see(created(user_id=user_id))
+        assert not scope.can_see(created(user_id=uuid4()))
+
+    def test_superuser_sees_every_school(self):
+        scope = NotificationScope(user_id=uuid4(), school_ids=frozenset(), is_superuser=True)
+
+        assert scope.can_see(created(school_id=uuid4()))
+
+
+class TestNotificationBroker:
+    """Tests for fan-out to open streams"""
+
+    async def test_many_clients_get_their_own_counts(self):
+        hub = NotificationBroker()
+        schools = [uuid4() for _ in range(3)]
+        clients = []
+        for i in range(300):
+            school_id = schools[i % 3]
+            scope = NotificationScope(user_id=uuid4(), school_ids=frozenset({school_id}))
+            subscription = hub.subscribe(scope)
+            stream = notification_event_stream(subscription, {uuid4() for _ in range(i % 5)})
+            await anext(stream)  # initial unread_count
+            clients.append((school_id, i % 5, stream))
+
+        first = created(school_id=schools[0])
+        hub.publish([first, created(school_id=schools[1]), created(school_id=None)])
+        hub.publish([read(first)])
+
+        for school_id, initial, stream in clients:
+            if school_id == schools[0]:
+                frames = await next_frames(stream, 3)
+                assert [name for name, _ in frames] == ["notification", "notification", "read"]
+                assert frames[-1][1]["unread_count"] == initial + 1
+            elif school_id == schools[1]:
+                frames = await next_frames(stream, 2)
+                assert [name for name, _ in frames] == ["notification", "notification"]
+                assert frames[-1][1]["unread_count"] == initial + 2
+            else:
+                # Only the global notification
+                frames = await next_frames(stream, 1)
+                assert frames[0][0] == "notification"
+                assert frames[0][1]["unread_count"] == initial + 1
+            await stream.aclose()
+
+        assert hub.subscriber_count == 0
+
+    async def test_events_racing_the_snapshot_count_once(self):
+        hub = NotificationBroker()
+        subscription = hub.subscribe(NotificationScope(user_id=uuid4(), school_ids=frozenset()))
+        counted, already_read = created(), created()
+        # Both committed after subscribing but before the unread ids were
+        # loaded: one is in the snapshot, the other was read meanwhile
+        hub.publish([counted, already_read])
+        hub.publish([read(already_read)])
+        stream = notification_event_stream(subscription, {counted.notification_id})
+
+        frames = [parse(await anext(stream))] + await next_frames(stream, 3)
+
+        assert [data["unread_count"] for _, data in frames] == [1, 1, 2, 1]
+        await stream.aclose()
+
+    async def test_slow_client_is_asked_to_resync(self, monkeypatch):
+        monkeypatch.setattr("app.core.config.settings.NOTIFICATION_STREAM_QUEUE_SIZE", 2)
+        hub = NotificationBroker()
+        subscription = hub.subscribe(NotificationScope(user_id=uuid4(), school_ids=frozenset()))
+        stream = notification_event_stream(subscription, set())
+        await anext(stream)
+
+        for _ in range(3):
+            hub.publish([created()])
+
+        assert (await next_frames(stream, 1))[0][0] == "resync"
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
+
+    async def test_idle_stream_sends_keep_alive(self):
+        hub = NotificationBroker()
+        subscription = hub.subscribe(NotificationScope(user_id=uuid4(), school_ids=frozenset()))
+        stream = notification_event_stream(subscription, set(), heartbeat_seconds=0.01)
+        await anext(stream)
+
+        assert await anext(stream) == ": keep-alive\n\n"
+        await stream.aclose()
+
+
+class TestPublishOnCommit:
+    """Tests for NotificationService publishing through the global broker"""
+
+    @pytest.fixture
+    async def sessions(self, async_engine):
+        async with async_engine.connect() as conn:
+            trans = await conn.begin()
+            yield async_sessionmaker(
+                bind=conn,
+                class_=AsyncSession,
+                expire_on_commit=False,
+                join_transaction_mode="create_savepoint"
+            )
+            await trans.rollback()
+
+    @pytest.fixture
+    async def stream(self):
+        subscription = broker.subscribe(
+            NotificationScope(user_id=uuid4(), school_ids=frozenset())
+        )
+        stream = notification_event_stream(subscription, set())
+        await anext(stream)
+        yield stream
+        await stream.aclose()
+
+    @staticmethod
+    def notification() -> NotificationCreate:
+        return NotificationCreate(
+            type=NotificationType.PQRS_RECEIVED,
+            title="Nuevo mensaje PQRS",
+            message="Asunto: prueba"
+        )
+
+    async def test_create_and_read_are_pushed_on_commit(self, sessions, stream):
+        async with sessions() as db:
+            notification = await NotificationService(db).create(self.notification())
+            await db.commit()
+
+        (name, data), = await next_frames(stream, 1)
+        assert name == "notification"
+        assert data["id"] == str(notification.id)
+        assert data["unread_count"] == 1
+
+        async with sessions() as db:
+            marked = await NotificationService(db).mark_as_read(
+                [notification.id], user_id=uuid4(), school_ids=[]
+            )
+            await db.commit()
+
+        assert marked == 1
+        assert await next_frames(stream, 1) == [
+            ("read", {"id": str(notification.id), "unread_count": 0})
+        ]
+
+    async def test_rolled_back_notification_is_not_pushed(self, sessions, stream):
+        async with sessions() as db:
+            await NotificationService(db).create(self.notification())
+            await db.rollback()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await next_frames(stream, 1)
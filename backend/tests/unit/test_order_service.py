@@ -29,9 +29,10 @@ class TestOrderCodeGeneration:
     @pytest.mark.asyncio
     async def test_generate_first_order_code(self, mock_db_session):
         """Should generate ENC-YYYY-0001 for first order"""
-        # The service makes TWO queries:
-        # 1. scalar_one_or_none() to get max code
-        # 2. scalar_one() to check if code exists (returns count)
+        # The sequence service makes THREE queries the first time:
+        # 1. UPDATE ... RETURNING on the counter - None means no counter yet
+        # 2. MAX() seed over existing codes - None means no orders exist
+        # 3. INSERT ... ON CONFLICT ... RETURNING to create the counter
         call_count = 0
 
         async def mock_execute(query):
@@ -39,11 +40,11 @@ class TestOrderCodeGeneration:
             call_count += 1
             mock_result = MagicMock()
             if call_count == 1:
-                # First call: get max code - None means no orders exist
+                mock_result.scalar_one_or_none = MagicMock(return_value=None)
+            elif call_count == 2:
                 mock_result.scalar_one_or_none = MagicMock(return_value=None)
             else:
-                # Second call: check if code exists - 0 means code is available
-                mock_result.scalar_one = MagicMock(return_value=0)
+                mock_result.scalar_one = MagicMock(return_value=1)
             return mock_result
 
         mock_db_session.execute = mock_execute
@@ -53,10 +54,11 @@ class TestOrderCodeGeneration:
 
         current_year = datetime.now().year
         assert code == f"ENC-{current_year}-0001"
+        assert call_count == 3
 
     @pytest.mark.asyncio
     async def test_generate_sequential_order_code(self, mock_db_session):
-        """Should increment sequence for new orders"""
+        """Should use the counter value in a single query once it exists"""
         current_year = datetime.now().year
         call_count = 0
 
@@ -64,12 +66,8 @@ class TestOrderCodeGeneration:
             nonlocal call_count
             call_count += 1
             mock_result = MagicMock()
-            if call_count == 1:
-                # First call: return existing max code
-                mock_result.scalar_one_or_none = MagicMock(return_value=f"ENC-{current_year}-0025")
-            else:
-                # Second call: code is available
-                mock_result.scalar_one = MagicMock(return_value=0)
+            # Counter already at 25, UPDATE ... RETURNING yields 26
+            mock_result.scalar_one_or_none = MagicMock(return_value=26)
             return mock_result
 
         mock_db_session.execute = mock_execute
@@ -78,21 +76,18 @@ class TestOrderCodeGeneration:
         code = await service._generate_order_code(str(uuid4()))
 
         assert code == f"ENC-{current_year}-0026"
+        assert call_count == 1
 
     @pytest.mark.asyncio
     async def test_order_code_format(self, mock_db_session):
         """Code should be ENC-YYYY-NNNN format (4 digits padded)"""
-        current_year = datetime.now().year
         call_count = 0
 
         async def mock_execute(query):
             nonlocal call_count
             call_count += 1
             mock_result = MagicMock()
-            if call_count == 1:
-                mock_result.scalar_one_or_none = MagicMock(return_value=f"ENC-{current_year}-0005")
-            else:
-                mock_result.scalar_one = MagicMock(return_value=0)
+            mock_result.scalar_one_or_none = MagicMock(return_value=5)
             return mock_result
 
         mock_db_session.execute = mock_execute
@@ -330,8 +325,8 @@ class TestOrderCreationValidation:
             call_count += 1
             mock_result = MagicMock()
             if call_count == 1:
-                # Code generation - uses scalar_one_or_none
-                mock_result.scalar_one_or_none = MagicMock(return_value=None)
+                # Code generation - sequence counter
+                mock_result.scalar_one_or_none = MagicMock(return_value=1)
             else:
                 # Garment type lookup - not found
                 mock_result.scalar_one_or_none = MagicMock(return_value=None)
@@ -0,0 +1,124 @@
+"""
+Unit Tests for the overdue sweep (app.services.overdue_sweep)
+
+Tests cover:
+- Only unpaid rows past due_date are flagged, once
+- One notification per school and kind for newly overdue rows
+- Per-school update_overdue_status
+"""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import select
+
+from app.models.accounting import AccountsReceivable, AccountsPayable
+from app.models.notification import Notification, NotificationType
+from app.services.accounting import AccountsReceivableService
+from app.services.overdue_sweep import sweep_overdue
+
+
+pytestmark = pytest.mark.unit
+
+
+def receivable(school_id, due_days: int | None, is_paid=False, amount="100000") -> AccountsReceivable:
+    return AccountsReceivable(
+        school_id=school_id,
+        amount=Decimal(amount),
+        amount_paid=Decimal("0"),
+        description="Pedido a crédito",
+        invoice_date=date.today() - timedelta(days=30),
+        due_date=date.today() + timedelta(days=due_days) if due_days is not None else None,
+        is_paid=is_paid
+    )
+
+
+async def overdue_notifications(db_session, school_id, notification_type) -> list[Notification]:
+    result = await db_session.execute(
+        select(Notification).where(
+            Notification.school_id == school_id,
+            Notification.type == notification_type
+        )
+    )
+    return list(result.scalars().all())
+
+
+class TestSweepOverdue:
+    """Tests for sweep_overdue"""
+
+    async def test_flags_only_unpaid_past_due(self, db_session, test_school):
+        past_due = receivable(test_school.id, -1)
+        due_today = receivable(test_school.id, 0)
+        paid = receivable(test_school.id, -5, is_paid=True)
+        no_due_date = receivable(test_school.id, None)
+        db_session.add_all([past_due, due_today, paid, no_due_date])
+        await db_session.flush()
+
+        receivables, _ = await sweep_overdue(db_session)
+
+        assert receivables >= 1
+        for row in (past_due, due_today, paid, no_due_date):
+            await db_session.refresh(row)
+        assert past_due.is_overdue is True
+        assert due_today.is_overdue is False
+        assert paid.is_overdue is False
+        assert no_due_date.is_overdue is False
+
+    async def test_one_notification_per_school_and_kind(self, db_session, test_school):
+        db_session.add_all([
+            receivable(test_school.id, -3, amount="100000"),
+            receivable(test_school.id, -10, amount="250000"),
+            AccountsPayable(
+                school_id=test_school.id,
+                vendor="Distribuidor ABC",
+                amount=Decimal("80000"),
+                amount_paid=Decimal("0"),
+                description="Compra de telas",
+                invoice_date=date.today() - timedelta(days=40),
+                due_date=date.today() - timedelta(days=2),
+                is_paid=False
+            ),
+        ])
+        await db_session.flush()
+
+        await sweep_overdue(db_session)
+
+        [receivables_note] = await overdue_notifications(
+            db_session, test_school.id, NotificationType.RECEIVABLES_OVERDUE
+        )
+        [payables_note] = await overdue_notifications(
+            db_session, test_school.id, NotificationType.PAYABLES_OVERDUE
+        )
+        assert receivables_note.title == "2 cuentas por cobrar vencidas"
+        assert receivables_note.message == "Saldo pendiente: $350,000"
+        assert payables_note.title == "1 cuenta por pagar vencida"
+
+    async def test_already_overdue_rows_are_not_notified_again(self, db_session, test_school):
+        db_session.add(receivable(test_school.id, -1))
+        await db_session.flush()
+
+        await sweep_overdue(db_session)
+        await sweep_overdue(db_session)
+
+        notes = await overdue_notifications(
+            db_session, test_school.id, NotificationType.RECEIVABLES_OVERDUE
+        )
+        assert len(notes) == 1
+
+
+async def test_update_overdue_status_limits_to_school(db_session, test_school, school_factory):
+    other_school = school_factory()
+    db_session.add(other_school)
+    await db_session.flush()
+
+    own = receivable(test_school.id, -1)
+    other = receivable(other_school.id, -1)
+    db_session.add_all([own, other])
+    await db_session.flush()
+
+    count = await AccountsReceivableService(db_session).update_overdue_status(test_school.id)
+
+    await db_session.refresh(own)
+    await db_session.refresh(other)
+    assert count == 1
+    assert own.is_overdue is True
+    assert other.is_overdue is False
@@ -0,0 +1,71 @@
+"""
+Unit Tests for keyset pagination helpers (app.db.pagination)
+"""
+import pytest
+from datetime import datetime
+from uuid import uuid4
+
+from app.db.pagination import (
+    CountMode, InvalidCursorError, count_rows, decode_cursor, encode_cursor,
+    keyset_paginate, page_rows
+)
+from app.models.sale import Sale, SaleStatus
+from sqlalchemy import select
+
+
+class TestCursor:
+    """Tests for cursor encoding"""
+
+    def test_round_trip_restores_column_types(self):
+        created_at = datetime(2026, 3, 1, 12, 30, 15, 123456)
+        sale_id = uuid4()
+
+        cursor = encode_cursor(created_at, sale_id)
+
+        assert decode_cursor(cursor, (Sale.created_at, Sale.id)) == (created_at, sale_id)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor("x"), "e30"])
+    def test_invalid_cursor_raises(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, (Sale.created_at, Sale.id))
+
+
+class TestKeysetPaginate:
+    """Tests for page query building and trimming"""
+
+    def test_cursor_replaces_offset(self):
+        cursor = encode_cursor(datetime(2026, 3, 1), uuid4())
+
+        query = keyset_paginate(select(Sale), (Sale.created_at, Sale.id), 10, cursor, skip=50)
+        sql = str(query)
+
+        assert "OFFSET" not in sql
+        assert "(sales.created_at, sales.id) <" in sql
+        assert query._limit == 11
+
+    def test_page_rows_returns_cursor_only_when_more_rows(self):
+        rows = [(datetime(2026, 3, i), uuid4()) for i in range(1, 4)]
+
+        page, next_cursor = page_rows(rows, 2, lambda row: row)
+        assert page == rows[:2]
+        assert decode_cursor(next_cursor, (Sale.created_at, Sale.id)) == rows[1]
+
+        page, next_cursor = page_rows(rows, 3, lambda row: row)
+        assert page == rows
+        assert next_cursor is None
+
+
+class TestCountRows:
+    """Tests for totals"""
+
+    async def test_approximate_binds_search_as_parameter(self, db_session):
+        search = "%'; DELETE FROM sales; --%"
+        query = select(Sale).where(
+            Sale.code.ilike(search),
+            Sale.status == SaleStatus.COMPLETED
+        )
+
+        approximate = await count_rows(db_session, query, CountMode.APPROXIMATE)
+
+        assert isinstance(approximate, int)
+        assert await count_rows(db_session, query, CountMode.EXACT) == 0
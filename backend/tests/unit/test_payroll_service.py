@@ -10,7 +10,9 @@ from datetime import date, datetime, timedelta
 from decimal import Decimal
 from uuid import uuid4
 
-from app.models.payroll import Employee, PayrollRun, PayrollItem, PayrollStatus, PaymentFrequency
+from app.models.payroll import (
+    Employee, EmployeeBonus, BonusType, PayrollRun, PayrollItem, PayrollStatus, PaymentFrequency
+)
 from app.services.payroll_service import PayrollService, payroll_service
 from app.schemas.payroll import PayrollRunCreate, PayrollRunUpdate
 
@@ -41,26 +43,25 @@ async def test_create_payroll_run_initializes_draft(mock_db_session, payroll_ser
         period_end=date.today()
     )
 
+    employee_id = uuid4()
     mock_employees = [
         MagicMock(
             spec=Employee,
-            id=uuid4(),
+            id=employee_id,
             is_active=True,
-            base_salary=Decimal("1500000")
+            base_salary=Decimal("1500000"),
+            health_deduction=Decimal("60000"),
+            pension_deduction=Decimal("60000"),
+            other_deductions=Decimal("0"),
         )
     ]
 
-    # Mock employee_service.get_employees
+    # Mock employee_service bulk loaders
     with patch('app.services.payroll_service.employee_service') as mock_emp_service:
-        mock_emp_service.get_employees = AsyncMock(return_value=mock_employees)
-        mock_emp_service.calculate_employee_totals = AsyncMock(return_value={
-            "base_salary": Decimal("1500000"),
-            "total_bonuses": Decimal("100000"),
-            "total_deductions": Decimal("120000"),
-            "net_amount": Decimal("1480000"),
-            "bonus_breakdown": [],
-            "deduction_breakdown": []
-        })
+        mock_emp_service.get_payroll_employees = AsyncMock(return_value=mock_employees)
+        mock_emp_service.get_active_bonuses_by_employee = AsyncMock(
+            return_value={employee_id: []}
+        )
 
         result = await payroll_service_instance.create_payroll_run(
             mock_db_session,
@@ -74,6 +75,55 @@ async def test_create_payroll_run_initializes_draft(mock_db_session, payroll_ser
     assert added_run.status == PayrollStatus.DRAFT
 
 
+@pytest.mark.asyncio
+async def test_create_payroll_run_inserts_items_in_one_batch(mock_db_session, payroll_service_instance):
+    """Test that a payroll run loads employees and bonuses once and inserts all items together."""
+    create_data = PayrollRunCreate(
+        period_start=date.today() - timedelta(days=15),
+        period_end=date.today()
+    )
+
+    mock_employees = [
+        MagicMock(
+            spec=Employee,
+            id=uuid4(),
+            is_active=True,
+            base_salary=Decimal("1000000"),
+            health_deduction=Decimal("40000"),
+            pension_deduction=Decimal("40000"),
+            other_deductions=Decimal("0"),
+        )
+        for _ in range(300)
+    ]
+    bonus = MagicMock(spec=EmployeeBonus)
+    bonus.name = "Transporte"
+    bonus.amount = Decimal("100000")
+    bonus.is_recurring = True
+    bonus.bonus_type = BonusType.FIXED
+    bonuses = {emp.id: [] for emp in mock_employees}
+    bonuses[mock_employees[0].id] = [bonus]
+
+    with patch('app.services.payroll_service.employee_service') as mock_emp_service:
+        mock_emp_service.get_payroll_employees = AsyncMock(return_value=mock_employees)
+        mock_emp_service.get_active_bonuses_by_employee = AsyncMock(return_value=bonuses)
+
+        result = await payroll_service_instance.create_payroll_run(
+            mock_db_session,
+            create_data,
+            created_by=uuid4()
+        )
+
+    mock_emp_service.get_payroll_employees.assert_awaited_once()
+    mock_emp_service.get_active_bonuses_by_employee.assert_awaited_once()
+    mock_db_session.execute.assert_awaited_once()
+    items = mock_db_session.execute.call_args[0][1]
+    assert len(items) == 300
+    assert items[0]["total_bonuses"] == Decimal("100000")
+    assert items[0]["net_amount"] == Decimal("1020000")
+    assert result.employee_count == 300
+    assert result.total_net == Decimal("920000") * 300 + Decimal("100000")
+
+
 @pytest.mark.asyncio
 async def test_create_payroll_run_validates_dates(mock_db_session, payroll_service_instance):
     """Test that payroll run rejects invalid date range."""
@@ -289,8 +339,15 @@ async def test_cannot_cancel_paid_payroll(mock_db_session, payroll_service_insta
 async def test_get_payroll_summary(mock_db_session, payroll_service_instance):
     """Test that payroll summary returns correct data."""
     mock_employees = [
-        MagicMock(spec=Employee, id=uuid4()),
-        MagicMock(spec=Employee, id=uuid4()),
+        MagicMock(
+            spec=Employee,
+            id=uuid4(),
+            base_salary=Decimal("1500000"),
+            health_deduction=Decimal("60000"),
+            pension_deduction=Decimal("60000"),
+            other_deductions=Decimal("0"),
+        )
+        for _ in range(2)
     ]
 
     # Mock pending payroll runs
@@ -301,15 +358,10 @@ async def test_get_payroll_summary(mock_db_session, payroll_service_instance):
     mock_last_paid.period_end = date.today() - timedelta(days=30)
 
     with patch('app.services.payroll_service.employee_service') as mock_emp_service:
-        mock_emp_service.get_employees = AsyncMock(return_value=mock_employees)
-        mock_emp_service.calculate_employee_totals = AsyncMock(return_value={
-            "base_salary": Decimal("1500000"),
-            "total_bonuses": Decimal("100000"),
-            "total_deductions": Decimal("120000"),
-            "net_amount": Decimal("1480000"),
-            "bonus_breakdown": [],
-            "deduction_breakdown": []
-        })
+        mock_emp_service.get_payroll_employees = AsyncMock(return_value=mock_employees)
+        mock_emp_service.get_active_bonuses_by_employee = AsyncMock(
+            return_value={emp.id: [] for emp in mock_employees}
+        )
 
         # Mock pending runs query
         pending_result = MagicMock()
@@ -324,6 +376,7 @@ async def test_get_payroll_summary(mock_db_session, payroll_service_instance):
         result = await payroll_service_instance.get_payroll_summary(mock_db_session)
 
     assert result["active_employees"] == 2
+    assert result["total_monthly_payroll"] == Decimal("2760000")
     assert result["pending_payroll_runs"] == 1
     assert result["last_payroll_date"] == mock_last_paid.period_end
 
@@ -421,3 +421,28 @@ class TestReportsServiceMocked:
         assert len(result) == 1
         assert result[0]["client_name"] == "Juan Pérez"
         assert result[0]["total_purchases"] == 10
+
+    @pytest.mark.asyncio
+    async def test_get_daily_sales_from_rollup(self, mock_db_session):
+        """Daily sales should be derived from rollup rows"""
+        rows = [
+            MagicMock(payment_method="cash", status="completed", sales_count=2, total_amount=Decimal("90000")),
+            MagicMock(payment_method="credit", status="completed", sales_count=1, total_amount=Decimal("45000")),
+            MagicMock(payment_method="cash", status="cancelled", sales_count=1, total_amount=Decimal("45000")),
+        ]
+        mock_db_session.execute = AsyncMock(
+            return_value=MagicMock(
+                scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=rows)))
+            )
+        )
+
+        service = ReportsService(mock_db_session)
+        result = await service.get_daily_sales(uuid4(), date(2024, 6, 15))
+
+        assert mock_db_session.execute.call_count == 1
+        assert result["completed_count"] == 3
+        assert result["cancelled_count"] == 1
+        assert result["pending_count"] == 0
+        assert result["total_revenue"] == 135000
+        assert result["cash_sales"] == 90000
+        assert result["credit_sales"] == 45000
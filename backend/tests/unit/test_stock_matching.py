@@ -0,0 +1,76 @@
+"""
+Unit Tests for ProductStockIndex (order item -> product matching)
+"""
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.services.stock_matching import ProductStockIndex
+
+
+GARMENT = uuid4()
+OTHER_GARMENT = uuid4()
+
+
+def make_product(size, color, garment_type_id=GARMENT):
+    return SimpleNamespace(id=uuid4(), garment_type_id=garment_type_id, size=size, color=color)
+
+
+class TestProductStockIndex:
+    """Tests for stock lookups and virtual consumption"""
+
+    def test_exact_variant_match(self):
+        white_m = make_product("M", "Blanco")
+        blue_m = make_product("M", "Azul")
+        index = ProductStockIndex([(white_m, 3), (blue_m, 10)])
+
+        product, stock = index.best_match(GARMENT, "M", "Blanco")
+
+        assert product is white_m
+        assert stock == 3
+
+    def test_empty_size_or_color_is_wildcard(self):
+        white_m = make_product("M", "Blanco")
+        blue_m = make_product("M", "Azul")
+        blue_l = make_product("L", "Azul")
+        index = ProductStockIndex([(white_m, 3), (blue_m, 10), (blue_l, 20)])
+
+        assert index.best_match(GARMENT, "M", None)[0] is blue_m
+        assert index.best_match(GARMENT, None, "Azul")[0] is blue_l
+        assert index.best_match(GARMENT, None, None)[0] is blue_l
+
+    def test_falls_back_to_same_garment_type(self):
+        small = make_product("S", "Blanco")
+        other = make_product("XL", "Blanco", garment_type_id=OTHER_GARMENT)
+        index = ProductStockIndex([(small, 4), (other, 50)])
+
+        product, stock = index.best_match(GARMENT, "XL", "Blanco")
+
+        assert product is small
+        assert stock == 4
+
+    def test_unknown_garment_type(self):
+        index = ProductStockIndex([(make_product("M", None), 5)])
+
+        assert index.best_match(OTHER_GARMENT, "M", None) == (None, 0)
+
+    def test_ties_resolve_to_first_loaded(self):
+        first = make_product("M", "Blanco")
+        second = make_product("M", "Blanco")
+        index = ProductStockIndex([(first, 5), (second, 5)])
+
+        assert index.best_match(GARMENT, "M", "Blanco")[0] is first
+
+    def test_consume_reduces_availability(self):
+        first = make_product("M", "Blanco")
+        second = make_product("M", "Blanco")
+        index = ProductStockIndex([(first, 5), (second, 3)])
+
+        index.consume(first.id, 4)
+
+        assert index.best_match(GARMENT, "M", "Blanco") == (second, 3)
+
+    def test_missing_inventory_counts_as_zero(self):
+        product = make_product("M", "Blanco")
+        index = ProductStockIndex([(product, None)])
+
+        assert index.best_match(GARMENT, "M", "Blanco") == (product, 0)
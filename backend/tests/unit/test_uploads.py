@@ -0,0 +1,125 @@
+"""
+Unit Tests for the upload pipeline (app.services.uploads) and its use
+by BusinessDocumentService
+
+Tests cover:
+- Chunked writes named by content hash
+- Deduplication of identical files
+- Incremental size limit without leftover temp files
+- Documents sharing a deduplicated file
+- A replaced document file is kept until it is released
+"""
+import hashlib
+import pytest
+from io import BytesIO
+from fastapi import UploadFile
+
+from app.services import uploads
+from app.services.document import BusinessDocumentService
+from app.services.uploads import UploadTooLargeError, store_upload
+
+
+pytestmark = pytest.mark.unit
+
+
+def upload(content: bytes, filename: str = "file.pdf") -> UploadFile:
+    return UploadFile(BytesIO(content), filename=filename)
+
+
+def stored_files(directory) -> list[str]:
+    return sorted(p.name for p in directory.iterdir())
+
+
+class TestStoreUpload:
+    """Tests for store_upload"""
+
+    async def test_streams_in_chunks_to_hash_name(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(uploads, "CHUNK_SIZE", 4)
+        content = b"%PDF-1.4 comprobante de pago"
+
+        stored = await store_upload(upload(content), tmp_path / "proofs", ".PDF", max_size=1024)
+
+        digest = hashlib.sha256(content).hexdigest()
+        assert stored.filename == f"{digest}.pdf"
+        assert stored.size == len(content)
+        assert stored.path.read_bytes() == content
+        assert not stored.deduplicated
+
+    async def test_identical_content_is_stored_once(self, tmp_path):
+        first = await store_upload(upload(b"same image"), tmp_path, ".png", max_size=1024)
+        second = await store_upload(upload(b"same image"), tmp_path, ".png", max_size=1024)
+
+        assert second.path == first.path
+        assert second.deduplicated
+        assert stored_files(tmp_path) == [first.filename]
+
+    async def test_too_large_is_rejected_without_leftovers(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(uploads, "CHUNK_SIZE", 10)
+
+        with pytest.raises(UploadTooLargeError):
+            await store_upload(upload(b"x" * 100), tmp_path, ".jpg", max_size=25)
+
+        assert stored_files(tmp_path) == []
+
+
+class TestDocumentFiles:
+    """Tests for documents sharing deduplicated files"""
+
+    @pytest.fixture
+    def service(self, db_session, tmp_path):
+        service = BusinessDocumentService(db_session)
+        service.upload_path = tmp_path / "documents"
+        return service
+
+    async def create(self, service, user, content: bytes, name: str):
+        return await service.create_document(
+            name=name,
+            description=None,
+            folder_id=None,
+            file=upload(content, f"{name}.pdf"),
+            original_filename=f"{name}.pdf",
+            content_type="application/pdf",
+            created_by_id=user.id
+        )
+
+    async def test_hard_delete_keeps_file_still_in_use(self, service, test_superuser):
+        first = await self.create(service, test_superuser, b"%PDF contrato", "contrato")
+        copy = await self.create(service, test_superuser, b"%PDF contrato", "contrato-copia")
+        assert copy.file_path == first.file_path
+
+        await service.delete_document(first.id, hard_delete=True)
+        assert service.get_download_path(copy).exists()
+
+        await service.delete_document(copy.id, hard_delete=True)
+        assert not service.get_download_path(copy).exists()
+
+    async def test_replaced_file_is_kept_until_released(self, service, test_superuser):
+        document = await self.create(service, test_superuser, b"%PDF v1", "contrato")
+        old_file_path = document.file_path
+        old_path = service.get_download_path(document)
+
+        updated = await service.update_document(
+            document.id,
+            {},
+            new_file=upload(b"%PDF v2", "contrato.pdf"),
+            new_filename="contrato.pdf",
+            new_content_type="application/pdf"
+        )
+
+        assert updated.file_path != old_file_path
+        assert old_path.exists()
+        assert await service.release_file(old_file_path, document.id)
+        assert not old_path.exists()
+        assert service.get_download_path(updated).exists()
+
+    async def test_rejects_type_mismatch(self, service, test_superuser):
+        with pytest.raises(ValueError, match="Tipo de archivo no permitido"):
+            await service.create_document(
+                name="script",
+                description=None,
+                folder_id=None,
+                file=upload(b"#!/bin/sh", "script.sh"),
+                original_filename="script.sh",
+                content_type="text/x-sh",
+                created_by_id=test_superuser.id
+            )
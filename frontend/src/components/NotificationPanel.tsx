@@ -16,6 +16,7 @@ import {
   Package,
   MessageSquare,
   AlertTriangle,
+  Clock,
 } from 'lucide-react';
 import { useNotifications } from '../hooks/useNotifications';
 import type { Notification, NotificationType } from '../types/api';
@@ -27,6 +28,8 @@ const TYPE_ICONS: Record<NotificationType, typeof Bell> = {
   order_status_changed: Package,
   pqrs_received: MessageSquare,
   low_stock_alert: AlertTriangle,
+  receivables_overdue: Clock,
+  payables_overdue: Clock,
 };
 
 // Color mapping for notification types
@@ -36,6 +39,8 @@ const TYPE_COLORS: Record<NotificationType, string> = {
   order_status_changed: 'bg-purple-100 text-purple-600',
   pqrs_received: 'bg-orange-100 text-orange-600',
   low_stock_alert: 'bg-amber-100 text-amber-600',
+  receivables_overdue: 'bg-red-100 text-red-600',
+  payables_overdue: 'bg-red-100 text-red-600',
 };
 
 function formatTimeAgo(dateString: string): string {
@@ -154,6 +159,11 @@ export function NotificationPanel() {
       markAsRead(notification.id);
     }
 
+    // Overdue receivables/payables summaries have no single reference
+    if (notification.type === 'receivables_overdue' || notification.type === 'payables_overdue') {
+      navigate('/accounting');
+    }
+
     // Navigate based on reference type
     if (notification.reference_type && notification.reference_id) {
       switch (notification.reference_type) {
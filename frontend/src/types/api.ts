@@ -1231,7 +1231,9 @@ export type NotificationType =
   | 'new_web_sale'
   | 'order_status_changed'
   | 'pqrs_received'
-  | 'low_stock_alert';
+  | 'low_stock_alert'
+  | 'receivables_overdue'
+  | 'payables_overdue';
 
 export type ReferenceType = 'order' | 'sale' | 'contact' | 'product';
 